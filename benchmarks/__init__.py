@@ -0,0 +1,12 @@
+"""
+Замеры производительности приложения.
+
+Измеряются время холодного запуска, время импорта модулей, время
+разбора параметров и скорость обработки файлов синтетического дерева
+утилитами-заглушками. Результаты сохраняются в JSON файл, который
+можно сравнить с результатами другого коммита:
+
+    python -m benchmarks run --output before.json
+    python -m benchmarks run --output after.json
+    python -m benchmarks compare before.json after.json
+"""
@@ -0,0 +1,114 @@
+"""Запуск замеров производительности и сравнение их результатов."""
+import sys
+from argparse import ArgumentParser, Namespace
+from os import cpu_count
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Dict
+
+from benchmarks.results import (DEFAULT_THRESHOLD, compare_reports,
+                                create_metric, create_report, load_report,
+                                save_report)
+from benchmarks.startup import (measure_cold_start, measure_import_times,
+                                measure_parse_time)
+from benchmarks.throughput import (create_stub_tools, create_tree,
+                                   measure_process_files)
+
+BENCHMARKS = ('startup', 'imports', 'parse', 'throughput')
+
+# Режимы обработки файлов для замера скорости: аргументы командной строки.
+THROUGHPUT_MODES = {
+    'serial': ('--jobs', '1'),
+    'parallel': ('--jobs', str(cpu_count() or 1)),
+    'batch': ('--batch', '--jobs', str(cpu_count() or 1)),
+}
+
+
+def run_benchmarks(parameters: Namespace) -> int:
+    """Выполнение замеров и сохранение отчёта."""
+    metrics: Dict[str, dict] = {}
+    benchmarks = parameters.only or BENCHMARKS
+    repeat = parameters.repeat
+
+    if 'startup' in benchmarks:
+        metrics['startup.version'] = create_metric(
+            measure_cold_start(repeat), 's')
+    if 'imports' in benchmarks:
+        for module, timings in measure_import_times(repeat).items():
+            metrics[f'import.{module}'] = create_metric(timings, 's')
+    if 'parse' in benchmarks:
+        metrics['parse.arguments'] = create_metric(
+            measure_parse_time(repeat), 's')
+    if 'throughput' in benchmarks:
+        with TemporaryDirectory() as directory:
+            stubs_path, tree_path = Path(directory, 'bin'), Path(
+                directory, 'tree')
+            create_stub_tools(stubs_path)
+            create_tree(tree_path, parameters.files)
+            for mode, arguments in THROUGHPUT_MODES.items():
+                timings = measure_process_files(tree_path, stubs_path,
+                                                arguments, repeat)
+                metrics[f'process_files.{mode}'] = create_metric(
+                    [parameters.files / timing for timing in timings],
+                    'files/s', higher_is_better=True)
+
+    save_report(create_report(metrics), parameters.output)
+    for name, metric in sorted(metrics.items()):
+        sys.stdout.write(
+            f'{name}: {metric["median"]:.6g} {metric["unit"]}\n')
+    sys.stdout.write(f'Отчёт сохранён в {parameters.output}\n')
+    return 0
+
+
+def compare_benchmarks(parameters: Namespace) -> int:
+    """Сравнение отчётов; ненулевой статус - есть ухудшения метрик."""
+    comparisons = compare_reports(load_report(parameters.baseline),
+                                  load_report(parameters.current),
+                                  threshold=parameters.threshold)
+    for comparison in comparisons:
+        mark = ' РЕГРЕССИЯ' if comparison['regression'] else ''
+        sys.stdout.write(
+            f'{comparison["name"]}: {comparison["before"]:.6g} -> '
+            f'{comparison["after"]:.6g} {comparison["unit"]} '
+            f'({comparison["change"]:+.1%}){mark}\n')
+    return int(any(comparison['regression'] for comparison in comparisons))
+
+
+def parse_arguments() -> Namespace:
+    """Разбор аргументов командной строки."""
+    parser = ArgumentParser(prog='python -m benchmarks',
+                            description=__doc__)
+    subparsers = parser.add_subparsers(dest='command')
+    subparsers.required = True
+
+    run_parser = subparsers.add_parser('run', help='Выполнить замеры')
+    run_parser.set_defaults(handler=run_benchmarks)
+    run_parser.add_argument('-o', '--output', type=Path,
+                            default=Path('benchmarks.json'),
+                            help='Путь до JSON файла с результатами '
+                            '(по-умолчанию: benchmarks.json)')
+    run_parser.add_argument('-r', '--repeat', type=int, default=5,
+                            help='Количество повторов каждого замера '
+                            '(по-умолчанию: 5)')
+    run_parser.add_argument('--files', type=int, default=500,
+                            help='Количество файлов синтетического дерева '
+                            '(по-умолчанию: 500)')
+    run_parser.add_argument('--only', nargs='+', choices=BENCHMARKS,
+                            help='Выполнить только указанные замеры')
+
+    compare_parser = subparsers.add_parser(
+        'compare', help='Сравнить результаты замеров')
+    compare_parser.set_defaults(handler=compare_benchmarks)
+    compare_parser.add_argument('baseline', type=Path,
+                                help='Отчёт, с которым выполняется сравнение')
+    compare_parser.add_argument('current', type=Path, help='Текущий отчёт')
+    compare_parser.add_argument('-t', '--threshold', type=float,
+                                default=DEFAULT_THRESHOLD,
+                                help='Допустимое относительное ухудшение '
+                                f'медианы (по-умолчанию: {DEFAULT_THRESHOLD})')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    arguments = parse_arguments()
+    sys.exit(arguments.handler(arguments))
@@ -0,0 +1,88 @@
+"""Результаты замеров: сохранение, загрузка и сравнение."""
+import json
+import platform
+from datetime import datetime, timezone
+from pathlib import Path
+from statistics import median
+from subprocess import DEVNULL, PIPE, run  # noqa: S404
+from typing import Dict, List, Sequence
+
+from codestyle import __version__ as application_version
+
+# Допустимое относительное ухудшение медианы метрики при сравнении.
+DEFAULT_THRESHOLD = 0.1
+
+
+def create_metric(values: Sequence[float], unit: str,
+                  higher_is_better: bool = False) -> dict:
+    """
+    Создание метрики из результатов повторных замеров.
+
+    :param values: Результаты замеров.
+    :param unit: Единица измерения.
+    :param higher_is_better: Большее значение метрики лучше (например,
+        для количества файлов в секунду).
+    :return: Метрика.
+    """
+    return {'unit': unit, 'higher_is_better': higher_is_better,
+            'median': median(values), 'min': min(values),
+            'values': list(values)}
+
+
+def create_report(metrics: Dict[str, dict]) -> dict:
+    """
+    Создание отчёта с описанием окружения замеров.
+
+    :param metrics: Метрики по названиям.
+    :return: Отчёт.
+    """
+    completed_process = run(  # noqa: S603, S607
+        ('git', 'rev-parse', 'HEAD'), stdout=PIPE, stderr=DEVNULL,
+        cwd=Path(__file__).parent)
+    commit = (completed_process.stdout.decode().strip()
+              if completed_process.returncode == 0 else None)
+    return {'version': application_version, 'commit': commit,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'created': datetime.now(timezone.utc).isoformat(),
+            'metrics': metrics}
+
+
+def save_report(report: dict, path: Path):
+    """Сохранение отчёта в JSON файл."""
+    with open(path, 'w', encoding='utf-8') as report_file:
+        json.dump(report, report_file, ensure_ascii=False, indent=2,
+                  sort_keys=True)
+
+
+def load_report(path: Path) -> dict:
+    """Загрузка отчёта из JSON файла."""
+    with open(path, encoding='utf-8') as report_file:
+        return json.load(report_file)
+
+
+def compare_reports(baseline: dict, current: dict,
+                    threshold: float = DEFAULT_THRESHOLD) -> List[dict]:
+    """
+    Сравнение медиан метрик, присутствующих в обоих отчётах.
+
+    :param baseline: Отчёт, с которым выполняется сравнение.
+    :param current: Текущий отчёт.
+    :param threshold: Допустимое относительное ухудшение метрики.
+    :return: Сравнения метрик (в порядке названий); regression - метрика
+        ухудшилась больше допустимого.
+    """
+    comparisons = []
+    baseline_metrics = baseline['metrics']
+    for name, metric in sorted(current['metrics'].items()):
+        if name not in baseline_metrics:
+            continue
+
+        before, after = baseline_metrics[name]['median'], metric['median']
+        change = (after - before) / before if before else 0.0
+        worsening = -change if metric['higher_is_better'] else change
+        comparisons.append({'name': name, 'unit': metric['unit'],
+                            'before': before, 'after': after,
+                            'change': change,
+                            'regression': worsening > threshold})
+    return comparisons
@@ -0,0 +1,123 @@
+"""Замеры запуска приложения: холодный старт, импорт, разбор параметров."""
+import os
+import re
+import sys
+from collections import defaultdict
+from pathlib import Path
+from subprocess import DEVNULL, PIPE, run  # noqa: S404
+from time import perf_counter
+from timeit import repeat as repeat_timer
+from typing import Dict, List, Tuple
+from unittest.mock import patch
+
+PROJECT_PATH = Path(__file__).parent.parent.absolute()
+
+# Строка вывода -X importtime:
+# "import time:       123 |       4567 |   codestyle.application".
+IMPORT_TIME_PATTERN = re.compile(
+    r'^import time:\s+(?P<self>\d+) \|\s+(?P<cumulative>\d+) \|'
+    r'(?P<indent>\s+)(?P<module>\S+)$')
+MICROSECONDS_IN_SECOND = 1000000
+
+
+def get_environment() -> Dict[str, str]:
+    """Окружение запуска, в котором импортируется проверяемый код."""
+    python_path = os.environ.get('PYTHONPATH')
+    return {**os.environ,
+            'PYTHONPATH': os.pathsep.join(
+                filter(None, (str(PROJECT_PATH), python_path)))}
+
+
+def measure_cold_start(repeat: int) -> List[float]:
+    """
+    Время холодного запуска python -m codestyle --version.
+
+    :param repeat: Количество замеров.
+    :return: Время каждого замера (в секундах).
+    """
+    timings = []
+    environment = get_environment()
+    for _ in range(repeat):
+        start = perf_counter()
+        run((sys.executable, '-m', 'codestyle', '--version'),  # noqa: S603
+            stdout=DEVNULL, stderr=DEVNULL, env=environment, check=True)
+        timings.append(perf_counter() - start)
+    return timings
+
+
+def measure_import_times(repeat: int,
+                         module: str = 'codestyle.command_line'
+                         ) -> Dict[str, List[float]]:
+    """
+    Время импорта модулей приложения по данным -X importtime.
+
+    Для модулей приложения учитывается полное время импорта (с
+    зависимостями), для сторонних пакетов, импортируемых модулями
+    приложения напрямую, - тоже полное время.
+
+    :param repeat: Количество замеров.
+    :param module: Импортируемый модуль.
+    :return: Время импорта каждого модуля (в секундах) по замерам.
+    """
+    timings: Dict[str, List[float]] = defaultdict(list)
+    environment = get_environment()
+    for _ in range(repeat):
+        completed_process = run(  # noqa: S603
+            (sys.executable, '-X', 'importtime', '-c', f'import {module}'),
+            stdout=DEVNULL, stderr=PIPE, env=environment, check=True)
+        for name, cumulative in _parse_import_times(
+                completed_process.stderr.decode()).items():
+            timings[name].append(cumulative / MICROSECONDS_IN_SECOND)
+    return dict(timings)
+
+
+def _parse_import_times(output: str) -> Dict[str, int]:
+    """
+    Разбор вывода -X importtime.
+
+    Вывод печатается по завершении импорта модуля, поэтому вложенные
+    импорты предшествуют импортирующему их модулю и имеют больший
+    отступ.
+
+    :param output: Вывод интерпретатора.
+    :return: Полное время импорта (в микросекундах) модулей приложения
+        и импортируемых ими напрямую сторонних модулей.
+    """
+    lines = []
+    for line in output.splitlines():
+        match = IMPORT_TIME_PATTERN.match(line)
+        if match is not None:
+            lines.append((len(match.group('indent')), match.group('module'),
+                          int(match.group('cumulative'))))
+
+    import_times = {}
+    parents: List[Tuple[int, str]] = []
+    for indent, module, cumulative in reversed(lines):
+        while parents and parents[-1][0] >= indent:
+            parents.pop()
+        parent = parents[-1][1] if parents else ''
+        if _is_application_module(module) or _is_application_module(parent):
+            import_times[module] = cumulative
+        parents.append((indent, module))
+    return import_times
+
+
+def _is_application_module(module: str) -> bool:
+    """Проверка принадлежности модуля приложению."""
+    return module.split('.')[0] == 'codestyle'
+
+
+def measure_parse_time(repeat: int, number: int = 20) -> List[float]:
+    """
+    Время разбора параметров командной строки ArgumentationTool.
+
+    :param repeat: Количество замеров.
+    :param number: Количество разборов в каждом замере.
+    :return: Среднее время одного разбора (в секундах) по замерам.
+    """
+    from codestyle.parameters_parse import ArgumentationTool
+
+    with patch.object(sys, 'argv', ['codestyle', str(PROJECT_PATH)]):
+        timings = repeat_timer(ArgumentationTool, repeat=repeat,
+                               number=number)
+    return [timing / number for timing in timings]
@@ -0,0 +1,96 @@
+"""Замеры скорости обработки файлов синтетического дерева."""
+import json
+import os
+import sys
+from itertools import cycle
+from pathlib import Path
+from subprocess import PIPE, run  # noqa: S404
+from typing import Iterable, List
+
+from benchmarks.startup import get_environment
+from codestyle.application import ENABLED_TOOLS
+
+# Расширения файлов синтетического дерева (по кругу).
+TREE_FILE_SUFFIXES = ('.py', '.js', '.css', '.sh', '.html')
+# Количество файлов в одной директории синтетического дерева.
+TREE_DIRECTORY_SIZE = 50
+
+STUB_TOOL_SCRIPT = '#!/bin/sh\nexit 0\n'
+STUB_NPM_SCRIPT = '#!/bin/sh\necho "{npm_root}"\n'
+
+# Скрипт замера: время process_files без запуска интерпретатора,
+# импорта модулей и разбора параметров.
+PROCESS_FILES_SCRIPT = """
+import json
+import sys
+from time import perf_counter
+
+from codestyle.application import ConsoleApplication
+from codestyle.parameters_parse import ArgumentationTool
+
+application = ConsoleApplication(ArgumentationTool().parameters_storage)
+start = perf_counter()
+try:
+    application.process_files()
+except SystemExit:
+    pass
+print(json.dumps(perf_counter() - start))
+"""
+
+
+def create_stub_tools(directory: Path):
+    """
+    Создание утилит-заглушек, успешно завершающихся без проверки.
+
+    :param directory: Директория, добавляемая в начало PATH.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    scripts = {tool.get_name(): STUB_TOOL_SCRIPT for tool in ENABLED_TOOLS}
+    scripts['npm'] = STUB_NPM_SCRIPT.format(npm_root=directory)
+    for name, script in scripts.items():
+        stub_path = directory / name
+        stub_path.write_text(script)
+        stub_path.chmod(0o755)
+
+
+def create_tree(directory: Path, files_count: int):
+    """
+    Создание синтетического дерева файлов.
+
+    :param directory: Корневая директория дерева.
+    :param files_count: Количество файлов.
+    """
+    for index, suffix in zip(range(files_count), cycle(TREE_FILE_SUFFIXES)):
+        file_path = (directory / f'package_{index // TREE_DIRECTORY_SIZE}'
+                     / f'module_{index}{suffix}')
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_text(f'# {index}\n')
+
+
+def measure_process_files(tree_path: Path, stubs_path: Path,
+                          arguments: Iterable[str],
+                          repeat: int) -> List[float]:
+    """
+    Время обработки дерева файлов методом process_files.
+
+    Каждый замер выполняется в отдельном процессе, чтобы кэши
+    приложения не переходили между замерами.
+
+    :param tree_path: Путь до дерева файлов.
+    :param stubs_path: Директория с утилитами-заглушками.
+    :param arguments: Дополнительные аргументы командной строки.
+    :param repeat: Количество замеров.
+    :return: Время каждого замера (в секундах).
+    """
+    environment = get_environment()
+    environment['PATH'] = os.pathsep.join(
+        (str(stubs_path), environment.get('PATH', '')))
+    command = (sys.executable, '-c', PROCESS_FILES_SCRIPT, str(tree_path),
+               '--no-cache', '--quiet', *arguments)
+
+    timings = []
+    for _ in range(repeat):
+        completed_process = run(command, stdout=PIPE,  # noqa: S603
+                                env=environment, cwd=tree_path, check=True)
+        timings.append(json.loads(completed_process.stdout))
+    return timings
@@ -1,26 +1,60 @@
 """Модуль с приложением."""
-from collections import defaultdict
-from functools import lru_cache
+import sys
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from difflib import unified_diff
+from functools import partial
+from itertools import chain
 from logging import ERROR, INFO, Logger, getLogger
+from math import ceil
+from time import monotonic
 from pathlib import Path
-from typing import Callable, Dict, List, Type
+from typing import (Callable, Dict, Iterable, Iterator, List, Optional,
+                    Sequence, Set, Tuple, Type, Union)
 
+from codestyle.baseline import Baseline, get_fingerprints
+from codestyle.cache import MEGABYTE, ResultCache, get_file_hash
 from codestyle.code_path import ExpandedPathTree
+from codestyle.diagnostics import format_diagnostics
+from codestyle.file_types import compile_name_filter, get_file_suffix
 from codestyle.parameters_parse import ParametersStorage
-from codestyle.system_wrappers import ExitCodes, interrupt_program_flow
+from codestyle.profiling import Profile
+from codestyle.reporters import REPORTERS, Reporter, create_record
+from codestyle.scheduling import (TimingHistory, estimate_durations,
+                                  get_parallel_efficiency)
+from codestyle.sharding import (BALANCE_SIZE, BALANCE_TIMING, get_size_costs,
+                                get_timing_costs, load_timings, select_shard)
+from codestyle.system_wrappers import (ExitCodes, cancel_processes,
+                                       interrupt_program_flow,
+                                       write_file_atomically)
+from codestyle.tool_registry import ToolRegistry
 from codestyle.tool_wrappers import (Autoflake, Autopep8, ConsoleTool, ESLint,
                                      Flake8, HTMLCS, PHPCBF, PHPCS, Result,
                                      TOOL_SETTINGS_PATH, Stylelint,
                                      MyPy, Black, ShellCheck, Hadolint)
+from codestyle.vcs import get_changed_paths
 
 FIX_SUCCESS = 'Твой код просто огонь!💥 Мне не пришлось ничего исправлять.'
+FIX_CHANGED = ('Проверено файлов - {total_count}, из них было исправлено - '
+               '{total_changed}.')
 FIX_UNSUCCESSFUL = ('Проверено файлов - {total_count}, из них было '
-                    'исправлено - {total_failed}.')
+                    'исправлено - {total_changed}, обработано с ошибками - '
+                    '{total_failed}.')
 CHECK_SUCCESS = ('Я проверил твои файлы ({total_count} шт.), можешь не '
                  'беспокоиться об их качестве. ✨ 💥')
 CHECK_UNSUCCESSFUL = ('💔 Так-так-таак... Коллегам не стыдно в глаза '
                       'смотреть? Необходимо поправить файлов: '
                       '{total_failed}.')
+INTERRUPTED = ('Обработка прервана: обработано файлов - {total_count}, из '
+               'них с ошибками - {total_failed}.')
+FIXED = 'Исправлено файлов: {total_fixed}.'
+FIX_FAILED = ('Утилиты исправления завершились с ошибкой для файлов: '
+              '{total_failed}.')
+PARALLEL_EFFICIENCY = ('Эффективность параллельной обработки: '
+                       '{efficiency:.0%} (заданий: {jobs_count}, время '
+                       'обработки: {elapsed:.1f} с).')
+TIMED_OUT = ('Превышено время работы утилит (--timeout): {total_timed_out}; '
+             'результаты этих запусков неполные.')
 MESSAGES = {'fix': {ExitCodes.SUCCESS: FIX_SUCCESS,
                     ExitCodes.UNSUCCESSFUL: FIX_UNSUCCESSFUL},
             'check': {ExitCodes.SUCCESS: CHECK_SUCCESS,
@@ -28,19 +62,29 @@ MESSAGES = {'fix': {ExitCodes.SUCCESS: FIX_SUCCESS,
 ENABLED_TOOLS = (Flake8, Autopep8, Autoflake, ESLint, PHPCS, PHPCBF, HTMLCS,
                  Stylelint, MyPy, Black, ShellCheck, Hadolint)
 
+# Обработка файла инструментом: путь до файла и инструмент.
+FileJob = Tuple[Path, ConsoleTool]
+# Ключ идентификатора утилиты в кэше результатов: класс и пакетный режим.
+ToolCacheKey = Tuple[Type[ConsoleTool], bool]
+# Снимок файла при исправлении: содержимое или хэш; None - файл недоступен.
+FixSnapshot = Optional[Union[bytes, str]]
+
 
-# TODO еще надо глянуть почему долго запускается, найти проблемные места
 class ConsoleApplication:
     """Консольное приложение."""
 
     logger: Logger = getLogger(__name__)
 
-    def __init__(self, parameters_storage: ParametersStorage):
+    def __init__(self, parameters_storage: ParametersStorage,
+                 tool_registry: Optional[ToolRegistry] = None):
         """
         Подготовка приложения к выполнению.
 
         :param parameters_storage: Хранилище параметров, извлечённых из
             командной строки и/или файла конфигурации.
+        :param tool_registry: Реестр утилит (по-умолчанию создаётся
+            новый реестр с кэшем в директории кэша приложения; его
+            резидентные серверы останавливаются после обработки файлов).
         """
         self.__parameters_storage = parameters_storage
         method = 'fix' if self.__parameters_storage.fix else 'check'
@@ -50,13 +94,95 @@ class ConsoleApplication:
         self.logger.debug('Разворачивание дерева файлов и директорий...')
         path_tree = ExpandedPathTree(
             *self.__parameters_storage.target,
-            excludes=self.__parameters_storage.exclude)
-        self.__path_gen = path_tree.path_gen()
+            excludes=self.__parameters_storage.exclude,
+            candidates=self.__get_changed_paths(),
+            use_ignore_files=self.__parameters_storage.ignore_files,
+            name_filter=self.__create_name_filter())
+        self.__path_gen = self.__select_shard(path_tree.path_gen())
 
         self.logger.debug('Определение метода обработки файлов...')
         self.__status_messages = MESSAGES[self.__process_method]
 
-    @lru_cache(maxsize=None)
+        self.__owns_tool_registry = tool_registry is None
+        if tool_registry is None:
+            tool_registry = ToolRegistry(self.__parameters_storage.cache_dir
+                                         if self.__parameters_storage.cache
+                                         else None)
+        self.__tool_registry = tool_registry
+        self.__tools: Dict[Type[ConsoleTool], ConsoleTool] = {}
+        self.__result_cache = self.__create_result_cache()
+        # История длительности нужна только для планирования параллельной
+        # обработки (см. __get_job_costs).
+        self.__timing_history = (
+            TimingHistory(self.__parameters_storage.cache_dir)
+            if self.__parameters_storage.cache and self.__jobs_count > 1
+            else None)
+        self.__busy_time = self.__parallel_time = 0.0
+        self.__tool_cache_keys: Dict[ToolCacheKey, str] = {}
+        self.__fixed_paths: Set[Path] = set()
+        self.__baseline = self.__load_baseline()
+        self.__new_baseline: Optional[Set[int]] = (
+            set() if self.__checks_files
+            and self.__parameters_storage.write_baseline is not None
+            else None)
+        self.__suppressed_count = 0
+
+    def __get_changed_paths(self) -> Optional[List[Path]]:
+        """
+        Пути до изменённых в git файлов, которыми ограничена обработка.
+
+        :return: Пути до файлов или None, если обрабатываются все файлы.
+        """
+        changed_since = self.__parameters_storage.changed_since
+        staged = self.__parameters_storage.staged
+        if not changed_since and not staged:
+            return None
+        return get_changed_paths(ref=changed_since, staged=staged)
+
+    def __select_shard(self, paths: Iterable[Path]) -> Iterable[Path]:
+        """
+        Отбор путей сегмента, обрабатываемого на этом узле (--shard).
+
+        :param paths: Пути до всех обрабатываемых файлов.
+        :return: Пути до файлов сегмента.
+        """
+        shard_position = self.__parameters_storage.shard_position
+        if shard_position is None:
+            return paths
+
+        balance = self.__parameters_storage.shard_balance
+        get_costs = None
+        if balance == BALANCE_SIZE:
+            get_costs = get_size_costs
+        elif balance == BALANCE_TIMING:
+            durations = self.__load_shard_timings()
+            get_costs = partial(get_timing_costs, durations=durations)
+        index, count = shard_position
+        self.logger.debug(f'Отбор файлов сегмента {index}/{count}...')
+        return select_shard(paths, index, count, get_costs=get_costs)
+
+    def __load_shard_timings(self) -> Dict[str, float]:
+        """
+        Чтение длительности обработки файлов из профиля (--shard-timings).
+
+        Если профиль не удалось прочитать - работа приложения
+            завершается со статусом ExitCodes.UNSUCCESSFUL
+        """
+        path = self.__parameters_storage.shard_timings
+        try:
+            return load_timings(path)
+        except (OSError, ValueError) as error:
+            interrupt_program_flow(
+                ExitCodes.UNSUCCESSFUL,
+                log_message=f'Не удалось прочитать профиль {path}: {error}',
+                log_level=ERROR)
+
+    @property
+    def __checks_files(self) -> bool:
+        """Проверяет ли приложение файлы (в том числе после исправления)."""
+        return (self.__process_method == 'check'
+                or self.__parameters_storage.check)
+
     def get_tool(self, cls: Type[ConsoleTool]) -> ConsoleTool:
         """
         Получить инстанс инструмента.
@@ -64,41 +190,668 @@ class ConsoleApplication:
         :param cls: класс инструмента
         :return:
         """
-        return cls(**self.__get_tool_kwargs(cls))
+        if cls not in self.__tools:
+            self.__tools[cls] = cls(**self.__get_tool_kwargs(cls))
+        return self.__tools[cls]
 
     def process_files(self):
         """Обработка файлов."""
         self.logger.info('Запуск обработки файлов...')
 
-        total_success = total_failed = 0
+        total_timed_out = 0
         status, log_level = ExitCodes.SUCCESS, INFO
 
-        for path in self.__path_gen:
-            for tool_cls in self.__file_suffix_tools.get(path.suffix, []):
-                tool = self.get_tool(tool_cls)
-                process_method = getattr(tool, self.__process_method)
-                result = self.__process_file(path, process_method)
-                if result.is_success:
-                    total_success += 1
-                else:
-                    total_failed += 1
-        if total_failed > 0:
+        results = self.__process_phases()
+
+        reporter = self.__create_reporter()
+        profile = self.__create_profile()
+        # Итоги каждого этапа обработки (при --fix --check - исправления
+        # и проверки): количество успешных и неуспешных запусков утилит и
+        # успешность обработки каждого файла.
+        phase_totals: Dict[str, Counter] = defaultdict(Counter)
+        phase_statuses: Dict[str, Dict[Path, bool]] = defaultdict(dict)
+        try:
+            for file_path, tool, result in results:
+                # Этап переключается генератором до выдачи его результатов.
+                file_statuses = phase_statuses[self.__process_method]
+                phase_totals[self.__process_method][
+                    'success' if result.is_success else 'failed'] += 1
+                if result.is_timed_out:
+                    total_timed_out += 1
+                file_statuses[file_path] = (
+                    file_statuses.get(file_path, True) and result.is_success)
+                if reporter is not None:
+                    reporter.add(create_record(file_path, tool, result))
+                if profile is not None:
+                    profile.add(file_path, tool.get_name(), result)
+                if self.__timing_history is not None and not result.is_cached:
+                    self.__timing_history.add(file_path, tool.get_name(),
+                                              self.__process_method,
+                                              result.duration)
+        except BaseException as error:
+            if isinstance(error, KeyboardInterrupt):
+                # Процессы утилит запущены в отдельных группах и не
+                # получают прерывание от терминала.
+                cancel_processes()
+                results.close()
+                file_statuses = phase_statuses[self.__process_method]
+                self.logger.warning(INTERRUPTED.format(
+                    total_count=len(file_statuses),
+                    total_failed=sum(not is_success for is_success
+                                     in file_statuses.values())))
+            if reporter is not None:
+                reporter.finish(None)
+            raise
+        finally:
+            if self.__owns_tool_registry:
+                self.__tool_registry.stop_backends()
+
+        if profile is not None:
+            self.__finish_profile(profile)
+        if self.__parallel_time:
+            self.logger.info(PARALLEL_EFFICIENCY.format(
+                efficiency=get_parallel_efficiency(
+                    self.__busy_time, self.__parallel_time,
+                    self.__jobs_count),
+                jobs_count=self.__jobs_count, elapsed=self.__parallel_time))
+        if self.__process_method == 'check' and self.__fixed_paths:
+            self.logger.info(FIXED.format(
+                total_fixed=len(self.__fixed_paths)))
+        fix_failed = sum(not is_success
+                         for is_success in phase_statuses['fix'].values())
+        if self.__process_method == 'check' and fix_failed:
+            # Статус завершения определяется только этапом проверки.
+            self.logger.warning(FIX_FAILED.format(total_failed=fix_failed))
+        if total_timed_out:
+            self.logger.warning(TIMED_OUT.format(
+                total_timed_out=total_timed_out))
+        if self.__new_baseline is not None:
+            self.__save_baseline()
+        elif self.__suppressed_count:
+            self.logger.info('Пропущено известных замечаний из базового '
+                             f'файла: {self.__suppressed_count}.')
+
+        totals = phase_totals[self.__process_method]
+        total_failed = totals['failed']
+        total_count = totals['failed'] + totals['success']
+        total_changed = len(self.__fixed_paths)
+        if self.__process_method == 'fix':
+            # Изменённые исправлением файлы учитываются отдельно от файлов,
+            # обработанных с ошибкой, и не считаются ошибкой обработки.
+            total_count, total_failed = len(phase_statuses['fix']), fix_failed
+        if total_failed > 0 or (
+                total_changed and self.__parameters_storage.exit_on_change):
             status, log_level = ExitCodes.UNSUCCESSFUL, ERROR
 
-        message = self.__status_messages[status].format(
-            total_count=(total_failed + total_success),
-            total_failed=total_failed)
+        message_template = self.__status_messages[status]
+        if (self.__process_method == 'fix' and total_changed
+                and not total_failed):
+            message_template = FIX_CHANGED
+        message = message_template.format(
+            total_count=total_count, total_failed=total_failed,
+            total_changed=total_changed)
+        if reporter is not None:
+            reporter.finish({'method': self.__process_method,
+                             'status': status, 'total_count': total_count,
+                             'total_failed': total_failed,
+                             'total_changed': total_changed})
+        if self.__result_cache is not None:
+            self.__result_cache.evict()
+        if self.__timing_history is not None:
+            self.__timing_history.save()
+        self.__tool_registry.save()
         interrupt_program_flow(status=status, log_message=message,
                                log_level=log_level)
 
-    def __tool_can_process(self, tool: ConsoleTool) -> bool:
-        """Проверка возможностей указанного инструмента."""
-        can_process = getattr(tool, f'for_{self.__process_method}', False)
+    def __tool_can_process(self, tool: ConsoleTool,
+                           process_method: Optional[str] = None) -> bool:
+        """
+        Проверка возможностей указанного инструмента.
+
+        Утилиты, указанные в --only-tool, используются и без флага
+        опциональной проверки; указанные в --skip-tool - не используются.
+
+        :param tool: Инструмент.
+        :param process_method: Метод обработки (по-умолчанию: метод
+            приложения).
+        """
+        process_method = process_method or self.__process_method
+        can_process = getattr(tool, f'for_{process_method}', False)
+        tool_name = tool.get_name()
+        if tool_name in self.__parameters_storage.skip_tools:
+            return False
+        if self.__parameters_storage.only_tools:
+            return (can_process
+                    and tool_name in self.__parameters_storage.only_tools)
         if getattr(self.__parameters_storage, tool.optional_flag, False):
             return can_process
 
         return can_process and not tool.optional
 
+    def __create_name_filter(self) -> Optional[Callable[[str], bool]]:
+        """
+        Отбор файлов по имени при обходе дерева файлов.
+
+        Используется с параметрами отбора файлов и утилит (--file_suffix,
+        --only-tool, --skip-tool): файлы, которые не обработает ни одна
+        утилита, отсекаются до обращения к ним в файловой системе.
+
+        :return: Функция проверки имени файла; None - без отбора.
+        """
+        storage = self.__parameters_storage
+        if (storage.file_suffixes is None and not storage.only_tools
+                and not storage.skip_tools):
+            return None
+
+        known_tool_names = {tool.get_name() for tool in ENABLED_TOOLS}
+        for tool_name in sorted((storage.only_tools | storage.skip_tools)
+                                - known_tool_names):
+            self.logger.warning(f'Утилита {tool_name} не поддерживается.')
+
+        suffixes = set(self.__file_suffix_tools)
+        if self.__process_method == 'fix' and self.__checks_files:
+            suffixes.update(self.get_file_suffix_tools('check'))
+        return compile_name_filter(suffixes)
+
+    def __load_baseline(self) -> Optional[Baseline]:
+        """
+        Чтение базового файла известных замечаний (только для проверки).
+
+        Если файл не удалось прочитать - работа приложения завершается
+            со статусом ExitCodes.UNSUCCESSFUL
+        """
+        path = self.__parameters_storage.baseline
+        if (path is None or not self.__checks_files
+                or self.__parameters_storage.write_baseline is not None):
+            return None
+
+        self.logger.debug(f'Чтение базового файла {path}...')
+        try:
+            return Baseline.load(path)
+        except (OSError, ValueError) as error:
+            interrupt_program_flow(
+                ExitCodes.UNSUCCESSFUL,
+                log_message=f'Не удалось прочитать базовый файл: {error}',
+                log_level=ERROR)
+
+    def __save_baseline(self):
+        """
+        Запись замечаний проверки в базовый файл.
+
+        Если файл не удалось записать - работа приложения завершается
+            со статусом ExitCodes.UNSUCCESSFUL
+        """
+        path = self.__parameters_storage.write_baseline
+        baseline = Baseline(self.__new_baseline)
+        try:
+            baseline.save(path)
+        except OSError as error:
+            interrupt_program_flow(
+                ExitCodes.UNSUCCESSFUL,
+                log_message=f'Не удалось записать базовый файл: {error}',
+                log_level=ERROR)
+        self.logger.info(f'Базовый файл {path} записан (замечаний: '
+                         f'{len(baseline)}).')
+
+    def __apply_baseline(self, file_path: Path, tool: ConsoleTool,
+                         result: Result) -> Result:
+        """
+        Исключение известных замечаний из результата проверки.
+
+        При записи базового файла известными считаются все замечания.
+        Результат без новых замечаний считается успешным; неуспешный
+        результат без разобранных замечаний не изменяется.
+
+        :param file_path: Путь до файла.
+        :param tool: Инструмент обработки.
+        :param result: Результат проверки файла.
+        :return: Результат с новыми замечаниями.
+        """
+        if result.is_success or self.__process_method != 'check' or (
+                self.__baseline is None and self.__new_baseline is None):
+            return result
+
+        diagnostics = tool.get_diagnostics(file_path, result)
+        fingerprints = get_fingerprints(file_path, diagnostics)
+        if self.__new_baseline is not None:
+            self.__new_baseline.update(fingerprints)
+            new_diagnostics = []
+        else:
+            new_diagnostics = [
+                diagnostic
+                for diagnostic, fingerprint in zip(diagnostics, fingerprints)
+                if fingerprint not in self.__baseline]
+        if not diagnostics or len(new_diagnostics) == len(diagnostics):
+            return result
+
+        self.__suppressed_count += len(diagnostics) - len(new_diagnostics)
+        if not new_diagnostics:
+            new_result = Result(ExitCodes.SUCCESS, diagnostics=[])
+        else:
+            new_result = Result(result.return_code,
+                                output=format_diagnostics(new_diagnostics),
+                                error=result.error,
+                                diagnostics=new_diagnostics)
+        new_result.duration, new_result.cpu_time, new_result.max_rss = (
+            result.duration, result.cpu_time, result.max_rss)
+        new_result.is_cached = result.is_cached
+        return new_result
+
+    def __create_reporter(self) -> Optional[Reporter]:
+        """Создание отчёта в машиночитаемом формате (если указан)."""
+        report_format = self.__parameters_storage.format
+        if report_format is None:
+            return None
+        return REPORTERS[report_format](self.__parameters_storage.output)
+
+    def __create_profile(self) -> Optional[Profile]:
+        """Создание профиля обработки (если он выводится или пишется)."""
+        if (not self.__parameters_storage.profile
+                and self.__parameters_storage.profile_output is None):
+            return None
+        return Profile()
+
+    def __finish_profile(self, profile: Profile):
+        """Вывод итогов профиля в поток ошибок и запись измерений."""
+        profile.finish()
+        if self.__parameters_storage.profile:
+            sys.stderr.write(profile.get_report(
+                self.__parameters_storage.profile_slowest) + '\n')
+        profile_output = self.__parameters_storage.profile_output
+        if profile_output is None:
+            return
+        try:
+            profile.save(profile_output)
+        except OSError as error:
+            self.logger.error(
+                f'Не удалось записать профиль {profile_output}: {error}')
+        else:
+            self.logger.info(f'Профиль обработки записан в {profile_output}.')
+
+    def __process_phases(self
+                         ) -> Iterator[Tuple[Path, ConsoleTool, Result]]:
+        """
+        Обработка файлов методом приложения.
+
+        При исправлении с проверкой (--fix --check) дерево файлов
+        обходится один раз: после исправления всех файлов они
+        проверяются теми же инструментами; результаты проверки файлов,
+        не изменённых исправлением, берутся из кэша результатов.
+        """
+        process_paths = (self.__process_batches
+                         if self.__parameters_storage.batch
+                         else self.__process_paths)
+        if self.__process_method == 'check' or not self.__checks_files:
+            yield from process_paths(self.__path_gen)
+            return
+
+        paths = list(self.__path_gen)
+        yield from process_paths(paths)
+
+        self.logger.info('Проверка исправленных файлов...')
+        self.__process_method = 'check'
+        self.__status_messages = MESSAGES[self.__process_method]
+        self.__file_suffix_tools = self.get_file_suffix_tools()
+        yield from process_paths(paths)
+
+    def __process_paths(self, paths: Iterable[Path]
+                        ) -> Iterator[Tuple[Path, ConsoleTool, Result]]:
+        """
+        Обработка файлов по одному запуску утилиты на каждый файл.
+
+        При исправлении файл обрабатывается всеми утилитами в одном
+        задании (см. __fix_file), а не отдельным заданием для каждой.
+        Утилиты, анализирующие проект целиком, обрабатывают все свои
+        файлы пакетным запуском (см. __is_project_scoped); их задания
+        выполняются первыми, параллельно с остальными, а результаты
+        выводятся вместе с результатами остальных утилит в порядке
+        путей до файлов.
+
+        :param paths: Пути до обрабатываемых файлов.
+        """
+        file_jobs: List[FileJob] = []
+        jobs = []
+        project_paths: Dict[ConsoleTool, List[Path]] = defaultdict(list)
+        for path in paths:
+            suffix = get_file_suffix(path)
+            for tool_cls in self.__file_suffix_tools.get(suffix, []):
+                tool = self.get_tool(tool_cls)
+                file_jobs.append((path, tool))
+                if self.__is_project_scoped(tool):
+                    project_paths[tool].append(path)
+                else:
+                    jobs.append((path, tool))
+        for tool in {job_tool for _, job_tool in jobs}:
+            self.__prepare_tool(tool, batch=False)
+        if self.__process_method == 'fix':
+            yield from self.__fix_paths(jobs)
+            return
+
+        project_jobs = []
+        for tool, tool_paths in project_paths.items():
+            self.__prepare_tool(tool, batch=True)
+            project_jobs.extend((batch, tool) for batch in tool.get_batches(
+                tool_paths, tool.check_arguments))
+        results = self.__map_jobs(
+            lambda job: (self.__process_batch(*job) if job in project_jobs
+                         else self.__process_job(*job)),
+            [*project_jobs, *jobs],
+            self.__get_job_costs([
+                *([(path, tool) for path in batch_paths]
+                  for batch_paths, tool in project_jobs),
+                *([job] for job in jobs)]))
+
+        project_results: Dict[FileJob, Result] = {}
+        for (batch_paths, tool), batch_results in zip(project_jobs, results):
+            self.logger.info(f'Обработка {len(batch_paths)} файлов утилитой '
+                             f'{tool.get_name()}..')
+            for path in batch_paths:
+                project_results[path, tool] = batch_results[str(path)]
+        job_results = zip(jobs, results)
+        for path, tool in file_jobs:
+            result = project_results.pop((path, tool), None)
+            if result is None:
+                _, result = next(job_results)
+                self.logger.info(f'Обработка {path}..')
+            result = self.__apply_baseline(path, tool, result)
+            self.__log_result(result)
+            yield path, tool, result
+
+    def __fix_paths(self, jobs: Sequence[Tuple[Path, ConsoleTool]]
+                    ) -> Iterator[Tuple[Path, ConsoleTool, Result]]:
+        """
+        Исправление файлов с объединением заданий одного файла.
+
+        :param jobs: Задания (путь до файла, инструмент) в порядке
+            обработки; задания одного файла следуют друг за другом.
+        :return: Генератор результатов в порядке заданий.
+        """
+        file_tools: Dict[Path, List[ConsoleTool]] = defaultdict(list)
+        for path, tool in jobs:
+            file_tools[path].append(tool)
+        fixes = self.__map_jobs(
+            lambda job: self.__fix_file(*job), list(file_tools.items()),
+            self.__get_job_costs([[(path, tool) for tool in tools]
+                                  for path, tools in file_tools.items()]))
+
+        for path, (results, snapshot, fixed_snapshot) in zip(file_tools,
+                                                             fixes):
+            for tool, result in zip(file_tools[path], results):
+                self.logger.info(f'Обработка {path}..')
+                self.__log_result(result)
+                yield path, tool, result
+            self.__report_fix(path, snapshot, fixed_snapshot)
+
+    def __fix_file(self, file_path: Path, tools: Sequence[ConsoleTool]
+                   ) -> Tuple[List[Result], FixSnapshot, FixSnapshot]:
+        """
+        Исправление файла набором инструментов.
+
+        Сначала файл исправляют инструменты, изменяющие только файлы на
+        диске; затем код файла читается один раз и передаётся по цепочке
+        инструментов, исправляющих код из стандартного ввода. Файл
+        перезаписывается (атомарно) только при изменении кода, поэтому
+        время изменения неизменённых файлов сохраняется.
+
+        :param file_path: Путь до файла.
+        :param tools: Инструменты в порядке обработки.
+        :return: Результаты обработки в порядке инструментов и снимки
+            файла до и после исправления (см. __get_fix_snapshot).
+        """
+        snapshot = self.__get_fix_snapshot(file_path)
+        results: Dict[ConsoleTool, Result] = {}
+        stdin_tools = []
+        for tool in tools:
+            if tool.supports_stdin_fix():
+                stdin_tools.append(tool)
+            else:
+                results[tool] = self.__process_job(file_path, tool)
+
+        try:
+            content = file_path.read_bytes()
+        except OSError:
+            stdin_tools, content = [], b''
+            results.update((tool, self.__process_job(file_path, tool))
+                           for tool in tools if tool not in results)
+
+        fixed_content = content
+        for tool in stdin_tools:
+            start_time = monotonic()
+            results[tool], fixed_content = tool.fix_content(file_path,
+                                                            fixed_content)
+            results[tool].duration = monotonic() - start_time
+        if fixed_content != content:
+            try:
+                write_file_atomically(file_path, fixed_content)
+            except OSError as error:
+                results[stdin_tools[-1]] = Result(
+                    ExitCodes.UNSUCCESSFUL,
+                    error=f'Не удалось записать {file_path}: {error}')
+        return ([results[tool] for tool in tools], snapshot,
+                self.__get_fix_snapshot(file_path))
+
+    def __get_fix_snapshot(self, file_path: Path) -> FixSnapshot:
+        """
+        Снимок файла для определения изменений при исправлении.
+
+        :param file_path: Путь до файла.
+        :return: Содержимое файла (если выводятся изменения) или хэш
+            содержимого; None - файл недоступен для чтения.
+        """
+        if not self.__parameters_storage.diff:
+            return get_file_hash(file_path)
+        try:
+            return file_path.read_bytes()
+        except OSError:
+            return None
+
+    def __report_fix(self, file_path: Path, snapshot: FixSnapshot,
+                     fixed_snapshot: FixSnapshot):
+        """
+        Учёт исправленного файла и вывод его изменений.
+
+        :param file_path: Путь до файла.
+        :param snapshot: Снимок файла до исправления.
+        :param fixed_snapshot: Снимок файла после исправления.
+        """
+        if snapshot is None or fixed_snapshot is None:
+            return
+        if snapshot == fixed_snapshot:
+            return
+
+        self.__fixed_paths.add(file_path)
+        self.logger.info(f'Файл {file_path} исправлен.')
+        if isinstance(snapshot, bytes) and isinstance(fixed_snapshot, bytes):
+            sys.stdout.writelines(unified_diff(
+                snapshot.decode(errors='replace').splitlines(keepends=True),
+                fixed_snapshot.decode(
+                    errors='replace').splitlines(keepends=True),
+                fromfile=str(file_path), tofile=str(file_path)))
+            sys.stdout.flush()
+
+    def __process_batches(self, paths: Iterable[Path]
+                          ) -> Iterator[Tuple[Path, ConsoleTool, Result]]:
+        """
+        Пакетная обработка файлов.
+
+        Пути группируются по утилитам и разбиваются на пакеты, каждый
+        из которых обрабатывается одним запуском утилиты; утилиты без
+        поддержки пакетного режима запускаются для каждого файла.
+        Без явно указанного размера пакета файлы утилиты делятся между
+        всеми параллельными заданиями. При исправлении пакеты утилиты
+        выполняются только после завершения пакетов предыдущей утилиты
+        (утилиты изменяют одни и те же файлы на диске); изменения файлов
+        определяются после обработки всех пакетов.
+
+        :param paths: Пути до обрабатываемых файлов.
+        """
+        tool_paths: Dict[Type[ConsoleTool], List[Path]] = defaultdict(list)
+        snapshots: Dict[Path, FixSnapshot] = {}
+        for path in paths:
+            suffix = get_file_suffix(path)
+            for tool_cls in self.__file_suffix_tools.get(suffix, []):
+                tool_paths[tool_cls].append(path)
+                if self.__process_method == 'fix' and path not in snapshots:
+                    snapshots[path] = self.__get_fix_snapshot(path)
+
+        tool_jobs = []
+        for tool_cls, paths in tool_paths.items():
+            tool = self.get_tool(tool_cls)
+            self.__prepare_tool(tool, batch=tool.supports_batch())
+            if not tool.supports_batch():
+                tool_jobs.append([([path], tool) for path in paths])
+                continue
+
+            run_arguments = getattr(tool, f'{self.__process_method}_arguments')
+            max_count = (self.__parameters_storage.batch_size
+                         or ceil(len(paths) / self.__jobs_count))
+            if self.__is_project_scoped(tool):
+                max_count = 0
+            tool_jobs.append([(batch, tool) for batch in tool.get_batches(
+                paths, run_arguments, max_count=max_count)])
+        jobs = list(chain.from_iterable(tool_jobs))
+        if self.__process_method != 'fix':
+            tool_jobs = [jobs]
+        results = chain.from_iterable(
+            self.__map_jobs(lambda job: self.__process_batch(*job),
+                            group_jobs, self.__get_job_costs(
+                                [[(path, tool) for path in paths]
+                                 for paths, tool in group_jobs]))
+            for group_jobs in tool_jobs)
+
+        for (file_paths, tool), batch_results in zip(jobs, results):
+            if tool.supports_batch():
+                self.logger.info(f'Обработка {len(file_paths)} файлов '
+                                 f'утилитой {tool.get_name()}..')
+            for path in file_paths:
+                if not tool.supports_batch():
+                    self.logger.info(f'Обработка {path}..')
+                result = self.__apply_baseline(path, tool,
+                                               batch_results[str(path)])
+                self.__log_result(result)
+                yield path, tool, result
+
+        for path, snapshot in snapshots.items():
+            self.__report_fix(path, snapshot, self.__get_fix_snapshot(path))
+
+    def __is_project_scoped(self, tool: ConsoleTool) -> bool:
+        """
+        Проверка обработки файлов утилитой одним запуском для проекта.
+
+        Используется только при проверке файлов; результаты таких утилит
+        зависят от других файлов проекта и не сохраняются в кэш
+        результатов (утилита использует свой инкрементальный кэш).
+        """
+        return (self.__process_method == 'check' and tool.project_scoped
+                and tool.supports_batch())
+
+    @property
+    def __jobs_count(self) -> int:
+        """Количество параллельно выполняемых заданий."""
+        return max(self.__parameters_storage.jobs, 1)
+
+    def __map_jobs(self, function: Callable, jobs: Sequence,
+                   costs: Optional[Sequence[float]] = None) -> Iterator:
+        """
+        Выполнение заданий в пуле потоков.
+
+        Задания выполняются параллельно, но результаты возвращаются в
+        порядке заданий, поэтому вывод не зависит от порядка завершения.
+        Задания запускаются в порядке убывания ожидаемой длительности:
+        долгие задания не остаются последними при простаивающих потоках.
+
+        :param function: Функция обработки задания.
+        :param jobs: Набор заданий.
+        :param costs: Ожидаемая длительность заданий (см.
+            __get_job_costs); None - задания запускаются по порядку.
+        :return: Генератор результатов в порядке заданий.
+        """
+        if self.__jobs_count == 1 or len(jobs) <= 1:
+            yield from map(function, jobs)
+            return
+
+        order = range(len(jobs))
+        if costs is not None:
+            order = sorted(order, key=lambda index: -costs[index])
+        start_time = monotonic()
+        with ThreadPoolExecutor(max_workers=self.__jobs_count) as executor:
+            futures = [None] * len(jobs)
+            for index in order:
+                futures[index] = executor.submit(self.__run_measured_job,
+                                                 function, jobs[index])
+            try:
+                for future in futures:
+                    result, duration = future.result()
+                    self.__busy_time += duration
+                    if future is futures[-1]:
+                        # Генератор может не возобновиться после выдачи
+                        # последнего результата.
+                        self.__parallel_time += monotonic() - start_time
+                    yield result
+            except BaseException:
+                # Ожидание выполняемых заданий при выходе из пула не
+                # должно длиться до завершения их утилит.
+                for future in futures:
+                    future.cancel()
+                cancel_processes()
+                raise
+
+    @staticmethod
+    def __run_measured_job(function: Callable, job) -> Tuple[object, float]:
+        """Выполнение задания с измерением его длительности."""
+        start_time = monotonic()
+        return function(job), monotonic() - start_time
+
+    def __get_job_costs(self, job_pairs: Sequence[Sequence[FileJob]]
+                        ) -> Optional[List[float]]:
+        """
+        Ожидаемая длительность заданий для планирования их запуска.
+
+        Длительность обработки файла утилитой берётся из истории
+        длительности (см. TimingHistory), для файлов без истории -
+        оценивается по размеру файла.
+
+        :param job_pairs: Пары (путь до файла, инструмент) каждого задания.
+        :return: Длительность в порядке заданий; None - задания
+            выполняются последовательно.
+        """
+        if self.__jobs_count == 1 or len(job_pairs) <= 1:
+            return None
+
+        all_pairs = {pair for pairs in job_pairs for pair in pairs}
+        file_sizes = get_size_costs({path for path, _ in all_pairs})
+        durations = {}
+        if self.__timing_history is not None:
+            for path, tool in all_pairs:
+                duration = self.__timing_history.get(
+                    path, tool.get_name(), self.__process_method)
+                if duration is not None:
+                    durations[path, tool] = duration
+        estimates = estimate_durations(
+            {(path, tool): file_sizes[path] for path, tool in all_pairs},
+            durations)
+        return [sum(estimates[pair] for pair in pairs) for pairs in job_pairs]
+
+    def __process_job(self, file_path: Path, tool: ConsoleTool) -> Result:
+        """
+        Обработка файла указанным инструментом с использованием кэша.
+
+        :param file_path: Путь обрабатываемого файла.
+        :param tool: Инструмент обработки.
+        :return: Результат обработки файла.
+        """
+        cache_key = self.__get_cache_key(tool, file_path, batch=False)
+        if cache_key is not None:
+            result = self.__result_cache.get(cache_key)
+            if result is not None:
+                return result
+
+        result = self.__process_file(file_path,
+                                     getattr(tool, self.__process_method))
+        if cache_key is not None and self.__is_complete(result):
+            self.__result_cache.set(cache_key, result)
+        return result
+
     def __process_file(self, file_path: Path,
                        process_method: Callable) -> Result:
         """
@@ -106,32 +859,150 @@ class ConsoleApplication:
 
         :param file_path: Путь обрабатываемого файла.
         :param process_method: Метод обработки (fix() / check()).
-        :return: Результат обработки файла.
+        :return: Результат обработки файла с длительностью обработки.
         """
-        self.logger.info(f'Обработка {file_path}..')
+        start_time = monotonic()
         result = process_method(str(file_path))
+        result.duration = monotonic() - start_time
+        return result
+
+    def __process_batch(self, file_paths: Sequence[Path],
+                        tool: ConsoleTool) -> Dict[str, Result]:
+        """
+        Обработка пакета файлов одним запуском утилиты.
+
+        Файлы с результатами в кэше исключаются из пакета; длительность
+        и процессорное время запуска утилиты делятся поровну между файлами
+        пакета (результат пакета может быть общим для всех файлов).
+
+        :param file_paths: Пути обрабатываемых файлов.
+        :param tool: Инструмент обработки.
+        :return: Результаты обработки для каждого из файлов.
+        """
+        if not tool.supports_batch():
+            return {str(path): self.__process_job(path, tool)
+                    for path in file_paths}
+
+        results = {}
+        cache_keys = {}
+        for path in file_paths:
+            cache_key = self.__get_cache_key(tool, path, batch=True)
+            if cache_key is not None:
+                result = self.__result_cache.get(cache_key)
+                if result is not None:
+                    results[str(path)] = result
+                    continue
+            cache_keys[str(path)] = cache_key
+
+        if cache_keys:
+            process_method = getattr(tool, f'{self.__process_method}_batch')
+            start_time = monotonic()
+            batch_results = process_method(list(cache_keys))
+            duration = (monotonic() - start_time) / len(cache_keys)
+            cpu_times = {path: batch_results[path].cpu_time
+                         for path in cache_keys}
+            for path, cpu_time in cpu_times.items():
+                batch_results[path].duration = duration
+                if cpu_time is not None:
+                    batch_results[path].cpu_time = cpu_time / len(cache_keys)
+            results.update(batch_results)
+        for path, cache_key in cache_keys.items():
+            if cache_key is not None and self.__is_complete(results[path]):
+                self.__result_cache.set(cache_key, results[path])
+        return results
+
+    @staticmethod
+    def __is_complete(result: Result) -> bool:
+        """
+        Проверка полноты результата перед сохранением в кэш.
+
+        Результаты с превышением времени работы или отброшенными
+        строками вывода не сохраняются.
+        """
+        return not result.is_timed_out and not result.skipped_lines
+
+    def __create_result_cache(self) -> Optional[ResultCache]:
+        """Создание кэша результатов (используется только для проверки)."""
+        if not self.__checks_files:
+            return None
+        if not self.__parameters_storage.cache:
+            return None
+        return ResultCache(self.__parameters_storage.cache_dir,
+                           self.__parameters_storage.cache_size * MEGABYTE)
+
+    def __prepare_tool(self, tool: ConsoleTool, batch: bool):
+        """
+        Подготовка инструмента к параллельной обработке файлов.
+
+        :param tool: Инструмент обработки.
+        :param batch: Подготовка к пакетной обработке файлов.
+        """
+        self.__prepare_tool_cache_key(tool, batch)
+        tool.start_backend(self.__process_method, batch=batch)
+
+    def __prepare_tool_cache_key(self, tool: ConsoleTool, batch: bool):
+        """
+        Вычисление ключа кэша для инструмента.
+
+        Выполняется до запуска параллельных заданий, так как требует
+        определения версии утилиты.
+
+        :param tool: Инструмент обработки.
+        :param batch: Ключ для пакетной обработки файлов.
+        """
+        if self.__result_cache is None or self.__process_method != 'check':
+            return
+        key = (type(tool), batch)
+        if key not in self.__tool_cache_keys:
+            run_arguments = getattr(tool, f'{self.__process_method}_arguments')
+            self.__tool_cache_keys[key] = self.__result_cache.get_tool_key(
+                tool, tool.get_command(run_arguments, batch=batch))
+
+    def __get_cache_key(self, tool: ConsoleTool, file_path: Path,
+                        batch: bool) -> Optional[str]:
+        """Ключ кэша для результата обработки файла инструментом."""
+        if (self.__result_cache is None or self.__process_method != 'check'
+                or self.__is_project_scoped(tool)):
+            return None
+        return self.__result_cache.get_file_key(
+            self.__tool_cache_keys[(type(tool), batch)], file_path)
 
+    def __log_result(self, result: Result):
+        """Вывод результата обработки файла."""
         if result.whole_output:
             level = INFO if result.is_success else ERROR
             self.logger.log(level, result.whole_output)
-        return result
 
-    def get_file_suffix_tools(self) -> Dict[str, List[ConsoleTool]]:
+    def get_file_suffix_tools(self, process_method: Optional[str] = None
+                              ) -> Dict[str, List[ConsoleTool]]:
         """
         Создание словаря с расширениями файлов.
 
-        :param tools: набор утилит
+        Учитываются только расширения из --file_suffix (если указан).
+
+        :param process_method: метод обработки (по-умолчанию: метод
+            приложения)
         :return: словарь с расширениями, каждому из которых
             соответствует свой набор поддерживаемых утилит
         """
+        file_suffixes = self.__parameters_storage.file_suffixes
         file_suffix_tools = defaultdict(list)
-        tools = filter(self.__tool_can_process, ENABLED_TOOLS)
+        tools = (tool for tool in ENABLED_TOOLS
+                 if self.__tool_can_process(tool, process_method))
         for tool in tools:
             for suffix in tool.supported_file_suffixes:
-                file_suffix_tools[suffix].append(tool)
+                if file_suffixes is None or suffix in file_suffixes:
+                    file_suffix_tools[suffix].append(tool)
 
         return file_suffix_tools
 
+    @property
+    def __needs_diagnostics(self) -> bool:
+        """Используются ли замечания утилит (в отчёте или базовом файле)."""
+        return (self.__parameters_storage.format is not None
+                or self.__baseline is not None
+                or self.__new_baseline is not None)
+
     def __get_tool_kwargs(self, tool_wrapper) -> dict:
         """
         Определение kwarg'ов для инициализации инструмента.
@@ -139,7 +1010,16 @@ class ConsoleApplication:
         :param tool_wrapper: Инструмент.
         :return: Словарь с kwarg'ами.
         """
-        tool_kwargs = {'configuration_path': None}
+        tool_kwargs = {'configuration_path': None,
+                       'registry': self.__tool_registry,
+                       'resident': self.__parameters_storage.resident,
+                       'in_process': self.__parameters_storage.in_process,
+                       'structured_output': self.__needs_diagnostics,
+                       'timeout': self.__get_tool_timeout(tool_wrapper),
+                       'max_output_lines': self.__max_output_lines,
+                       'cache_dir': (self.__parameters_storage.cache_dir
+                                     if self.__parameters_storage.cache
+                                     else None)}
 
         if self.__parameters_storage.settings != TOOL_SETTINGS_PATH:
             configuration_path = self.__get_config_path(
@@ -152,6 +1032,32 @@ class ConsoleApplication:
 
         return tool_kwargs
 
+    @property
+    def __max_output_lines(self) -> Optional[int]:
+        """
+        Количество хранимых строк вывода утилит для каждого файла.
+
+        Для отчётов и базового файла вывод хранится полностью, так как
+        из него разбираются все замечания.
+        """
+        max_output_lines = self.__parameters_storage.max_output_lines
+        if not max_output_lines or max_output_lines < 0:
+            return None
+        return None if self.__needs_diagnostics else max_output_lines
+
+    def __get_tool_timeout(self, tool_wrapper) -> Optional[float]:
+        """
+        Ограничение времени запуска инструмента.
+
+        Ограничение утилиты (tool_timeout) заменяет общее (timeout).
+
+        :param tool_wrapper: Инструмент.
+        :return: Ограничение в секундах или None - без ограничения.
+        """
+        timeout = self.__parameters_storage.tool_timeouts.get(
+            tool_wrapper.get_name(), self.__parameters_storage.timeout)
+        return timeout if timeout and timeout > 0 else None
+
     def __get_config_path(self, tool_wrapper, settings_path: Path) -> Path:
         """
         Определение пути к конфигурации для указанного инструмента.
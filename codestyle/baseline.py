@@ -0,0 +1,136 @@
+"""
+Базовый файл известных замечаний (baseline).
+
+Замечания из базового файла не считаются ошибками при проверке, поэтому
+приложение завершается с ошибкой только при новых замечаниях. Замечание
+определяется отпечатком из названия утилиты, кода правила, пути до
+файла и содержимого строки без номера строки - сдвиг кода не делает
+известные замечания новыми.
+
+Отпечатки (64 бита) хранятся в файле отсортированным массивом и ищутся
+двоичным поиском сразу после чтения файла, без разбора его содержимого.
+"""
+import os
+import sys
+from array import array
+from bisect import bisect_left
+from hashlib import blake2b
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import Iterable, List, Sequence
+
+from codestyle.diagnostics import Diagnostic
+
+# Сигнатура (с версией формата) в начале базового файла.
+BASELINE_SIGNATURE = b'CODESTYLE-BASELINE\x01\n'
+# Код типа массива отпечатков: беззнаковые 64-битные числа.
+FINGERPRINT_TYPECODE = 'Q'
+FINGERPRINT_SIZE = 8
+# Порядок байтов отпечатков в файле.
+FINGERPRINT_BYTEORDER = 'little'
+
+
+def get_fingerprints(file_path: Path,
+                     diagnostics: Sequence[Diagnostic]) -> List[int]:
+    """
+    Отпечатки замечаний к файлу.
+
+    Отпечаток не зависит от номера строки и отступов: учитываются
+    утилита, код правила (сообщение - для замечаний без кода), путь до
+    файла относительно текущей директории и содержимое строки.
+
+    :param file_path: Путь до файла.
+    :param diagnostics: Замечания к файлу.
+    :return: Отпечатки в порядке замечаний.
+    """
+    if not diagnostics:
+        return []
+    try:
+        lines = Path(file_path).read_text(encoding='utf-8',
+                                          errors='replace').splitlines()
+    except OSError:
+        lines = []
+
+    path = Path(os.path.relpath(os.path.abspath(file_path))).as_posix()
+    fingerprints = []
+    for diagnostic in diagnostics:
+        line = (lines[diagnostic.line - 1]
+                if 0 < diagnostic.line <= len(lines) else '')
+        key = '\0'.join((diagnostic.tool, diagnostic.code
+                         or diagnostic.message, path, ' '.join(line.split())))
+        digest = blake2b(key.encode(), digest_size=FINGERPRINT_SIZE).digest()
+        fingerprints.append(int.from_bytes(digest, FINGERPRINT_BYTEORDER))
+    return fingerprints
+
+
+class Baseline:
+    """
+    Набор отпечатков известных замечаний.
+
+    Отпечатки хранятся в отсортированном массиве (8 байт на отпечаток),
+    проверка наличия отпечатка - двоичный поиск.
+    """
+
+    def __init__(self, fingerprints: Iterable[int] = ()):
+        """
+        Создание набора.
+
+        :param fingerprints: Отпечатки замечаний (повторы исключаются).
+        """
+        self.__fingerprints = array(FINGERPRINT_TYPECODE,
+                                    sorted(set(fingerprints)))
+
+    @classmethod
+    def load(cls, path: Path) -> 'Baseline':
+        """
+        Чтение набора из базового файла.
+
+        :param path: Путь до базового файла.
+        :return: Набор отпечатков.
+        :raises OSError: Если файл не удалось прочитать.
+        :raises ValueError: Если файл не является базовым файлом.
+        """
+        with open(path, 'rb') as baseline_file:
+            data = baseline_file.read()
+        if (not data.startswith(BASELINE_SIGNATURE)
+                or (len(data) - len(BASELINE_SIGNATURE)) % FINGERPRINT_SIZE):
+            raise ValueError(f'{path} не является базовым файлом')
+
+        baseline = cls()
+        fingerprints = baseline.__fingerprints
+        fingerprints.frombytes(data[len(BASELINE_SIGNATURE):])
+        if sys.byteorder != FINGERPRINT_BYTEORDER:
+            fingerprints.byteswap()
+        return baseline
+
+    def save(self, path: Path):
+        """
+        Запись набора в базовый файл (атомарно).
+
+        :param path: Путь до базового файла.
+        :raises OSError: Если файл не удалось записать.
+        """
+        fingerprints = array(FINGERPRINT_TYPECODE, self.__fingerprints)
+        if sys.byteorder != FINGERPRINT_BYTEORDER:
+            fingerprints.byteswap()
+
+        path = Path(path).absolute()
+        with NamedTemporaryFile('wb', delete=False, dir=path.parent,
+                                prefix=f'.{path.name}.') as baseline_file:
+            baseline_file.write(BASELINE_SIGNATURE)
+            baseline_file.write(fingerprints.tobytes())
+        try:
+            os.replace(baseline_file.name, path)
+        except OSError:
+            os.unlink(baseline_file.name)
+            raise
+
+    def __contains__(self, fingerprint: int) -> bool:
+        """Проверка наличия отпечатка замечания (двоичный поиск)."""
+        index = bisect_left(self.__fingerprints, fingerprint)
+        return (index < len(self.__fingerprints)
+                and self.__fingerprints[index] == fingerprint)
+
+    def __len__(self) -> int:
+        """Количество отпечатков известных замечаний."""
+        return len(self.__fingerprints)
@@ -0,0 +1,177 @@
+"""Модуль с кэшем результатов обработки файлов."""
+import json
+import os
+from hashlib import sha256
+from logging import getLogger
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import Iterable, Optional
+
+from codestyle import __version__ as application_version
+from codestyle.diagnostics import Diagnostic
+from codestyle.tool_wrappers import ConsoleTool, Result
+
+DEFAULT_CACHE_PATH = (Path(os.environ.get('XDG_CACHE_HOME', '~/.cache'))
+                      .expanduser() / __package__)
+DEFAULT_CACHE_SIZE = 100  # мегабайт
+MEGABYTE = 1024 * 1024
+# Размер блока чтения файла при вычислении хэша содержимого.
+READ_BLOCK_SIZE = 64 * 1024
+
+_logger = getLogger(__name__)
+
+
+def get_file_hash(file_path: Path) -> Optional[str]:
+    """
+    Вычисление хэша содержимого файла.
+
+    :param file_path: Путь до файла.
+    :return: Хэш содержимого или None, если файл недоступен для чтения.
+    """
+    file_hash = sha256()
+    try:
+        with open(file_path, 'rb') as file:
+            for block in iter(lambda: file.read(READ_BLOCK_SIZE), b''):
+                file_hash.update(block)
+    except OSError:
+        return None
+    return file_hash.hexdigest()
+
+
+class ResultCache:
+    """
+    Кэш результатов обработки файлов на диске.
+
+    Ключ записи учитывает путь до файла (он содержится в выводе утилит,
+    а их настройки могут зависеть от него) и содержимое файла, класс и
+    версию утилиты, содержимое её конфигурации и аргументы запуска.
+    Размер кэша ограничен: при превышении удаляются давно не
+    использованные записи.
+    """
+
+    RESULTS_DIRECTORY_NAME = 'results'
+
+    def __init__(self, directory: Path, max_size: int):
+        """
+        Создание кэша.
+
+        :param directory: Директория кэша.
+        :param max_size: Максимальный размер записей кэша (в байтах).
+        """
+        self.directory = Path(directory)
+        self.max_size = max_size
+        self.__results_path = self.directory / self.RESULTS_DIRECTORY_NAME
+        self.__has_new_entries = False
+
+    @staticmethod
+    def get_tool_key(tool: ConsoleTool, command: Iterable[str]) -> str:
+        """
+        Ключ утилиты, общий для всех обрабатываемых ею файлов.
+
+        :param tool: Инструмент обработки.
+        :param command: Команда запуска утилиты без путей до файлов.
+        :return: Ключ утилиты.
+        """
+        tool_cls = type(tool)
+        configuration_hash = ''
+        if tool.configuration_path:
+            configuration_hash = get_file_hash(tool.configuration_path) or ''
+
+        key_parts = (application_version,
+                     f'{tool_cls.__module__}.{tool_cls.__qualname__}',
+                     tool.get_version(), configuration_hash, *command)
+        return sha256('\0'.join(key_parts).encode()).hexdigest()
+
+    @staticmethod
+    def get_file_key(tool_key: str, file_path: Path) -> Optional[str]:
+        """
+        Ключ результата обработки файла.
+
+        :param tool_key: Ключ утилиты.
+        :param file_path: Путь до файла.
+        :return: Ключ или None, если файл недоступен для чтения.
+        """
+        file_hash = get_file_hash(file_path)
+        if file_hash is None:
+            return None
+        key_parts = (tool_key, os.path.abspath(file_path), file_hash)
+        return sha256('\0'.join(key_parts).encode(
+            errors='surrogateescape')).hexdigest()
+
+    def get(self, key: str) -> Optional[Result]:
+        """
+        Получение результата из кэша.
+
+        Время изменения найденной записи обновляется, отмечая её
+        использование для вытеснения давно не использованных записей.
+
+        :param key: Ключ результата обработки файла.
+        :return: Результат или None, если он отсутствует в кэше.
+        """
+        entry_path = self.__get_entry_path(key)
+        try:
+            with open(entry_path, encoding='utf-8') as entry_file:
+                entry = json.load(entry_file)
+            os.utime(entry_path)
+        except (OSError, ValueError):
+            return None
+        diagnostics = entry.get('diagnostics')
+        if diagnostics is not None:
+            diagnostics = [Diagnostic(*fields) for fields in diagnostics]
+        result = Result(entry['return_code'], output=entry['output'],
+                        error=entry['error'], diagnostics=diagnostics)
+        result.is_cached = True
+        return result
+
+    def set(self, key: str, result: Result):  # noqa: A003
+        """
+        Сохранение результата в кэш.
+
+        :param key: Ключ результата обработки файла.
+        :param result: Результат обработки файла.
+        """
+        entry_path = self.__get_entry_path(key)
+        entry = {'return_code': result.return_code, 'output': result.output,
+                 'error': result.error, 'diagnostics': None}
+        if result.diagnostics is not None:
+            entry['diagnostics'] = [diagnostic.key
+                                    for diagnostic in result.diagnostics]
+        try:
+            entry_path.parent.mkdir(parents=True, exist_ok=True)
+            with NamedTemporaryFile('w', encoding='utf-8', delete=False,
+                                    dir=entry_path.parent) as entry_file:
+                json.dump(entry, entry_file, ensure_ascii=False)
+            os.replace(entry_file.name, entry_path)
+        except OSError as error:
+            _logger.debug(f'Не удалось сохранить результат в кэш: {error}')
+            return
+        self.__has_new_entries = True
+
+    def evict(self):
+        """Удаление давно не использованных записей сверх размера кэша."""
+        if not self.__has_new_entries:
+            return
+
+        entries = []
+        for directory_entry in os.scandir(self.__results_path):
+            if not directory_entry.is_dir():
+                continue
+            for entry in os.scandir(directory_entry.path):
+                entry_stat = entry.stat()
+                entries.append((entry_stat.st_mtime, entry_stat.st_size,
+                                entry.path))
+
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, entry_path in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            try:
+                os.remove(entry_path)
+            except OSError:
+                continue
+            total_size -= size
+        self.__has_new_entries = False
+
+    def __get_entry_path(self, key: str) -> Path:
+        """Путь до записи кэша (записи распределены по поддиректориям)."""
+        return self.__results_path / key[:2] / f'{key}.json'
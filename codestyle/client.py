@@ -0,0 +1,104 @@
+"""
+Клиент демона приложения (запуск: python -m codestyle.client).
+
+Передаёт аргументы командной строки запущенному демону (codestyle
+--daemon) и выводит результат его работы; если демон недоступен или
+запущен в другом окружении - обрабатывает файлы самостоятельно. Для
+быстрого запуска модуль не импортирует остальные модули приложения.
+"""
+import json
+import os
+import socket
+import sys
+from pathlib import Path
+from typing import Dict, Optional
+
+# Переменная окружения с путём до сокета демона.
+SOCKET_PATH_VARIABLE = 'CODESTYLE_SOCKET'
+DEFAULT_SOCKET_PATH = Path(
+    os.environ.get(SOCKET_PATH_VARIABLE)
+    or Path(os.environ.get('XDG_RUNTIME_DIR')
+            # Имя сокета включает uid, а демон создаёт его с правами 0o600.
+            or os.environ.get('TMPDIR') or '/tmp')  # noqa: S108
+    / f'{__package__}-{os.getuid()}.sock')
+
+# Статус завершения при ошибке (совпадает с ExitCodes.UNSUCCESSFUL).
+UNSUCCESSFUL_STATUS = 1
+# Переменные окружения (и префиксы их названий в нижнем регистре), от
+# которых зависят найденные утилиты и их настройки.
+TOOL_ENVIRONMENT_VARIABLES = ('PATH', 'VIRTUAL_ENV', 'PYTHONPATH',
+                              'PYTHONHOME', 'NODE_PATH', 'PREFIX')
+TOOL_ENVIRONMENT_PREFIXES = ('npm_config_', 'mypy')
+
+
+def get_tool_environment() -> Dict[str, str]:
+    """
+    Переменные окружения, от которых зависит запуск утилит.
+
+    Демон обрабатывает запросы только клиентов с тем же окружением, что
+    и у него: иначе утилиты искались бы в PATH демона, а не клиента.
+    """
+    return {name: value for name, value in os.environ.items()
+            if name in TOOL_ENVIRONMENT_VARIABLES
+            or name.lower().startswith(TOOL_ENVIRONMENT_PREFIXES)}
+
+
+def run_client():
+    """Обработка файлов демоном или, если он недоступен, локально."""
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        connection.connect(str(DEFAULT_SOCKET_PATH))
+    except OSError:
+        connection.close()
+        _run_locally()
+        return
+
+    try:
+        with connection, connection.makefile('rwb') as stream:
+            status = _send_request(stream)
+    except KeyboardInterrupt:
+        sys.stderr.write(f'Проверка прервана.{os.linesep}')
+        sys.exit(UNSUCCESSFUL_STATUS)
+    if status is None:
+        _run_locally()
+        return
+    sys.exit(status)
+
+
+def _run_locally():
+    """Обработка файлов без демона."""
+    from codestyle.command_line import run_process
+    run_process()
+
+
+def _send_request(stream) -> Optional[int]:
+    """
+    Отправка запроса демону и вывод его ответа.
+
+    :param stream: Файловый объект соединения с демоном.
+    :return: Статус завершения обработки; None - демон отказался
+        обрабатывать запрос (файлы обрабатываются без демона).
+    """
+    request = {'arguments': sys.argv[1:], 'working_directory': os.getcwd(),
+               'environment': get_tool_environment()}
+    stream.write(json.dumps(request).encode() + b'\n')
+    stream.flush()
+
+    for line in stream:
+        message = json.loads(line)
+        if 'status' in message:
+            return message['status']
+        if 'refused' in message:
+            sys.stderr.write(f'{message["refused"]}, файлы обрабатываются '
+                             f'без демона.{os.linesep}')
+            return None
+        output = sys.stderr if message['stream'] == 'stderr' else sys.stdout
+        output.write(message['data'])
+        output.flush()
+
+    sys.stderr.write(f'Соединение с демоном прервано.{os.linesep}')
+    return UNSUCCESSFUL_STATUS
+
+
+if __name__ == '__main__':
+    run_client()
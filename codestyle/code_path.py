@@ -1,30 +1,269 @@
 """Модуль с генератором путей к файлам."""
+import os
+import re
 from logging import CRITICAL, getLogger
-from pathlib import Path
-from typing import Generator, Iterable
+from operator import attrgetter
+from pathlib import Path, PurePath
+from typing import (Callable, Generator, Iterable, Iterator, List, Optional,
+                    Pattern, Sequence, Tuple)
 
 
 _logger = getLogger(__name__)
 
+# Файлы с правилами игнорирования путей (в порядке возрастания
+# приоритета внутри одной директории).
+IGNORE_FILE_NAMES = ('.gitignore', '.codestyleignore')
+GIT_DIRECTORY_NAME = '.git'
+
+
+def compile_excludes(excludes: Iterable[str]) -> Callable[[str], bool]:
+    """
+    Компиляция globbing шаблонов исключений в одну проверку.
+
+    Семантика шаблонов совпадает с Path.match: относительный шаблон
+    сопоставляется с последними частями пути, абсолютный - с путём
+    целиком; * и ? не захватывают разделитель директорий.
+
+    :param excludes: globbing шаблоны исключений
+    :return: функция проверки пути (в виде строки) на исключение
+    """
+    expressions = []
+    for exclude in excludes:
+        parts = PurePath(exclude).parts
+        if not parts:
+            raise ValueError(f'Пустой шаблон исключения: {exclude!r}')
+
+        if PurePath(exclude).is_absolute():
+            prefix, parts = '^/', parts[1:]
+        else:
+            prefix = '(?:^|/)'
+        expression = '/'.join(map(_translate_glob_part, parts))
+        expressions.append(f'{prefix}{expression}$')
+
+    if not expressions:
+        return lambda path: False
+    return re.compile('|'.join(expressions)).search
+
+
+def _translate_glob_part(part: str, escapes: bool = False) -> str:
+    """
+    Преобразование части globbing шаблона в регулярное выражение.
+
+    В отличие от fnmatch.translate, результат не захватывает
+    разделитель директорий.
+
+    :param part: часть шаблона (без разделителей директорий)
+    :param escapes: обратная косая черта экранирует следующий символ
+    :return: регулярное выражение
+    """
+    index, length = 0, len(part)
+    expression = []
+    while index < length:
+        char = part[index]
+        index += 1
+        if escapes and char == '\\' and index < length:
+            expression.append(re.escape(part[index]))
+            index += 1
+        elif char == '*':
+            expression.append('[^/]*')
+        elif char == '?':
+            expression.append('[^/]')
+        elif char == '[':
+            end = index
+            if end < length and part[end] == '!':
+                end += 1
+            if end < length and part[end] == ']':
+                end += 1
+            while end < length and part[end] != ']':
+                end += 1
+            if end >= length:
+                expression.append('\\[')
+                continue
+
+            chars = part[index:end].replace('\\', '\\\\')
+            index = end + 1
+            if chars.startswith('!'):
+                chars = f'^{chars[1:]}'
+            elif chars.startswith('^'):
+                chars = f'\\{chars}'
+            expression.append(f'(?!/)[{chars}]')
+        else:
+            expression.append(re.escape(char))
+    return ''.join(expression)
+
+
+def _translate_ignore_pattern(pattern: str) -> str:
+    """
+    Преобразование шаблона из .gitignore в регулярное выражение.
+
+    Шаблон без косой черты (кроме завершающей) совпадает на любой
+    глубине, иначе - относительно директории файла с шаблонами;
+    ** совпадает с любым количеством директорий.
+
+    :param pattern: шаблон без отрицания и завершающей косой черты
+    :return: регулярное выражение для пути относительно директории
+        файла с шаблонами
+    """
+    expression = '' if '/' in pattern else '(?:.*/)?'
+    parts = pattern[1:].split('/') if pattern.startswith('/') else (
+        pattern.split('/'))
+    for index, part in enumerate(parts):
+        is_last = index == len(parts) - 1
+        if part == '**':
+            expression += '.*' if is_last else '(?:.*/)?'
+            continue
+        expression += _translate_glob_part(part, escapes=True)
+        if not is_last:
+            expression += '/'
+    return f'^{expression}$'
+
+
+class IgnoreFile:
+    """
+    Набор правил из файла игнорирования (.gitignore, .codestyleignore).
+
+    Поддерживается семантика .gitignore: комментарии, отрицание (!),
+    привязка к директории файла (/ в начале или середине шаблона),
+    правила только для директорий (/ в конце шаблона) и ``**``.
+    """
+
+    def __init__(self, lines: Iterable[str], base_path: str,
+                 prefix: str = ''):
+        """
+        Создание набора правил.
+
+        :param lines: строки файла игнорирования
+        :param base_path: путь (в виде строки генератора путей), к
+            которому применяются правила
+        :param prefix: путь base_path относительно директории файла
+            игнорирования (для файлов из родительских директорий)
+        """
+        self.prefix = prefix
+        self.__offset = len(base_path.rstrip('/')) + 1
+        self.__rules = [rule for rule in map(self.__parse_line, lines)
+                        if rule is not None]
+
+    @classmethod
+    def read(cls, file_path: str, base_path: str,
+             prefix: str = '') -> Optional['IgnoreFile']:
+        """
+        Чтение файла игнорирования.
+
+        :param file_path: путь до файла
+        :param base_path: путь, к которому применяются правила
+        :param prefix: путь base_path относительно директории файла
+        :return: набор правил или None, если файл недоступен
+        """
+        try:
+            with open(file_path, encoding='utf-8',
+                      errors='surrogateescape') as ignore_file:
+                return cls(ignore_file.read().splitlines(), base_path,
+                           prefix)
+        except OSError as error:
+            _logger.debug(f'Файл {file_path} недоступен: {error}')
+            return None
+
+    def match(self, path: str, is_dir: bool) -> Optional[bool]:
+        """
+        Проверка пути по правилам (последнее совпавшее правило главное).
+
+        :param path: путь внутри base_path (в виде строки)
+        :param is_dir: путь является директорией
+        :return: True - путь игнорируется, False - путь явно включён
+            отрицанием, None - ни одно правило не совпало
+        """
+        relative_path = self.prefix + path[self.__offset:]
+        for expression, is_negated, is_dir_only in reversed(self.__rules):
+            if is_dir_only and not is_dir:
+                continue
+            if expression.match(relative_path):
+                return not is_negated
+        return None
+
+    @staticmethod
+    def __parse_line(line: str) -> Optional[Tuple[Pattern, bool, bool]]:
+        """
+        Разбор строки файла игнорирования.
+
+        :param line: строка файла
+        :return: регулярное выражение, признаки отрицания и правила
+            только для директорий; None - строка не содержит правила
+        """
+        stripped_line = line.rstrip(' ')
+        if stripped_line.endswith('\\') and len(stripped_line) < len(line):
+            stripped_line += ' '
+        if not stripped_line or stripped_line.startswith('#'):
+            return None
+
+        is_negated = stripped_line.startswith('!')
+        if is_negated or stripped_line.startswith(('\\!', '\\#')):
+            stripped_line = stripped_line[1:]
+        is_dir_only = stripped_line.endswith('/')
+        pattern = stripped_line.rstrip('/')
+        if not pattern:
+            return None
+
+        expression = re.compile(_translate_ignore_pattern(pattern), re.DOTALL)
+        return expression, is_negated, is_dir_only
+
+
+def _is_ignored(ignore_files: Sequence[IgnoreFile], path: str,
+                is_dir: bool) -> bool:
+    """
+    Проверка пути по наборам правил игнорирования.
+
+    :param ignore_files: наборы правил от внешней директории к внутренней
+        (правила внутренних директорий приоритетнее)
+    :param path: путь (в виде строки генератора путей)
+    :param is_dir: путь является директорией
+    :return: путь игнорируется
+    """
+    for ignore_file in reversed(ignore_files):
+        is_ignored = ignore_file.match(path, is_dir)
+        if is_ignored is not None:
+            return is_ignored
+    return False
+
 
 class ExpandedPathTree:
     """Развёрнутое дерево путей к файлам."""
 
-    def __init__(self, *targets, excludes: Iterable[str] = ()):
+    def __init__(self, *targets, excludes: Iterable[str] = (),
+                 candidates: Optional[Iterable[Path]] = None,
+                 use_ignore_files: bool = False,
+                 name_filter: Optional[Callable[[str], bool]] = None):
         """
         Создание объекта.
 
         :param targets: пути в файловой системе
         :param excludes: исключаемые из генератора пути
+        :param candidates: абсолютные (канонические) пути до файлов, которыми
+            ограничивается генератор (директории при этом не обходятся);
+            None - без ограничения
+        :param use_ignore_files: не обходить пути, игнорируемые правилами
+            из файлов .gitignore и .codestyleignore (в том числе из
+            родительских директорий в пределах git репозитория); к явно
+            указанным и изменённым в git путям правила не применяются
+        :param name_filter: функция отбора файлов по имени; отклонённые
+            файлы отсекаются при чтении директории, до обращения к ним в
+            файловой системе (None - без отбора)
         """
         self.check_path_availability(targets)
         self.targets = set(targets)
         self.excludes = set(excludes)
+        self.candidates = None if candidates is None else sorted(candidates)
+        self.use_ignore_files = use_ignore_files
+        self.name_filter = name_filter
+        self.__excludes_matcher = compile_excludes(self.excludes)
 
     def path_gen(self, targets=None) -> Generator[Path, None, None]:
         """Генератор развёрнутых путей."""
+        if targets is None and self.candidates is not None:
+            yield from self.__filter_candidates()
+            return
+
         targets = targets if targets else self.targets
-        for path in targets:
+        for path in sorted(targets):
             yield from self.__generate_paths(path)
 
     @staticmethod
@@ -40,23 +279,160 @@ class ExpandedPathTree:
         for path in missing_paths:
             _logger.log(CRITICAL, f'Путь {path} недоступен.')
 
-    def __is_excluded(self, path: Path) -> bool:
+    def __is_excluded(self, path: str) -> bool:
         """Проверка исключён путь или нет."""
-        for exclude in self.excludes:
-            if path.match(exclude):
-                return True
-        return False
+        return bool(self.__excludes_matcher(path))
+
+    def __is_accepted_name(self, name: str) -> bool:
+        """Проверка имени файла функцией отбора."""
+        return self.name_filter is None or self.name_filter(name)
 
     def __generate_paths(self, path: Path) -> Generator[Path, None, None]:
         """
         Генерация путей с проверкой доступности в файловой системе.
 
+        Директории обходятся итеративно (в порядке имён), без
+        ограничения глубины рекурсией; исключённые директории
+        отсекаются до чтения их содержимого, а файлы, отклонённые
+        функцией отбора по имени, - до проверки исключений и правил
+        игнорирования.
+
         :param path: путь до файла или директории
         :return: генератор путей до файлов
         """
-        if self.__is_excluded(path):
+        if self.__is_excluded(str(path)):
             return
         if path.is_file():
-            yield path
-        elif path.is_dir():
-            yield from self.path_gen(path.iterdir())
+            if self.__is_accepted_name(path.name):
+                yield path
+            return
+        if not path.is_dir():
+            return
+
+        visited_links = set()
+        root_ignore_files = self.__read_parent_ignore_files(path)
+        entries_stack = [self.__scan_directory(str(path), root_ignore_files)]
+        while entries_stack:
+            entries, ignore_files = entries_stack[-1]
+            entry = next(entries, None)
+            if entry is None:
+                entries_stack.pop()
+                continue
+            # Тип элемента известен из чтения директории (кроме ссылок).
+            is_dir = entry.is_dir()
+            if not is_dir and not self.__is_accepted_name(entry.name):
+                continue
+            if self.__is_excluded(entry.path):
+                continue
+
+            if self.use_ignore_files and (
+                    (is_dir and entry.name == GIT_DIRECTORY_NAME)
+                    or _is_ignored(ignore_files, entry.path, is_dir)):
+                continue
+            if entry.is_file():
+                yield Path(entry.path)
+            elif is_dir:
+                if entry.is_symlink():
+                    real_path = os.path.realpath(entry.path)
+                    if real_path in visited_links:
+                        continue
+                    visited_links.add(real_path)
+                entries_stack.append(
+                    self.__scan_directory(entry.path, ignore_files))
+
+    def __scan_directory(self, path: str, ignore_files: Tuple[
+            IgnoreFile, ...]) -> Tuple[Iterator[os.DirEntry],
+                                       Tuple[IgnoreFile, ...]]:
+        """
+        Чтение содержимого директории.
+
+        :param path: путь до директории
+        :param ignore_files: правила игнорирования родительских директорий
+        :return: итератор элементов директории, упорядоченных по имени, и
+            правила игнорирования с учётом файлов из этой директории
+        """
+        try:
+            with os.scandir(path) as scanned_entries:
+                entries: List[os.DirEntry] = sorted(
+                    scanned_entries, key=attrgetter('name'))
+        except OSError as error:
+            _logger.warning(f'Директория {path} недоступна: {error}')
+            return iter(()), ignore_files
+
+        if self.use_ignore_files:
+            names = {entry.name for entry in entries}
+            ignore_files += tuple(filter(None, (
+                IgnoreFile.read(os.path.join(path, name), path)
+                for name in IGNORE_FILE_NAMES if name in names)))
+        return iter(entries), ignore_files
+
+    def __read_parent_ignore_files(self, path: Path) -> Tuple[
+            IgnoreFile, ...]:
+        """
+        Чтение файлов игнорирования из родительских директорий.
+
+        Учитываются директории до корня git репозитория; вне репозитория -
+        до текущей рабочей директории.
+
+        :param path: путь до обходимой директории
+        :return: правила игнорирования от внешней директории к внутренней
+        """
+        if not self.use_ignore_files:
+            return ()
+
+        absolute_path = Path(os.path.abspath(path))
+        if (absolute_path / GIT_DIRECTORY_NAME).exists():
+            return ()
+
+        current_directory = Path.cwd()
+        parents = []
+        for parent in absolute_path.parents:
+            parents.append(parent)
+            if (parent / GIT_DIRECTORY_NAME).exists():
+                break
+        else:
+            if current_directory not in parents:
+                return ()
+            parents = parents[:parents.index(current_directory) + 1]
+
+        ignore_files = []
+        for parent in reversed(parents):
+            prefix = f'{absolute_path.relative_to(parent).as_posix()}/'
+            for name in IGNORE_FILE_NAMES:
+                ignore_file_path = parent / name
+                if ignore_file_path.is_file():
+                    ignore_files.append(IgnoreFile.read(
+                        str(ignore_file_path), str(path), prefix))
+        return tuple(filter(None, ignore_files))
+
+    def __filter_candidates(self) -> Generator[Path, None, None]:
+        """
+        Генерация путей из кандидатов, находящихся внутри целевых путей.
+
+        Пути строятся относительно целевых путей, а исключения
+        проверяются для каждой директории на пути до файла - так же,
+        как при обходе дерева.
+
+        :return: генератор путей до файлов
+        """
+        generated_paths = set()
+        for target in sorted(self.targets):
+            target_path = Path(target).resolve()
+            for candidate in self.candidates:
+                try:
+                    relative_parts = candidate.relative_to(target_path).parts
+                except ValueError:
+                    continue
+
+                path = target
+                is_excluded = self.__is_excluded(str(path))
+                for part in relative_parts:
+                    path /= part
+                    is_excluded = is_excluded or self.__is_excluded(str(path))
+
+                if (is_excluded or candidate in generated_paths
+                        or not self.__is_accepted_name(path.name)):
+                    continue
+                if path.is_file():
+                    generated_paths.add(candidate)
+                    yield path
@@ -1,19 +1,36 @@
 """Модуль командной строки."""
-from logging import WARNING
+import sys
+from logging import ERROR, INFO, WARNING
 from logging.config import dictConfig
+from typing import Sequence
 
-from codestyle.application import ConsoleApplication
-from codestyle.parameters_parse import ArgumentationTool, ParametersStorage
+from codestyle.application import (FIX_CHANGED, INTERRUPTED, MESSAGES,
+                                   ConsoleApplication)
+from codestyle.daemon import run_daemon
+from codestyle.parameters import MERGE_RESULTS_COMMAND
+from codestyle.parameters_parse import (ArgumentationTool,
+                                        MergeResultsArgumentationTool,
+                                        ParametersStorage)
+from codestyle.reporters import REPORTERS, merge_reports
 from codestyle.settings import get_logging_config
 from codestyle.system_wrappers import ExitCodes, interrupt_program_flow
 
 
 def run_process():
     """Запуск процесса обработки файлов."""
+    if sys.argv[1:2] == [MERGE_RESULTS_COMMAND]:
+        run_merge_results(sys.argv[2:])
+        return
+
     arg_tool = ArgumentationTool()
     parameters_storage: ParametersStorage = arg_tool.parameters_storage
     dictConfig(get_logging_config(parameters_storage.line_separator,
-                                  parameters_storage.logging_level))
+                                  parameters_storage.logging_level,
+                                  stream=parameters_storage.logging_stream))
+
+    if parameters_storage.daemon:
+        run_daemon(parameters_storage)
+        return
 
     try:
         ConsoleApplication(parameters_storage).process_files()
@@ -21,3 +38,48 @@ def run_process():
         interrupt_program_flow(status=ExitCodes.UNSUCCESSFUL,
                                log_message='Проверка прервана.',
                                log_level=WARNING)
+
+
+def run_merge_results(arguments: Sequence[str]):
+    """
+    Объединение отчётов сегментов (codestyle merge-results).
+
+    Работа приложения завершается со статусом обработки всех сегментов.
+
+    :param arguments: Аргументы командной строки после названия команды.
+    """
+    parameters_storage = MergeResultsArgumentationTool(
+        arguments).parameters_storage
+    dictConfig(get_logging_config(parameters_storage.line_separator,
+                                  parameters_storage.logging_level,
+                                  stream=parameters_storage.logging_stream))
+
+    reporter = None
+    if parameters_storage.format is not None:
+        reporter = REPORTERS[parameters_storage.format](
+            parameters_storage.output)
+    try:
+        summary = merge_reports(parameters_storage.report, reporter)
+    except (OSError, ValueError) as error:
+        if reporter is not None:
+            reporter.finish(None)
+        interrupt_program_flow(
+            status=ExitCodes.UNSUCCESSFUL,
+            log_message=f'Не удалось объединить отчёты: {error}',
+            log_level=ERROR)
+    if reporter is not None:
+        reporter.finish(summary)
+
+    status = summary['status']
+    message = MESSAGES[summary['method']][status]
+    if (summary['method'] == 'fix' and summary['total_changed']
+            and not summary['total_failed']):
+        message = FIX_CHANGED
+    if summary['interrupted']:
+        message = INTERRUPTED
+    interrupt_program_flow(
+        status=status,
+        log_message=message.format(total_count=summary['total_count'],
+                                   total_failed=summary['total_failed'],
+                                   total_changed=summary['total_changed']),
+        log_level=ERROR if status != ExitCodes.SUCCESS else INFO)
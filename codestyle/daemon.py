@@ -0,0 +1,255 @@
+"""
+Модуль демона приложения.
+
+Демон (codestyle --daemon) принимает запросы клиента (модуль client)
+через Unix сокет и обрабатывает их в уже запущенном процессе: модули
+импортированы, а найденные утилиты и их версии хранятся в общем
+реестре. Запросы обрабатываются по очереди, так как обработка меняет
+рабочую директорию и стандартные потоки вывода процесса. Утилиты
+запускаются в окружении демона, поэтому запросы клиентов с другим
+окружением (PATH, виртуальное окружение, настройки npm) отклоняются -
+такой клиент обрабатывает файлы самостоятельно.
+"""
+import json
+import os
+import socket
+import sys
+import traceback
+from contextlib import redirect_stderr, redirect_stdout, suppress
+from io import TextIOBase
+from logging import ERROR, getLogger
+from logging.config import dictConfig
+from pathlib import Path
+from socketserver import StreamRequestHandler, UnixStreamServer
+from typing import BinaryIO, Sequence
+
+from codestyle.application import ENABLED_TOOLS, ConsoleApplication
+from codestyle.client import get_tool_environment
+from codestyle.parameters_parse import ArgumentationTool, ParametersStorage
+from codestyle.settings import get_logging_config
+from codestyle.system_wrappers import ExitCodes, interrupt_program_flow
+from codestyle.tool_registry import ToolRegistry
+
+# Права доступа к сокету: только для владельца.
+SOCKET_UMASK = 0o177
+
+_logger = getLogger(__name__)
+
+
+class ClientStream(TextIOBase):
+    """Поток вывода, передающий записанный текст клиенту."""
+
+    def __init__(self, connection: BinaryIO, name: str):
+        """
+        Создание потока.
+
+        :param connection: Файловый объект соединения с клиентом.
+        :param name: Название потока у клиента (stdout или stderr).
+        """
+        super().__init__()
+        self.connection = connection
+        self.name = name
+        self.is_connected = True
+
+    def writable(self) -> bool:
+        """Поток доступен для записи."""
+        return True
+
+    def write(self, data: str) -> int:
+        """
+        Передача текста клиенту.
+
+        После разрыва соединения текст отбрасывается, чтобы обработка
+        файлов не прерывалась ошибками вывода.
+
+        :param data: Текст.
+        :return: Длина текста.
+        """
+        if data and self.is_connected:
+            send_message(self.connection, stream=self.name, data=data)
+            self.is_connected = not self.connection.closed
+        return len(data)
+
+
+def send_message(connection: BinaryIO, **message):
+    """Передача сообщения клиенту (JSON объект в отдельной строке)."""
+    try:
+        connection.write(json.dumps(message).encode() + b'\n')
+        connection.flush()
+    except OSError:
+        connection.close()
+
+
+class DaemonRequestHandler(StreamRequestHandler):
+    """Обработчик запроса клиента."""
+
+    def handle(self):
+        """Обработка запроса и передача статуса завершения клиенту."""
+        try:
+            request = json.loads(self.rfile.readline())
+            arguments = request['arguments']
+            working_directory = request['working_directory']
+        except (ValueError, KeyError, TypeError) as error:
+            _logger.warning(f'Некорректный запрос клиента: {error!r}')
+            return
+        if request.get('environment') != self.server.environment:
+            send_message(self.wfile, refused='Окружение клиента отличается '
+                         'от окружения демона')
+            return
+
+        status = process_request(arguments, working_directory,
+                                 self.server.tool_registry, self.wfile)
+        send_message(self.wfile, status=status)
+        self.server.restore_logging()
+
+
+class DaemonServer(UnixStreamServer):
+    """Сервер демона, обрабатывающий запросы по очереди."""
+
+    def __init__(self, socket_path: Path, tool_registry: ToolRegistry,
+                 parameters_storage: ParametersStorage):
+        """
+        Создание сервера.
+
+        :param socket_path: Путь до Unix сокета.
+        :param tool_registry: Реестр утилит, общий для всех запросов.
+        :param parameters_storage: Параметры запуска демона.
+        """
+        self.tool_registry = tool_registry
+        self.parameters_storage = parameters_storage
+        # Окружение утилит, в котором демон обрабатывает запросы.
+        self.environment = get_tool_environment()
+        super().__init__(str(socket_path), DaemonRequestHandler)
+
+    def restore_logging(self):
+        """Восстановление логирования демона после обработки запроса."""
+        dictConfig(get_logging_config(
+            self.parameters_storage.line_separator,
+            self.parameters_storage.logging_level,
+            stream=self.parameters_storage.logging_stream))
+
+
+def process_request(arguments: Sequence[str], working_directory: str,
+                    tool_registry: ToolRegistry, connection: BinaryIO) -> int:
+    """
+    Обработка файлов по запросу клиента.
+
+    Выполняется так же, как локальный запуск приложения в рабочей
+    директории клиента; вывод передаётся клиенту.
+
+    :param arguments: Аргументы командной строки клиента.
+    :param working_directory: Рабочая директория клиента.
+    :param tool_registry: Реестр утилит.
+    :param connection: Файловый объект соединения с клиентом.
+    :return: Статус завершения обработки.
+    """
+    daemon_directory = os.getcwd()
+    stdout = ClientStream(connection, 'stdout')
+    stderr = ClientStream(connection, 'stderr')
+    try:
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            os.chdir(working_directory)
+            return _run_application(arguments, working_directory,
+                                    tool_registry)
+    except OSError as error:
+        send_message(connection, stream='stderr', data=f'{error}{os.linesep}')
+        return ExitCodes.UNSUCCESSFUL
+    finally:
+        os.chdir(daemon_directory)
+
+
+def _run_application(arguments: Sequence[str], working_directory: str,
+                     tool_registry: ToolRegistry) -> int:
+    """
+    Запуск приложения с перехватом завершения работы.
+
+    :param arguments: Аргументы командной строки.
+    :param working_directory: Рабочая директория.
+    :param tool_registry: Реестр утилит.
+    :return: Статус завершения обработки.
+    """
+    try:
+        parameters_storage = ArgumentationTool(
+            arguments,
+            working_directory=Path(working_directory)).parameters_storage
+        dictConfig(get_logging_config(
+            parameters_storage.line_separator,
+            parameters_storage.logging_level,
+            stream=parameters_storage.logging_stream))
+        if parameters_storage.daemon:
+            interrupt_program_flow(
+                status=ExitCodes.UNSUCCESSFUL,
+                log_message='Запуск демона через клиент не поддерживается.',
+                log_level=ERROR)
+        ConsoleApplication(parameters_storage,
+                           tool_registry=tool_registry).process_files()
+    except SystemExit as error:
+        return _get_exit_status(error.code)
+    except Exception:  # noqa: B902
+        traceback.print_exc()
+        return ExitCodes.UNSUCCESSFUL
+    return ExitCodes.SUCCESS
+
+
+def _get_exit_status(code) -> int:
+    """Статус завершения по аргументу SystemExit (как у интерпретатора)."""
+    if code is None:
+        return ExitCodes.SUCCESS
+    if isinstance(code, int):
+        return code
+    sys.stderr.write(f'{code}\n')
+    return ExitCodes.UNSUCCESSFUL
+
+
+def run_daemon(parameters_storage: ParametersStorage):
+    """
+    Запуск демона, обрабатывающего запросы до прерывания (Ctrl+C).
+
+    Если демон уже запущен на указанном сокете - работа приложения
+        завершается со статусом ExitCodes.UNSUCCESSFUL
+
+    :param parameters_storage: Параметры запуска демона.
+    """
+    socket_path = Path(parameters_storage.socket)
+    if _is_daemon_running(socket_path):
+        interrupt_program_flow(
+            status=ExitCodes.UNSUCCESSFUL,
+            log_message=f'Демон уже запущен на {socket_path}.',
+            log_level=ERROR)
+    if socket_path.exists():
+        socket_path.unlink()
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+
+    tool_registry = ToolRegistry(parameters_storage.cache_dir
+                                 if parameters_storage.cache else None)
+    for tool in ENABLED_TOOLS:
+        tool_registry.which(tool.get_name())
+
+    umask = os.umask(SOCKET_UMASK)
+    try:
+        server = DaemonServer(socket_path, tool_registry, parameters_storage)
+    finally:
+        os.umask(umask)
+
+    _logger.info(f'Демон ожидает запросы на {socket_path}..')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        _logger.info('Демон остановлен.')
+    finally:
+        server.server_close()
+        tool_registry.stop_backends()
+        tool_registry.save()
+        with suppress(FileNotFoundError):
+            socket_path.unlink()
+
+
+def _is_daemon_running(socket_path: Path) -> bool:
+    """Проверка, принимает ли сокет соединения."""
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    with connection:
+        try:
+            connection.connect(str(socket_path))
+        except OSError:
+            return False
+    return True
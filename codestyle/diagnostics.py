@@ -0,0 +1,138 @@
+"""
+Замечания утилит в едином формате.
+
+Вывод каждой утилиты разбирается её обёрткой (см. tool_wrappers) в
+набор замечаний Diagnostic, которые используются для отчётов без
+повторного разбора текста.
+"""
+import re
+from os import linesep
+from typing import Iterable, List, Optional, Pattern, Tuple
+
+# Уровни важности замечаний.
+ERROR = 'error'
+WARNING = 'warning'
+INFO = 'info'
+SEVERITIES = {
+    'error': ERROR,
+    'fatal': ERROR,
+    'warning': WARNING,
+    'warn': WARNING,
+    'info': INFO,
+    'note': INFO,
+    'style': INFO,
+}
+
+# Строка вывода с замечанием: путь:строка[:столбец][:] сообщение,
+# например: "/code/file.sh:3:8: note: Double quote [SC2086]".
+DEFAULT_DIAGNOSTIC_PATTERN: Pattern = re.compile(
+    r'^(?P<path>[^:\s][^:]*):(?P<line>\d+)(?::(?P<column>\d+))?:?\s*'
+    r'(?:(?P<severity>error|warning|note|info|style):\s*)?'
+    r'(?P<message>.*?)(?:\s+\[(?P<code>[\w.-]+)\])?$')
+
+
+def normalize_severity(severity: Optional[str],
+                       default: str = ERROR) -> str:
+    """
+    Уровень важности замечания (error, warning или info).
+
+    :param severity: Уровень важности в выводе утилиты.
+    :param default: Уровень важности, если он не указан или неизвестен.
+    :return: Уровень важности.
+    """
+    if not severity:
+        return default
+    return SEVERITIES.get(str(severity).lower(), default)
+
+
+class Diagnostic:
+    """Замечание утилиты к строке файла."""
+
+    __slots__ = ('path', 'line', 'col', 'code', 'severity', 'message',
+                 'tool')
+
+    def __init__(self, path: str, line: int, col: Optional[int], code: str,
+                 severity: str, message: str, tool: str):
+        """
+        Создание замечания.
+
+        :param path: Путь до файла.
+        :param line: Номер строки (с 1; 0 - замечание ко всему файлу).
+        :param col: Номер столбца (с 1) или None, если не указан.
+        :param code: Код правила утилиты (пустая строка - без кода).
+        :param severity: Уровень важности (error, warning или info).
+        :param message: Сообщение.
+        :param tool: Название утилиты.
+        """
+        self.path = path
+        self.line = line
+        self.col = col
+        self.code = code
+        self.severity = severity
+        self.message = message
+        self.tool = tool
+
+    @property
+    def key(self) -> Tuple:
+        """Значения полей замечания (для сравнения и сохранения)."""
+        return (self.path, self.line, self.col, self.code, self.severity,
+                self.message, self.tool)
+
+    def __eq__(self, other) -> bool:
+        """Сравнение замечаний по значениям полей."""
+        if not isinstance(other, Diagnostic):
+            return NotImplemented
+        return self.key == other.key
+
+    def __hash__(self) -> int:
+        """Хэш значений полей замечания."""
+        return hash(self.key)
+
+    def __repr__(self) -> str:
+        """Представление замечания со значениями полей."""
+        return f'Diagnostic{self.key!r}'
+
+    def __str__(self) -> str:
+        """Замечание в формате gcc: путь:строка:столбец: уровень: ..."""
+        position = f'{self.line}:{self.col}' if self.col else f'{self.line}'
+        code = f' [{self.code}]' if self.code else ''
+        return (f'{self.path}:{position}: {self.severity}: '
+                f'{self.message}{code}')
+
+
+def parse_text_diagnostics(text: str, pattern: Pattern, tool: str,
+                           default_path: str = '',
+                           default_severity: str = ERROR
+                           ) -> List[Diagnostic]:
+    """
+    Замечания из текстового вывода утилиты.
+
+    :param text: Вывод утилиты.
+    :param pattern: Регулярное выражение строки с замечанием: группа
+        message, необязательные - path, line (без неё замечание
+        относится ко всему файлу), column, code и severity.
+    :param tool: Название утилиты.
+    :param default_path: Путь до файла для строк без пути.
+    :param default_severity: Уровень важности для строк без уровня.
+    :return: Замечания в порядке вывода.
+    """
+    diagnostics = []
+    for line in text.splitlines():
+        match = pattern.match(line)
+        if match is None:
+            continue
+        groups = match.groupdict()
+        diagnostics.append(Diagnostic(
+            groups.get('path') or default_path,
+            int(groups.get('line') or 0),
+            int(groups['column']) if groups.get('column') else None,
+            groups.get('code') or '',
+            normalize_severity(groups.get('severity'), default_severity),
+            groups['message'].strip(),
+            tool))
+    return diagnostics
+
+
+def format_diagnostics(diagnostics: Iterable[Diagnostic]) -> str:
+    """Текстовый вывод замечаний (по замечанию в строке)."""
+    return linesep.join(map(str, diagnostics))
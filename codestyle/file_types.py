@@ -0,0 +1,167 @@
+"""
+Определение типа файла для выбора обрабатывающих его утилит.
+
+Тип файла - суффикс, по которому выбираются утилиты. Он определяется по
+имени файла (Dockerfile), собственному суффиксу файла или, для файлов без
+суффикса, по строке shebang в начале файла; двоичные файлы и файлы без
+известного интерпретатора не обрабатываются.
+
+Начало файла читается только для файлов без суффикса, а результат
+запоминается по устройству, inode, времени изменения и размеру файла,
+поэтому повторное определение типа (в демоне, при исправлении с
+проверкой) не читает неизменённый файл.
+"""
+import os
+import re
+import stat
+from fnmatch import fnmatchcase
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Collection, Optional, Tuple
+
+# Шаблоны имён файлов и соответствующие им суффиксы.
+FILE_NAME_SUFFIXES = (
+    ('Dockerfile', '.dockerfile'),
+    ('Dockerfile.*', '.dockerfile'),
+    ('Containerfile', '.dockerfile'),
+    ('Containerfile.*', '.dockerfile'),
+)
+# Интерпретаторы из строки shebang и соответствующие им суффиксы.
+INTERPRETER_SUFFIXES = {
+    'sh': '.sh',
+    'bash': '.sh',
+    'dash': '.sh',
+    'ksh': '.sh',
+    'python': '.py',
+}
+# Шаблоны названий интерпретаторов с версией (python3.11, pypy3) и
+# интерпретаторы, по которым определяется суффикс.
+INTERPRETER_ALIASES = (
+    (re.compile(r'(?:python|pypy)(?:\d+(?:\.\d+)?)?'), 'python'),
+)
+# Количество байт, читаемых из начала файла без суффикса.
+HEAD_SIZE = 512
+# Максимальное количество запомненных типов файлов без суффикса.
+MAX_CACHED_FILES = 65536
+
+SHEBANG_PATTERN = re.compile(rb'^#![ \t]*(?P<command>[^\r\n]*)')
+
+
+def get_file_suffix(file_path: Path) -> str:
+    """
+    Суффикс файла, по которому выбираются обрабатывающие его утилиты.
+
+    :param file_path: Путь до файла.
+    :return: Суффикс (с точкой в начале); пустая строка - файл не
+        обрабатывается утилитами.
+    """
+    suffix = get_name_suffix(file_path.name)
+    if suffix is not None:
+        return suffix
+
+    try:
+        file_stat = os.stat(file_path)
+    except OSError:
+        return ''
+    if not stat.S_ISREG(file_stat.st_mode):
+        return ''
+    return _get_content_suffix(str(file_path), (
+        file_stat.st_dev, file_stat.st_ino, file_stat.st_mtime_ns,
+        file_stat.st_size))
+
+
+def get_name_suffix(name: str) -> Optional[str]:
+    """
+    Суффикс файла по его имени (без обращения к файловой системе).
+
+    :param name: Имя файла.
+    :return: Суффикс; None - имя файла без суффикса, суффикс
+        определяется по содержимому файла.
+    """
+    for pattern, suffix in FILE_NAME_SUFFIXES:
+        if fnmatchcase(name, pattern):
+            return suffix
+    # Суффикс определяется так же, как PurePath.suffix.
+    index = name.rfind('.')
+    if 0 < index < len(name) - 1:
+        return name[index:]
+    return None
+
+
+def compile_name_filter(suffixes: Collection[str]) -> Callable[[str], bool]:
+    """
+    Проверка имён файлов по набору обрабатываемых суффиксов.
+
+    Файлы без суффикса принимаются, если среди суффиксов есть суффикс
+    интерпретатора (их тип определяется по содержимому).
+
+    :param suffixes: Суффиксы обрабатываемых файлов.
+    :return: Функция проверки имени файла.
+    """
+    suffixes = frozenset(suffixes)
+    accepts_content = not suffixes.isdisjoint(INTERPRETER_SUFFIXES.values())
+
+    def is_accepted(name: str) -> bool:
+        suffix = get_name_suffix(name)
+        return accepts_content if suffix is None else suffix in suffixes
+
+    return is_accepted
+
+
+@lru_cache(maxsize=MAX_CACHED_FILES)
+def _get_content_suffix(file_path: str,
+                        file_id: Tuple[int, int, int, int]) -> str:
+    """
+    Суффикс файла по началу его содержимого (запоминается).
+
+    :param file_path: Путь до файла.
+    :param file_id: Устройство, inode, время изменения и размер файла.
+    :return: Суффикс для интерпретатора из строки shebang; пустая
+        строка - двоичный файл или интерпретатор неизвестен.
+    """
+    try:
+        with open(file_path, 'rb') as file:
+            head = file.read(HEAD_SIZE)
+    except OSError:
+        return ''
+    if b'\0' in head:
+        return ''
+
+    interpreter = get_interpreter(head)
+    return get_interpreter_suffix(interpreter) if interpreter else ''
+
+
+def get_interpreter_suffix(interpreter: str) -> str:
+    """
+    Суффикс файла по названию интерпретатора (с учётом его версии).
+
+    :param interpreter: Название интерпретатора из строки shebang.
+    :return: Суффикс; пустая строка - интерпретатор неизвестен.
+    """
+    for pattern, alias in INTERPRETER_ALIASES:
+        if pattern.fullmatch(interpreter):
+            interpreter = alias
+            break
+    return INTERPRETER_SUFFIXES.get(interpreter, '')
+
+
+def get_interpreter(head: bytes) -> Optional[str]:
+    """
+    Название интерпретатора из строки shebang.
+
+    Для команд вида "/usr/bin/env [-S] bash" возвращается название
+    запускаемой env программы.
+
+    :param head: Начало содержимого файла.
+    :return: Название интерпретатора или None, если строки shebang нет.
+    """
+    match = SHEBANG_PATTERN.match(head)
+    if match is None:
+        return None
+
+    arguments = match.group('command').decode(errors='replace').split()
+    if arguments and os.path.basename(arguments[0]) == 'env':
+        arguments = [argument for argument in arguments[1:]
+                     if not argument.startswith('-')
+                     and '=' not in argument]
+    return os.path.basename(arguments[0]) if arguments else None
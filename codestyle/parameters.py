@@ -5,20 +5,30 @@
 https://docs.python.org/3/library/argparse.html#the-add-argument-method
 https://pypi.org/project/ConfigArgParse/
 """
+from os import cpu_count
 from pathlib import Path
 
 from codestyle import __version__ as application_version
+from codestyle.cache import DEFAULT_CACHE_PATH, DEFAULT_CACHE_SIZE
+from codestyle.client import DEFAULT_SOCKET_PATH, SOCKET_PATH_VARIABLE
+from codestyle.profiling import DEFAULT_SLOWEST_COUNT
+from codestyle.reporters import REPORTERS
+from codestyle.sharding import BALANCE_HASH, BALANCE_METHODS
 from codestyle.tool_wrappers import (ESLint, Flake8, HTMLCS, PHPCBF, PHPCS,
                                      Stylelint, TOOL_SETTINGS_PATH,
                                      MyPy, Black, Hadolint)
 
+DEFAULT_JOBS = cpu_count() or 1
+# Команда объединения отчётов сегментов (codestyle merge-results).
+MERGE_RESULTS_COMMAND = 'merge-results'
+
 PARAMETERS: tuple = (
     (
         ('target',),
         {
             'metavar': 'target',
             'type': Path,
-            'nargs': '+',
+            'nargs': '*',
             'help': 'Путь до проверяемых файлов или директорий',
         },
     ),
@@ -30,6 +40,108 @@ PARAMETERS: tuple = (
             'help': 'Исправить ошибки по возможности',
         },
     ),
+    (
+        ('--check',),
+        {
+            'dest': 'check',
+            'action': 'store_true',
+            'help': 'Проверить файлы после исправления (с параметром --fix) '
+            'за один запуск приложения',
+        },
+    ),
+    (
+        ('--diff',),
+        {
+            'dest': 'diff',
+            'action': 'store_true',
+            'help': 'Выводить изменения исправленных файлов в формате '
+            'unified diff (с параметром --fix)',
+        },
+    ),
+    (
+        ('--exit-on-change',),
+        {
+            'dest': 'exit_on_change',
+            'action': 'store_true',
+            'help': 'Завершать работу с ошибкой, если исправление изменило '
+            'файлы (с параметром --fix)',
+        },
+    ),
+    (
+        ('--format',),
+        {
+            'dest': 'format',
+            'choices': tuple(REPORTERS),
+            'default': None,
+            'help': 'Формат машиночитаемого отчёта о результатах обработки '
+            'файлов (сообщения приложения при выводе отчёта в '
+            'стандартный вывод пишутся в поток ошибок)',
+        },
+    ),
+    (
+        ('--output',),
+        {
+            'dest': 'output',
+            'metavar': '<report path>',
+            'type': Path,
+            'default': None,
+            'help': 'Путь до файла отчёта (с параметром --format; '
+            'по-умолчанию: стандартный вывод)',
+        },
+    ),
+    (
+        ('--baseline',),
+        {
+            'dest': 'baseline',
+            'metavar': '<baseline path>',
+            'type': Path,
+            'default': None,
+            'help': 'Путь до базового файла известных замечаний: при '
+            'проверке ошибками считаются только новые замечания',
+        },
+    ),
+    (
+        ('--write-baseline',),
+        {
+            'dest': 'write_baseline',
+            'metavar': '<baseline path>',
+            'type': Path,
+            'default': None,
+            'help': 'Записать замечания проверки в базовый файл по '
+            'указанному пути (вместо --baseline)',
+        },
+    ),
+    (
+        ('--profile',),
+        {
+            'dest': 'profile',
+            'action': 'store_true',
+            'help': 'Вывести в поток ошибок профиль обработки: время, '
+            'процессорное время и память утилит, самые долгие запуски',
+        },
+    ),
+    (
+        ('--profile-slowest',),
+        {
+            'dest': 'profile_slowest',
+            'metavar': '<количество запусков>',
+            'type': int,
+            'default': DEFAULT_SLOWEST_COUNT,
+            'help': 'Количество самых долгих запусков утилит в профиле '
+            f'(по-умолчанию: {DEFAULT_SLOWEST_COUNT})',
+        },
+    ),
+    (
+        ('--profile-output',),
+        {
+            'dest': 'profile_output',
+            'metavar': '<profile path>',
+            'type': Path,
+            'default': None,
+            'help': 'Путь до файла для записи измерений профиля обработки в '
+            'формате JSON',
+        },
+    ),
     (
         ('-c', '--compact'),
         {
@@ -70,8 +182,30 @@ PARAMETERS: tuple = (
         {
             'dest': 'file_suffix',
             'metavar': '<file suffix>',
+            'action': 'append',
             'help': 'Проверяемое расширение файлов (.py, .js и так '
-            'далее; по-умолчанию: все расширения)',
+            'далее; можно указать несколько раз; по-умолчанию: все '
+            'расширения)',
+        },
+    ),
+    (
+        ('--only-tool',),
+        {
+            'dest': 'only_tool',
+            'metavar': '<утилита>',
+            'action': 'append',
+            'help': 'Обрабатывать файлы только указанной утилитой (в том '
+            'числе опциональной; можно указать несколько раз)',
+        },
+    ),
+    (
+        ('--skip-tool',),
+        {
+            'dest': 'skip_tool',
+            'metavar': '<утилита>',
+            'action': 'append',
+            'help': 'Не обрабатывать файлы указанной утилитой (можно '
+            'указать несколько раз)',
         },
     ),
     (
@@ -84,6 +218,204 @@ PARAMETERS: tuple = (
             'default': (),
         },
     ),
+    (
+        ('--no-ignore-files',),
+        {
+            'dest': 'ignore_files',
+            'action': 'store_false',
+            'help': 'Не учитывать правила из файлов .gitignore и '
+            '.codestyleignore при обходе директорий',
+        },
+    ),
+    (
+        ('--changed-since',),
+        {
+            'dest': 'changed_since',
+            'metavar': '<git ссылка>',
+            'default': None,
+            'help': 'Обрабатывать только файлы, изменённые относительно '
+            'указанной ветки, тега или коммита git (включая '
+            'неотслеживаемые файлы)',
+        },
+    ),
+    (
+        ('--staged',),
+        {
+            'dest': 'staged',
+            'action': 'store_true',
+            'help': 'Обрабатывать только файлы, изменения которых '
+            'добавлены в индекс git',
+        },
+    ),
+    (
+        ('--shard',),
+        {
+            'dest': 'shard',
+            'metavar': '<номер>/<количество>',
+            'default': None,
+            'help': 'Обрабатывать только файлы указанного сегмента (номера '
+            'начинаются с 1) для разделения работы между узлами CI',
+        },
+    ),
+    (
+        ('--shard-balance',),
+        {
+            'dest': 'shard_balance',
+            'choices': BALANCE_METHODS,
+            'default': BALANCE_HASH,
+            'help': 'Способ разделения файлов между сегментами: по хэшу '
+            'пути, по размеру файлов или по длительности обработки из '
+            f'профиля --shard-timings (по-умолчанию: {BALANCE_HASH})',
+        },
+    ),
+    (
+        ('--shard-timings',),
+        {
+            'dest': 'shard_timings',
+            'metavar': '<profile path>',
+            'type': Path,
+            'default': None,
+            'help': 'Путь до профиля предыдущего запуска (--profile-output) '
+            'для разделения файлов по длительности обработки',
+        },
+    ),
+    (
+        ('--batch',),
+        {
+            'dest': 'batch',
+            'action': 'store_true',
+            'help': 'Обрабатывать файлы пакетами: один запуск утилиты на '
+            'группу файлов вместо запуска для каждого файла',
+        },
+    ),
+    (
+        ('--batch-size',),
+        {
+            'dest': 'batch_size',
+            'metavar': '<количество файлов>',
+            'type': int,
+            'default': 0,
+            'help': 'Максимальное количество файлов в пакете '
+            '(по-умолчанию: 0 - ограничено только длиной командной строки)',
+        },
+    ),
+    (
+        ('-j', '--jobs'),
+        {
+            'dest': 'jobs',
+            'metavar': '<количество заданий>',
+            'type': int,
+            'default': DEFAULT_JOBS,
+            'help': 'Количество параллельно обрабатываемых заданий '
+            f'(по-умолчанию: количество процессоров - {DEFAULT_JOBS})',
+        },
+    ),
+    (
+        ('--timeout',),
+        {
+            'dest': 'timeout',
+            'metavar': '<секунд>',
+            'type': float,
+            'default': 0,
+            'help': 'Ограничение времени одного запуска утилиты: утилита '
+            'завершается вместе с порождёнными процессами, а файл '
+            'считается необработанным (по-умолчанию: 0 - без '
+            'ограничения)',
+        },
+    ),
+    (
+        ('--tool-timeout',),
+        {
+            'dest': 'tool_timeout',
+            'metavar': '<утилита>=<секунд>',
+            'action': 'append',
+            'default': None,
+            'help': 'Ограничение времени запуска указанной утилиты вместо '
+            '--timeout (0 - без ограничения), например: mypy=300',
+        },
+    ),
+    (
+        ('--max-output-lines',),
+        {
+            'dest': 'max_output_lines',
+            'metavar': '<количество строк>',
+            'type': int,
+            'default': 0,
+            'help': 'Читать вывод утилит построчно и хранить только '
+            'указанное количество последних строк для каждого файла '
+            '(по-умолчанию: 0 - весь вывод)',
+        },
+    ),
+    (
+        ('--no-cache',),
+        {
+            'dest': 'cache',
+            'action': 'store_false',
+            'help': 'Не использовать кэш на диске (результаты проверки '
+            'файлов и сведения об утилитах)',
+        },
+    ),
+    (
+        ('--cache-dir',),
+        {
+            'dest': 'cache_dir',
+            'type': Path,
+            'default': DEFAULT_CACHE_PATH,
+            'help': 'Путь до директории кэша '
+            f'(по-умолчанию: {DEFAULT_CACHE_PATH})',
+        },
+    ),
+    (
+        ('--cache-size',),
+        {
+            'dest': 'cache_size',
+            'metavar': '<мегабайт>',
+            'type': int,
+            'default': DEFAULT_CACHE_SIZE,
+            'help': 'Максимальный размер кэша результатов в мегабайтах '
+            f'(по-умолчанию: {DEFAULT_CACHE_SIZE})',
+        },
+    ),
+    (
+        ('--resident',),
+        {
+            'dest': 'resident',
+            'action': 'store_true',
+            'help': 'Использовать резидентные серверы утилит (eslint_d, '
+            'dmypy, blackd), если они установлены',
+        },
+    ),
+    (
+        ('--in-process',),
+        {
+            'dest': 'in_process',
+            'action': 'store_true',
+            'help': 'Выполнять Python утилиты (flake8, autopep8, autoflake, '
+            'black) в пуле процессов приложения, если они установлены в '
+            'его окружении',
+        },
+    ),
+    (
+        ('--daemon',),
+        {
+            'dest': 'daemon',
+            'action': 'store_true',
+            'help': 'Запустить демон, обрабатывающий запросы клиента '
+            '(python -m codestyle.client) без повторного запуска '
+            'приложения',
+        },
+    ),
+    (
+        ('--socket',),
+        {
+            'dest': 'socket',
+            'type': Path,
+            'default': DEFAULT_SOCKET_PATH,
+            'help': 'Путь до Unix сокета демона (по-умолчанию: значение '
+            f'переменной окружения {SOCKET_PATH_VARIABLE} или '
+            f'{DEFAULT_SOCKET_PATH})',
+        },
+    ),
     (
         ('--phpcs-encoding',),
         {
@@ -188,3 +520,45 @@ PARAMETERS: tuple = (
         {'action': 'version', 'version': application_version},
     ),
 )
+
+MERGE_RESULTS_PARAMETERS: tuple = (
+    (
+        ('report',),
+        {
+            'metavar': '<report path>',
+            'type': Path,
+            'nargs': '+',
+            'help': 'Путь до отчёта сегмента в формате json или jsonl',
+        },
+    ),
+    (
+        ('--format',),
+        {
+            'dest': 'format',
+            'choices': tuple(REPORTERS),
+            'default': None,
+            'help': 'Формат объединённого отчёта (по-умолчанию: отчёт не '
+            'записывается, выводятся только итоги)',
+        },
+    ),
+    (
+        ('--output',),
+        {
+            'dest': 'output',
+            'metavar': '<report path>',
+            'type': Path,
+            'default': None,
+            'help': 'Путь до файла объединённого отчёта (с параметром '
+            '--format; по-умолчанию: стандартный вывод)',
+        },
+    ),
+    (
+        ('-q', '--quiet'),
+        {
+            'dest': 'quiet',
+            'action': 'store_true',
+            'help': 'Включить тихий режим работы приложения '
+            '(показывать только ошибки)',
+        },
+    ),
+)
@@ -1,13 +1,15 @@
 """Парсинг параметров из командной строки и конфигурационного файла."""
 from os import linesep
 from pathlib import Path
-from typing import Tuple
+from typing import Dict, FrozenSet, Optional, Sequence, Tuple
 
 from configargparse import ArgumentParser, Namespace, DefaultConfigFileParser
 
 from codestyle import (__name__ as application_name,
                        __description__ as application_description)
-from codestyle.parameters import PARAMETERS
+from codestyle.parameters import (MERGE_RESULTS_COMMAND,
+                                  MERGE_RESULTS_PARAMETERS, PARAMETERS)
+from codestyle.sharding import BALANCE_TIMING, parse_shard
 
 
 class ParametersStorage(Namespace):
@@ -37,6 +39,80 @@ class ParametersStorage(Namespace):
             return 'WARNING'
         return 'INFO'
 
+    @property
+    def logging_stream(self) -> str:
+        """
+        Поток вывода сообщений приложения.
+
+        Если машиночитаемый отчёт (format) выводится в стандартный
+        вывод - сообщения пишутся в поток ошибок, чтобы не нарушать
+        формат отчёта.
+        """
+        has_report = getattr(self, 'format', None) is not None
+        if has_report and getattr(self, 'output', None) is None:
+            return 'ext://sys.stderr'
+        return 'ext://sys.stdout'
+
+    @property
+    def tool_timeouts(self) -> Dict[str, Optional[float]]:
+        """
+        Ограничения времени запуска утилит по их названиям.
+
+        Ограничения указываются параметром tool_timeout в формате
+        <утилита>=<секунд>; 0 - без ограничения (None).
+
+        :raises ValueError: Если ограничение указано в неверном формате.
+        """
+        timeouts = {}
+        for value in getattr(self, 'tool_timeout', None) or ():
+            tool_name, separator, seconds = value.partition('=')
+            if not tool_name.strip() or not separator:
+                raise ValueError(f'ожидается <утилита>=<секунд>: {value}')
+            timeout = float(seconds)
+            if timeout < 0:
+                raise ValueError(f'отрицательное ограничение: {value}')
+            timeouts[tool_name.strip().lower()] = timeout or None
+        return timeouts
+
+    @property
+    def file_suffixes(self) -> Optional[FrozenSet[str]]:
+        """
+        Суффиксы обрабатываемых файлов (параметр file_suffix).
+
+        Суффикс без точки в начале дополняется ею; None - обрабатываются
+        файлы со всеми суффиксами.
+        """
+        suffixes = getattr(self, 'file_suffix', None)
+        if not suffixes:
+            return None
+        return frozenset(suffix if suffix.startswith('.') else f'.{suffix}'
+                         for suffix in suffixes)
+
+    @property
+    def only_tools(self) -> FrozenSet[str]:
+        """Названия утилит, которыми ограничена обработка файлов."""
+        return self.__get_tool_names('only_tool')
+
+    @property
+    def skip_tools(self) -> FrozenSet[str]:
+        """Названия утилит, исключённых из обработки файлов."""
+        return self.__get_tool_names('skip_tool')
+
+    @property
+    def shard_position(self) -> Optional[Tuple[int, int]]:
+        """
+        Номер сегмента и количество сегментов (параметр shard).
+
+        :raises ValueError: Если сегмент указан в неверном формате.
+        """
+        shard = getattr(self, 'shard', None)
+        return parse_shard(shard) if shard else None
+
+    def __get_tool_names(self, name: str) -> FrozenSet[str]:
+        """Названия утилит из параметра (в нижнем начертании)."""
+        return frozenset(tool_name.strip().lower()
+                         for tool_name in getattr(self, name, None) or ())
+
 
 class ArgumentationTool:
     """
@@ -51,20 +127,116 @@ class ArgumentationTool:
     DEFAULT_CONFIG_FILES: Tuple[str, ...] = (str(USER_PARAMETERS_PATH),
                                              str(IN_CWD_PARAMETERS_PATH))
 
-    def __init__(self):
-        """Подготовка инструмента для работы с параметрами."""
+    def __init__(self, arguments: Optional[Sequence[str]] = None,
+                 working_directory: Optional[Path] = None):
+        """
+        Подготовка инструмента для работы с параметрами.
+
+        :param arguments: Аргументы командной строки (по-умолчанию:
+            аргументы запуска приложения).
+        :param working_directory: Директория, в которой ищется файл
+            параметров (по-умолчанию: текущая директория при запуске).
+        """
+        default_config_files = self.DEFAULT_CONFIG_FILES
+        if working_directory is not None:
+            default_config_files = (
+                str(self.USER_PARAMETERS_PATH),
+                str(Path(working_directory).absolute()
+                    / self.PARAMETERS_FILE_NAME))
+
         self.__argument_parser = ArgumentParser(
             add_env_var_help=False,
             config_file_parser_class=DefaultConfigFileParser,
-            default_config_files=self.DEFAULT_CONFIG_FILES,
+            default_config_files=default_config_files,
             prog=application_name,
             description=application_description)
 
         self.__define_parameters()
         self.parameters_storage, _ = self.__argument_parser.parse_known_args(
-            namespace=ParametersStorage())
+            args=arguments, namespace=ParametersStorage())
+        self.__check_targets()
+        self.__check_report()
+        self.__check_timeouts()
+        self.__check_shard()
+
+    def __check_targets(self):
+        """
+        Проверка наличия путей для обработки.
+
+        Пути не требуются только для запуска демона.
+        """
+        if getattr(self.parameters_storage, 'daemon', False):
+            return
+        if not getattr(self.parameters_storage, 'target', True):
+            self.__argument_parser.error(
+                'необходимо указать путь до проверяемых файлов или '
+                'директорий (target)')
+
+    def __check_report(self):
+        """
+        Проверка совместимости параметров вывода.
+
+        Изменения файлов (diff) и отчёт не могут одновременно
+        выводиться в стандартный вывод.
+        """
+        if (getattr(self.parameters_storage, 'diff', False)
+                and getattr(self.parameters_storage, 'format', None)
+                and not getattr(self.parameters_storage, 'output', None)):
+            self.__argument_parser.error(
+                'для вывода отчёта вместе с изменениями файлов (--diff) '
+                'необходимо указать файл отчёта (--output)')
+
+    def __check_timeouts(self):
+        """Проверка ограничений времени запуска отдельных утилит."""
+        try:
+            getattr(self.parameters_storage, 'tool_timeouts', None)
+        except ValueError as error:
+            self.__argument_parser.error(
+                f'неверное ограничение времени утилиты (--tool-timeout), '
+                f'{error}')
+
+    def __check_shard(self):
+        """Проверка сегмента и способа разделения файлов."""
+        try:
+            getattr(self.parameters_storage, 'shard_position', None)
+        except ValueError as error:
+            self.__argument_parser.error(
+                f'неверный сегмент (--shard), {error}')
+        if (getattr(self.parameters_storage, 'shard_balance', None)
+                == BALANCE_TIMING
+                and not getattr(self.parameters_storage, 'shard_timings',
+                                None)):
+            self.__argument_parser.error(
+                'для разделения файлов по длительности обработки '
+                'необходимо указать профиль (--shard-timings)')
 
     def __define_parameters(self):
         """Добавление параметров."""
         for arguments, options in PARAMETERS:
             self.__argument_parser.add_argument(*arguments, **options)
+
+
+class MergeResultsArgumentationTool:
+    """
+    Инструмент для разбора аргументов команды merge-results.
+
+    Набор аргументов описан в модуле parameters
+    (MERGE_RESULTS_PARAMETERS); файлы параметров не используются.
+    """
+
+    def __init__(self, arguments: Optional[Sequence[str]] = None):
+        """
+        Разбор аргументов команды.
+
+        :param arguments: Аргументы командной строки после названия
+            команды.
+        """
+        self.__argument_parser = ArgumentParser(
+            prog=f'{application_name} {MERGE_RESULTS_COMMAND}',
+            description='Объединение отчётов сегментов (--shard) в один '
+            'отчёт со статусом завершения всей обработки')
+        for parameter_arguments, options in MERGE_RESULTS_PARAMETERS:
+            self.__argument_parser.add_argument(*parameter_arguments,
+                                                **options)
+        self.parameters_storage = self.__argument_parser.parse_args(
+            args=arguments, namespace=ParametersStorage())
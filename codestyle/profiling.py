@@ -0,0 +1,201 @@
+"""
+Профиль обработки файлов.
+
+Для каждого запуска утилиты сохраняются длительность, процессорное время
+и пиковая память процесса утилиты (см. system_wrappers.run_measured).
+По окончании обработки выводятся итоги по утилитам с процентилями
+длительности и самые долгие пары файл - утилита; измерения могут быть
+сохранены в формате JSON для дальнейшего анализа.
+"""
+import json
+from collections import defaultdict
+from math import ceil
+from pathlib import Path
+from time import monotonic
+from typing import Dict, List, Optional, Sequence
+
+from codestyle.cache import MEGABYTE
+from codestyle.tool_wrappers import Result
+
+# Процентили длительности запусков утилиты в итогах.
+PERCENTILES = (50, 90, 99)
+# Количество самых долгих запусков в итогах по-умолчанию.
+DEFAULT_SLOWEST_COUNT = 10
+
+
+class Timing:
+    """Измерения запуска утилиты для файла."""
+
+    __slots__ = ('file', 'tool', 'duration', 'cpu_time', 'max_rss',
+                 'is_cached')
+
+    def __init__(self, file: str, tool: str, duration: float,
+                 cpu_time: Optional[float], max_rss: Optional[int],
+                 is_cached: bool):
+        """
+        Создание измерений.
+
+        :param file: Путь до файла.
+        :param tool: Название утилиты.
+        :param duration: Длительность обработки в секундах.
+        :param cpu_time: Процессорное время в секундах (None - не
+            измерялось).
+        :param max_rss: Пиковая память в байтах (None - не измерялась).
+        :param is_cached: Результат получен из кэша (не измерялся).
+        """
+        self.file = file
+        self.tool = tool
+        self.duration = duration
+        self.cpu_time = cpu_time
+        self.max_rss = max_rss
+        self.is_cached = is_cached
+
+    def to_dict(self) -> Dict:
+        """Измерения в виде словаря (для JSON)."""
+        return {'file': self.file, 'tool': self.tool,
+                'duration': round(self.duration, 6),
+                'cpu_time': (None if self.cpu_time is None
+                             else round(self.cpu_time, 6)),
+                'max_rss': self.max_rss, 'cached': self.is_cached}
+
+
+def get_percentile(values: Sequence[float], percentile: float) -> float:
+    """
+    Процентиль значений (методом ближайшего ранга).
+
+    :param values: Отсортированные по возрастанию значения.
+    :param percentile: Процентиль (от 0 до 100).
+    :return: Значение процентиля; 0 - для пустого набора.
+    """
+    if not values:
+        return 0.0
+    rank = max(ceil(percentile / 100 * len(values)), 1)
+    return values[rank - 1]
+
+
+class Profile:
+    """Профиль обработки файлов: измерения запусков утилит."""
+
+    def __init__(self):
+        """Создание профиля; общее время отсчитывается от создания."""
+        self.timings: List[Timing] = []
+        self.elapsed = 0.0
+        self.__start_time = monotonic()
+
+    def add(self, file_path: Path, tool_name: str,  # noqa: A003
+            result: Result):
+        """
+        Добавление измерений результата обработки файла.
+
+        :param file_path: Путь до файла.
+        :param tool_name: Название утилиты.
+        :param result: Результат обработки.
+        """
+        self.timings.append(Timing(str(file_path), tool_name,
+                                   result.duration, result.cpu_time,
+                                   result.max_rss, result.is_cached))
+
+    def finish(self):
+        """Фиксация общего времени обработки."""
+        self.elapsed = monotonic() - self.__start_time
+
+    def get_tool_totals(self) -> Dict[str, Dict]:
+        """
+        Итоги по утилитам (результаты из кэша учитываются отдельно).
+
+        :return: Итоги по названиям утилит: количество запусков и
+            результатов из кэша, суммарные длительность и процессорное
+            время, процентили длительности и наибольшая пиковая память.
+        """
+        tool_timings: Dict[str, List[Timing]] = defaultdict(list)
+        cached_counts: Dict[str, int] = defaultdict(int)
+        for timing in self.timings:
+            if timing.is_cached:
+                cached_counts[timing.tool] += 1
+            else:
+                tool_timings[timing.tool].append(timing)
+
+        totals = {}
+        for tool in sorted({timing.tool for timing in self.timings}):
+            timings = tool_timings[tool]
+            durations = sorted(timing.duration for timing in timings)
+            cpu_times = [timing.cpu_time for timing in timings
+                         if timing.cpu_time is not None]
+            max_rss = [timing.max_rss for timing in timings
+                       if timing.max_rss is not None]
+            totals[tool] = {
+                'count': len(timings),
+                'cached': cached_counts[tool],
+                'duration': round(sum(durations), 6),
+                'cpu_time': round(sum(cpu_times), 6) if cpu_times else None,
+                'percentiles': {
+                    f'p{percentile}': round(
+                        get_percentile(durations, percentile), 6)
+                    for percentile in PERCENTILES},
+                'max_rss': max(max_rss) if max_rss else None,
+            }
+        return totals
+
+    def get_slowest(self, count: int) -> List[Timing]:
+        """Самые долгие запуски утилит (по убыванию длительности)."""
+        timings = [timing for timing in self.timings if not timing.is_cached]
+        return sorted(timings, key=lambda timing: timing.duration,
+                      reverse=True)[:count]
+
+    def get_report(self, slowest_count: int = DEFAULT_SLOWEST_COUNT) -> str:
+        """
+        Текстовые итоги профиля.
+
+        :param slowest_count: Количество самых долгих запусков.
+        :return: Таблица итогов по утилитам и самые долгие запуски.
+        """
+        percentile_names = [f'p{percentile}' for percentile in PERCENTILES]
+        rows = [('утилита', 'запусков', 'из кэша', 'время, с', 'CPU, с',
+                 *(f'{name}, с' for name in percentile_names),
+                 'память, МБ')]
+        for tool, totals in self.get_tool_totals().items():
+            rows.append((
+                tool, str(totals['count']), str(totals['cached']),
+                f'{totals["duration"]:.3f}',
+                self.__format_value(totals['cpu_time'], '{:.3f}'),
+                *(f'{totals["percentiles"][name]:.3f}'
+                  for name in percentile_names),
+                self.__format_value(totals['max_rss'], '{:.1f}',
+                                    MEGABYTE)))
+        widths = [max(len(row[column]) for row in rows)
+                  for column in range(len(rows[0]))]
+
+        lines = [f'Профиль обработки (общее время: {self.elapsed:.3f} с):']
+        lines.extend('  '.join([row[0].ljust(widths[0]), *(
+            value.rjust(width) for value, width in zip(row[1:], widths[1:])),
+        ]).rstrip() for row in rows)
+        slowest = self.get_slowest(slowest_count)
+        if slowest:
+            lines.append(f'Самые долгие запуски ({len(slowest)}):')
+            lines.extend(f'{timing.duration:10.3f} с  {timing.tool}  '
+                         f'{timing.file}' for timing in slowest)
+        return '\n'.join(lines)
+
+    @staticmethod
+    def __format_value(value: Optional[float], template: str,
+                       unit: int = 1) -> str:
+        """Форматирование измерения ('-' - не измерялось)."""
+        return '-' if value is None else template.format(value / unit)
+
+    def to_dict(self) -> Dict:
+        """Измерения и итоги профиля в виде словаря (для JSON)."""
+        return {'elapsed': round(self.elapsed, 6),
+                'tools': self.get_tool_totals(),
+                'timings': [timing.to_dict() for timing in self.timings]}
+
+    def save(self, path: Path):
+        """
+        Запись измерений и итогов профиля в файл в формате JSON.
+
+        :param path: Путь до файла.
+        :raises OSError: Если файл не удалось записать.
+        """
+        with open(path, 'w', encoding='utf-8') as profile_file:
+            json.dump(self.to_dict(), profile_file, ensure_ascii=False,
+                      indent=2)
+            profile_file.write('\n')
@@ -0,0 +1,369 @@
+"""
+Машиночитаемые отчёты о результатах обработки файлов.
+
+Отчёт записывается по мере получения результатов (без накопления в
+памяти): каждый результат обработки файла утилитой превращается в
+запись с названием утилиты, путём до файла, статусом завершения,
+длительностью и найденными в выводе замечаниями.
+"""
+import json
+import re
+import sys
+from logging import getLogger
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, TextIO, Tuple, Type
+# Экранирование без разбора XML: уязвимостям разбора не подвержено.
+from xml.sax.saxutils import escape, quoteattr  # noqa: S406
+
+from codestyle import __name__ as application_name, __version__
+from codestyle.diagnostics import ERROR, INFO, WARNING
+from codestyle.system_wrappers import ExitCodes
+from codestyle.tool_wrappers import ConsoleTool, Result
+
+SARIF_SCHEMA = ('https://schemastore.azurewebsites.net/schemas/json/'
+                'sarif-2.1.0.json')
+# Уровни результатов SARIF для уровней важности замечаний.
+SARIF_LEVELS = {ERROR: 'error', WARNING: 'warning', INFO: 'note'}
+# Символы, недопустимые в документе XML 1.0 (в том числе после экранирования).
+XML_ILLEGAL_CHARACTERS = re.compile(
+    '[^\t\n\r\x20-\ud7ff\ue000-\ufffd\U00010000-\U0010ffff]')
+
+_logger = getLogger(__name__)
+
+
+def create_record(file_path: Path, tool: ConsoleTool,
+                  result: Result) -> Dict:
+    """
+    Запись отчёта о результате обработки файла утилитой.
+
+    :param file_path: Путь до файла.
+    :param tool: Инструмент обработки.
+    :param result: Результат обработки.
+    :return: Запись отчёта.
+    """
+    return {
+        'tool': tool.get_name(),
+        'file': str(file_path),
+        'return_code': result.return_code,
+        'success': result.is_success,
+        'timed_out': result.is_timed_out,
+        'duration': round(result.duration, 6),
+        'output': result.output,
+        'error': result.error,
+        'diagnostics': [{
+            'line': diagnostic.line,
+            'column': diagnostic.col,
+            'code': diagnostic.code,
+            'severity': diagnostic.severity,
+            'message': diagnostic.message,
+        } for diagnostic in tool.get_diagnostics(file_path, result)],
+    }
+
+
+class Reporter:
+    """
+    Отчёт, записываемый в поток (наследуется для конкретных форматов).
+
+    Записи передаются методу add по мере обработки файлов; finish
+    завершает документ отчёта и закрывает файл отчёта.
+    """
+
+    def __init__(self, output_path: Optional[Path] = None):
+        """
+        Создание отчёта и запись его начала.
+
+        :param output_path: Путь до файла отчёта; None - стандартный
+            вывод.
+        """
+        self.output_path = output_path
+        self.stream: TextIO = (sys.stdout if output_path is None else open(
+            output_path, 'w', encoding='utf-8'))
+        self.records_count = 0
+        self._start()
+
+    def add(self, record: Dict):  # noqa: A003
+        """
+        Запись результата обработки файла.
+
+        :param record: Запись отчёта (см. create_record).
+        """
+        self._add(record)
+        self.records_count += 1
+        self.stream.flush()
+
+    def finish(self, summary: Optional[Dict]):
+        """
+        Завершение отчёта.
+
+        :param summary: Итоги обработки; None - обработка прервана.
+        """
+        try:
+            self._finish(summary)
+            self.stream.flush()
+        finally:
+            if self.output_path is not None:
+                self.stream.close()
+
+    def _start(self):
+        """Запись начала документа отчёта."""
+
+    def _add(self, record: Dict):
+        """Запись результата в формате отчёта."""
+        raise NotImplementedError
+
+    def _finish(self, summary: Optional[Dict]):
+        """Запись окончания документа отчёта."""
+
+
+class JsonLinesReporter(Reporter):
+    """Отчёт JSON Lines: запись в каждой строке, итоги - в последней."""
+
+    def _add(self, record: Dict):
+        self.__write_line({'type': 'result', **record})
+
+    def _finish(self, summary: Optional[Dict]):
+        if summary is not None:
+            self.__write_line({'type': 'summary', **summary})
+
+    def __write_line(self, data: Dict):
+        """Запись объекта JSON в отдельной строке."""
+        self.stream.write(json.dumps(data, ensure_ascii=False))
+        self.stream.write('\n')
+
+
+class JsonReporter(Reporter):
+    """Отчёт JSON: объект с массивом записей results и итогами summary."""
+
+    def _start(self):
+        self.stream.write('{"results": [')
+
+    def _add(self, record: Dict):
+        if self.records_count:
+            self.stream.write(', ')
+        self.stream.write(json.dumps(record, ensure_ascii=False))
+
+    def _finish(self, summary: Optional[Dict]):
+        self.stream.write('], "summary": ')
+        self.stream.write(json.dumps(summary, ensure_ascii=False))
+        self.stream.write('}\n')
+
+
+class SarifReporter(Reporter):
+    """
+    Отчёт SARIF 2.1.0 с одним запуском приложения.
+
+    Каждое замечание записывается отдельным результатом (код правила
+    утилиты - ruleId); неуспешная обработка без замечаний - результатом
+    с выводом утилиты. Название утилиты указывается в свойствах
+    результата.
+
+    .. seealso:: https://docs.oasis-open.org/sarif/sarif/v2.1.0/
+    """
+
+    def __init__(self, output_path: Optional[Path] = None):
+        """
+        Создание отчёта и запись его начала.
+
+        :param output_path: Путь до файла отчёта; None - стандартный
+            вывод.
+        """
+        self.__has_results = False
+        super().__init__(output_path)
+
+    def _start(self):
+        header = json.dumps({
+            '$schema': SARIF_SCHEMA,
+            'version': '2.1.0',
+        }, ensure_ascii=False)
+        driver = json.dumps({'driver': {
+            'name': application_name,
+            'version': __version__,
+        }}, ensure_ascii=False)
+        self.stream.write(f'{header[:-1]}, "runs": [{{"tool": {driver}, '
+                          '"results": [')
+
+    def _add(self, record: Dict):
+        for sarif_result in self.__get_results(record):
+            if self.__has_results:
+                self.stream.write(', ')
+            self.stream.write(json.dumps(sarif_result, ensure_ascii=False))
+            self.__has_results = True
+
+    def _finish(self, summary: Optional[Dict]):
+        invocation = {'executionSuccessful': summary is not None}
+        if summary is not None:
+            invocation['exitCode'] = summary['status']
+        self.stream.write('], "invocations": ')
+        self.stream.write(json.dumps([invocation], ensure_ascii=False))
+        self.stream.write('}]}\n')
+
+    @staticmethod
+    def __get_results(record: Dict) -> List[Dict]:
+        """Результаты SARIF для записи отчёта."""
+        artifact = {'artifactLocation': {'uri': Path(
+            record['file']).as_posix()}}
+        results = []
+        for diagnostic in record['diagnostics']:
+            location = dict(artifact)
+            if diagnostic['line'] > 0:
+                location['region'] = {'startLine': diagnostic['line']}
+                if diagnostic['column']:
+                    location['region']['startColumn'] = diagnostic['column']
+            sarif_result = {
+                'level': SARIF_LEVELS[diagnostic['severity']],
+                'message': {'text': diagnostic['message']},
+                'locations': [{'physicalLocation': location}],
+                'properties': {'tool': record['tool']},
+            }
+            if diagnostic['code']:
+                sarif_result['ruleId'] = diagnostic['code']
+            results.append(sarif_result)
+
+        if not results and not record['success']:
+            message = record['output'] or record['error'] or (
+                f'Статус завершения: {record["return_code"]}')
+            results.append({
+                'level': 'error',
+                'message': {'text': message},
+                'locations': [{'physicalLocation': artifact}],
+                'properties': {'tool': record['tool']},
+            })
+        return results
+
+
+class JUnitReporter(Reporter):
+    """
+    Отчёт JUnit XML: тест для каждой пары файл - утилита.
+
+    Неуспешная обработка записывается как failure, превышение времени
+    работы утилиты - как error (тест не был выполнен до конца).
+
+    Количество тестов и ошибок не указывается в атрибутах testsuite,
+    так как они записываются до результатов; системы CI вычисляют их по
+    элементам testcase.
+    """
+
+    def _start(self):
+        self.stream.write('<?xml version="1.0" encoding="utf-8"?>\n')
+        self.stream.write(
+            f'<testsuite name={quoteattr(application_name)}>\n')
+
+    def _add(self, record: Dict):
+        attributes = (f'classname={self.__quote(record["tool"])} '
+                      f'name={self.__quote(record["file"])} '
+                      f'time="{record["duration"]:.3f}"')
+        if record['success']:
+            self.stream.write(f'  <testcase {attributes}/>\n')
+            return
+
+        message = f'Статус завершения: {record["return_code"]}'
+        element = 'failure'
+        if record['timed_out']:
+            message, element = 'Превышено время работы утилиты', 'error'
+        text = XML_ILLEGAL_CHARACTERS.sub('', record['output']
+                                          or record['error'])
+        self.stream.write(
+            f'  <testcase {attributes}>\n'
+            f'    <{element} message={quoteattr(message)}>{escape(text)}'
+            f'</{element}>\n'
+            '  </testcase>\n')
+
+    @staticmethod
+    def __quote(value: str) -> str:
+        """Значение атрибута без недопустимых в XML 1.0 символов."""
+        return quoteattr(XML_ILLEGAL_CHARACTERS.sub('', value))
+
+    def _finish(self, summary: Optional[Dict]):
+        self.stream.write('</testsuite>\n')
+
+
+# Форматы отчётов и соответствующие классы.
+REPORTERS: Dict[str, Type[Reporter]] = {
+    'json': JsonReporter,
+    'jsonl': JsonLinesReporter,
+    'sarif': SarifReporter,
+    'junit': JUnitReporter,
+}
+
+
+def load_report(report_path: Path) -> Tuple[List[Dict], Optional[Dict]]:
+    """
+    Чтение записей и итогов отчёта в формате json или jsonl.
+
+    :param report_path: Путь до файла отчёта.
+    :return: Записи отчёта и итоги; None - обработка была прервана.
+    :raises OSError: Если файл не удалось прочитать.
+    :raises ValueError: Если отчёт в другом формате или повреждён.
+    """
+    with open(report_path, encoding='utf-8') as report_file:
+        content = report_file.read()
+    try:
+        report = json.loads(content)
+    except ValueError:
+        report = None
+    if isinstance(report, dict) and 'results' in report:
+        return report['results'], report['summary']
+
+    records, summary = [], None
+    for line in filter(str.strip, content.splitlines()):
+        data = json.loads(line)
+        record_type = data.pop('type', None) if isinstance(
+            data, dict) else None
+        if record_type == 'result':
+            records.append(data)
+        elif record_type == 'summary':
+            summary = data
+        else:
+            raise ValueError(f'{report_path} не является отчётом в формате '
+                             'json или jsonl')
+    return records, summary
+
+
+def merge_reports(report_paths: Iterable[Path],
+                  reporter: Optional[Reporter] = None) -> Dict:
+    """
+    Объединение отчётов сегментов обработки (--shard).
+
+    Записи отчётов передаются в общий отчёт по мере чтения; итоги
+    суммируются. Обработка считается неуспешной, если хотя бы один
+    сегмент завершился с ошибкой или был прерван (отчёт без итогов).
+
+    :param report_paths: Пути до отчётов сегментов.
+    :param reporter: Общий отчёт (без завершения); None - только итоги.
+    :return: Итоги обработки всех сегментов и количество прерванных
+        сегментов (interrupted).
+    :raises OSError: Если отчёт не удалось прочитать.
+    :raises ValueError: Если отчёт повреждён или сегменты обработаны
+        разными методами.
+    """
+    methods = set()
+    total_count = total_failed = total_changed = interrupted = 0
+    status = ExitCodes.SUCCESS
+    for report_path in report_paths:
+        records, summary = load_report(report_path)
+        for record in records:
+            if reporter is not None:
+                reporter.add(record)
+        if summary is None:
+            _logger.warning(f'Обработка сегмента {report_path} была '
+                            'прервана.')
+            interrupted += 1
+            total_count += len({record['file'] for record in records})
+            total_failed += len({record['file'] for record in records
+                                 if not record['success']})
+            status = ExitCodes.UNSUCCESSFUL
+            continue
+        methods.add(summary['method'])
+        total_count += summary['total_count']
+        total_failed += summary['total_failed']
+        total_changed += summary.get('total_changed', 0)
+        if summary['status'] != ExitCodes.SUCCESS:
+            status = ExitCodes.UNSUCCESSFUL
+
+    if len(methods) > 1:
+        raise ValueError('сегменты обработаны разными методами: '
+                         f'{", ".join(sorted(methods))}')
+    return {'method': methods.pop() if methods else 'check',
+            'status': status, 'total_count': total_count,
+            'total_failed': total_failed, 'total_changed': total_changed,
+            'interrupted': interrupted}
@@ -0,0 +1,545 @@
+"""
+Резидентные серверы утилит.
+
+Сервер запускается один раз за работу приложения (или используется уже
+запущенный) и обрабатывает файлы без холодного запуска утилиты; сервер,
+запущенный приложением, останавливается по завершении работы.
+Python утилиты вместо сервера могут выполняться в пуле процессов
+приложения (PythonEngine).
+"""
+import os
+import socket
+import sys
+import time
+import traceback
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from configparser import ConfigParser, Error as ConfigError
+from contextlib import redirect_stderr, redirect_stdout
+from importlib import import_module
+from importlib.util import find_spec
+from io import BytesIO, TextIOWrapper
+from logging import getLogger
+from multiprocessing import get_all_start_methods, get_context
+from pathlib import Path
+from subprocess import (DEVNULL, PIPE, CompletedProcess,  # noqa: S404
+                        Popen, run)
+from threading import Lock
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+
+from codestyle.system_wrappers import write_file_atomically
+
+_logger = getLogger(__name__)
+
+# Статус завершения black при ошибке форматирования.
+BLACK_ERROR_STATUS = 123
+
+
+class ResidentBackend(ABC):
+    """
+    Резидентный сервер утилиты (базовый класс конкретных серверов).
+
+    Сервер получает команду запуска утилиты (без путей до файлов) и
+    возвращает результат в виде завершённого процесса, как при запуске
+    утилиты из командной строки.
+    """
+
+    # Название исполняемого файла сервера.
+    executable_name: str = ''
+
+    @classmethod
+    def locate(cls, which: Callable[[str], Optional[str]]) -> Optional[str]:
+        """
+        Поиск исполняемого файла сервера.
+
+        :param which: Функция поиска исполняемого файла по названию.
+        :return: Путь или None, если сервер не установлен.
+        """
+        return which(cls.executable_name)
+
+    def __init__(self, executable: str, state_directory: Optional[Path]):
+        """
+        Создание сервера (без запуска).
+
+        :param executable: Путь до исполняемого файла сервера.
+        :param state_directory: Директория для файлов состояния сервера;
+            None - используется расположение по-умолчанию.
+        """
+        self.executable = executable
+        self.state_directory = state_directory
+        self.is_owned = False
+        self.__is_started: Optional[bool] = None
+        self.__lock = Lock()
+
+    def ensure_started(self, command: Sequence[str]) -> bool:
+        """
+        Запуск сервера при первом обращении.
+
+        :param command: Команда запуска утилиты.
+        :return: Сервер доступен; иначе утилита запускается без сервера.
+        """
+        with self.__lock:
+            if self.__is_started is None:
+                try:
+                    self.__is_started = self._start(command)
+                except OSError as error:
+                    _logger.debug(str(error))
+                    self.__is_started = False
+                if not self.__is_started:
+                    _logger.warning(
+                        f'Не удалось запустить {self.executable_name}, '
+                        'утилита будет запускаться без сервера.')
+            return self.__is_started
+
+    def stop(self):
+        """Остановка сервера, если он был запущен приложением."""
+        with self.__lock:
+            if self.__is_started and self.is_owned:
+                try:
+                    self._stop()
+                except OSError as error:
+                    _logger.debug(str(error))
+            self.__is_started = None
+            self.is_owned = False
+
+    @abstractmethod
+    def run(self, command: Sequence[str], file_paths: Sequence[str],
+            input_data: Optional[bytes] = None) -> CompletedProcess:
+        """
+        Обработка файлов сервером.
+
+        :param command: Команда запуска утилиты без путей до файлов.
+        :param file_paths: Пути до обрабатываемых файлов.
+        :param input_data: Данные стандартного ввода утилиты.
+        :return: Результат в виде завершённого процесса утилиты.
+        """
+
+    @abstractmethod
+    def _start(self, command: Sequence[str]) -> bool:
+        """Запуск сервера или подключение к запущенному."""
+
+    @abstractmethod
+    def _stop(self):
+        """Остановка сервера."""
+
+
+class EslintD(ResidentBackend):
+    """
+    Сервер ESLint, принимающий аргументы командной строки eslint.
+
+    .. seealso:: https://github.com/mantoni/eslint_d.js
+    """
+
+    executable_name = 'eslint_d'
+
+    def run(self, command: Sequence[str], file_paths: Sequence[str],
+            input_data: Optional[bytes] = None) -> CompletedProcess:
+        """Обработка файлов eslint_d с аргументами команды eslint."""
+        return run(  # noqa: S603
+            [self.executable, *command[1:], *file_paths], input=input_data,
+            stdout=PIPE, stderr=PIPE)
+
+    def _start(self, command: Sequence[str]) -> bool:
+        """Запуск eslint_d, если он ещё не запущен."""
+        status = run((self.executable, 'status'),  # noqa: S603
+                     stdout=PIPE, stderr=DEVNULL)
+        if status.stdout.decode().strip().startswith('Running'):
+            return True
+
+        self.is_owned = True
+        return run((self.executable, 'start'),  # noqa: S603
+                   stdout=DEVNULL, stderr=DEVNULL).returncode == 0
+
+    def _stop(self):
+        run((self.executable, 'stop'),  # noqa: S603
+            stdout=DEVNULL, stderr=DEVNULL)
+
+
+class DMypy(ResidentBackend):
+    """
+    Сервер mypy с инкрементальной проверкой файлов.
+
+    Сервер перезапускается самим dmypy при изменении параметров mypy.
+
+    .. seealso:: https://mypy.readthedocs.io/en/stable/mypy_daemon.html
+    """
+
+    executable_name = 'dmypy'
+    STATUS_FILE_NAME = 'dmypy.json'
+
+    def run(self, command: Sequence[str], file_paths: Sequence[str],
+            input_data: Optional[bytes] = None) -> CompletedProcess:
+        """Проверка файлов командой dmypy run с параметрами mypy."""
+        return run(  # noqa: S603
+            [*self.__get_command('run'), '--', *command[1:], *file_paths],
+            input=input_data, stdout=PIPE, stderr=PIPE)
+
+    def _start(self, command: Sequence[str]) -> bool:
+        """Запуск dmypy с параметрами mypy, если он ещё не запущен."""
+        status = run(self.__get_command('status'),  # noqa: S603
+                     stdout=DEVNULL, stderr=DEVNULL)
+        if status.returncode == 0:
+            return True
+
+        self.is_owned = True
+        return run(  # noqa: S603
+            [*self.__get_command('start'), '--', *command[1:]],
+            stdout=DEVNULL, stderr=DEVNULL).returncode == 0
+
+    def _stop(self):
+        run(self.__get_command('stop'),  # noqa: S603
+            stdout=DEVNULL, stderr=DEVNULL)
+
+    def __get_command(self, action: str) -> List[str]:
+        """Команда dmypy с файлом состояния в директории приложения."""
+        if self.state_directory is None:
+            return [self.executable, action]
+
+        Path(self.state_directory).mkdir(parents=True, exist_ok=True)
+        status_path = Path(self.state_directory) / self.STATUS_FILE_NAME
+        return [self.executable, '--status-file', str(status_path), action]
+
+
+class BlackD(ResidentBackend):
+    """
+    HTTP сервер black, форматирующий переданный исходный код.
+
+    Параметры форматирования передаются заголовками запроса; из файла
+    конфигурации black учитываются длина строки и нормализация строк.
+
+    .. seealso:: https://black.readthedocs.io/en/stable/
+    """
+
+    executable_name = 'blackd'
+    HOST = '127.0.0.1'
+    # Время ожидания запуска сервера и ответа на запрос (в секундах).
+    START_TIMEOUT = 10
+    REQUEST_TIMEOUT = 60
+    # Параметры конфигурации black и соответствующие заголовки запроса.
+    CONFIGURATION_HEADERS = {
+        'line-length': 'X-Line-Length',
+        'line_length': 'X-Line-Length',
+        'skip-string-normalization': 'X-Skip-String-Normalization',
+        'skip_string_normalization': 'X-Skip-String-Normalization',
+    }
+
+    def __init__(self, executable: str, state_directory: Optional[Path]):
+        """
+        Создание сервера (без запуска).
+
+        :param executable: Путь до исполняемого файла blackd.
+        :param state_directory: Не используется - у сервера нет файлов
+            состояния.
+        """
+        super().__init__(executable, state_directory)
+        self.__process: Optional[Popen] = None
+        self.__url = ''
+
+    def run(self, command: Sequence[str], file_paths: Sequence[str],
+            input_data: Optional[bytes] = None) -> CompletedProcess:
+        """Форматирование файлов или кода из стандартного ввода."""
+        headers = self.__get_headers(command)
+        errors = []
+        return_code = 0
+        stdout = b''
+        for file_path in file_paths:
+            if input_data is None:
+                is_reformatted, error = self.__format_file(file_path,
+                                                           headers)
+            else:
+                stdout, error = self.__format_source(input_data, headers)
+                is_reformatted = stdout != input_data
+            if error is not None:
+                return_code = BLACK_ERROR_STATUS
+                errors.append(f'error: cannot format {file_path}: {error}')
+            elif is_reformatted:
+                errors.append(f'reformatted {file_path}')
+        return CompletedProcess([self.executable, *file_paths], return_code,
+                                stdout=stdout, stderr=os.linesep.join(
+                                    errors).encode())
+
+    def _start(self, command: Sequence[str]) -> bool:
+        """Запуск blackd на свободном порту и ожидание подключения."""
+        with socket.socket() as port_socket:
+            port_socket.bind((self.HOST, 0))
+            port = port_socket.getsockname()[1]
+
+        self.__process = Popen(  # noqa: S603
+            (self.executable, '--bind-host', self.HOST, '--bind-port',
+             str(port)), stdout=DEVNULL, stderr=DEVNULL)
+        self.is_owned = True
+        deadline = time.monotonic() + self.START_TIMEOUT
+        while time.monotonic() < deadline:
+            if self.__process.poll() is not None:
+                return False
+            try:
+                socket.create_connection((self.HOST, port), timeout=1).close()
+            except OSError:
+                time.sleep(0.05)
+                continue
+            self.__url = f'http://{self.HOST}:{port}'
+            return True
+
+        self._stop()
+        return False
+
+    def _stop(self):
+        if self.__process is not None:
+            self.__process.terminate()
+            self.__process.wait()
+            self.__process = None
+
+    def __format_file(self, file_path: str, headers: Dict[str, str]
+                      ) -> Tuple[bool, Optional[str]]:
+        """
+        Форматирование файла сервером.
+
+        :param file_path: Путь до файла.
+        :param headers: Заголовки запроса с параметрами форматирования.
+        :return: Файл изменён; текст ошибки или None, если файл обработан.
+        """
+        try:
+            source = Path(file_path).read_bytes()
+        except OSError as error:
+            return False, str(error)
+
+        formatted_source, error = self.__format_source(source, headers)
+        if error is not None or formatted_source == source:
+            return False, error
+        try:
+            write_file_atomically(Path(file_path), formatted_source)
+        except OSError as error:
+            return False, str(error)
+        return True, None
+
+    def __format_source(self, source: bytes, headers: Dict[str, str]
+                        ) -> Tuple[bytes, Optional[str]]:
+        """
+        Форматирование исходного кода сервером.
+
+        :param source: Исходный код.
+        :param headers: Заголовки запроса с параметрами форматирования.
+        :return: Отформатированный код; текст ошибки или None.
+        """
+        request = Request(self.__url, data=source, headers=headers,
+                          method='POST')
+        try:
+            with urlopen(request,  # noqa: S310
+                         timeout=self.REQUEST_TIMEOUT) as response:
+                status, formatted_source = response.status, response.read()
+        except HTTPError as error:
+            return source, error.read().decode(errors='replace').strip()
+        except (URLError, OSError) as error:
+            return source, str(error)
+        return formatted_source if status == 200 else source, None
+
+    def __get_headers(self, command: Sequence[str]) -> Dict[str, str]:
+        """Заголовки запроса по файлу конфигурации из команды black."""
+        headers = {'Content-Type': 'text/plain; charset=utf-8'}
+        if '--config' not in command[:-1]:
+            return headers
+
+        parser = ConfigParser()
+        try:
+            parser.read(command[command.index('--config') + 1],
+                        encoding='utf-8')
+        except ConfigError as error:
+            _logger.debug(str(error))
+            return headers
+
+        for section in parser.sections():
+            for key, value in parser.items(section):
+                header = self.CONFIGURATION_HEADERS.get(key)
+                value = value.strip().strip('"\'')
+                if header is not None and value.lower() not in ('', 'false'):
+                    headers[header] = value
+        return headers
+
+
+def _import_module(module_name: str):
+    """Импорт модуля утилиты в процессе пула (результат не передаётся)."""
+    import_module(module_name)
+
+
+def _run_entry_point(entry_point: Callable[[List[str]], Optional[int]],
+                     arguments: List[str], working_directory: str,
+                     input_data: Optional[bytes] = None
+                     ) -> Tuple[int, bytes, bytes]:
+    """
+    Запуск точки входа утилиты в процессе пула.
+
+    Потоки ввода и вывода подменяются так же, как при запуске утилиты из
+    командной строки с перенаправленными потоками.
+
+    :param entry_point: Функция, принимающая аргументы командной строки.
+    :param arguments: Аргументы командной строки без названия утилиты.
+    :param working_directory: Рабочая директория приложения.
+    :param input_data: Данные стандартного ввода утилиты.
+    :return: Статус завершения, стандартный вывод и вывод ошибок.
+    """
+    stdin = TextIOWrapper(BytesIO(input_data or b''), encoding='utf-8')
+    stdout = TextIOWrapper(BytesIO(), encoding='utf-8', write_through=True)
+    stderr = TextIOWrapper(BytesIO(), encoding='utf-8', write_through=True)
+    sys.stdin, original_stdin = stdin, sys.stdin
+    try:
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            try:
+                os.chdir(working_directory)
+                status = entry_point(arguments)
+            except SystemExit as error:
+                status = error.code
+            except Exception:  # noqa: B902
+                traceback.print_exc()
+                status = 1
+            if status is not None and not isinstance(status, int):
+                sys.stderr.write(f'{status}\n')
+                status = 1
+    finally:
+        sys.stdin = original_stdin
+    return status or 0, stdout.buffer.getvalue(), stderr.buffer.getvalue()
+
+
+def _run_flake8(arguments: List[str]) -> Optional[int]:
+    """Точка входа flake8."""
+    from flake8.main.cli import main
+    return main(arguments)
+
+
+def _run_autopep8(arguments: List[str]) -> Optional[int]:
+    """Точка входа autopep8."""
+    import autopep8
+    return autopep8.main(['autopep8', *arguments])
+
+
+def _run_autoflake(arguments: List[str]) -> Optional[int]:
+    """Точка входа autoflake (аргументы читаются из sys.argv)."""
+    import autoflake
+    sys.argv, original_argv = ['autoflake', *arguments], sys.argv
+    try:
+        return autoflake.main()
+    finally:
+        sys.argv = original_argv
+
+
+def _run_black(arguments: List[str]) -> Optional[int]:
+    """Точка входа black."""
+    import black
+    return black.main.main(args=arguments, prog_name='black')
+
+
+class PythonEngine(ResidentBackend):
+    """
+    Выполнение Python утилиты в пуле процессов приложения.
+
+    Процессы пула запускаются через forkserver (или spawn, если он
+    недоступен), а не копированием процесса приложения, в котором уже
+    работают потоки заданий. Процессы импортируют утилиту один раз,
+    после чего её точка входа вызывается с теми же аргументами, что и
+    исполняемый файл, поэтому вывод совпадает с выводом утилиты из
+    командной строки. Используется модуль утилиты, установленный в
+    окружении приложения. Пул общий для всех утилит.
+    """
+
+    # Модуль утилиты, импортируемый процессами пула.
+    module_name: str = ''
+    # Точка входа утилиты (функция уровня модуля, передаётся в пул).
+    entry_point: Callable[[List[str]], Optional[int]]
+
+    __executor: Optional[ProcessPoolExecutor] = None
+    __executor_lock = Lock()
+
+    @classmethod
+    def locate(cls, which: Callable[[str], Optional[str]]) -> Optional[str]:
+        """
+        Поиск модуля утилиты без его импорта.
+
+        :param which: Не используется - утилита ищется среди модулей.
+        :return: Название модуля или None, если модуль не установлен
+            или способ запуска процессов пула не выбирается (до
+            Python 3.7).
+        """
+        if sys.version_info < (3, 7):
+            return None
+        if find_spec(cls.module_name.partition('.')[0]) is None:
+            return None
+        return cls.module_name
+
+    def run(self, command: Sequence[str], file_paths: Sequence[str],
+            input_data: Optional[bytes] = None) -> CompletedProcess:
+        """Вызов точки входа утилиты в процессе пула."""
+        arguments = [*command[1:], *file_paths]
+        try:
+            status, stdout, stderr = self.__get_executor().submit(
+                _run_entry_point, type(self).entry_point, arguments,
+                os.getcwd(), input_data).result()
+        except BrokenProcessPool as error:
+            _logger.debug(str(error))
+            return run([*command, *file_paths],  # noqa: S603
+                       input=input_data, stdout=PIPE, stderr=PIPE)
+        return CompletedProcess([*command, *file_paths], status,
+                                stdout=stdout, stderr=stderr)
+
+    def _start(self, command: Sequence[str]) -> bool:
+        """Импорт модуля утилиты в процессе пула."""
+        self.is_owned = True
+        try:
+            self.__get_executor().submit(_import_module,
+                                         self.module_name).result()
+        except (ImportError, BrokenProcessPool) as error:
+            _logger.debug(str(error))
+            return False
+        return True
+
+    def _stop(self):
+        with PythonEngine.__executor_lock:
+            if PythonEngine.__executor is not None:
+                PythonEngine.__executor.shutdown()
+                PythonEngine.__executor = None
+
+    @classmethod
+    def __get_executor(cls) -> ProcessPoolExecutor:
+        """Общий пул процессов (создаётся при первом обращении)."""
+        with PythonEngine.__executor_lock:
+            if PythonEngine.__executor is None:
+                # До Python 3.7 способ запуска процессов не указывается
+                # (см. locate).
+                executor_kwargs = {}
+                if sys.version_info >= (3, 7):
+                    start_method = ('forkserver'
+                                    if 'forkserver' in get_all_start_methods()
+                                    else 'spawn')
+                    executor_kwargs['mp_context'] = get_context(start_method)
+                PythonEngine.__executor = ProcessPoolExecutor(
+                    **executor_kwargs)
+            return PythonEngine.__executor
+
+
+class Flake8Engine(PythonEngine):
+    """Выполнение flake8 в пуле процессов."""
+
+    module_name = 'flake8.main.cli'
+    entry_point = staticmethod(_run_flake8)
+
+
+class Autopep8Engine(PythonEngine):
+    """Выполнение autopep8 в пуле процессов."""
+
+    module_name = 'autopep8'
+    entry_point = staticmethod(_run_autopep8)
+
+
+class AutoflakeEngine(PythonEngine):
+    """Выполнение autoflake в пуле процессов."""
+
+    module_name = 'autoflake'
+    entry_point = staticmethod(_run_autoflake)
+
+
+class BlackEngine(PythonEngine):
+    """Выполнение black в пуле процессов."""
+
+    module_name = 'black'
+    entry_point = staticmethod(_run_black)
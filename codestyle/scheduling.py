@@ -0,0 +1,168 @@
+"""
+Планирование параллельных заданий по ожидаемой длительности.
+
+Длительность обработки файлов утилитами запоминается в истории рядом с
+кэшем результатов; задания запускаются от самых долгих к коротким, чтобы
+в конце обработки не оставалось одного долгого задания при простаивающих
+остальных потоках. Длительность файлов без истории оценивается по их
+размеру.
+"""
+import json
+import os
+from logging import getLogger
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import Dict, Hashable, Optional, TypeVar
+
+# Максимальное количество записей в истории длительности (вытесняются
+# давно не обновлявшиеся записи).
+MAX_TIMINGS = 20000
+# Вес нового измерения при сглаживании длительности.
+SMOOTHING_FACTOR = 0.5
+
+Key = TypeVar('Key', bound=Hashable)
+
+_logger = getLogger(__name__)
+
+
+def estimate_durations(sizes: Dict[Key, float],
+                       durations: Dict[Key, float]) -> Dict[Key, float]:
+    """
+    Оценка длительности обработки по известным длительностям и размерам.
+
+    Неизвестная длительность оценивается по размеру и средней скорости
+    обработки с известной длительностью (без известных длительностей -
+    оценкой считается размер; без размера - средняя длительность).
+
+    :param sizes: Размер (в байтах) по ключу.
+    :param durations: Известная длительность в секундах (для части
+        ключей).
+    :return: Длительность или её оценка для каждого ключа из sizes.
+    """
+    known = {key: durations[key] for key in sizes if key in durations}
+    if not known:
+        return dict(sizes)
+
+    known_size = sum(sizes[key] for key in known)
+    known_duration = sum(known.values())
+    mean_duration = known_duration / len(known)
+    estimates = dict(known)
+    for key, size in sizes.items():
+        if key not in known:
+            estimates[key] = (size / known_size * known_duration
+                              if known_size else mean_duration)
+    return estimates
+
+
+def get_parallel_efficiency(busy_time: float, elapsed: float,
+                            workers_count: int) -> float:
+    """
+    Эффективность параллельной обработки.
+
+    :param busy_time: Суммарная длительность выполнения заданий.
+    :param elapsed: Общее время параллельной обработки.
+    :param workers_count: Количество параллельных заданий.
+    :return: Доля времени потоков, занятая заданиями (от 0 до 1).
+    """
+    if elapsed <= 0 or workers_count <= 0:
+        return 0.0
+    return min(busy_time / (elapsed * workers_count), 1.0)
+
+
+class TimingHistory:
+    """
+    История длительности обработки файлов утилитами.
+
+    Хранится в директории кэша приложения: для каждого файла, утилиты и
+    метода обработки запоминается сглаженная длительность измеренных
+    запусков (результаты из кэша не учитываются). Количество записей
+    ограничено, при превышении удаляются давно не обновлявшиеся.
+    """
+
+    TIMINGS_FILE_NAME = 'timings.json'
+
+    def __init__(self, directory: Path, max_count: int = MAX_TIMINGS):
+        """
+        Создание истории.
+
+        :param directory: Директория кэша.
+        :param max_count: Максимальное количество записей.
+        """
+        self.directory = Path(directory)
+        self.max_count = max_count
+        self.__timings: Optional[Dict[str, float]] = None
+        self.__has_new_timings = False
+
+    @staticmethod
+    def get_key(file_path: Path, tool_name: str, method: str) -> str:
+        """Ключ записи: метод, утилита и абсолютный путь до файла."""
+        return '\0'.join((method, tool_name, os.path.abspath(file_path)))
+
+    def get(self, file_path: Path, tool_name: str,
+            method: str) -> Optional[float]:
+        """
+        Длительность обработки файла утилитой.
+
+        :param file_path: Путь до файла.
+        :param tool_name: Название утилиты.
+        :param method: Метод обработки (check / fix).
+        :return: Длительность в секундах или None, если её нет в истории.
+        """
+        return self.__load_timings().get(
+            self.get_key(file_path, tool_name, method))
+
+    def add(self, file_path: Path, tool_name: str,
+            method: str, duration: float):
+        """
+        Добавление измеренной длительности обработки файла.
+
+        :param file_path: Путь до файла.
+        :param tool_name: Название утилиты.
+        :param method: Метод обработки (check / fix).
+        :param duration: Длительность в секундах.
+        """
+        timings = self.__load_timings()
+        key = self.get_key(file_path, tool_name, method)
+        previous_duration = timings.pop(key, None)
+        if previous_duration is not None:
+            duration = (previous_duration * (1 - SMOOTHING_FACTOR)
+                        + duration * SMOOTHING_FACTOR)
+        timings[key] = round(duration, 4)
+        self.__has_new_timings = True
+
+    def save(self):
+        """Сохранение истории на диск (если она изменилась)."""
+        if not self.__has_new_timings:
+            return
+
+        timings = self.__load_timings()
+        for key in list(timings)[:max(len(timings) - self.max_count, 0)]:
+            del timings[key]
+        timings_path = self.directory / self.TIMINGS_FILE_NAME
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with NamedTemporaryFile('w', encoding='utf-8', delete=False,
+                                    dir=self.directory) as timings_file:
+                json.dump(timings, timings_file, ensure_ascii=False)
+            os.replace(timings_file.name, timings_path)
+        except OSError as error:
+            _logger.debug(f'Не удалось сохранить историю длительности: '
+                          f'{error}')
+            return
+        self.__has_new_timings = False
+
+    def __load_timings(self) -> Dict[str, float]:
+        """Записи истории (с диска - при первом обращении)."""
+        if self.__timings is not None:
+            return self.__timings
+
+        self.__timings = {}
+        try:
+            with open(self.directory / self.TIMINGS_FILE_NAME,
+                      encoding='utf-8') as timings_file:
+                timings = json.load(timings_file)
+        except (OSError, ValueError):
+            timings = {}
+        if isinstance(timings, dict):
+            self.__timings.update(timings)
+        return self.__timings
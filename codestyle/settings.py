@@ -2,7 +2,8 @@
 import codestyle
 
 
-def get_logging_config(line_separator: str, logging_level: str) -> dict:
+def get_logging_config(line_separator: str, logging_level: str,
+                       stream: str = 'ext://sys.stdout') -> dict:
     """Получение конфигурации логирования с учётом передаваемых параметров."""
     bold_sequence = '\033[1m'  # добавляет тексту жирное начертание
     bold_sequence_end = '\033[0m'  # сбрасывает жирное начертание
@@ -21,7 +22,7 @@ def get_logging_config(line_separator: str, logging_level: str) -> dict:
                 'level': 'DEBUG',
                 'formatter': 'standard',
                 'class': 'logging.StreamHandler',
-                'stream': 'ext://sys.stdout',
+                'stream': stream,
             },
         },
         'loggers': {
@@ -0,0 +1,162 @@
+"""
+Разделение обрабатываемых файлов между узлами CI (сегменты).
+
+Каждый узел запускается с параметром --shard <номер>/<количество> и
+обрабатывает только файлы своего сегмента; каждый файл попадает ровно в
+один сегмент. По-умолчанию сегмент файла определяется хэшем его пути
+относительно текущей директории, поэтому разделение не зависит от
+расположения рабочей копии на узле и не требует обхода всего дерева до
+начала обработки.
+
+При балансировке по размеру файлов или по длительности их обработки
+из профиля предыдущего запуска (--profile-output) файлы распределяются
+жадно, от самых затратных к менее затратным, в наименее загруженный
+сегмент. Разделение детерминировано: все узлы получают одинаковый набор
+файлов и одинаковые затраты, поэтому выбирают согласованные сегменты.
+"""
+import heapq
+import json
+import os
+from hashlib import blake2b
+from pathlib import Path
+from typing import (Callable, Dict, Iterable, Iterator, List, Optional,
+                    Tuple)
+
+from codestyle.scheduling import estimate_durations
+
+# Способы разделения файлов между сегментами.
+BALANCE_HASH = 'hash'
+BALANCE_SIZE = 'size'
+BALANCE_TIMING = 'timing'
+BALANCE_METHODS = (BALANCE_HASH, BALANCE_SIZE, BALANCE_TIMING)
+# Функция затрат на обработку файлов: путь до файла - затраты.
+CostsGetter = Callable[[List[Path]], Dict[Path, float]]
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """
+    Разбор сегмента в формате <номер>/<количество>.
+
+    :param value: Сегмент, например "2/4" (номера начинаются с 1).
+    :return: Номер сегмента и количество сегментов.
+    :raises ValueError: Если сегмент указан в неверном формате.
+    """
+    index_text, separator, count_text = value.partition('/')
+    if not separator:
+        raise ValueError(f'ожидается <номер>/<количество>: {value}')
+    index, count = int(index_text), int(count_text)
+    if not 0 < index <= count:
+        raise ValueError(f'номер должен быть от 1 до {count}: {value}')
+    return index, count
+
+
+def get_path_key(file_path: Path) -> str:
+    """Путь до файла относительно текущей директории (ключ сегмента)."""
+    return Path(os.path.relpath(os.path.abspath(file_path))).as_posix()
+
+
+def get_hash_shard(file_path: Path, count: int) -> int:
+    """
+    Номер сегмента файла по хэшу его пути (от 1 до count).
+
+    :param file_path: Путь до файла.
+    :param count: Количество сегментов.
+    """
+    digest = blake2b(get_path_key(file_path).encode(errors='replace'),
+                     digest_size=8).digest()
+    return int.from_bytes(digest, 'big') % count + 1
+
+
+def select_shard(paths: Iterable[Path], index: int, count: int,
+                 get_costs: Optional[CostsGetter] = None) -> Iterator[Path]:
+    """
+    Отбор путей сегмента.
+
+    :param paths: Пути до всех обрабатываемых файлов.
+    :param index: Номер сегмента (от 1 до count).
+    :param count: Количество сегментов.
+    :param get_costs: Функция затрат на обработку файлов; None - отбор по
+        хэшу пути, без чтения всех путей до начала обработки.
+    :return: Генератор путей сегмента в исходном порядке.
+    """
+    if get_costs is None:
+        yield from (path for path in paths
+                    if get_hash_shard(path, count) == index)
+        return
+
+    paths = list(paths)
+    costs = get_costs(paths)
+    # Нагрузка сегментов: затраты, количество файлов (для файлов без
+    # затрат, например пустых) и номер сегмента.
+    loads = [(0.0, 0, shard) for shard in range(1, count + 1)]
+    shards: Dict[Path, int] = {}
+    for path in sorted(paths, key=lambda path: (-costs[path],
+                                                get_path_key(path))):
+        load, files_count, shard = heapq.heappop(loads)
+        shards[path] = shard
+        heapq.heappush(loads, (load + costs[path], files_count + 1, shard))
+    yield from (path for path in paths if shards[path] == index)
+
+
+def get_size_costs(paths: Iterable[Path]) -> Dict[Path, float]:
+    """
+    Затраты на обработку файлов по их размеру.
+
+    :param paths: Пути до файлов.
+    :return: Размер в байтах (0 - файл недоступен) для каждого пути.
+    """
+    costs = {}
+    for path in paths:
+        try:
+            costs[path] = float(os.stat(path).st_size)
+        except OSError:
+            costs[path] = 0.0
+    return costs
+
+
+def load_timings(profile_path: Path) -> Dict[str, float]:
+    """
+    Длительность обработки файлов из профиля (см. Profile.save).
+
+    Учитываются только измеренные запуски утилит (не из кэша);
+    длительности запусков разных утилит для одного файла суммируются.
+
+    :param profile_path: Путь до файла профиля.
+    :return: Длительность в секундах по пути до файла (см. get_path_key).
+    :raises OSError: Если файл не удалось прочитать.
+    :raises ValueError: Если файл не является профилем.
+    """
+    with open(profile_path, encoding='utf-8') as profile_file:
+        profile = json.load(profile_file)
+    try:
+        timings = [timing for timing in profile['timings']
+                   if not timing['cached']]
+        durations: Dict[str, float] = {}
+        for timing in timings:
+            key = get_path_key(Path(timing['file']))
+            durations[key] = durations.get(key, 0.0) + float(
+                timing['duration'])
+    except (KeyError, TypeError) as error:
+        raise ValueError(f'неверный формат профиля: {error!r}') from error
+    return durations
+
+
+def get_timing_costs(paths: Iterable[Path],
+                     durations: Dict[str, float]) -> Dict[Path, float]:
+    """
+    Затраты на обработку файлов по длительности из профиля.
+
+    Длительность файлов, отсутствующих в профиле, оценивается по их
+    размеру (см. scheduling.estimate_durations).
+
+    :param paths: Пути до файлов.
+    :param durations: Длительность по пути до файла (см. load_timings).
+    :return: Длительность в секундах для каждого пути.
+    """
+    sizes = get_size_costs(paths)
+    path_durations = {}
+    for path in sizes:
+        key = get_path_key(path)
+        if key in durations:
+            path_durations[path] = durations[key]
+    return estimate_durations(sizes, path_durations)
@@ -1,15 +1,49 @@
 """Набор вспомогательных инструментов для взаимодействия с ОС."""
+import os
+import signal
+import stat
 import sys
+import time
 from enum import IntEnum
+from pathlib import Path
+from struct import calcsize
 from logging import INFO, getLogger
-from subprocess import (CalledProcessError, TimeoutExpired,  # noqa: S404
+from subprocess import (PIPE, CalledProcessError,  # noqa: S404
+                        CompletedProcess, Popen, TimeoutExpired,
                         check_output as check_process_output)
-from typing import Optional
+from tempfile import NamedTemporaryFile
+from threading import Lock, Thread
+from typing import Callable, List, Optional, Sequence, Set, Tuple
 
 from codestyle import FIRST_ELEMENT_INDEX
 
 _logger = getLogger(__name__)
 
+# Запас длины командной строки (байт) на случай изменения окружения.
+ARGUMENTS_LENGTH_RESERVE = 4096
+# Максимальная длина командной строки (байт) для систем без SC_ARG_MAX.
+DEFAULT_ARGUMENTS_MAX_LENGTH = 32768
+# Размер указателя на аргумент в массиве argv.
+POINTER_SIZE = calcsize('P')
+# Единица ru_maxrss в байтах: килобайты, в macOS - байты.
+MAX_RSS_UNIT = 1 if sys.platform == 'darwin' else 1024
+
+# Максимальная длина строки вывода (байт) при построчном чтении: более
+# длинные строки передаются частями.
+MAX_LINE_LENGTH = 65536
+# Обработчик строки вывода процесса (см. LineReader).
+LineHandler = Callable[[bytes], None]
+# Процессорное время (секунды) и пиковая память (байт) процесса.
+ResourceUsage = Tuple[float, int]
+# Границы интервала (секунды) опроса процесса при ожидании с ограничением
+# времени (см. wait_measured).
+WAIT_DELAY_MIN = 0.0005
+WAIT_DELAY_MAX = 0.05
+
+# Процессы, запущенные run_measured и ещё не завершённые.
+_running_processes: Set[Popen] = set()
+_running_processes_lock = Lock()
+
 
 class ExitCodes(IntEnum):
     """Коды завершения работы программы."""
@@ -27,15 +61,279 @@ def interrupt_program_flow(status: int = ExitCodes.SUCCESS,
     sys.exit(status)
 
 
-def check_output(run_arguments: tuple) -> Optional[str]:
-    """Получение результата работы программы с запускаемыми аргументами."""
+def check_output(run_arguments: tuple,
+                 interrupt: bool = True) -> Optional[str]:
+    """
+    Получение результата работы программы с запускаемыми аргументами.
+
+    :param run_arguments: Аргументы запуска программы.
+    :param interrupt: Завершить работу приложения, если программа
+        недоступна; иначе - вернуть None.
+    :return: Результат работы программы.
+    """
     tool_name = run_arguments[FIRST_ELEMENT_INDEX]
     try:
         _logger.debug(f'Проверка наличия {tool_name} в системе...')
         return check_process_output(run_arguments,  # noqa: S603
                                     timeout=10).decode().rstrip()
     except (CalledProcessError, FileNotFoundError, TimeoutExpired) as error:
+        if not interrupt:
+            _logger.debug(str(error))
+            return None
+
         _logger.warning(f'Инструмент {tool_name} не найден.')
         _logger.debug(str(error))
 
         interrupt_program_flow(ExitCodes.UNSUCCESSFUL)
+
+
+def get_arguments_max_length() -> int:
+    """
+    Максимальная длина аргументов командной строки запускаемого процесса.
+
+    Учитывает размер переменных окружения, которые передаются процессу
+    вместе с аргументами.
+    """
+    try:
+        max_length = os.sysconf('SC_ARG_MAX')
+    except (AttributeError, ValueError, OSError):
+        max_length = DEFAULT_ARGUMENTS_MAX_LENGTH
+
+    environment_length = sum(
+        get_argument_length(f'{key}={value}')
+        for key, value in os.environ.items())
+    return max(max_length - environment_length - ARGUMENTS_LENGTH_RESERVE,
+               ARGUMENTS_LENGTH_RESERVE)
+
+
+def get_argument_length(argument: str) -> int:
+    """Размер аргумента командной строки в памяти запускаемого процесса."""
+    return len(os.fsencode(argument)) + 1 + POINTER_SIZE
+
+
+def write_file_atomically(file_path: Path, content: bytes):
+    """
+    Замена содержимого файла через временный файл в той же директории.
+
+    Файл не бывает записан частично, права доступа сохраняются; для
+    символической ссылки заменяется файл, на который она указывает.
+
+    :param file_path: Путь до файла.
+    :param content: Новое содержимое файла.
+    """
+    real_path = Path(os.path.realpath(file_path))
+    file_mode = stat.S_IMODE(real_path.stat().st_mode)
+    with NamedTemporaryFile('wb', delete=False, dir=real_path.parent,
+                            prefix=f'.{real_path.name}.') as temporary_file:
+        temporary_file.write(content)
+    try:
+        os.chmod(temporary_file.name, file_mode)
+        os.replace(temporary_file.name, real_path)
+    except OSError:
+        os.unlink(temporary_file.name)
+        raise
+
+
+def wait_measured(process: Popen, timeout: Optional[float] = None
+                  ) -> Optional[ResourceUsage]:
+    """
+    Ожидание завершения процесса с измерением использованных ресурсов.
+
+    Процесс ожидается через os.wait4 (если доступен), который возвращает
+    процессорное время и пиковую память именно этого процесса: в отличие
+    от resource.getrusage(RUSAGE_CHILDREN), значения не смешиваются с
+    параллельно завершающимися процессами. Статус завершения сохраняется
+    в process.returncode, как после Popen.wait.
+
+    :param process: Процесс, завершение которого ещё не ожидалось.
+    :param timeout: Ограничение времени ожидания в секундах.
+    :return: Использованные процессом ресурсы; None - не измерены.
+    :raises TimeoutExpired: Если процесс не завершился вовремя.
+    """
+    if not hasattr(os, 'wait4') or process.returncode is not None:
+        process.wait(timeout=timeout)
+        return None
+
+    try:
+        pid, wait_status, usage = os.wait4(
+            process.pid, 0 if timeout is None else os.WNOHANG)
+        if timeout is not None:
+            deadline = time.monotonic() + timeout
+            delay = WAIT_DELAY_MIN
+            while pid != process.pid:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutExpired(process.args, timeout)
+                delay = min(delay * 2, remaining, WAIT_DELAY_MAX)
+                time.sleep(delay)
+                pid, wait_status, usage = os.wait4(process.pid, os.WNOHANG)
+    except ChildProcessError:
+        # Процесс уже ожидался вне этой функции.
+        process.wait(timeout=timeout)
+        return None
+
+    if os.WIFSIGNALED(wait_status):
+        process.returncode = -os.WTERMSIG(wait_status)
+    else:
+        process.returncode = os.WEXITSTATUS(wait_status)
+    return (usage.ru_utime + usage.ru_stime,
+            usage.ru_maxrss * MAX_RSS_UNIT)
+
+
+class LineReader:
+    """
+    Построчное чтение вывода процесса (вместо Popen.communicate).
+
+    Стандартный вывод и поток ошибок читаются в отдельных потоках, и
+    каждая строка сразу передаётся обработчику, поэтому вывод процесса
+    не накапливается в памяти.
+    """
+
+    def __init__(self, process: Popen, input_data: Optional[bytes],
+                 line_handlers: Tuple[LineHandler, LineHandler]):
+        """
+        Запуск чтения вывода процесса.
+
+        :param process: Процесс с перехваченными выводом и ошибками.
+        :param input_data: Данные стандартного ввода процесса.
+        :param line_handlers: Обработчики строк стандартного вывода и
+            потока ошибок (вызываются в потоках чтения).
+        """
+        self.__process = process
+        self.__threads: List[Thread] = [
+            Thread(target=self.__read_lines, args=(stream, handler),
+                   daemon=True)
+            for stream, handler in zip((process.stdout, process.stderr),
+                                       line_handlers)]
+        if input_data is not None:
+            self.__threads.append(Thread(
+                target=self.__write_input, args=(process.stdin, input_data),
+                daemon=True))
+        for thread in self.__threads:
+            thread.start()
+
+    def wait(self, timeout: Optional[float] = None
+             ) -> Optional[ResourceUsage]:
+        """
+        Ожидание завершения процесса и чтения его вывода.
+
+        Повторный вызов после TimeoutExpired только ожидает завершения:
+        данные стандартного ввода записываются один раз.
+
+        :param timeout: Ограничение времени ожидания в секундах.
+        :return: Использованные процессом ресурсы (см. wait_measured).
+        :raises TimeoutExpired: Если процесс не завершился вовремя.
+        """
+        usage = wait_measured(self.__process, timeout=timeout)
+        for thread in self.__threads:
+            thread.join()
+        return usage
+
+    @staticmethod
+    def __read_lines(stream, handler: LineHandler):
+        """Передача строк потока обработчику до его закрытия."""
+        try:
+            for line in iter(lambda: stream.readline(MAX_LINE_LENGTH), b''):
+                handler(line)
+        except (OSError, ValueError):
+            # Поток закрыт при прерывании работы.
+            return
+
+    @staticmethod
+    def __write_input(stream, input_data: bytes):
+        """Запись данных стандартного ввода процесса."""
+        try:
+            stream.write(input_data)
+            stream.close()
+        except (OSError, ValueError):
+            # Процесс завершился, не прочитав ввод.
+            return
+
+
+def run_measured(command: Sequence[str],
+                 input_data: Optional[bytes] = None,
+                 timeout: Optional[float] = None,
+                 line_handlers: Optional[Tuple[LineHandler,
+                                               LineHandler]] = None
+                 ) -> CompletedProcess:
+    """
+    Запуск процесса с измерением использованных ресурсов.
+
+    Аналог subprocess.run с перехватом стандартного вывода и ошибок.
+    Процесс запускается в отдельной группе процессов: при превышении
+    времени работы или прерывании завершается вся группа, включая
+    порождённые утилитой процессы.
+
+    :param command: Команда запуска.
+    :param input_data: Данные стандартного ввода процесса.
+    :param timeout: Ограничение времени работы процесса в секундах
+        (None - без ограничения).
+    :param line_handlers: Обработчики строк стандартного вывода и
+        потока ошибок (см. LineReader); если указаны - вывод не
+        сохраняется в завершённом процессе.
+    :return: Завершённый процесс с атрибутами cpu_time и max_rss (см.
+        wait_measured; None - не измерены) и timed_out (превышено время
+        работы).
+    """
+    outputs: Tuple[List[bytes], List[bytes]] = ([], [])
+    if line_handlers is None:
+        line_handlers = (outputs[0].append, outputs[1].append)
+    timed_out = False
+    with Popen(command,  # noqa: S603
+               stdin=None if input_data is None else PIPE,
+               stdout=PIPE, stderr=PIPE,
+               start_new_session=True) as process:
+        with _running_processes_lock:
+            _running_processes.add(process)
+        try:
+            reader = LineReader(process, input_data, line_handlers)
+            usage = reader.wait(timeout=timeout)
+        except TimeoutExpired:
+            timed_out = True
+            kill_process_group(process)
+            usage = reader.wait()
+        except BaseException:
+            kill_process_group(process)
+            raise
+        finally:
+            with _running_processes_lock:
+                _running_processes.discard(process)
+    cpu_time, max_rss = usage if usage is not None else (None, None)
+    completed_process = CompletedProcess(process.args, process.returncode,
+                                         b''.join(outputs[0]),
+                                         b''.join(outputs[1]))
+    completed_process.cpu_time = cpu_time
+    completed_process.max_rss = max_rss
+    completed_process.timed_out = timed_out
+    return completed_process
+
+
+def kill_process_group(process: Popen):
+    """
+    Принудительное завершение группы незавершённого процесса.
+
+    :param process: Процесс, запущенный в отдельной группе процессов.
+    """
+    if process.returncode is not None:
+        return
+    try:
+        if hasattr(os, 'killpg'):
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except (ProcessLookupError, PermissionError):
+        _logger.debug(f'Процесс {process.pid} уже завершён.')
+
+
+def cancel_processes():
+    """
+    Завершение групп всех запущенных run_measured процессов.
+
+    Используется при прерывании работы приложения: процессы утилит
+    запущены в отдельных группах и не получают сигнал прерывания от
+    терминала.
+    """
+    with _running_processes_lock:
+        processes = list(_running_processes)
+    for process in processes:
+        kill_process_group(process)
@@ -0,0 +1,179 @@
+"""Модуль с реестром консольных утилит."""
+import json
+import os
+from logging import getLogger
+from pathlib import Path
+from shutil import which
+from tempfile import NamedTemporaryFile
+from typing import Dict, Optional, Sequence, Type
+
+from codestyle.resident import ResidentBackend
+from codestyle.system_wrappers import (ExitCodes, check_output,
+                                       interrupt_program_flow)
+
+_logger = getLogger(__name__)
+
+
+class ToolRegistry:
+    """
+    Реестр консольных утилит.
+
+    Утилиты ищутся в PATH при первом обращении, без их запуска.
+    Результаты запуска утилит с постоянным выводом (версия, пути
+    установки) запоминаются и, если указана директория кэша,
+    сохраняются на диск с ключом из пути до исполняемого файла, времени
+    его изменения и условий запуска - при обновлении утилиты или её
+    настроек они определяются заново. Здесь же хранятся запущенные
+    резидентные серверы утилит.
+    """
+
+    PROBES_FILE_NAME = 'probes.json'
+
+    def __init__(self, cache_directory: Optional[Path] = None):
+        """
+        Создание реестра.
+
+        :param cache_directory: Директория кэша результатов запуска
+            утилит; None - результаты хранятся только в памяти.
+        """
+        self.cache_directory = cache_directory
+        self.__executables: Dict[str, Optional[str]] = {}
+        self.__probes: Optional[Dict[str, str]] = None
+        self.__has_new_probes = False
+        self.__backends: Dict[Type[ResidentBackend],
+                              Optional[ResidentBackend]] = {}
+
+    def which(self, name: str) -> Optional[str]:
+        """
+        Путь до исполняемого файла утилиты (определяется один раз).
+
+        :param name: Название утилиты.
+        :return: Путь или None, если утилита не найдена.
+        """
+        if name not in self.__executables:
+            self.__executables[name] = which(name)
+        return self.__executables[name]
+
+    def require(self, name: str) -> str:
+        """
+        Путь до исполняемого файла обязательной утилиты.
+
+        Если утилита не найдена - работа приложения завершается со
+            статусом ExitCodes.UNSUCCESSFUL
+
+        :param name: Название утилиты.
+        :return: Путь до исполняемого файла.
+        """
+        _logger.debug(f'Проверка наличия {name} в системе...')
+        executable = self.which(name)
+        if executable is None:
+            interrupt_program_flow(
+                ExitCodes.UNSUCCESSFUL,
+                log_message=f'Инструмент {name} не найден.')
+        return executable
+
+    def probe(self, name: str, *arguments: str,
+              context: Sequence[str] = ()) -> Optional[str]:
+        """
+        Вывод утилиты, запущенной с указанными аргументами.
+
+        Вывод должен зависеть только от установленной утилиты и
+        переданных условий запуска: он запоминается до изменения её
+        исполняемого файла или условий.
+
+        :param name: Название утилиты.
+        :param arguments: Аргументы запуска.
+        :param context: Условия запуска, от которых зависит вывод
+            (например, значения переменных окружения с настройками).
+        :return: Вывод или None, если утилиту не удалось запустить.
+        """
+        executable = self.which(name)
+        if executable is None:
+            return None
+
+        key = self.__get_probe_key(executable, arguments, context)
+        probes = self.__load_probes()
+        if key is not None and key in probes:
+            return probes[key]
+
+        output = check_output((executable, *arguments), interrupt=False)
+        if key is not None and output is not None:
+            probes[key] = output
+            self.__has_new_probes = True
+        return output
+
+    def get_backend(self, backend_cls: Type[ResidentBackend]
+                    ) -> Optional[ResidentBackend]:
+        """
+        Резидентный сервер утилиты (один на реестр).
+
+        Сервер запускается при первой обработке файлов, поэтому реестр,
+        общий для нескольких запусков приложения, сохраняет его.
+
+        :param backend_cls: Класс сервера.
+        :return: Сервер или None, если он не установлен.
+        """
+        if backend_cls not in self.__backends:
+            executable = backend_cls.locate(self.which)
+            self.__backends[backend_cls] = None if executable is None else (
+                backend_cls(executable, self.cache_directory))
+        return self.__backends[backend_cls]
+
+    def stop_backends(self):
+        """Остановка резидентных серверов, запущенных приложением."""
+        for backend in filter(None, self.__backends.values()):
+            backend.stop()
+
+    def save(self):
+        """Сохранение новых результатов запуска утилит на диск."""
+        if not self.__has_new_probes or self.cache_directory is None:
+            return
+
+        probes_path = Path(self.cache_directory) / self.PROBES_FILE_NAME
+        try:
+            probes_path.parent.mkdir(parents=True, exist_ok=True)
+            with NamedTemporaryFile('w', encoding='utf-8', delete=False,
+                                    dir=probes_path.parent) as probes_file:
+                json.dump(self.__probes, probes_file, ensure_ascii=False)
+            os.replace(probes_file.name, probes_path)
+        except OSError as error:
+            _logger.debug(f'Не удалось сохранить кэш утилит: {error}')
+            return
+        self.__has_new_probes = False
+
+    @staticmethod
+    def __get_probe_key(executable: str, arguments: tuple,
+                        context: Sequence[str]) -> Optional[str]:
+        """Ключ результата запуска утилиты (None - файл недоступен)."""
+        real_path = os.path.realpath(executable)
+        try:
+            executable_stat = os.stat(real_path)
+        except OSError:
+            return None
+        key_parts = (real_path, str(executable_stat.st_mtime_ns),
+                     str(executable_stat.st_size), *arguments)
+        if context:
+            # Пустая строка отделяет аргументы запуска от условий.
+            key_parts = (*key_parts, '', *context)
+        return '\0'.join(key_parts)
+
+    def __load_probes(self) -> Dict[str, str]:
+        """Результаты запуска утилит (с диска - при первом обращении)."""
+        if self.__probes is not None:
+            return self.__probes
+
+        self.__probes = {}
+        if self.cache_directory is not None:
+            probes_path = Path(self.cache_directory) / self.PROBES_FILE_NAME
+            try:
+                with open(probes_path, encoding='utf-8') as probes_file:
+                    probes = json.load(probes_file)
+            except (OSError, ValueError):
+                probes = {}
+            if isinstance(probes, dict):
+                self.__probes.update(probes)
+        return self.__probes
+
+
+# Реестр для инструментов, созданных без явно указанного реестра.
+DEFAULT_REGISTRY = ToolRegistry()
@@ -3,37 +3,131 @@
 
 Новые добавляются в константу ENABLED_TOOLS модуля application.
 """
-from os import linesep
+import json
+import re
+from collections import deque
+from functools import partial
+from os import environ, linesep
+from os.path import abspath
 from pathlib import Path
-from subprocess import PIPE, run  # noqa: S404
-from typing import Sequence, Optional
+from subprocess import CompletedProcess  # noqa: S404
+from typing import (Callable, Deque, Dict, Iterator, List, Optional,
+                    Pattern, Sequence, Tuple, Type)
 
 from codestyle import APPLICATION_PATH
-from codestyle.system_wrappers import ExitCodes, check_output
+from codestyle.diagnostics import (DEFAULT_DIAGNOSTIC_PATTERN, ERROR,
+                                   WARNING, Diagnostic, format_diagnostics,
+                                   normalize_severity, parse_text_diagnostics)
+from codestyle.system_wrappers import (ExitCodes, get_argument_length,
+                                       get_arguments_max_length,
+                                       interrupt_program_flow, run_measured)
+from codestyle.resident import (AutoflakeEngine, Autopep8Engine, BlackD,
+                                BlackEngine, DMypy, EslintD, Flake8Engine,
+                                ResidentBackend)
+from codestyle.tool_registry import DEFAULT_REGISTRY, ToolRegistry
 
 TOOL_SETTINGS_PATH = APPLICATION_PATH / 'tool_settings'
 
+# Строка вывода начинается с пути до файла и номера строки в нём,
+# например: "/code/file.py:12:1: E302 expected 2 blank lines".
+PATH_PREFIX_PATTERN = re.compile(r'^(?P<path>[^:\s][^:]*):\d+')
+# Путь, указывающий утилите на чтение кода из стандартного ввода.
+STDIN_PATH = '-'
+# Замечания результата обработки; None - вывод не разобран.
+ParsedDiagnostics = Optional[List[Diagnostic]]
+# Определение ключа строки вывода (см. OutputTail); None - строка без файла.
+LineKeyGetter = Callable[[str], Optional[str]]
+
 
 class Result:
     """Результат обработки файла."""
 
-    def __init__(self, return_code: int, output: str = '', error: str = ''):
+    def __init__(self, return_code: int, output: str = '', error: str = '',
+                 duration: float = 0.0,
+                 diagnostics: ParsedDiagnostics = None,
+                 cpu_time: Optional[float] = None,
+                 max_rss: Optional[int] = None, timed_out: bool = False,
+                 skipped_lines: int = 0):
         """
         Создание результата обработки.
 
         :param return_code: Код работы программы.
         :param output: Результат работы.
         :param error: Результат работы в виде ошибки.
+        :param duration: Длительность обработки в секундах (0 - не
+            измерялась, например, для результата из кэша).
+        :param diagnostics: Замечания утилиты; None - не разобраны
+            (см. ConsoleTool.get_diagnostics).
+        :param cpu_time: Процессорное время утилиты в секундах (None -
+            не измерялось, например, для резидентного сервера).
+        :param max_rss: Пиковая память процесса утилиты в байтах (None -
+            не измерялась).
+        :param timed_out: Утилита завершена из-за превышения времени
+            работы (результат неполный).
+        :param skipped_lines: Количество отброшенных строк вывода (см.
+            OutputTail); вывод содержит только последние строки.
         """
         self.return_code = return_code
         self.output = output or ''
         self.error = error or ''
+        self.duration = duration
+        self.diagnostics = diagnostics
+        self.cpu_time = cpu_time
+        self.max_rss = max_rss
+        self.is_timed_out = timed_out
+        self.skipped_lines = skipped_lines
+        # Результат получен из кэша (см. cache.ResultCache).
+        self.is_cached = False
         self.is_success = self.return_code == ExitCodes.SUCCESS
 
     @property
     def whole_output(self) -> str:
         """Полный вывод работы используемой программы с ошибками."""
-        return self.output + linesep if self.output else self.error
+        output = self.output + linesep if self.output else self.error
+        if self.skipped_lines and output:
+            output = (f'... (пропущено строк вывода: {self.skipped_lines})'
+                      f'{linesep}{output}')
+        return output
+
+
+class OutputTail:
+    """
+    Ограниченный хвост построчного вывода утилиты.
+
+    Для каждого ключа (файла пакета; None - строки без файла) хранятся
+    только последние строки и количество отброшенных строк, поэтому
+    память не зависит от объёма вывода утилиты.
+    """
+
+    def __init__(self, max_lines: int,
+                 get_key: Optional[LineKeyGetter] = None):
+        """
+        Создание хвоста вывода.
+
+        :param max_lines: Количество хранимых строк для каждого ключа.
+        :param get_key: Функция определения ключа строки (по-умолчанию
+            все строки относятся к ключу None).
+        """
+        self.max_lines = max_lines
+        self.__get_key = get_key
+        self.lines: Dict[Optional[str], Deque[str]] = {}
+        self.skipped_counts: Dict[Optional[str], int] = {}
+
+    def add_line(self, line: bytes):
+        """Добавление строки вывода (с отбрасыванием самой старой)."""
+        text = line.decode(errors='replace').rstrip('\r\n')
+        key = self.__get_key(text) if self.__get_key is not None else None
+        lines = self.lines.get(key)
+        if lines is None:
+            lines = self.lines[key] = deque(maxlen=self.max_lines)
+        if len(lines) == self.max_lines:
+            self.skipped_counts[key] = self.skipped_counts.get(key, 0) + 1
+        lines.append(text)
+
+    def get_text(self) -> str:
+        """Хранимые строки (сгруппированные по ключам)."""
+        return linesep.join(line for lines in self.lines.values()
+                            for line in lines)
 
 
 class ConsoleTool:
@@ -43,9 +137,8 @@ class ConsoleTool:
     Переменные класса ниже изменяют/расширяют поведение утилиты.
     """
 
-    # Аргумент, передаваемый в командную строку для отображения описания
-    # утилиты с набором доступным параметров.
-    help_argument: str = '--help'
+    # Аргумент командной строки для вывода версии утилиты.
+    version_argument: str = '--version'
 
     # Аргумент командной строки для указания названия аргумента,
     # принимающего путь до конфигурации утилиты.
@@ -66,7 +159,9 @@ class ConsoleTool:
     # начертании.
     cli_tool_name: str = ''
 
-    # Суфиксы файлов (с точкой в начале), которые поддерживаются утилитой.
+    # Суфиксы файлов (с точкой в начале), которые поддерживаются утилитой;
+    # суффикс файла без собственного суффикса определяется по имени и
+    # строке shebang (см. file_types.get_file_suffix).
     supported_file_suffixes: tuple
 
     # Дополнительные аргументы командной строки, используемые для
@@ -77,6 +172,56 @@ class ConsoleTool:
     # проверки файлов.
     check_arguments: tuple = ()
 
+    # Аргументы командной строки для исправления кода из стандартного
+    # ввода с выводом результата в стандартный вывод (используются
+    # вместо fix_arguments); None - утилита исправляет только файлы.
+    stdin_fix_arguments: Optional[tuple] = None
+
+    # Аргументы командной строки, определяющие формат вывода утилиты.
+    output_arguments: tuple = ()
+
+    # Аргументы командной строки, определяющие формат вывода утилиты
+    # при пакетной обработке файлов (используются вместо output_arguments).
+    batch_output_arguments: tuple = ()
+
+    # Регулярное выражение, извлекающее (группа path) путь до файла из
+    # строки вывода при пакетной обработке; None - утилита не
+    # поддерживает пакетную обработку и запускается для каждого файла.
+    batch_output_pattern: Optional[Pattern] = None
+
+    # Аргументы командной строки, включающие вывод замечаний в формате
+    # JSON (используются вместо output_arguments и batch_output_arguments
+    # для инструмента, созданного с structured_output; вывод разбирается
+    # методом parse_json_output); None - утилита не выводит JSON.
+    json_output_arguments: Optional[tuple] = None
+
+    # Регулярное выражение строки текстового вывода с замечанием
+    # (группа message; необязательные - path, line, column, code и
+    # severity).
+    diagnostic_pattern: Pattern = DEFAULT_DIAGNOSTIC_PATTERN
+
+    # Уровень важности замечаний, для которых утилита его не выводит.
+    default_severity: str = ERROR
+
+    # Утилита анализирует проект целиком (например, граф импортов):
+    # при проверке все её файлы обрабатываются одним пакетным запуском
+    # (с разбиением только по длине командной строки) и без параметра
+    # --batch; требует batch_output_pattern.
+    project_scoped: bool = False
+
+    # Аргумент командной строки для указания директории кэша утилиты
+    # (кэш хранится в директории кэша приложения); пустая строка -
+    # утилита не использует кэш на диске.
+    cache_dir_argument: str = ''
+
+    # Класс резидентного сервера утилиты, используемого вместо запуска
+    # утилиты для каждого файла (пакета файлов), если сервер установлен.
+    resident_backend: Optional[Type[ResidentBackend]] = None
+
+    # Класс выполнения Python утилиты в пуле процессов приложения
+    # (предпочтительнее резидентного сервера, если включены оба).
+    in_process_backend: Optional[Type[ResidentBackend]] = None
+
     # Флаги ниже определяют возможности утилиты: переключение for_check
     # в True сообщает, утилита имеет возможность проверять файлы;
     # for_fix - для исправления/форматирования файлов.
@@ -87,16 +232,54 @@ class ConsoleTool:
     optional_flag: str = ''
     optional = False
 
-    def __init__(self, configuration_path: Path = None):
+    def __init__(self, configuration_path: Path = None,
+                 registry: Optional[ToolRegistry] = None,
+                 resident: bool = False, in_process: bool = False,
+                 structured_output: bool = False,
+                 timeout: Optional[float] = None,
+                 max_output_lines: Optional[int] = None,
+                 cache_dir: Optional[Path] = None):
         """
         Проверка доступности приложения в запускаемой среде.
 
         :param configuration_path: путь до конфигурации приложения
+        :param registry: реестр утилит (по-умолчанию: общий реестр
+            без кэша на диске)
+        :param resident: использовать резидентный сервер утилиты, если
+            он установлен
+        :param in_process: выполнять утилиту в пуле процессов
+            приложения, если её модуль установлен
+        :param structured_output: запускать утилиту с выводом замечаний
+            в формате JSON, если она его поддерживает
+        :param timeout: ограничение времени одного запуска утилиты в
+            секундах (None - без ограничения; не действует для
+            резидентных серверов)
+        :param max_output_lines: читать вывод утилиты построчно и
+            хранить только указанное количество последних строк для
+            каждого файла (None - хранить весь вывод; не действует для
+            вывода в формате JSON и резидентных серверов)
+        :param cache_dir: директория кэша приложения, в которой
+            утилита с cache_dir_argument хранит свой кэш (None - кэш
+            утилиты по-умолчанию)
         """
         if isinstance(configuration_path, Path):
             self.configuration_path = configuration_path
-
-        check_output((self.get_name(), self.help_argument))
+        self.structured_output = (structured_output
+                                  and self.json_output_arguments is not None)
+        self.timeout = timeout
+        self.max_output_lines = max_output_lines
+        self.cache_dir = cache_dir
+
+        self.registry = registry if registry is not None else DEFAULT_REGISTRY
+        self.registry.require(self.get_name())
+        self.__version: Optional[str] = None
+        self.__backend: Optional[ResidentBackend] = None
+        for is_enabled, backend_cls in ((in_process, self.in_process_backend),
+                                        (resident, self.resident_backend)):
+            if is_enabled and backend_cls is not None:
+                self.__backend = self.registry.get_backend(backend_cls)
+            if self.__backend is not None:
+                break
 
     @classmethod
     def get_name(cls) -> str:
@@ -111,30 +294,375 @@ class ConsoleTool:
         """Исправление файла по указанному пути."""
         return self._process_file(file_path, self.fix_arguments)
 
+    def fix_content(self, file_path: Path,
+                    content: bytes) -> Tuple[Result, bytes]:
+        """
+        Исправление кода файла без записи на диск.
+
+        Код передаётся утилите через стандартный ввод, путь до файла
+        подставляется в вывод утилиты вместо STDIN_PATH.
+
+        :param file_path: Путь до файла, которому принадлежит код.
+        :param content: Код файла.
+        :return: Результат обработки и исправленный код (исходный - при
+            неуспешной обработке).
+        """
+        completed_process = self.__run(
+            self.get_command(self.stdin_fix_arguments), [STDIN_PATH],
+            input_data=content)
+        error_lines = completed_process.stderr.decode().rstrip().splitlines()
+        error = linesep.join(self.__replace_stdin_path(line, str(file_path))
+                             for line in error_lines)
+        result = Result(completed_process.returncode, error=error,
+                        **self.__get_process_details(completed_process))
+        if not result.is_success:
+            return result, content
+        return result, completed_process.stdout
+
+    def get_version(self) -> str:
+        """Версия утилиты (определяется при первом обращении)."""
+        if self.__version is None:
+            self.__version = self.registry.probe(
+                self.get_name(), self.version_argument) or ''
+        return self.__version
+
+    def start_backend(self, process_method: str, batch: bool = False):
+        """
+        Запуск резидентного сервера утилиты до обработки файлов.
+
+        Позволяет запустить сервер до создания параллельных заданий;
+        иначе он запускается при обработке первого файла.
+
+        :param process_method: Метод обработки (fix / check).
+        :param batch: Запуск для пакетной обработки файлов.
+        """
+        if self.__backend is not None:
+            run_arguments = getattr(self, f'{process_method}_arguments')
+            self.__backend.ensure_started(
+                self.get_command(run_arguments, batch=batch))
+
+    @classmethod
+    def supports_stdin_fix(cls) -> bool:
+        """Утилита может исправлять код из стандартного ввода."""
+        return cls.stdin_fix_arguments is not None
+
+    @classmethod
+    def supports_batch(cls) -> bool:
+        """Поддерживает ли утилита обработку нескольких файлов за запуск."""
+        return cls.batch_output_pattern is not None
+
+    def check_batch(self, file_paths: Sequence[str]) -> Dict[str, Result]:
+        """Проверка набора файлов одним запуском утилиты."""
+        return self._process_batch(file_paths, self.check_arguments)
+
+    def fix_batch(self, file_paths: Sequence[str]) -> Dict[str, Result]:
+        """Исправление набора файлов одним запуском утилиты."""
+        return self._process_batch(file_paths, self.fix_arguments)
+
+    def get_batches(self, file_paths: Sequence, run_arguments: tuple,
+                    max_count: int = 0) -> Iterator[list]:
+        """
+        Разбиение путей до файлов на пакеты для пакетной обработки.
+
+        Размер пакета ограничен максимальной длиной командной строки и,
+        если указано, количеством файлов.
+
+        :param file_paths: Пути до обрабатываемых файлов.
+        :param run_arguments: Аргументы запуска.
+        :param max_count: Максимальное количество файлов в пакете
+            (0 - без ограничения).
+        :return: Генератор пакетов путей до файлов.
+        """
+        command = self.get_command(run_arguments, batch=True)
+        max_length = (get_arguments_max_length()
+                      - sum(map(get_argument_length, command)))
+
+        batch: list = []
+        batch_length = 0
+        for file_path in file_paths:
+            length = get_argument_length(str(file_path))
+            if batch and (batch_length + length > max_length
+                          or len(batch) == max_count):
+                yield batch
+                batch, batch_length = [], 0
+            batch.append(file_path)
+            batch_length += length
+
+        if batch:
+            yield batch
+
     def _get_extra_run_arguments(self) -> Sequence:
         """Дополнительные аргументы запуска приложения."""
         return self.extra_run_arguments if self.extra_run_arguments else ()
 
-    def _process_file(self, file_path: Path, run_arguments: tuple) -> Result:
+    def get_command(self, run_arguments: tuple, batch: bool = False) -> list:
         """
-        Обработка указанного файла.
+        Команда запуска утилиты без путей до обрабатываемых файлов.
 
-        :param file_path: Путь до обрабатываемого файла.
         :param run_arguments: Аргументы запуска.
-        :return: Результат обработки файла.
+        :param batch: Команда для пакетной обработки файлов.
+        :return: Команда запуска.
         """
         configuration = []
         if self.configuration_path and self.configuration_argument:
             configuration = [self.configuration_argument,
                              str(self.configuration_path)]
 
-        completed_process = run(  # noqa: S603
-            [self.get_name(), *configuration, *run_arguments,
-             *self._get_extra_run_arguments(), file_path], stdout=PIPE,
-            stderr=PIPE)
-        return Result(completed_process.returncode,
-                      output=completed_process.stdout.decode().rstrip(),
-                      error=completed_process.stderr.decode().rstrip())
+        output_arguments = (self.batch_output_arguments if batch
+                            else self.output_arguments)
+        if self.structured_output:
+            output_arguments = self.json_output_arguments
+        return [self.get_name(), *configuration, *run_arguments,
+                *self._get_extra_run_arguments(),
+                *self.__get_cache_arguments(), *output_arguments]
+
+    def __get_cache_arguments(self) -> list:
+        """Аргументы директории кэша утилиты (кроме резидентных серверов)."""
+        if (not self.cache_dir_argument or self.cache_dir is None
+                or self.__backend is not None):
+            return []
+        return [self.cache_dir_argument,
+                str(Path(self.cache_dir) / self.get_name())]
+
+    def _process_file(self, file_path: Path, run_arguments: tuple) -> Result:
+        """
+        Обработка указанного файла.
+
+        :param file_path: Путь до обрабатываемого файла.
+        :param run_arguments: Аргументы запуска.
+        :return: Результат обработки файла.
+        """
+        completed_process = self.__run(self.get_command(run_arguments),
+                                       [file_path])
+        return self._create_result(completed_process)
+
+    def _process_batch(self, file_paths: Sequence[str],
+                       run_arguments: tuple) -> Dict[str, Result]:
+        """
+        Обработка набора файлов одним запуском утилиты.
+
+        :param file_paths: Пути до обрабатываемых файлов.
+        :param run_arguments: Аргументы запуска.
+        :return: Результаты обработки для каждого из файлов.
+        """
+        completed_process = self.__run(
+            self.get_command(run_arguments, batch=True), file_paths,
+            batch=True)
+        result = self._create_result(completed_process)
+        results = self._split_batch_result(result, file_paths)
+        for file_path, file_result in results.items():
+            if file_result is not result:
+                file_result.skipped_lines = (
+                    completed_process.skipped_counts.get(file_path, 0))
+        return results
+
+    def __run(self, command: Sequence[str], file_paths: Sequence,
+              input_data: Optional[bytes] = None,
+              batch: bool = False) -> CompletedProcess:
+        """
+        Запуск утилиты для файлов (через резидентный сервер, если доступен).
+
+        При превышении времени работы (timeout) сообщение об этом
+        добавляется в поток ошибок завершённого процесса. При
+        ограничении вывода (max_output_lines) завершённый процесс
+        содержит только последние строки вывода (см. OutputTail).
+
+        :param command: Команда запуска без путей до файлов.
+        :param file_paths: Пути до обрабатываемых файлов.
+        :param input_data: Данные стандартного ввода утилиты.
+        :param batch: Пакетный запуск: строки вывода ограничиваются для
+            каждого файла отдельно.
+        :return: Завершённый процесс утилиты с количеством отброшенных
+            строк по файлам (skipped_counts).
+        """
+        if self.__backend is not None and self.__backend.ensure_started(
+                command):
+            completed_process = self.__backend.run(
+                command, list(map(str, file_paths)), input_data=input_data)
+            completed_process.skipped_counts = {}
+            return completed_process
+
+        output_tails = None
+        if (self.max_output_lines is not None and not self.structured_output
+                and input_data is None):
+            get_key = (partial(self.__match_batch_path,
+                               known_paths=self.__get_known_paths(file_paths))
+                       if batch else None)
+            output_tails = (OutputTail(self.max_output_lines, get_key),
+                            OutputTail(self.max_output_lines, get_key))
+        completed_process = run_measured(
+            [*command, *file_paths], input_data=input_data,
+            timeout=self.timeout, line_handlers=None if output_tails is None
+            else tuple(tail.add_line for tail in output_tails))
+        completed_process.skipped_counts = {}
+        if output_tails is not None:
+            completed_process.stdout, completed_process.stderr = (
+                tail.get_text().encode() for tail in output_tails)
+            for tail in output_tails:
+                for key, count in tail.skipped_counts.items():
+                    completed_process.skipped_counts[key] = (
+                        completed_process.skipped_counts.get(key, 0) + count)
+        if completed_process.timed_out:
+            message = (f'Превышено время работы {self.get_name()} '
+                       f'({self.timeout:g} с), процесс завершён.')
+            completed_process.stderr = linesep.encode().join(filter(None, (
+                completed_process.stderr.rstrip(), message.encode())))
+        return completed_process
+
+    def __replace_stdin_path(self, line: str, file_path: str) -> str:
+        """Замена STDIN_PATH на путь до файла в строке вывода утилиты."""
+        match = (self.batch_output_pattern.match(line)
+                 if self.batch_output_pattern is not None else None)
+        if match is None or match.group('path') != STDIN_PATH:
+            return line
+        start, end = match.span('path')
+        return line[:start] + file_path + line[end:]
+
+    def _create_result(self, completed_process: CompletedProcess) -> Result:
+        """
+        Создание результата обработки из завершённого процесса.
+
+        Вывод в формате JSON заменяется текстовым выводом разобранных
+        замечаний; если его не удалось разобрать (или утилита не
+        разбирает JSON) - используется как есть.
+        """
+        output = completed_process.stdout.decode().rstrip()
+        error = completed_process.stderr.decode().rstrip()
+        details = self.__get_process_details(completed_process)
+        if self.structured_output and output and not details['timed_out']:
+            try:
+                diagnostics = self.parse_json_output(json.loads(output))
+            except (ValueError, TypeError, KeyError) as parse_error:
+                error = linesep.join(filter(None, (
+                    error, f'Не удалось разобрать вывод {self.get_name()}: '
+                    f'{parse_error!r}')))
+            else:
+                if diagnostics is not None:
+                    return Result(completed_process.returncode,
+                                  output=format_diagnostics(diagnostics),
+                                  error=error, diagnostics=diagnostics,
+                                  **details)
+        return Result(completed_process.returncode, output=output,
+                      error=error, **details)
+
+    @staticmethod
+    def __get_process_details(completed_process: CompletedProcess) -> dict:
+        """
+        Сведения о запуске утилиты для результата обработки.
+
+        Использованные процессом ресурсы и признак превышения времени
+        работы (см. run_measured), количество отброшенных строк вывода
+        (см. __run). Для резидентных серверов ресурсы не измеряются.
+        """
+        return {'cpu_time': getattr(completed_process, 'cpu_time', None),
+                'max_rss': getattr(completed_process, 'max_rss', None),
+                'timed_out': getattr(completed_process, 'timed_out', False),
+                'skipped_lines': sum(getattr(
+                    completed_process, 'skipped_counts', {}).values())}
+
+    def parse_json_output(self, data) -> ParsedDiagnostics:
+        """
+        Замечания из вывода утилиты в формате JSON.
+
+        Переопределяется утилитами с json_output_arguments; без
+        переопределения вывод сохраняется как есть и разбирается
+        текстовым шаблоном замечаний (см. get_diagnostics).
+
+        :param data: Разобранный вывод утилиты.
+        :return: Замечания в порядке вывода; None - вывод не разобран.
+        """
+        return None
+
+    def get_diagnostics(self, file_path: Path,
+                        result: Result) -> List[Diagnostic]:
+        """
+        Замечания из результата обработки файла.
+
+        Текстовый вывод разбирается один раз - замечания сохраняются в
+        результате.
+
+        :param file_path: Путь до обработанного файла (для строк вывода
+            без пути).
+        :param result: Результат обработки файла.
+        :return: Замечания в порядке вывода.
+        """
+        if result.diagnostics is None:
+            result.diagnostics = [
+                diagnostic
+                for text in (result.output, result.error)
+                for diagnostic in parse_text_diagnostics(
+                    text, self.diagnostic_pattern, self.get_name(),
+                    default_path=str(file_path),
+                    default_severity=self.default_severity)]
+        return result.diagnostics
+
+    def _split_batch_result(self, result: Result,
+                            file_paths: Sequence[str]) -> Dict[str, Result]:
+        """
+        Разделение результата пакетной обработки по файлам.
+
+        Строки вывода (и разобранные замечания) относятся к файлу по
+        пути в их начале; строки без пути отбрасываются. Если ни одну
+        строку неуспешной обработки не удалось отнести к файлу или
+        утилита завершена из-за превышения времени работы - результат
+        пакета получают все файлы.
+
+        :param result: Результат пакетной обработки.
+        :param file_paths: Пути до обработанных файлов.
+        :return: Результаты обработки для каждого из файлов.
+        """
+        known_paths = self.__get_known_paths(file_paths)
+        outputs: Dict[str, List[str]] = {path: [] for path in file_paths}
+        errors: Dict[str, List[str]] = {path: [] for path in file_paths}
+        for text, file_lines in ((result.output, outputs),
+                                 (result.error, errors)):
+            for line in text.splitlines():
+                file_path = self.__match_batch_path(line, known_paths)
+                if file_path is not None:
+                    file_lines[file_path].append(line)
+
+        if result.is_timed_out or (not result.is_success and not any(
+                (*outputs.values(), *errors.values()))):
+            return {path: result for path in file_paths}
+
+        diagnostics: Dict[str, ParsedDiagnostics] = {
+            path: None if result.diagnostics is None else []
+            for path in file_paths}
+        for diagnostic in result.diagnostics or ():
+            file_path = known_paths.get(diagnostic.path, known_paths.get(
+                abspath(diagnostic.path)))
+            if file_path is not None:
+                diagnostics[file_path].append(diagnostic)
+
+        results = {}
+        for file_path in file_paths:
+            output, error = outputs[file_path], errors[file_path]
+            return_code = (result.return_code if output or error
+                           else ExitCodes.SUCCESS)
+            results[file_path] = Result(return_code,
+                                        output=linesep.join(output),
+                                        error=linesep.join(error),
+                                        diagnostics=diagnostics[file_path],
+                                        cpu_time=result.cpu_time,
+                                        max_rss=result.max_rss)
+        return results
+
+    @staticmethod
+    def __get_known_paths(file_paths: Sequence[str]) -> Dict[str, str]:
+        """Пути до файлов пакета по их абсолютным и указанным путям."""
+        known_paths = {abspath(path): path for path in file_paths}
+        known_paths.update((path, path) for path in file_paths)
+        return known_paths
+
+    def __match_batch_path(self, line: str,
+                           known_paths: Dict[str, str]) -> Optional[str]:
+        """Определение пути до файла, к которому относится строка вывода."""
+        match = self.batch_output_pattern.match(line)
+        if match is None:
+            return None
+
+        path = match.group('path')
+        return known_paths.get(path, known_paths.get(abspath(path)))
 
 
 class Flake8(ConsoleTool):
@@ -147,6 +675,11 @@ class Flake8(ConsoleTool):
     configuration_file_name = 'flake8.conf'
     configuration_path = TOOL_SETTINGS_PATH / configuration_file_name
     supported_file_suffixes = ('.py',)
+    batch_output_pattern = PATH_PREFIX_PATTERN
+    diagnostic_pattern = re.compile(
+        r'^(?P<path>[^:\s][^:]*):(?P<line>\d+):(?P<column>\d+): '
+        r'(?P<code>[A-Z]+\d+) (?P<message>.*)$')
+    in_process_backend = Flake8Engine
     for_check = True
 
 
@@ -158,8 +691,12 @@ class Autopep8(ConsoleTool):
     """
 
     configuration_argument = ''
-    extra_run_arguments = ('--in-place', '--aggressive')
+    extra_run_arguments = ('--aggressive',)
+    fix_arguments = ('--in-place',)
+    stdin_fix_arguments = ()
     supported_file_suffixes = ('.py',)
+    batch_output_pattern = PATH_PREFIX_PATTERN
+    in_process_backend = Autopep8Engine
     for_fix = True
 
 
@@ -173,6 +710,8 @@ class Autoflake(ConsoleTool):
     configuration_argument = ''
     extra_run_arguments = ('--in-place', '--remove-unused-variables')
     supported_file_suffixes = ('.py',)
+    batch_output_pattern = PATH_PREFIX_PATTERN
+    in_process_backend = AutoflakeEngine
     for_fix = True
 
 
@@ -186,6 +725,14 @@ class MyPy(ConsoleTool):
     configuration_file_name = 'mypy.conf'
     configuration_path = TOOL_SETTINGS_PATH / configuration_file_name
     supported_file_suffixes = ('.py',)
+    batch_output_pattern = PATH_PREFIX_PATTERN
+    diagnostic_pattern = re.compile(
+        r'^(?P<path>[^:\s][^:]*):(?P<line>\d+):(?:(?P<column>\d+):)? '
+        r'(?P<severity>error|warning|note): (?P<message>.*?)'
+        r'(?:  \[(?P<code>[\w-]+)\])?$')
+    project_scoped = True
+    cache_dir_argument = '--cache-dir'
+    resident_backend = DMypy
     for_check = True
     optional = True
     optional_flag = 'mypy'
@@ -200,7 +747,15 @@ class Black(ConsoleTool):
 
     configuration_file_name = 'black.cfg'
     configuration_path = TOOL_SETTINGS_PATH / configuration_file_name
+    stdin_fix_arguments = ()
     supported_file_suffixes = ('.py',)
+    batch_output_pattern = re.compile(
+        r'^(?:reformatted|error: cannot format) (?P<path>.+?)(?::\s.*)?$')
+    diagnostic_pattern = re.compile(
+        r'^error: cannot format (?P<path>.+?): (?P<message>'
+        r'Cannot parse: (?P<line>\d+):(?P<column>\d+).*|.*)$')
+    resident_backend = BlackD
+    in_process_backend = BlackEngine
     for_fix = True
     optional = True
     optional_flag = 'black'
@@ -218,8 +773,19 @@ class ShellCheck(ConsoleTool):
     configuration_file_name = '.shellcheckrc'
     configuration_path = TOOL_SETTINGS_PATH / configuration_file_name
     supported_file_suffixes = ('.sh',)
+    batch_output_arguments = ('--format=gcc',)
+    batch_output_pattern = PATH_PREFIX_PATTERN
+    json_output_arguments = ('--format=json',)
     for_check = True
 
+    def parse_json_output(self, data: list) -> List[Diagnostic]:
+        """Замечания из вывода shellcheck в формате JSON."""
+        return [Diagnostic(comment['file'], comment['line'],
+                           comment.get('column'), f'SC{comment["code"]}',
+                           normalize_severity(comment.get('level')),
+                           comment['message'], self.get_name())
+                for comment in data]
+
 
 class Hadolint(ConsoleTool):
     """
@@ -230,11 +796,24 @@ class Hadolint(ConsoleTool):
     """
 
     configuration_argument = ''
-    supported_file_suffixes = ('',)
+    supported_file_suffixes = ('.dockerfile',)
+    batch_output_pattern = PATH_PREFIX_PATTERN
+    json_output_arguments = ('--format', 'json')
+    diagnostic_pattern = re.compile(
+        r'^(?P<path>[^:\s][^:]*):(?P<line>\d+) (?P<code>[A-Z]+\d+) '
+        r'(?:(?P<severity>error|warning|info|style): )?(?P<message>.*)$')
     for_check = True
     optional = True
     optional_flag = 'hadolint'
 
+    def parse_json_output(self, data: list) -> List[Diagnostic]:
+        """Замечания из вывода hadolint в формате JSON."""
+        return [Diagnostic(comment['file'], comment['line'],
+                           comment.get('column'), comment['code'],
+                           normalize_severity(comment.get('level')),
+                           comment['message'], self.get_name())
+                for comment in data]
+
 
 class ESLint(ConsoleTool):
     """
@@ -243,17 +822,82 @@ class ESLint(ConsoleTool):
     .. seealso:: https://eslint.org
     """
 
-    NPM_ROOT: Optional[str] = check_output(('npm', 'root', '-g'))
-    NPM_ROOT_PATH: str = str(Path(NPM_ROOT).resolve())
-
     supported_file_suffixes = ('.js', '.vue')
     configuration_file_name = 'eslint.json'
     configuration_path = TOOL_SETTINGS_PATH / configuration_file_name
     fix_arguments = ('--fix',)
-    extra_run_arguments = ('--resolve-plugins-relative-to', NPM_ROOT_PATH)
+    batch_output_arguments = ('--format=unix',)
+    batch_output_pattern = PATH_PREFIX_PATTERN
+    json_output_arguments = ('--format=json',)
+    resident_backend = EslintD
     for_check = True
     for_fix = True
 
+    # Уровни важности замечаний ESLint (severity в выводе JSON).
+    severities = {1: WARNING, 2: ERROR}
+
+    def __init__(self, **kwargs):
+        """
+        Создание инструмента с определением пути до плагинов ESLint.
+
+        :param kwargs: Параметры инструмента (см. ConsoleTool).
+        """
+        super().__init__(**kwargs)
+        self.npm_root_path = self.__get_npm_root_path()
+
+    def _get_extra_run_arguments(self) -> tuple:
+        return ('--resolve-plugins-relative-to', self.npm_root_path,
+                *self.extra_run_arguments)
+
+    def parse_json_output(self, data: list) -> List[Diagnostic]:
+        """Замечания из вывода eslint в формате JSON (по файлам)."""
+        return [Diagnostic(file_result['filePath'], message.get('line', 0),
+                           message.get('column'), message.get('ruleId') or '',
+                           self.severities.get(message.get('severity'),
+                                               ERROR),
+                           message['message'], self.get_name())
+                for file_result in data
+                for message in file_result['messages']]
+
+    def __get_npm_root_path(self) -> str:
+        """
+        Путь до глобальных npm пакетов (с плагинами ESLint).
+
+        Если путь не удалось определить - работа приложения завершается
+            со статусом ExitCodes.UNSUCCESSFUL
+        """
+        self.registry.require('npm')
+        npm_root = self.registry.probe('npm', 'root', '-g',
+                                       context=self.__get_npm_config())
+        if npm_root is None:
+            interrupt_program_flow(
+                ExitCodes.UNSUCCESSFUL,
+                log_message='Не удалось определить директорию глобальных '
+                'npm пакетов.')
+        return str(Path(npm_root).resolve())
+
+    @staticmethod
+    def __get_npm_config() -> Tuple[str, ...]:
+        """
+        Настройки npm, от которых зависит путь до глобальных пакетов.
+
+        Учитываются переменные окружения с настройками npm (в том числе
+        prefix) и время изменения пользовательского файла настроек.
+        """
+        environment = {name.lower(): value
+                       for name, value in environ.items()
+                       if name.lower().startswith('npm_config_')
+                       or name == 'PREFIX'}
+        user_config_path = environment.get(
+            'npm_config_userconfig', str(Path.home() / '.npmrc'))
+        try:
+            user_config_time = str(Path(user_config_path).stat().st_mtime_ns)
+        except OSError:
+            user_config_time = ''
+        return (*(f'{name}={value}'
+                  for name, value in sorted(environment.items())),
+                user_config_path, user_config_time)
+
 
 class _PHPCodeSniffer(ConsoleTool):
     """
@@ -284,8 +928,24 @@ class _PHPCodeSniffer(ConsoleTool):
 class PHPCS(_PHPCodeSniffer):
     """Инструмент проверки кода PHP_CodeSniffer."""
 
+    batch_output_arguments = ('--report=emacs',)
+    batch_output_pattern = PATH_PREFIX_PATTERN
+    json_output_arguments = ('--report=json',)
+    diagnostic_pattern = re.compile(
+        r'^(?P<path>[^:\s][^:]*):(?P<line>\d+):(?P<column>\d+): '
+        r'(?P<severity>error|warning) - (?P<message>.*?)'
+        r'(?: \((?P<code>[\w.]+)\))?$')
     for_check = True
 
+    def parse_json_output(self, data: dict) -> List[Diagnostic]:
+        """Замечания из отчёта phpcs в формате JSON (по файлам)."""
+        return [Diagnostic(path, message['line'], message.get('column'),
+                           message.get('source', ''),
+                           normalize_severity(message.get('type')),
+                           message['message'], self.get_name())
+                for path, file_report in data['files'].items()
+                for message in file_report['messages']]
+
 
 class PHPCBF(_PHPCodeSniffer):
     """Инструмент форматирования кода PHP_CodeSniffer."""
@@ -305,6 +965,10 @@ class HTMLCS(ConsoleTool):
     check_arguments = ('hint',)
     fix_arguments = ('format', '--in-place')
     supported_file_suffixes = ('.html',)
+    diagnostic_pattern = re.compile(
+        r'^\s*(?:\[(?P<severity>\w+)\]\s*)?line (?P<line>\d+), '
+        r'column (?P<column>\d+): (?P<message>.*?)'
+        r'(?: \((?P<code>[^,()]+)(?:, [^()]*)?\))?$')
     for_check = True
 
 
@@ -319,7 +983,30 @@ class Stylelint(ConsoleTool):
     configuration_path = TOOL_SETTINGS_PATH / configuration_file_name
     supported_file_suffixes = ('.css', '.html', '.md', '.sass', '.scss',
                                '.less', '.sss')
-    extra_run_arguments = ('--formatter=verbose',)
+    output_arguments = ('--formatter=verbose',)
+    batch_output_arguments = ('--formatter=unix',)
+    batch_output_pattern = PATH_PREFIX_PATTERN
+    json_output_arguments = ('--formatter=json',)
+    diagnostic_pattern = re.compile(
+        r'^(?P<path>[^:\s][^:]*):(?P<line>\d+):(?P<column>\d+): '
+        r'(?P<message>.*?)(?: \((?P<code>[\w/-]+)\))?'
+        r'(?: \[(?P<severity>error|warning)\])?$')
     fix_arguments = ('--fix',)
     for_check = True
     for_fix = True
+
+    def parse_json_output(self, data: list) -> List[Diagnostic]:
+        """Замечания из вывода stylelint в формате JSON (по файлам)."""
+        diagnostics = []
+        for file_result in data:
+            for warning in file_result['warnings']:
+                rule = warning.get('rule', '')
+                message = warning['text']
+                if rule and message.endswith(f' ({rule})'):
+                    message = message[:-len(rule) - 3]
+                diagnostics.append(Diagnostic(
+                    file_result['source'], warning['line'],
+                    warning.get('column'), rule,
+                    normalize_severity(warning.get('severity')), message,
+                    self.get_name()))
+        return diagnostics
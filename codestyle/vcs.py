@@ -0,0 +1,78 @@
+"""Модуль получения изменённых файлов из локального git репозитория."""
+from logging import ERROR
+from os import fsdecode
+from pathlib import Path
+from subprocess import PIPE, run  # noqa: S404
+from typing import Iterator, List, Optional
+
+from codestyle.system_wrappers import ExitCodes, interrupt_program_flow
+
+# Разделитель имён файлов в выводе git с флагом -z.
+GIT_NAMES_SEPARATOR = '\0'
+
+
+def get_changed_paths(ref: Optional[str] = None,
+                      staged: bool = False) -> List[Path]:
+    """
+    Получение путей до изменённых файлов.
+
+    Используются только индекс и рабочее дерево локального репозитория,
+    сетевые операции не выполняются; удалённые файлы не учитываются.
+
+    :param ref: Ссылка (ветка, тег, коммит), относительно которой
+        определяются изменения рабочего дерева; неотслеживаемые файлы
+        также считаются изменёнными.
+    :param staged: Учитывать изменения, добавленные в индекс.
+    :return: Отсортированные абсолютные пути до изменённых файлов.
+    """
+    root = Path(_run_git('rev-parse', '--show-toplevel').rstrip('\n'))
+
+    names = set()
+    if staged:
+        names.update(_get_names('diff', '-z', '--cached', '--name-only',
+                                '--diff-filter=d'))
+    if ref:
+        names.update(_get_names('diff', '-z', '--name-only',
+                                '--diff-filter=d', ref, '--'))
+        names.update(_get_names('ls-files', '-z', '--others',
+                                '--exclude-standard', '--full-name'))
+    return sorted(root / name for name in names)
+
+
+def _get_names(*arguments: str) -> Iterator[str]:
+    """
+    Имена файлов (относительно корня репозитория) из вывода git.
+
+    :param arguments: Аргументы запуска git, включая флаг -z.
+    :return: Генератор имён файлов.
+    """
+    output = _run_git(*arguments)
+    return filter(None, output.split(GIT_NAMES_SEPARATOR))
+
+
+def _run_git(*arguments: str) -> str:
+    """
+    Запуск git с указанными аргументами.
+
+    При ошибке работа приложения завершается со статусом
+        ExitCodes.UNSUCCESSFUL
+
+    :param arguments: Аргументы запуска git.
+    :return: Вывод git.
+    """
+    try:
+        completed_process = run(('git', *arguments),  # noqa: S603, S607
+                                stdout=PIPE, stderr=PIPE)
+    except FileNotFoundError:
+        interrupt_program_flow(status=ExitCodes.UNSUCCESSFUL,
+                               log_message='Инструмент git не найден.',
+                               log_level=ERROR)
+        return ''
+
+    if completed_process.returncode != ExitCodes.SUCCESS:
+        error = fsdecode(completed_process.stderr).rstrip()
+        interrupt_program_flow(
+            status=ExitCodes.UNSUCCESSFUL,
+            log_message=f'Не удалось получить изменения из git: {error}',
+            log_level=ERROR)
+    return fsdecode(completed_process.stdout)
@@ -15,20 +15,22 @@ with open('requirements.txt', encoding='utf-8') as requirements_file:
     install_requires = requirements_file.read()
 
 application_entrypoint = f'{name} = {name}.command_line:run_process'
+client_entrypoint = f'{name}-client = {name}.client:run_client'
 
 setup(
     name=name,
     version=version,
     author=author,
     author_email=author_email,
-    packages=find_packages(exclude=('tests',)),
+    packages=find_packages(exclude=('tests', 'benchmarks')),
     include_package_data=True,
     zip_safe=False,
     url=url,
     license='GPLv3',
     description=short_description,
     long_description=long_description,
-    entry_points={'console_scripts': [application_entrypoint]},
+    entry_points={'console_scripts': [application_entrypoint,
+                                      client_entrypoint]},
     install_requires=install_requires,
     classifiers=[
         'Development Status :: 4 - Beta',
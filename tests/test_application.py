@@ -1,14 +1,61 @@
 """Проверки модуля application."""
+import json
 from logging import ERROR, INFO
+from io import StringIO
 from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import sleep
+from typing import Optional
 from unittest import TestCase
 from unittest.mock import Mock, call, patch
 
 from codestyle.application import ConsoleApplication
+from codestyle.cache import MEGABYTE
+from codestyle.diagnostics import Diagnostic
+from codestyle.scheduling import TimingHistory
 from codestyle.system_wrappers import ExitCodes
+from codestyle.tool_wrappers import Result
 
 
 MOCK_TEST_FILE = '/code/test_dir/test_file.py'
+# Параметры, отключающие дополнительные режимы работы приложения.
+DEFAULT_PARAMETERS = {
+    'target': (),
+    'exclude': (),
+    'ignore_files': True,
+    'fix': False,
+    'check': False,
+    'diff': False,
+    'exit_on_change': False,
+    'batch': False,
+    'jobs': 1,
+    'cache': False,
+    'changed_since': None,
+    'staged': False,
+    'resident': False,
+    'in_process': False,
+    'format': None,
+    'output': None,
+    'baseline': None,
+    'write_baseline': None,
+    'profile': False,
+    'profile_slowest': 10,
+    'profile_output': None,
+    'timeout': 0,
+    'tool_timeouts': {},
+    'max_output_lines': 0,
+    'file_suffixes': None,
+    'only_tools': frozenset(),
+    'skip_tools': frozenset(),
+    'shard_position': None,
+    'shard_balance': 'hash',
+    'shard_timings': None,
+}
+
+
+def create_parameters_storage(**parameters) -> Mock:
+    """Создание хранилища параметров с параметрами по-умолчанию."""
+    return Mock(**{**DEFAULT_PARAMETERS, **parameters})
 
 
 class TestConsoleApplication(TestCase):
@@ -28,7 +75,7 @@ class TestConsoleApplication(TestCase):
         mocked_logger: Mock,
     ):
         """Проверка инициализации с fix методом."""
-        mock_parameters_storage = Mock(
+        mock_parameters_storage = create_parameters_storage(
             target=(MOCK_TEST_FILE,),
             fix=True,
             exclude=('/code/test_dir/test_exclude.py',),
@@ -63,7 +110,13 @@ class TestConsoleApplication(TestCase):
         args, kwargs = mocked_tree.call_args
         self.assertTupleEqual((MOCK_TEST_FILE,), args)
         self.assertDictEqual(
-            {'excludes': ('/code/test_dir/test_exclude.py',)}, kwargs
+            {
+                'excludes': ('/code/test_dir/test_exclude.py',),
+                'candidates': None,
+                'use_ignore_files': True,
+                'name_filter': None,
+            },
+            kwargs,
         )
 
         self.assertEqual(True, mock_get_item.called)
@@ -81,9 +134,8 @@ class TestConsoleApplication(TestCase):
         mock_get_item = Mock()
         mocked_messages.__getitem__ = mock_get_item
 
-        mock_parameters_storage = Mock(
+        mock_parameters_storage = create_parameters_storage(
             target=(MOCK_TEST_FILE,),
-            fix=False,
             exclude=('/code/test_dir/test_exclude.py',),
         )
 
@@ -128,11 +180,11 @@ class TestConsoleApplication(TestCase):
 
         mocked_process_file.return_value = Mock(is_success=False)
 
-        mock_tool = Mock(autospec=True)
+        mock_tool = Mock(autospec=True, project_scoped=False)
         mocked_tool.return_value = mock_tool
         mock_get = Mock(return_value=[mock_tool])
         application = ConsoleApplication(
-            Mock(fix=False, target=(), exclude=())
+            create_parameters_storage()
         )
         application._ConsoleApplication__file_suffix_tools = Mock(get=mock_get)
 
@@ -213,7 +265,7 @@ class TestConsoleApplication(TestCase):
             )
         )
         ConsoleApplication(
-            Mock(fix=False, target=(), exclude=())
+            create_parameters_storage()
         ).process_files()
 
         self.assertEqual(True, mocked_interrupt_program_flow.called)
@@ -230,13 +282,924 @@ class TestConsoleApplication(TestCase):
             kwargs,
         )
 
+    @patch('codestyle.application.interrupt_program_flow', new_callable=Mock)
+    @patch('codestyle.application.ExpandedPathTree', new_callable=Mock)
+    @patch.object(ConsoleApplication, 'logger', new=Mock())
+    @patch.object(ConsoleApplication, 'get_tool', new_callable=Mock)
+    @patch.object(
+        ConsoleApplication, 'get_file_suffix_tools', new_callable=Mock
+    )
+    def test_process_files_with_batch(
+        self,
+        mocked_file_suffix_tools_getter: Mock,
+        mocked_tool_getter: Mock,
+        mocked_tree: Mock,
+        mocked_interrupt_program_flow: Mock,
+    ):
+        """Проверка process_files в пакетном режиме."""
+        paths = [Path('first.py'), Path('second.py'), Path('third.py')]
+        mocked_tree.return_value = Mock(
+            path_gen=Mock(return_value=iter(paths))
+        )
+        mock_tool_cls = Mock()
+        mocked_file_suffix_tools_getter.return_value = {
+            '.py': [mock_tool_cls]
+        }
+
+        mock_check_batch = Mock(
+            side_effect=lambda batch: {
+                path: Mock(is_success=path != 'second.py', whole_output='',
+                           cpu_time=None)
+                for path in batch
+            }
+        )
+        mock_tool = Mock(
+            supports_batch=Mock(return_value=True),
+            check_arguments=('--check',),
+            get_batches=Mock(return_value=iter([paths[:2], paths[2:]])),
+            check_batch=mock_check_batch,
+            project_scoped=False,
+        )
+        mock_tool.get_name.return_value = 'tool'
+        mocked_tool_getter.return_value = mock_tool
+
+        ConsoleApplication(
+            create_parameters_storage(batch=True, batch_size=2)
+        ).process_files()
+
+        self.assertEqual(1, mocked_tool_getter.call_count)
+        args, kwargs = mocked_tool_getter.call_args
+        self.assertTupleEqual((mock_tool_cls,), args)
+
+        self.assertEqual(1, mock_tool.get_batches.call_count)
+        args, kwargs = mock_tool.get_batches.call_args
+        self.assertTupleEqual((paths, ('--check',)), args)
+        self.assertDictEqual({'max_count': 2}, kwargs)
+
+        self.assertEqual(2, mock_check_batch.call_count)
+        self.assertListEqual(
+            [call(['first.py', 'second.py']), call(['third.py'])],
+            mock_check_batch.mock_calls,
+        )
+
+        self.assertEqual(1, mocked_interrupt_program_flow.call_count)
+        args, kwargs = mocked_interrupt_program_flow.call_args
+        self.assertEqual(ExitCodes.UNSUCCESSFUL, kwargs['status'])
+        self.assertEqual(
+            '💔 Так-так-таак... Коллегам не стыдно в глаза смотреть? '
+            'Необходимо поправить файлов: 1.',
+            kwargs['log_message'],
+        )
+
+    @patch('codestyle.application.interrupt_program_flow', new=Mock())
+    @patch('codestyle.application.ExpandedPathTree', new_callable=Mock)
+    @patch.object(ConsoleApplication, 'logger', new=Mock())
+    @patch.object(ConsoleApplication, 'get_tool', new_callable=Mock)
+    @patch.object(
+        ConsoleApplication, 'get_file_suffix_tools', new_callable=Mock
+    )
+    def test_process_files_with_batch_fix_jobs(
+        self,
+        mocked_file_suffix_tools_getter: Mock,
+        mocked_tool_getter: Mock,
+        mocked_tree: Mock,
+    ):
+        """Проверка сохранения исправлений утилит в пакетном режиме."""
+        def create_tool(old: bytes, new: bytes) -> Mock:
+            def fix_batch(batch: list) -> dict:
+                for path in batch:
+                    content = Path(path).read_bytes()
+                    sleep(0.01)
+                    Path(path).write_bytes(content.replace(old, new))
+                return {path: Result(0) for path in batch}
+
+            return Mock(
+                supports_batch=Mock(return_value=True),
+                fix_arguments=(),
+                get_batches=lambda paths, arguments, max_count: [
+                    paths[index:index + max_count]
+                    for index in range(0, len(paths), max_count)
+                ],
+                fix_batch=fix_batch,
+            )
+
+        tools = {'autopep8': create_tool(b'x', b'y'),
+                 'autoflake': create_tool(b'1', b'2')}
+        mocked_file_suffix_tools_getter.return_value = {'.py': list(tools)}
+        mocked_tool_getter.side_effect = tools.get
+
+        with TemporaryDirectory() as directory:
+            paths = [Path(directory) / f'{index}.py' for index in range(4)]
+            for path in paths:
+                path.write_bytes(b'x = 1\n')
+            mocked_tree.return_value = Mock(
+                path_gen=Mock(return_value=iter(paths))
+            )
+
+            ConsoleApplication(
+                create_parameters_storage(fix=True, batch=True, batch_size=1,
+                                          jobs=8)
+            ).process_files()
+
+            self.assertListEqual([b'y = 2\n'] * 4,
+                                 [path.read_bytes() for path in paths])
+
+    @patch('codestyle.application.interrupt_program_flow', new_callable=Mock)
+    @patch('codestyle.application.ExpandedPathTree', new_callable=Mock)
+    @patch.object(ConsoleApplication, 'logger', new_callable=Mock)
+    @patch.object(ConsoleApplication, 'get_tool', new_callable=Mock)
+    @patch.object(
+        ConsoleApplication, 'get_file_suffix_tools', new_callable=Mock
+    )
+    def test_process_files_with_jobs(
+        self,
+        mocked_file_suffix_tools_getter: Mock,
+        mocked_tool_getter: Mock,
+        mocked_logger: Mock,
+        mocked_tree: Mock,
+        mocked_interrupt_program_flow: Mock,
+    ):
+        """Проверка сохранения порядка вывода при параллельной обработке."""
+        paths = [Path(f'{index}.py') for index in range(8)]
+        mocked_tree.return_value = Mock(
+            path_gen=Mock(return_value=iter(paths))
+        )
+        mocked_file_suffix_tools_getter.return_value = {'.py': [Mock()]}
+
+        def check(path: str) -> Mock:
+            sleep(0.01 * (8 - int(path[0])))
+            return Mock(is_success=True, whole_output=path)
+
+        mocked_tool_getter.return_value = Mock(check=check,
+                                               project_scoped=False)
+
+        ConsoleApplication(
+            create_parameters_storage(jobs=4)
+        ).process_files()
+
+        self.assertListEqual(
+            [call(INFO, str(path)) for path in paths],
+            mocked_logger.log.mock_calls,
+        )
+        args, kwargs = mocked_interrupt_program_flow.call_args
+        self.assertEqual(ExitCodes.SUCCESS, kwargs['status'])
+
+    @patch('codestyle.application.interrupt_program_flow', new=Mock())
+    @patch('codestyle.application.write_file_atomically', new_callable=Mock)
+    @patch('codestyle.application.ExpandedPathTree', new_callable=Mock)
+    @patch.object(ConsoleApplication, 'logger', new=Mock())
+    @patch.object(ConsoleApplication, 'get_tool', new_callable=Mock)
+    @patch.object(
+        ConsoleApplication, 'get_file_suffix_tools', new_callable=Mock
+    )
+    def test_process_files_with_fix_pipeline(
+        self,
+        mocked_file_suffix_tools_getter: Mock,
+        mocked_tool_getter: Mock,
+        mocked_tree: Mock,
+        mocked_write: Mock,
+    ):
+        """Проверка цепочки исправлений с однократной записью файла."""
+        calls = []
+
+        def create_tool(name: str, replacement: Optional[bytes]) -> Mock:
+            def fix(path: str) -> Result:
+                calls.append(name)
+                return Result(0)
+
+            def fix_content(path: Path, content: bytes) -> tuple:
+                calls.append(name)
+                return Result(0), content.replace(b'x', replacement)
+
+            return Mock(fix=fix, fix_content=fix_content,
+                        supports_stdin_fix=Mock(
+                            return_value=replacement is not None))
+
+        tools = {'autopep8': create_tool('autopep8', b'y'),
+                 'autoflake': create_tool('autoflake', None),
+                 'black': create_tool('black', b'z')}
+        mocked_file_suffix_tools_getter.return_value = {'.py': list(tools)}
+        mocked_tool_getter.side_effect = tools.get
+
+        with TemporaryDirectory() as directory:
+            paths = [Path(directory) / 'changed.py',
+                     Path(directory) / 'unchanged.py']
+            paths[0].write_bytes(b'x = 1\n')
+            paths[1].write_bytes(b'a = 1\n')
+            mocked_tree.return_value = Mock(
+                path_gen=Mock(return_value=iter(paths))
+            )
+
+            ConsoleApplication(
+                create_parameters_storage(fix=True)
+            ).process_files()
+
+        self.assertListEqual(
+            ['autoflake', 'autopep8', 'black'] * 2, calls,
+        )
+        mocked_write.assert_called_once_with(paths[0], b'y = 1\n')
+
+    @patch('codestyle.application.interrupt_program_flow', new_callable=Mock)
+    @patch('codestyle.application.ResultCache', new_callable=Mock)
+    @patch('codestyle.application.TimingHistory', new=Mock())
+    @patch('codestyle.application.ExpandedPathTree', new_callable=Mock)
+    @patch.object(ConsoleApplication, 'logger', new_callable=Mock)
+    @patch.object(ConsoleApplication, 'get_tool', new_callable=Mock)
+    @patch.object(
+        ConsoleApplication, 'get_file_suffix_tools', new_callable=Mock
+    )
+    def test_process_files_with_fix_and_check(
+        self,
+        mocked_file_suffix_tools_getter: Mock,
+        mocked_tool_getter: Mock,
+        mocked_logger: Mock,
+        mocked_tree: Mock,
+        mocked_cache_cls: Mock,
+        mocked_interrupt_program_flow: Mock,
+    ):
+        """Проверка исправления и проверки файлов за один обход."""
+        def fix(path: str) -> Result:
+            if Path(path).name == 'changed.py':
+                Path(path).write_bytes(b'y = 1\n')
+            return Result(0)
+
+        fixer = Mock(fix=Mock(side_effect=fix), project_scoped=False,
+                     supports_stdin_fix=Mock(return_value=False))
+        checker = Mock(check=Mock(return_value=Result(1, output='E302')),
+                       check_arguments=(), project_scoped=False)
+        mocked_file_suffix_tools_getter.side_effect = [
+            {'.py': ['fixer']}, {'.py': ['checker']},
+        ]
+        mocked_tool_getter.side_effect = {'fixer': fixer,
+                                          'checker': checker}.get
+
+        mock_cache = mocked_cache_cls.return_value
+        mock_cache.get_tool_key.return_value = 'checker'
+        mock_cache.get_file_key = Mock(
+            side_effect=lambda tool_key, path: f'{tool_key}-{path.name}'
+        )
+        mock_cache.get = Mock(
+            side_effect=lambda key: (
+                Result(0) if key == 'checker-unchanged.py' else None
+            )
+        )
+
+        with TemporaryDirectory() as directory:
+            paths = [Path(directory) / 'changed.py',
+                     Path(directory) / 'unchanged.py']
+            for path in paths:
+                path.write_bytes(b'x = 1\n')
+            mock_path_gen = Mock(return_value=iter(paths))
+            mocked_tree.return_value = Mock(path_gen=mock_path_gen)
+
+            ConsoleApplication(
+                create_parameters_storage(
+                    fix=True, check=True, cache=True,
+                    cache_dir=Path('/cache'), cache_size=1,
+                )
+            ).process_files()
+
+        self.assertEqual(1, mock_path_gen.call_count)
+        self.assertEqual(2, fixer.fix.call_count)
+        self.assertEqual(1, checker.check.call_count)
+        args, kwargs = checker.check.call_args
+        self.assertTupleEqual((str(paths[0]),), args)
+        self.assertListEqual(
+            [call('checker-changed.py', checker.check.return_value)],
+            mock_cache.set.mock_calls,
+        )
+        self.assertIn(call('Исправлено файлов: 1.'),
+                      mocked_logger.info.mock_calls)
+
+        args, kwargs = mocked_interrupt_program_flow.call_args
+        self.assertEqual(ExitCodes.UNSUCCESSFUL, kwargs['status'])
+        self.assertEqual(
+            '💔 Так-так-таак... Коллегам не стыдно в глаза смотреть? '
+            'Необходимо поправить файлов: 1.',
+            kwargs['log_message'],
+        )
+
+    @patch('codestyle.application.interrupt_program_flow', new_callable=Mock)
+    @patch('codestyle.application.ExpandedPathTree', new_callable=Mock)
+    @patch.object(ConsoleApplication, 'logger', new_callable=Mock)
+    @patch.object(ConsoleApplication, 'get_tool', new_callable=Mock)
+    @patch.object(
+        ConsoleApplication, 'get_file_suffix_tools', new_callable=Mock
+    )
+    def test_process_files_with_fix_and_check_resolved(
+        self,
+        mocked_file_suffix_tools_getter: Mock,
+        mocked_tool_getter: Mock,
+        mocked_logger: Mock,
+        mocked_tree: Mock,
+        mocked_interrupt_program_flow: Mock,
+    ):
+        """Проверка статуса по этапу проверки при --fix --check."""
+        def fix(path: str) -> Result:
+            Path(path).write_bytes(b'y = 1\n')
+            # Утилита исправления сообщает об исправленных замечаниях
+            # ненулевым статусом (как phpcbf).
+            return Result(1, output='Fixed 1 error')
+
+        fixer = Mock(fix=Mock(side_effect=fix), project_scoped=False,
+                     supports_stdin_fix=Mock(return_value=False))
+        checker = Mock(check=Mock(return_value=Result(0)),
+                       check_arguments=(), project_scoped=False)
+        mocked_file_suffix_tools_getter.side_effect = [
+            {'.py': ['fixer']}, {'.py': ['checker']},
+        ]
+        mocked_tool_getter.side_effect = {'fixer': fixer,
+                                          'checker': checker}.get
+
+        with TemporaryDirectory() as directory:
+            path = Path(directory) / 'changed.py'
+            path.write_bytes(b'x = 1\n')
+            mocked_tree.return_value = Mock(
+                path_gen=Mock(return_value=iter([path]))
+            )
+
+            ConsoleApplication(
+                create_parameters_storage(fix=True, check=True)
+            ).process_files()
+
+        self.assertEqual(1, checker.check.call_count)
+        self.assertIn(
+            call('Утилиты исправления завершились с ошибкой для файлов: 1.'),
+            mocked_logger.warning.mock_calls,
+        )
+        args, kwargs = mocked_interrupt_program_flow.call_args
+        self.assertEqual(ExitCodes.SUCCESS, kwargs['status'])
+        self.assertEqual(
+            'Я проверил твои файлы (1 шт.), можешь не беспокоиться об их '
+            'качестве. ✨ 💥',
+            kwargs['log_message'],
+        )
+
+    @patch('codestyle.application.interrupt_program_flow', new_callable=Mock)
+    @patch('codestyle.application.ExpandedPathTree', new_callable=Mock)
+    @patch.object(ConsoleApplication, 'logger', new=Mock())
+    @patch.object(ConsoleApplication, 'get_tool', new_callable=Mock)
+    @patch.object(
+        ConsoleApplication, 'get_file_suffix_tools', new_callable=Mock
+    )
+    def test_process_files_with_fix_diff(
+        self,
+        mocked_file_suffix_tools_getter: Mock,
+        mocked_tool_getter: Mock,
+        mocked_tree: Mock,
+        mocked_interrupt_program_flow: Mock,
+    ):
+        """Проверка подсчёта изменённых файлов и вывода изменений."""
+        def fix(path: str) -> Result:
+            file_path = Path(path)
+            file_path.write_bytes(file_path.read_bytes().replace(b'x', b'y'))
+            return Result(0)
+
+        mocked_file_suffix_tools_getter.return_value = {'.py': [Mock]}
+        mocked_tool_getter.return_value = Mock(
+            fix=fix, supports_stdin_fix=Mock(return_value=False))
+        stdout = StringIO()
+
+        with TemporaryDirectory() as directory:
+            paths = [Path(directory) / 'changed.py',
+                     Path(directory) / 'unchanged.py']
+            paths[0].write_bytes(b'x = 1\n')
+            paths[1].write_bytes(b'a = 1\n')
+            mocked_tree.return_value = Mock(
+                path_gen=Mock(return_value=iter(paths))
+            )
+
+            with patch('codestyle.application.sys.stdout', new=stdout):
+                ConsoleApplication(
+                    create_parameters_storage(fix=True, diff=True)
+                ).process_files()
+
+        self.assertEqual(
+            f'--- {paths[0]}\n+++ {paths[0]}\n@@ -1 +1 @@\n-x = 1\n+y = 1\n',
+            stdout.getvalue(),
+        )
+        args, kwargs = mocked_interrupt_program_flow.call_args
+        self.assertEqual(ExitCodes.SUCCESS, kwargs['status'])
+        self.assertEqual(
+            'Проверено файлов - 2, из них было исправлено - 1.',
+            kwargs['log_message'],
+        )
+
+    @patch('codestyle.application.interrupt_program_flow', new_callable=Mock)
+    @patch('codestyle.application.ExpandedPathTree', new_callable=Mock)
+    @patch.object(ConsoleApplication, 'logger', new=Mock())
+    @patch.object(ConsoleApplication, 'get_tool', new_callable=Mock)
+    @patch.object(
+        ConsoleApplication, 'get_file_suffix_tools', new_callable=Mock
+    )
+    def test_process_files_with_fix_exit_on_change(
+        self,
+        mocked_file_suffix_tools_getter: Mock,
+        mocked_tool_getter: Mock,
+        mocked_tree: Mock,
+        mocked_interrupt_program_flow: Mock,
+    ):
+        """Проверка статуса исправления с параметром --exit-on-change."""
+        def fix(path: str) -> Result:
+            Path(path).write_bytes(b'y = 1\n')
+            return Result(0)
+
+        mocked_file_suffix_tools_getter.return_value = {'.py': [Mock]}
+        mocked_tool_getter.return_value = Mock(
+            fix=fix, supports_stdin_fix=Mock(return_value=False))
+
+        for exit_on_change, status in ((False, ExitCodes.SUCCESS),
+                                       (True, ExitCodes.UNSUCCESSFUL)):
+            with self.subTest(exit_on_change=exit_on_change), \
+                    TemporaryDirectory() as directory:
+                path = Path(directory) / 'changed.py'
+                path.write_bytes(b'x = 1\n')
+                mocked_tree.return_value = Mock(
+                    path_gen=Mock(return_value=iter([path]))
+                )
+
+                ConsoleApplication(
+                    create_parameters_storage(
+                        fix=True, exit_on_change=exit_on_change)
+                ).process_files()
+
+                args, kwargs = mocked_interrupt_program_flow.call_args
+                self.assertEqual(status, kwargs['status'])
+                self.assertEqual(
+                    'Проверено файлов - 1, из них было исправлено - 1.',
+                    kwargs['log_message'],
+                )
+
+    @patch('codestyle.application.interrupt_program_flow', new=Mock())
+    @patch('codestyle.application.ExpandedPathTree', new_callable=Mock)
+    @patch.object(ConsoleApplication, 'logger', new=Mock())
+    @patch.object(ConsoleApplication, 'get_tool', new_callable=Mock)
+    @patch.object(
+        ConsoleApplication, 'get_file_suffix_tools', new_callable=Mock
+    )
+    def test_process_files_with_report(
+        self,
+        mocked_file_suffix_tools_getter: Mock,
+        mocked_tool_getter: Mock,
+        mocked_tree: Mock,
+    ):
+        """Проверка записи отчёта с длительностью обработки."""
+        paths = [Path('first.py'), Path('second.py')]
+        mocked_tree.return_value = Mock(
+            path_gen=Mock(return_value=iter(paths))
+        )
+        mocked_file_suffix_tools_getter.return_value = {'.py': [Mock]}
+        diagnostic = Diagnostic('second.py', 1, 1, 'E302', 'error',
+                                'expected 2 blank lines', 'flake8')
+        mock_tool = Mock(
+            check=Mock(side_effect=[
+                Result(0), Result(1, output=str(diagnostic))
+            ]),
+            get_diagnostics=Mock(
+                side_effect=lambda path, result: (
+                    [] if result.is_success else [diagnostic]
+                )
+            ),
+            project_scoped=False,
+        )
+        mock_tool.get_name.return_value = 'flake8'
+        mocked_tool_getter.return_value = mock_tool
+        stdout = StringIO()
+
+        with patch('codestyle.reporters.sys.stdout', new=stdout):
+            ConsoleApplication(
+                create_parameters_storage(format='jsonl')
+            ).process_files()
+
+        records = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        self.assertListEqual(
+            [('first.py', True), ('second.py', False)],
+            [(record['file'], record['success']) for record in records[:2]],
+        )
+        self.assertEqual('flake8', records[1]['tool'])
+        self.assertEqual('E302', records[1]['diagnostics'][0]['code'])
+        self.assertLessEqual(0, records[0]['duration'])
+        self.assertDictEqual(
+            {'type': 'summary', 'method': 'check',
+             'status': ExitCodes.UNSUCCESSFUL, 'total_count': 2,
+             'total_failed': 1, 'total_changed': 0},
+            records[2],
+        )
+
+    @patch('codestyle.application.cancel_processes', new_callable=Mock)
+    @patch('codestyle.application.ExpandedPathTree', new_callable=Mock)
+    @patch.object(ConsoleApplication, 'logger', new_callable=Mock)
+    @patch.object(ConsoleApplication, 'get_tool', new_callable=Mock)
+    @patch.object(
+        ConsoleApplication, 'get_file_suffix_tools', new_callable=Mock
+    )
+    def test_process_files_with_keyboard_interrupt(
+        self,
+        mocked_file_suffix_tools_getter: Mock,
+        mocked_tool_getter: Mock,
+        mocked_logger: Mock,
+        mocked_tree: Mock,
+        mocked_cancel_processes: Mock,
+    ):
+        """Проверка итогов обработанных файлов при прерывании."""
+        paths = [Path('first.py'), Path('second.py'), Path('third.py')]
+        mocked_tree.return_value = Mock(
+            path_gen=Mock(return_value=iter(paths))
+        )
+        mocked_file_suffix_tools_getter.return_value = {'.py': [Mock]}
+        mock_tool = Mock(check=Mock(side_effect=[
+            Result(0), Result(1, output='error'), KeyboardInterrupt,
+        ]), project_scoped=False)
+        mock_tool.get_name.return_value = 'flake8'
+        mocked_tool_getter.return_value = mock_tool
+
+        with self.assertRaises(KeyboardInterrupt):
+            ConsoleApplication(create_parameters_storage()).process_files()
+
+        self.assertEqual(True, mocked_cancel_processes.called)
+        mocked_logger.warning.assert_called_once_with(
+            'Обработка прервана: обработано файлов - 2, из них с ошибками - '
+            '1.'
+        )
+
+    @patch('codestyle.application.interrupt_program_flow', new=Mock())
+    @patch('codestyle.application.ExpandedPathTree', new_callable=Mock)
+    @patch.object(ConsoleApplication, 'logger', new=Mock())
+    @patch.object(ConsoleApplication, 'get_tool', new_callable=Mock)
+    @patch.object(
+        ConsoleApplication, 'get_file_suffix_tools', new_callable=Mock
+    )
+    def test_process_files_with_profile(
+        self,
+        mocked_file_suffix_tools_getter: Mock,
+        mocked_tool_getter: Mock,
+        mocked_tree: Mock,
+    ):
+        """Проверка вывода и записи профиля обработки."""
+        paths = [Path('first.py'), Path('second.py')]
+        mocked_tree.return_value = Mock(
+            path_gen=Mock(return_value=iter(paths))
+        )
+        mocked_file_suffix_tools_getter.return_value = {'.py': [Mock]}
+        mock_tool = Mock(check=Mock(side_effect=[
+            Result(0, cpu_time=0.5, max_rss=1024),
+            Result(1, cpu_time=1.5, max_rss=2048),
+        ]), project_scoped=False)
+        mock_tool.get_name.return_value = 'flake8'
+        mocked_tool_getter.return_value = mock_tool
+        stderr = StringIO()
+
+        with TemporaryDirectory() as directory:
+            profile_path = Path(directory) / 'profile.json'
+            with patch('codestyle.application.sys.stderr', new=stderr):
+                ConsoleApplication(create_parameters_storage(
+                    profile=True, profile_slowest=1,
+                    profile_output=profile_path,
+                )).process_files()
+            profile = json.loads(profile_path.read_text(encoding='utf-8'))
+
+        lines = stderr.getvalue().splitlines()
+        self.assertEqual(True, lines[0].startswith('Профиль обработки'))
+        self.assertEqual('flake8', lines[2].split()[0])
+        self.assertEqual('Самые долгие запуски (1):', lines[3])
+        self.assertEqual(5, len(lines))
+        self.assertListEqual(
+            [('first.py', 0.5, 1024), ('second.py', 1.5, 2048)],
+            [(timing['file'], timing['cpu_time'], timing['max_rss'])
+             for timing in profile['timings']],
+        )
+        self.assertEqual(2.0, profile['tools']['flake8']['cpu_time'])
+
+    @patch('codestyle.application.interrupt_program_flow', new_callable=Mock)
+    @patch('codestyle.application.ExpandedPathTree', new_callable=Mock)
+    @patch.object(ConsoleApplication, 'logger', new=Mock())
+    @patch.object(ConsoleApplication, 'get_tool', new_callable=Mock)
+    @patch.object(
+        ConsoleApplication, 'get_file_suffix_tools', new_callable=Mock
+    )
+    def test_process_files_with_baseline(
+        self,
+        mocked_file_suffix_tools_getter: Mock,
+        mocked_tool_getter: Mock,
+        mocked_tree: Mock,
+        mocked_interrupt_program_flow: Mock,
+    ):
+        """Проверка записи базового файла и пропуска известных замечаний."""
+        mocked_file_suffix_tools_getter.return_value = {'.py': [Mock]}
+
+        def check(path: str) -> Result:
+            lines = Path(path).read_text().splitlines()
+            diagnostics = [
+                Diagnostic(path, index, 1, 'F401', 'error', 'unused',
+                           'flake8')
+                for index, line in enumerate(lines, start=1)
+                if line.startswith('import')
+            ]
+            return Result(1 if diagnostics else 0, output='unused',
+                          diagnostics=diagnostics)
+
+        mocked_tool_getter.return_value = Mock(
+            check=check,
+            get_diagnostics=lambda path, result: result.diagnostics,
+            project_scoped=False,
+        )
+
+        def run_application(**parameters) -> int:
+            mocked_tree.return_value = Mock(
+                path_gen=Mock(return_value=iter([file_path]))
+            )
+            ConsoleApplication(
+                create_parameters_storage(**parameters)
+            ).process_files()
+            args, kwargs = mocked_interrupt_program_flow.call_args
+            return kwargs['status']
+
+        with TemporaryDirectory() as directory:
+            file_path = Path(directory) / 'test.py'
+            baseline_path = Path(directory) / 'baseline.bin'
+            file_path.write_text('import os\n')
+
+            self.assertEqual(
+                ExitCodes.SUCCESS,
+                run_application(write_baseline=baseline_path),
+            )
+            self.assertEqual(True, baseline_path.exists())
+
+            file_path.write_text('\n\nimport os\n')
+            self.assertEqual(ExitCodes.SUCCESS,
+                             run_application(baseline=baseline_path))
+
+            file_path.write_text('import os\nimport sys\n')
+            self.assertEqual(ExitCodes.UNSUCCESSFUL,
+                             run_application(baseline=baseline_path))
+
+    @patch('codestyle.application.interrupt_program_flow', new=Mock())
+    @patch('codestyle.application.ResultCache', new_callable=Mock)
+    @patch('codestyle.application.TimingHistory', new=Mock())
+    @patch('codestyle.application.ExpandedPathTree', new_callable=Mock)
+    @patch.object(ConsoleApplication, 'logger', new=Mock())
+    @patch.object(ConsoleApplication, 'get_tool', new_callable=Mock)
+    @patch.object(
+        ConsoleApplication, 'get_file_suffix_tools', new_callable=Mock
+    )
+    def test_process_files_with_cache(
+        self,
+        mocked_file_suffix_tools_getter: Mock,
+        mocked_tool_getter: Mock,
+        mocked_tree: Mock,
+        mocked_cache_cls: Mock,
+    ):
+        """Проверка повторного использования результатов из кэша."""
+        paths = [Path('cached.py'), Path('new.py')]
+        mocked_tree.return_value = Mock(
+            path_gen=Mock(return_value=iter(paths))
+        )
+        mocked_file_suffix_tools_getter.return_value = {'.py': [Mock]}
+        cached_result = Result(0)
+        new_result = Result(1, output='new.py:1:1: E302')
+        mock_tool = Mock(check=Mock(return_value=new_result),
+                         check_arguments=(), project_scoped=False)
+        mocked_tool_getter.return_value = mock_tool
+
+        mock_cache = mocked_cache_cls.return_value
+        mock_cache.get_file_key = Mock(
+            side_effect=lambda tool_key, path: f'{tool_key}-{path}'
+        )
+        mock_cache.get_tool_key.return_value = 'tool'
+        mock_cache.get = Mock(
+            side_effect=lambda key: (
+                cached_result if key == 'tool-cached.py' else None
+            )
+        )
+
+        ConsoleApplication(
+            create_parameters_storage(
+                cache=True, cache_dir=Path('/cache'), cache_size=1
+            )
+        ).process_files()
+
+        args, kwargs = mocked_cache_cls.call_args
+        self.assertTupleEqual((Path('/cache'), MEGABYTE), args)
+
+        self.assertEqual(1, mock_tool.check.call_count)
+        args, kwargs = mock_tool.check.call_args
+        self.assertTupleEqual(('new.py',), args)
+
+        self.assertEqual(1, mock_cache.set.call_count)
+        args, kwargs = mock_cache.set.call_args
+        self.assertTupleEqual(('tool-new.py', new_result), args)
+        self.assertEqual(True, mock_cache.evict.called)
+
+    @patch('codestyle.application.interrupt_program_flow', new=Mock())
+    @patch('codestyle.application.TimingHistory', new=Mock())
+    @patch('codestyle.application.ExpandedPathTree', new_callable=Mock)
+    @patch.object(ConsoleApplication, 'logger', new_callable=Mock)
+    @patch.object(ConsoleApplication, 'get_tool', new_callable=Mock)
+    @patch.object(
+        ConsoleApplication, 'get_file_suffix_tools', new_callable=Mock
+    )
+    def test_process_files_with_cache_and_same_content(
+        self,
+        mocked_file_suffix_tools_getter: Mock,
+        mocked_tool_getter: Mock,
+        mocked_logger: Mock,
+        mocked_tree: Mock,
+    ):
+        """Проверка кэша для файлов с одинаковым содержимым."""
+        mocked_file_suffix_tools_getter.return_value = {'.py': [Mock]}
+        mock_tool = Mock(
+            check=Mock(side_effect=lambda path: Result(
+                1, output=f'{path}:1:1: E999 bad')),
+            check_arguments=(),
+            configuration_path=None,
+            get_version=Mock(return_value='1.0'),
+            get_command=Mock(return_value=['tool']),
+            project_scoped=False,
+        )
+        mocked_tool_getter.return_value = mock_tool
+
+        with TemporaryDirectory() as directory:
+            paths = [Path(directory) / 'a.py', Path(directory) / 'b.py']
+            for path in paths:
+                path.write_text('a = 1\n')
+
+            for _ in range(2):
+                mocked_tree.return_value = Mock(
+                    path_gen=Mock(return_value=iter(paths))
+                )
+                ConsoleApplication(
+                    create_parameters_storage(
+                        cache=True, cache_dir=Path(directory) / 'cache',
+                        cache_size=1,
+                    )
+                ).process_files()
+
+        self.assertEqual(2, mock_tool.check.call_count)
+        self.assertListEqual(
+            [call(ERROR, f'{path}:1:1: E999 bad\n') for path in paths * 2],
+            mocked_logger.log.mock_calls,
+        )
+
+    @patch('codestyle.application.interrupt_program_flow', new_callable=Mock)
+    @patch('codestyle.application.ResultCache', new_callable=Mock)
+    @patch('codestyle.application.TimingHistory', new=Mock())
+    @patch('codestyle.application.ExpandedPathTree', new_callable=Mock)
+    @patch.object(ConsoleApplication, 'logger', new=Mock())
+    @patch.object(ConsoleApplication, 'get_tool', new_callable=Mock)
+    @patch.object(
+        ConsoleApplication, 'get_file_suffix_tools', new_callable=Mock
+    )
+    def test_process_files_with_project_scoped_tool(
+        self,
+        mocked_file_suffix_tools_getter: Mock,
+        mocked_tool_getter: Mock,
+        mocked_tree: Mock,
+        mocked_cache_cls: Mock,
+        mocked_interrupt_program_flow: Mock,
+    ):
+        """Проверка обработки файлов проекта одним запуском утилиты."""
+        paths = [Path('first.py'), Path('second.py'), Path('third.py')]
+        mocked_tree.return_value = Mock(
+            path_gen=Mock(return_value=iter(paths))
+        )
+        mocked_file_suffix_tools_getter.return_value = {'.py': [Mock]}
+        mock_check_batch = Mock(
+            side_effect=lambda batch: {
+                path: Result(int(path == 'second.py')) for path in batch
+            }
+        )
+        mock_tool = Mock(
+            project_scoped=True,
+            supports_batch=Mock(return_value=True),
+            check_arguments=('--check',),
+            get_batches=Mock(side_effect=lambda paths, arguments: [paths]),
+            check_batch=mock_check_batch,
+        )
+        mock_tool.get_name.return_value = 'mypy'
+        mocked_tool_getter.return_value = mock_tool
+
+        ConsoleApplication(
+            create_parameters_storage(
+                cache=True, cache_dir=Path('/cache'), cache_size=1, jobs=4
+            )
+        ).process_files()
+
+        self.assertEqual(False, mock_tool.check.called)
+        self.assertListEqual(
+            [call(['first.py', 'second.py', 'third.py'])],
+            mock_check_batch.mock_calls,
+        )
+        mock_cache = mocked_cache_cls.return_value
+        self.assertEqual(False, mock_cache.get.called)
+        self.assertEqual(False, mock_cache.set.called)
+
+        args, kwargs = mocked_interrupt_program_flow.call_args
+        self.assertEqual(ExitCodes.UNSUCCESSFUL, kwargs['status'])
+        self.assertEqual(
+            '💔 Так-так-таак... Коллегам не стыдно в глаза смотреть? '
+            'Необходимо поправить файлов: 1.',
+            kwargs['log_message'],
+        )
+
+    @patch('codestyle.application.interrupt_program_flow', new=Mock())
+    @patch('codestyle.application.TimingHistory', new=Mock())
+    @patch('codestyle.application.ExpandedPathTree', new_callable=Mock)
+    @patch.object(ConsoleApplication, 'logger', new=Mock())
+    @patch.object(ConsoleApplication, 'get_tool', new_callable=Mock)
+    @patch.object(
+        ConsoleApplication, 'get_file_suffix_tools', new_callable=Mock
+    )
+    def test_process_files_with_project_scoped_tool_order(
+        self,
+        mocked_file_suffix_tools_getter: Mock,
+        mocked_tool_getter: Mock,
+        mocked_tree: Mock,
+    ):
+        """Проверка вывода результатов в порядке путей до файлов."""
+        paths = [Path('first.py'), Path('second.py')]
+        mocked_tree.return_value = Mock(
+            path_gen=Mock(return_value=iter(paths))
+        )
+        flake8 = Mock(check=Mock(return_value=Result(0)),
+                      get_diagnostics=Mock(return_value=[]),
+                      project_scoped=False)
+        flake8.get_name.return_value = 'flake8'
+        mypy = Mock(
+            project_scoped=True,
+            supports_batch=Mock(return_value=True),
+            check_arguments=(),
+            get_batches=Mock(side_effect=lambda paths, arguments: [paths]),
+            check_batch=Mock(side_effect=lambda batch: {
+                path: Result(0) for path in batch
+            }),
+            get_diagnostics=Mock(return_value=[]),
+        )
+        mypy.get_name.return_value = 'mypy'
+        tools = {'flake8': flake8, 'mypy': mypy}
+        mocked_file_suffix_tools_getter.return_value = {
+            '.py': ['flake8', 'mypy']
+        }
+        mocked_tool_getter.side_effect = tools.get
+        stdout = StringIO()
+
+        with patch('codestyle.reporters.sys.stdout', new=stdout):
+            ConsoleApplication(
+                create_parameters_storage(format='jsonl', jobs=4)
+            ).process_files()
+
+        records = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        self.assertListEqual(
+            [('first.py', 'flake8'), ('first.py', 'mypy'),
+             ('second.py', 'flake8'), ('second.py', 'mypy')],
+            [(record['file'], record['tool']) for record in records[:-1]],
+        )
+
+    @patch('codestyle.application.get_changed_paths', new_callable=Mock)
+    @patch('codestyle.application.ExpandedPathTree', new_callable=Mock)
+    @patch.object(ConsoleApplication, 'logger', new=Mock())
+    @patch.object(ConsoleApplication, 'get_file_suffix_tools', new=Mock())
+    def test_init_with_changed_since(
+        self, mocked_tree: Mock, mocked_changed_paths_getter: Mock
+    ):
+        """Проверка ограничения дерева файлами, изменёнными в git."""
+        ConsoleApplication(
+            create_parameters_storage(target=('src',), changed_since='main')
+        )
+
+        self.assertEqual(1, mocked_changed_paths_getter.call_count)
+        args, kwargs = mocked_changed_paths_getter.call_args
+        self.assertDictEqual({'ref': 'main', 'staged': False}, kwargs)
+
+        args, kwargs = mocked_tree.call_args
+        self.assertTupleEqual(('src',), args)
+        self.assertEqual(
+            mocked_changed_paths_getter.return_value, kwargs['candidates']
+        )
+
+    @patch('codestyle.application.TimingHistory', new_callable=Mock)
+    @patch('codestyle.application.ResultCache', new=Mock())
+    @patch('codestyle.application.ExpandedPathTree', new=Mock())
+    @patch.object(ConsoleApplication, 'logger', new=Mock())
+    @patch.object(ConsoleApplication, 'get_file_suffix_tools', new=Mock())
+    def test_init_timing_history(self, mocked_history_cls: Mock):
+        """Проверка использования истории только при параллельной работе."""
+        for jobs, call_count in ((1, 0), (4, 1)):
+            with self.subTest(jobs=jobs):
+                mocked_history_cls.reset_mock()
+
+                ConsoleApplication(create_parameters_storage(
+                    cache=True, cache_dir=Path('/cache'), cache_size=1,
+                    jobs=jobs))
+
+                self.assertEqual(call_count, mocked_history_cls.call_count)
+
     @patch('codestyle.application.ExpandedPathTree', new=Mock())
     @patch('codestyle.application.getLogger', new=Mock())
     @patch.object(ConsoleApplication, 'get_file_suffix_tools', new=Mock())
     def test_tool_can_process(self):
         """Проверки __tool_can_process метода в разных вариациях."""
         application = ConsoleApplication(
-            Mock(autospec=True, fix=False, target=iter([]))
+            create_parameters_storage(autospec=True, target=iter([]))
         )
 
         false_result = application._ConsoleApplication__tool_can_process(
@@ -248,3 +1211,99 @@ class TestConsoleApplication(TestCase):
             Mock(for_check=True, optional_flag='')
         )
         self.assertEqual(True, true_result)
+
+    def test_tool_can_process_with_tool_filters(self):
+        """Проверка __tool_can_process с --only-tool и --skip-tool."""
+        application = ConsoleApplication(create_parameters_storage(
+            target=iter([]), only_tools=frozenset({'hadolint', 'flake8'}),
+            skip_tools=frozenset({'flake8'})))
+        tool_can_process = application._ConsoleApplication__tool_can_process
+
+        for name, optional, expected in (('hadolint', True, True),
+                                         ('flake8', False, False),
+                                         ('mypy', False, False)):
+            with self.subTest(name=name):
+                tool = Mock(for_check=True, optional=optional,
+                            optional_flag='')
+                tool.get_name.return_value = name
+                self.assertEqual(expected, tool_can_process(tool))
+
+    def test_get_file_suffix_tools_with_filters(self):
+        """Проверка отбора расширений и утилит по параметрам."""
+        application = ConsoleApplication(create_parameters_storage(
+            target=iter([]), file_suffixes=frozenset({'.py', '.sh'}),
+            skip_tools=frozenset({'shellcheck'}), mypy=True))
+
+        file_suffix_tools = application.get_file_suffix_tools()
+
+        self.assertSetEqual({'.py'}, set(file_suffix_tools))
+        self.assertIn('mypy', {tool.get_name()
+                               for tool in file_suffix_tools['.py']})
+
+    @patch('codestyle.application.ExpandedPathTree', new_callable=Mock)
+    def test_select_shard(self, mocked_tree: Mock):
+        """Проверка разделения файлов между сегментами."""
+        paths = [Path(f'module_{number}.py') for number in range(20)]
+        shards = []
+        for index in (1, 2):
+            mocked_tree.return_value = Mock(
+                path_gen=Mock(return_value=iter(paths))
+            )
+            application = ConsoleApplication(create_parameters_storage(
+                shard_position=(index, 2), shard_balance='size'))
+            shards.append(list(application._ConsoleApplication__path_gen))
+
+        self.assertListEqual(paths, sorted(shards[0] + shards[1],
+                                           key=paths.index))
+        self.assertEqual(10, len(shards[0]))
+
+    @patch('codestyle.application.interrupt_program_flow', new=Mock())
+    @patch('codestyle.application.ResultCache', new=Mock(return_value=None))
+    @patch('codestyle.application.ExpandedPathTree', new_callable=Mock)
+    @patch.object(ConsoleApplication, 'logger', new_callable=Mock)
+    @patch.object(ConsoleApplication, 'get_tool', new_callable=Mock)
+    @patch.object(
+        ConsoleApplication, 'get_file_suffix_tools', new_callable=Mock
+    )
+    def test_process_files_longest_first(
+        self,
+        mocked_file_suffix_tools_getter: Mock,
+        mocked_tool_getter: Mock,
+        mocked_logger: Mock,
+        mocked_tree: Mock,
+    ):
+        """Проверка запуска заданий от самых долгих с историей."""
+        started = []
+
+        def check(path: str) -> Result:
+            started.append(Path(path).name)
+            return Result(0)
+
+        mock_tool = Mock(check=check, project_scoped=False)
+        mock_tool.get_name.return_value = 'flake8'
+        mocked_tool_getter.return_value = mock_tool
+        mocked_file_suffix_tools_getter.return_value = {'.py': [Mock]}
+
+        with TemporaryDirectory() as directory:
+            paths = [Path(directory) / f'{name}.py'
+                     for name in ('small', 'slow', 'large')]
+            for path, size in zip(paths, (10, 10, 1000)):
+                path.write_text('x' * size)
+            history = TimingHistory(Path(directory) / 'cache')
+            history.add(paths[1], 'flake8', 'check', 60.0)
+            history.add(paths[2], 'flake8', 'check', 1.0)
+            history.save()
+            mocked_tree.return_value = Mock(
+                path_gen=Mock(return_value=iter(paths))
+            )
+
+            ConsoleApplication(create_parameters_storage(
+                jobs=2, cache=True, cache_dir=Path(directory) / 'cache',
+                cache_size=1)).process_files()
+
+            self.assertSetEqual({'slow.py', 'large.py'}, set(started[:2]))
+            self.assertEqual('small.py', started[2])
+            self.assertIn('Эффективность параллельной обработки', str(
+                mocked_logger.info.mock_calls))
+            history = TimingHistory(Path(directory) / 'cache')
+            self.assertLess(history.get(paths[1], 'flake8', 'check'), 60)
@@ -0,0 +1,95 @@
+"""Проверки модуля baseline."""
+import os
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from codestyle.baseline import BASELINE_SIGNATURE, Baseline, get_fingerprints
+from codestyle.diagnostics import Diagnostic
+
+
+def create_diagnostic(line: int, code: str = 'E302') -> Diagnostic:
+    """Создание замечания flake8 к строке файла."""
+    return Diagnostic('test.py', line, 1, code, 'error', 'message', 'flake8')
+
+
+class TestGetFingerprints(TestCase):
+    """Проверки get_fingerprints."""
+
+    def setUp(self):
+        """Создание файла во временной директории."""
+        self.directory = TemporaryDirectory()
+        self.current_directory = os.getcwd()
+        os.chdir(self.directory.name)
+        self.file_path = Path('test.py')
+
+    def tearDown(self):
+        """Удаление временной директории."""
+        os.chdir(self.current_directory)
+        self.directory.cleanup()
+
+    def test_stable_across_line_shift(self):
+        """Проверка независимости отпечатка от номера строки и отступа."""
+        self.file_path.write_text('import os\ndef f():\n    pass\n')
+        fingerprints = get_fingerprints(self.file_path,
+                                        [create_diagnostic(2)])
+
+        self.file_path.write_text('import os\n\n\n  def   f():\n    pass\n')
+        shifted_fingerprints = get_fingerprints(self.file_path,
+                                                [create_diagnostic(4)])
+
+        self.assertListEqual(fingerprints, shifted_fingerprints)
+        self.assertLess(fingerprints[0], 2 ** 64)
+
+    def test_differs_by_code_and_content(self):
+        """Проверка различия отпечатков разных замечаний."""
+        self.file_path.write_text('import os\nimport sys\n')
+
+        fingerprints = get_fingerprints(
+            self.file_path,
+            [create_diagnostic(1), create_diagnostic(2),
+             create_diagnostic(1, code='F401')])
+
+        self.assertEqual(3, len(set(fingerprints)))
+
+    def test_without_diagnostics(self):
+        """Проверка, что файл без замечаний не читается."""
+        self.assertListEqual([], get_fingerprints(Path('missing.py'), []))
+
+
+class TestBaseline(TestCase):
+    """Проверки Baseline."""
+
+    def test_contains(self):
+        """Проверка поиска отпечатков."""
+        baseline = Baseline([2 ** 64 - 1, 5, 3, 5])
+
+        self.assertEqual(3, len(baseline))
+        self.assertIn(5, baseline)
+        self.assertIn(2 ** 64 - 1, baseline)
+        self.assertNotIn(4, baseline)
+        self.assertNotIn(6, baseline)
+
+    def test_save_and_load(self):
+        """Проверка записи и чтения базового файла."""
+        with TemporaryDirectory() as directory:
+            path = Path(directory) / 'baseline.bin'
+            Baseline([3, 1, 2]).save(path)
+
+            data = path.read_bytes()
+            baseline = Baseline.load(path)
+
+        self.assertEqual(True, data.startswith(BASELINE_SIGNATURE))
+        self.assertEqual(len(BASELINE_SIGNATURE) + 3 * 8, len(data))
+        self.assertEqual(1, data[len(BASELINE_SIGNATURE)])
+        self.assertEqual(3, len(baseline))
+        self.assertIn(2, baseline)
+
+    def test_load_invalid_file(self):
+        """Проверка чтения файла другого формата."""
+        with TemporaryDirectory() as directory:
+            path = Path(directory) / 'baseline.bin'
+            path.write_bytes(b'not a baseline')
+
+            with self.assertRaises(ValueError):
+                Baseline.load(path)
@@ -0,0 +1,126 @@
+"""Проверки модуля cache."""
+import os
+from hashlib import sha256
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import Mock
+
+from codestyle.cache import ResultCache, get_file_hash
+from codestyle.diagnostics import Diagnostic
+from codestyle.tool_wrappers import Flake8, Result
+
+
+class TestGetFileHash(TestCase):
+    """Проверки get_file_hash."""
+
+    def test_get_file_hash(self):
+        """Проверка хэша содержимого файла."""
+        with TemporaryDirectory() as directory:
+            file_path = Path(directory) / 'test.py'
+            file_path.write_bytes(b'print()')
+
+            self.assertEqual(
+                sha256(b'print()').hexdigest(), get_file_hash(file_path)
+            )
+
+    def test_get_file_hash_without_file(self):
+        """Проверка хэша отсутствующего файла."""
+        self.assertEqual(None, get_file_hash(Path('/missing/test.py')))
+
+
+class TestResultCache(TestCase):
+    """Проверки ResultCache."""
+
+    def setUp(self):
+        """Создание кэша во временной директории."""
+        self.directory = TemporaryDirectory()
+        self.cache = ResultCache(Path(self.directory.name), max_size=1024)
+
+    def tearDown(self):
+        """Удаление временной директории."""
+        self.directory.cleanup()
+
+    def test_get_missing(self):
+        """Проверка получения отсутствующего результата."""
+        self.assertEqual(None, self.cache.get('ab' * 32))
+
+    def test_set_and_get(self):
+        """Проверка сохранения и получения результата."""
+        self.cache.set('ab' * 32, Result(1, output='ошибка', error='error'))
+
+        result = self.cache.get('ab' * 32)
+
+        self.assertEqual(1, result.return_code)
+        self.assertEqual('ошибка', result.output)
+        self.assertEqual('error', result.error)
+        self.assertEqual(None, result.diagnostics)
+        self.assertEqual(True, result.is_cached)
+
+    def test_set_and_get_with_diagnostics(self):
+        """Проверка сохранения разобранных замечаний."""
+        diagnostic = Diagnostic('test.py', 1, None, 'E302', 'error',
+                                'expected 2 blank lines', 'flake8')
+        self.cache.set('ab' * 32, Result(1, diagnostics=[diagnostic]))
+
+        result = self.cache.get('ab' * 32)
+
+        self.assertListEqual([diagnostic], result.diagnostics)
+
+    def test_get_tool_key(self):
+        """Проверка зависимости ключа утилиты от версии и команды."""
+        tool = Mock(spec=Flake8, configuration_path=None)
+        tool.get_version.return_value = '3.8.3'
+
+        key = ResultCache.get_tool_key(tool, ['flake8', '--config'])
+        self.assertEqual(
+            key, ResultCache.get_tool_key(tool, ['flake8', '--config'])
+        )
+        self.assertNotEqual(key, ResultCache.get_tool_key(tool, ['flake8']))
+
+        tool.get_version.return_value = '3.9.0'
+        self.assertNotEqual(
+            key, ResultCache.get_tool_key(tool, ['flake8', '--config'])
+        )
+
+    def test_get_file_key(self):
+        """Проверка зависимости ключа файла от его содержимого."""
+        file_path = Path(self.directory.name) / 'test.py'
+        file_path.write_text('a = 1')
+        key = ResultCache.get_file_key('tool', file_path)
+
+        self.assertEqual(key, ResultCache.get_file_key('tool', file_path))
+        self.assertNotEqual(key, ResultCache.get_file_key('other', file_path))
+
+        file_path.write_text('a = 2')
+        self.assertNotEqual(key, ResultCache.get_file_key('tool', file_path))
+
+    def test_get_file_key_with_same_content(self):
+        """Проверка зависимости ключа файла от его пути."""
+        file_paths = [Path(self.directory.name) / name
+                      for name in ('a.py', 'b.py')]
+        for file_path in file_paths:
+            file_path.write_text('a = 1')
+
+        self.assertNotEqual(ResultCache.get_file_key('tool', file_paths[0]),
+                            ResultCache.get_file_key('tool', file_paths[1]))
+        self.assertEqual(
+            ResultCache.get_file_key('tool', file_paths[0]),
+            ResultCache.get_file_key(
+                'tool', Path(os.path.relpath(file_paths[0]))),
+        )
+
+    def test_evict(self):
+        """Проверка вытеснения давно не использованных записей."""
+        keys = [f'{index:02}' * 32 for index in range(3)]
+        for index, key in enumerate(keys):
+            self.cache.set(key, Result(0, output='x' * 400))
+            entry_path = self.cache._ResultCache__get_entry_path(key)
+            os.utime(entry_path, (index, index))
+        self.cache.get(keys[0])
+
+        self.cache.evict()
+
+        self.assertNotEqual(None, self.cache.get(keys[0]))
+        self.assertEqual(None, self.cache.get(keys[1]))
+        self.assertNotEqual(None, self.cache.get(keys[2]))
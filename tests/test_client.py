@@ -0,0 +1,79 @@
+"""Проверки модуля client."""
+import json
+from io import BytesIO, StringIO
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import MagicMock, Mock, patch
+
+from codestyle.client import (_send_request, get_tool_environment,
+                              run_client)
+
+
+class TestClient(TestCase):
+    """Проверки клиента демона."""
+
+    @patch('codestyle.command_line.run_process', new_callable=Mock)
+    @patch('codestyle.client.DEFAULT_SOCKET_PATH',
+           new=Path('/missing/daemon.sock'))
+    def test_run_client_without_daemon(self, mocked_run_process: Mock):
+        """Проверка локальной обработки без запущенного демона."""
+        run_client()
+
+        self.assertEqual(1, mocked_run_process.call_count)
+
+    @patch('codestyle.client.sys.argv', new=['codestyle', 'test.py'])
+    def test_send_request(self):
+        """Проверка запроса и вывода ответа демона."""
+        messages = (
+            {'stream': 'stdout', 'data': 'output'},
+            {'stream': 'stderr', 'data': 'error'},
+            {'status': 1},
+        )
+        stream = MagicMock()
+        stream.__iter__.return_value = iter([
+            json.dumps(message).encode() + b'\n' for message in messages
+        ])
+        stdout, stderr = StringIO(), StringIO()
+
+        with patch('codestyle.client.sys.stdout', new=stdout), \
+                patch('codestyle.client.sys.stderr', new=stderr):
+            status = _send_request(stream)
+
+        self.assertEqual(1, status)
+        self.assertEqual('output', stdout.getvalue())
+        self.assertEqual('error', stderr.getvalue())
+        args, kwargs = stream.write.call_args
+        request = json.loads(args[0])
+        self.assertEqual(['test.py'], request['arguments'])
+        self.assertDictEqual(get_tool_environment(), request['environment'])
+
+    @patch('codestyle.client.sys.argv', new=['codestyle'])
+    def test_send_request_refused(self):
+        """Проверка отказа демона в обработке запроса."""
+        stream = MagicMock()
+        stream.__iter__.return_value = iter([
+            json.dumps({'refused': 'Окружение отличается'}).encode() + b'\n'
+        ])
+        stderr = StringIO()
+
+        with patch('codestyle.client.sys.stderr', new=stderr):
+            self.assertEqual(None, _send_request(stream))
+        self.assertIn('без демона', stderr.getvalue())
+
+    @patch.dict('codestyle.client.os.environ', clear=True,
+                PATH='/usr/bin', npm_config_prefix='/opt', HOME='/root')
+    def test_get_tool_environment(self):
+        """Проверка отбора переменных окружения утилит."""
+        self.assertDictEqual({'PATH': '/usr/bin', 'npm_config_prefix': '/opt'},
+                             get_tool_environment())
+
+    @patch('codestyle.client.sys.argv', new=['codestyle'])
+    def test_send_request_with_broken_connection(self):
+        """Проверка обрыва соединения до получения статуса."""
+        stderr = StringIO()
+
+        with patch('codestyle.client.sys.stderr', new=stderr):
+            status = _send_request(BytesIO())
+
+        self.assertEqual(1, status)
+        self.assertIn('Соединение с демоном прервано.', stderr.getvalue())
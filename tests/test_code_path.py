@@ -1,10 +1,14 @@
 """Проверки модуля code_path."""
-from pathlib import Path
+from inspect import stack
+from pathlib import Path, PurePath
+from sys import getrecursionlimit, setrecursionlimit
+from tempfile import TemporaryDirectory
 from unittest import TestCase
-from unittest.mock import Mock, call, patch
+from unittest.mock import Mock, patch
 
 from codestyle import code_path
-from codestyle.code_path import ExpandedPathTree
+from codestyle.code_path import (ExpandedPathTree, IgnoreFile,
+                                 compile_excludes)
 
 
 class TestExpandedPathTree(TestCase):
@@ -69,20 +73,11 @@ class TestExpandedPathTree(TestCase):
     )
     def test_is_excluded_returns_false(self):
         """Проверка возвращения False для __is_excluded метода."""
-        mock_exclude = Mock()
-        mock_match = Mock(return_value=False)
-
-        tree = ExpandedPathTree(Mock(), excludes=(mock_exclude,))
-        result = tree._ExpandedPathTree__is_excluded(Mock(match=mock_match))
+        tree = ExpandedPathTree(Mock(), excludes=('*/vendor',))
+        result = tree._ExpandedPathTree__is_excluded('vendor/file.php')
 
         self.assertEqual(False, result)
 
-        self.assertEqual(True, mock_match.called)
-        self.assertEqual(1, mock_match.call_count)
-        args, kwargs = mock_match.call_args
-        self.assertTupleEqual((mock_exclude,), args)
-        self.assertDictEqual({}, kwargs)
-
     @patch.object(
         ExpandedPathTree,
         'check_path_availability',
@@ -90,10 +85,8 @@ class TestExpandedPathTree(TestCase):
     )
     def test_is_excluded_returns_true(self):
         """Проверка возвращения True для __is_excluded метода."""
-        tree = ExpandedPathTree(Mock(), excludes=(Mock(),))
-        result = tree._ExpandedPathTree__is_excluded(
-            Mock(match=Mock(return_value=True))
-        )
+        tree = ExpandedPathTree(Mock(), excludes=('*.js', '*/vendor'))
+        result = tree._ExpandedPathTree__is_excluded('code/vendor')
 
         self.assertEqual(True, result)
 
@@ -114,79 +107,279 @@ class TestExpandedPathTree(TestCase):
             context_manager.output,
         )
 
-    @patch.object(
-        ExpandedPathTree, '_ExpandedPathTree__is_excluded', new_callable=Mock
-    )
     @patch.object(ExpandedPathTree, 'check_path_availability', new=Mock)
-    def test_generate_paths_for_excluded_path(self, mocked_is_excluded: Mock):
+    def test_generate_paths_for_excluded_path(self):
         """Проверка __generate_paths для исключённого пути."""
-        mock_path = Mock()
-        mocked_is_excluded.return_value = True
-
-        tree = ExpandedPathTree(Mock(), excludes=(Mock(),))
-        result = tree._ExpandedPathTree__generate_paths(mock_path)
+        tree = ExpandedPathTree(Mock(), excludes=('*.py',))
+        result = tree._ExpandedPathTree__generate_paths(Path('test.py'))
 
         self.assertEqual([], list(result))
 
-        self.assertEqual(True, mocked_is_excluded.called)
-        self.assertEqual(1, mocked_is_excluded.call_count)
-        args, kwargs = mocked_is_excluded.call_args
-        self.assertTupleEqual((mock_path,), args)
-        self.assertDictEqual({}, kwargs)
-
-    @patch.object(
-        ExpandedPathTree,
-        '_ExpandedPathTree__is_excluded',
-        new=Mock(return_value=False),
-    )
     @patch.object(ExpandedPathTree, 'check_path_availability', new=Mock)
     def test_generate_paths_yields_file_path(self):
-        """Проверка, что генератор возвращает только пути к файлам."""
-        mock_is_file = Mock(return_value=True)
-        mock_file_path = Mock(is_file=mock_is_file)
+        """Проверка, что генератор возвращает путь к указанному файлу."""
+        with TemporaryDirectory() as directory:
+            file_path = Path(directory) / 'test.py'
+            file_path.touch()
 
-        tree = ExpandedPathTree(Mock(), excludes=(Mock(),))
-        result = tree._ExpandedPathTree__generate_paths(mock_file_path)
+            tree = ExpandedPathTree(Mock(), excludes=('*.js',))
+            result = tree._ExpandedPathTree__generate_paths(file_path)
 
-        self.assertEqual([mock_file_path], list(result))
+            self.assertEqual([file_path], list(result))
 
-        self.assertEqual(True, mock_is_file.called)
-        self.assertEqual(1, mock_is_file.call_count)
-        args, kwargs = mock_is_file.call_args
-        self.assertTupleEqual((), args)
-        self.assertDictEqual({}, kwargs)
+    @patch.object(ExpandedPathTree, 'check_path_availability', new=Mock)
+    def test_generate_path(self):
+        """Проверки обхода директории в порядке имён с исключениями."""
+        with TemporaryDirectory() as directory:
+            root = Path(directory)
+            for name in ('b.py', 'a/c.py', 'a/b/d.py', 'vendor/e.php',
+                         'a/vendor/f.php', 'a/g.js'):
+                (root / name).parent.mkdir(parents=True, exist_ok=True)
+                (root / name).touch()
+
+            tree = ExpandedPathTree(root, excludes=('vendor', '*.js'))
+            with patch('codestyle.code_path.os.scandir',
+                       wraps=code_path.os.scandir) as mocked_scandir:
+                result = list(tree._ExpandedPathTree__generate_paths(root))
+
+            self.assertListEqual(
+                [root / 'a/b/d.py', root / 'a/c.py', root / 'b.py'], result
+            )
+            scanned_paths = [
+                args[0] for args, _ in mocked_scandir.call_args_list
+            ]
+            self.assertListEqual(
+                [str(root), str(root / 'a'), str(root / 'a/b')],
+                scanned_paths,
+            )
 
-    @patch.object(
-        ExpandedPathTree, '_ExpandedPathTree__is_excluded', new_callable=Mock
-    )
     @patch.object(ExpandedPathTree, 'check_path_availability', new=Mock)
-    def test_generate_path(self, mocked_is_excluded: Mock):
-        """Проверки __generate_paths метода."""
-        mock_is_file = Mock(return_value=True)
-        mock_file_path = Mock(is_file=mock_is_file)
-        mock_iterdir = Mock(return_value=iter([mock_file_path]))
+    def test_generate_paths_deep_tree(self):
+        """Проверка обхода дерева глубже предела рекурсии."""
+        with TemporaryDirectory() as directory:
+            deepest_path = root = Path(directory)
+            for _ in range(100):
+                deepest_path /= 'd'
+                deepest_path.mkdir()
+            (deepest_path / 'test.py').touch()
+
+            tree = ExpandedPathTree(root)
+            recursion_limit = getrecursionlimit()
+            setrecursionlimit(len(stack(0)) + 50)
+            try:
+                result = list(tree._ExpandedPathTree__generate_paths(root))
+            finally:
+                setrecursionlimit(recursion_limit)
+
+            self.assertListEqual([deepest_path / 'test.py'], result)
 
-        mocked_is_excluded.return_value = False
+    @patch.object(ExpandedPathTree, 'check_path_availability', new=Mock)
+    def test_generate_paths_with_symlink_loop(self):
+        """Проверка обхода директории с циклической символической ссылкой."""
+        with TemporaryDirectory() as directory:
+            root = Path(directory)
+            (root / 'test.py').touch()
+            (root / 'loop').symlink_to(root, target_is_directory=True)
+
+            tree = ExpandedPathTree(root)
+            result = list(tree._ExpandedPathTree__generate_paths(root))
+
+            self.assertListEqual(
+                [root / 'loop/test.py', root / 'test.py'], result
+            )
+
+
+class TestCompileExcludes(TestCase):
+    """Проверки compile_excludes."""
+
+    def test_matches_like_path_match(self):
+        """Проверка совпадения семантики с Path.match."""
+        excludes = ('*.py', 'vendor', '*/vendor', '/code/*', 'a/b', '[!a]?.js')
+        paths = ('x.py', 'src/x.py', 'vendor', 'src/vendor', '/code/x',
+                 '/code/x/y', 'a/b', 'c/a/b', 'b1.js', 'a1.js', '/vendor')
+
+        for exclude in excludes:
+            is_excluded = compile_excludes((exclude,))
+            for path in paths:
+                self.assertEqual(
+                    PurePath(path).match(exclude),
+                    bool(is_excluded(path)),
+                    f'{exclude} - {path}',
+                )
+
+    def test_without_excludes(self):
+        """Проверка отсутствия исключений."""
+        self.assertEqual(False, compile_excludes(())('test.py'))
 
-        tree = ExpandedPathTree(Mock(), excludes=(Mock(),))
-        result = tree._ExpandedPathTree__generate_paths(
-            Mock(is_file=Mock(return_value=False), iterdir=mock_iterdir)
+    @patch.object(ExpandedPathTree, 'check_path_availability', new=Mock)
+    def test_path_gen_with_candidates(self):
+        """Проверка ограничения генератора путями-кандидатами."""
+        with TemporaryDirectory() as directory:
+            root = Path(directory).resolve()
+            for name in ('src/changed.py', 'src/vendor/changed.php',
+                         'other/changed.py', 'src/unchanged.py'):
+                (root / name).parent.mkdir(parents=True, exist_ok=True)
+                (root / name).touch()
+
+            tree = ExpandedPathTree(
+                root / 'src',
+                excludes=('*/vendor',),
+                candidates=[
+                    root / 'src/changed.py',
+                    root / 'src/vendor/changed.php',
+                    root / 'src/deleted.py',
+                    root / 'other/changed.py',
+                ],
+            )
+
+            self.assertListEqual(
+                [root / 'src/changed.py'], list(tree.path_gen())
+            )
+
+    @patch.object(ExpandedPathTree, 'check_path_availability', new=Mock)
+    def test_path_gen_with_name_filter(self):
+        """Проверка отбора файлов по имени при обходе дерева."""
+        with TemporaryDirectory() as directory:
+            root = Path(directory).resolve()
+            for name in ('src/test.py', 'src/test.js', 'src/js/test.py',
+                         'test.js'):
+                (root / name).parent.mkdir(parents=True, exist_ok=True)
+                (root / name).touch()
+
+            tree = ExpandedPathTree(
+                root / 'src', root / 'test.js',
+                name_filter=lambda name: name.endswith('.py'),
+            )
+
+            self.assertListEqual(
+                [root / 'src/js/test.py', root / 'src/test.py'],
+                sorted(tree.path_gen()),
+            )
+
+
+class TestIgnoreFiles(TestCase):
+    """Проверки учёта файлов .gitignore и .codestyleignore."""
+
+    def test_ignore_file_match(self):
+        """Проверка семантики правил .gitignore."""
+        ignore_file = IgnoreFile(
+            (
+                '# комментарий',
+                '',
+                '*.log',
+                '!keep.log',
+                '/build',
+                'docs/*.txt',
+                'cache/',
+                '**/generated/**',
+                'a/**/z.py',
+                r'\#hash',
+                r'\!bang',
+            ),
+            'root',
+        )
+        cases = (
+            ('root/x.log', False, True),
+            ('root/sub/x.log', False, True),
+            ('root/sub/keep.log', False, False),
+            ('root/build', True, True),
+            ('root/sub/build', True, None),
+            ('root/docs/x.txt', False, True),
+            ('root/sub/docs/x.txt', False, None),
+            ('root/docs/sub/x.txt', False, None),
+            ('root/cache', True, True),
+            ('root/cache', False, None),
+            ('root/sub/cache', True, True),
+            ('root/x/generated/y/z.py', False, True),
+            ('root/a/z.py', False, True),
+            ('root/a/b/c/z.py', False, True),
+            ('root/#hash', False, True),
+            ('root/!bang', False, True),
+            ('root/test.py', False, None),
         )
 
-        self.assertEqual([mock_file_path], list(result))
+        for path, is_dir, expected in cases:
+            self.assertEqual(
+                expected, ignore_file.match(path, is_dir), path
+            )
 
-        self.assertEqual(True, mock_iterdir.called)
-        self.assertEqual(1, mock_iterdir.call_count)
-        args, kwargs = mock_iterdir.call_args
-        self.assertTupleEqual((), args)
-        self.assertDictEqual({}, kwargs)
+    def test_ignore_file_with_prefix(self):
+        """Проверка правил из родительской директории."""
+        ignore_file = IgnoreFile(('/src/build', 'src/*.pyc'), 'target', 'src/')
 
-        self.assertEqual(True, mocked_is_excluded.called)
-        self.assertEqual(2, mocked_is_excluded.call_count)
-        self.assertIn(call(mock_file_path), mocked_is_excluded.mock_calls)
+        self.assertEqual(True, ignore_file.match('target/build', True))
+        self.assertEqual(True, ignore_file.match('target/x.pyc', False))
+        self.assertEqual(None, ignore_file.match('target/a/x.pyc', False))
 
-        self.assertEqual(True, mock_is_file.called)
-        self.assertEqual(1, mock_is_file.call_count)
-        args, kwargs = mock_is_file.call_args
-        self.assertTupleEqual((), args)
-        self.assertDictEqual({}, kwargs)
+    @patch.object(ExpandedPathTree, 'check_path_availability', new=Mock)
+    def test_generate_paths_with_ignore_files(self):
+        """Проверка обхода с вложенными файлами игнорирования."""
+        with TemporaryDirectory() as directory:
+            root = Path(directory)
+            (root / '.git').mkdir()
+            files = {
+                '.gitignore': 'node_modules/\n*.log\n/dist\n',
+                '.codestyleignore': '*.min.js\n',
+                'node_modules/x/index.js': '',
+                'dist/bundle.js': '',
+                'src/dist/source.js': '',
+                'src/app.min.js': '',
+                'src/app.js': '',
+                'src/debug.log': '',
+                'src/.gitignore': '!debug.log\ngenerated\n',
+                'src/generated/model.py': '',
+                'src/sub/error.log': '',
+                'main.py': '',
+            }
+            for name, content in files.items():
+                (root / name).parent.mkdir(parents=True, exist_ok=True)
+                (root / name).write_text(content)
+
+            tree = ExpandedPathTree(root, use_ignore_files=True)
+            with patch('codestyle.code_path.os.scandir',
+                       wraps=code_path.os.scandir) as mocked_scandir:
+                result = list(tree._ExpandedPathTree__generate_paths(root))
+
+            self.assertListEqual(
+                [
+                    root / '.codestyleignore',
+                    root / '.gitignore',
+                    root / 'main.py',
+                    root / 'src/.gitignore',
+                    root / 'src/app.js',
+                    root / 'src/debug.log',
+                    root / 'src/dist/source.js',
+                ],
+                result,
+            )
+            scanned_paths = {
+                args[0] for args, _ in mocked_scandir.call_args_list
+            }
+            self.assertSetEqual(
+                {str(root), str(root / 'src'), str(root / 'src/dist'),
+                 str(root / 'src/sub')},
+                scanned_paths,
+            )
+
+    @patch.object(ExpandedPathTree, 'check_path_availability', new=Mock)
+    def test_generate_paths_with_parent_ignore_files(self):
+        """Проверка правил из родительских директорий репозитория."""
+        with TemporaryDirectory() as directory:
+            root = Path(directory)
+            (root / '.git').mkdir()
+            (root / '.gitignore').write_text('/src/build\n*.pyc\n')
+            for name in ('src/build/x.py', 'src/x.pyc', 'src/x.py'):
+                (root / name).parent.mkdir(parents=True, exist_ok=True)
+                (root / name).touch()
+
+            tree = ExpandedPathTree(root / 'src', use_ignore_files=True)
+            result = list(tree.path_gen())
+            tree_without_ignore = ExpandedPathTree(root / 'src')
+            result_without_ignore = list(tree_without_ignore.path_gen())
+
+            self.assertListEqual([root / 'src/x.py'], result)
+            self.assertListEqual(
+                [root / 'src/build/x.py', root / 'src/x.py',
+                 root / 'src/x.pyc'],
+                result_without_ignore,
+            )
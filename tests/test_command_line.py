@@ -1,9 +1,11 @@
 """Проверки модуля command_line."""
-from logging import WARNING
+from logging import ERROR, WARNING
+from pathlib import Path
 from unittest import TestCase
 from unittest.mock import Mock, patch
 
-from codestyle.command_line import run_process
+from codestyle.application import CHECK_UNSUCCESSFUL
+from codestyle.command_line import run_merge_results, run_process
 
 
 class Test(TestCase):
@@ -22,7 +24,10 @@ class Test(TestCase):
     ):
         """Проверка run_process без исключения."""
         mock_parameters_storage = Mock(
-            line_separator='\n', logging_level='WARNING'
+            line_separator='\n',
+            logging_level='WARNING',
+            logging_stream='ext://sys.stdout',
+            daemon=False,
         )
         mocked_argumentation_tool.return_value = Mock(
             parameters_storage=mock_parameters_storage
@@ -57,7 +62,7 @@ class Test(TestCase):
         self.assertEqual(1, mocked_logging_config_getter.call_count)
         args, kwargs = mocked_logging_config_getter.call_args
         self.assertTupleEqual(('\n', 'WARNING'), args)
-        self.assertDictEqual({}, kwargs)
+        self.assertDictEqual({'stream': 'ext://sys.stdout'}, kwargs)
 
         self.assertEqual(True, mocked_application.called)
         self.assertEqual(1, mocked_application.call_count)
@@ -84,7 +89,7 @@ class Test(TestCase):
     ):
         """Проверка обработки KeyboardInterrupt исключения."""
         mocked_argumentation_tool.return_value = Mock(
-            parameters_storage=Mock(line_separator='\n')
+            parameters_storage=Mock(line_separator='\n', daemon=False)
         )
         mocked_application.return_value = Mock(
             process_files=Mock(side_effect=KeyboardInterrupt)
@@ -118,7 +123,7 @@ class Test(TestCase):
     ):
         """Проверка отсутствия обработки других исключений в run_process."""
         mocked_argumentation_tool.return_value = Mock(
-            parameters_storage=Mock(line_separator='\n')
+            parameters_storage=Mock(line_separator='\n', daemon=False)
         )
         mocked_application.return_value = Mock(
             process_files=Mock(side_effect=KeyError)
@@ -128,3 +133,40 @@ class Test(TestCase):
             run_process()
 
         self.assertEqual(False, mocked_interrupt_program_flow.called)
+
+    @patch('codestyle.command_line.run_merge_results', new_callable=Mock)
+    @patch('codestyle.command_line.ArgumentationTool', new_callable=Mock)
+    def test_run_process_merge_results(
+        self,
+        mocked_argumentation_tool: Mock,
+        mocked_run_merge_results: Mock,
+    ):
+        """Проверка запуска команды merge-results."""
+        with patch('sys.argv', ['codestyle', 'merge-results', '1.jsonl']):
+            run_process()
+
+        self.assertEqual(False, mocked_argumentation_tool.called)
+        mocked_run_merge_results.assert_called_once_with(['1.jsonl'])
+
+    @patch('codestyle.command_line.interrupt_program_flow', new_callable=Mock)
+    @patch('codestyle.command_line.merge_reports', new_callable=Mock)
+    @patch('codestyle.command_line.dictConfig', new=Mock)
+    def test_run_merge_results(
+        self,
+        mocked_merge_reports: Mock,
+        mocked_interrupt_program_flow: Mock,
+    ):
+        """Проверка статуса и сообщения объединения отчётов."""
+        mocked_merge_reports.return_value = {
+            'method': 'check', 'status': 1, 'total_count': 4,
+            'total_failed': 2, 'total_changed': 0, 'interrupted': 0}
+
+        run_merge_results(['1.jsonl', '2.jsonl'])
+
+        args, kwargs = mocked_merge_reports.call_args
+        self.assertTupleEqual(([Path('1.jsonl'), Path('2.jsonl')], None),
+                              args)
+        mocked_interrupt_program_flow.assert_called_once_with(
+            status=1,
+            log_message=CHECK_UNSUCCESSFUL.format(total_failed=2),
+            log_level=ERROR)
@@ -0,0 +1,131 @@
+"""Проверки модуля daemon."""
+import json
+import os
+import sys
+from io import BytesIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from threading import Thread
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from codestyle.client import run_client
+from codestyle.daemon import DaemonServer, process_request
+from codestyle.tool_registry import ToolRegistry
+
+
+def read_messages(connection: BytesIO) -> list:
+    """Сообщения, переданные клиенту."""
+    return [json.loads(line) for line in connection.getvalue().splitlines()]
+
+
+@patch('codestyle.daemon.dictConfig', new=Mock())
+@patch('codestyle.daemon.ArgumentationTool',
+       new=Mock(return_value=Mock(parameters_storage=Mock(daemon=False))))
+class TestProcessRequest(TestCase):
+    """Проверки process_request."""
+
+    @patch('codestyle.daemon.ConsoleApplication', new_callable=Mock)
+    def test_process_request_with_exit(self, mocked_application: Mock):
+        """Проверка передачи вывода и статуса завершения клиенту."""
+        def process_files():
+            sys.stdout.write('Обработка test.py..\n')
+            raise SystemExit(1)
+
+        mocked_application.return_value.process_files = process_files
+        connection = BytesIO()
+        registry = ToolRegistry()
+        current_directory = os.getcwd()
+
+        with TemporaryDirectory() as directory:
+            status = process_request(['test.py'], directory, registry,
+                                     connection)
+
+        self.assertEqual(1, status)
+        self.assertEqual(current_directory, os.getcwd())
+        self.assertListEqual(
+            [{'stream': 'stdout', 'data': 'Обработка test.py..\n'}],
+            read_messages(connection),
+        )
+        args, kwargs = mocked_application.call_args
+        self.assertDictEqual({'tool_registry': registry}, kwargs)
+
+    @patch('codestyle.daemon.ConsoleApplication', new_callable=Mock)
+    def test_process_request_with_error(self, mocked_application: Mock):
+        """Проверка обработки исключения без остановки демона."""
+        mocked_application.return_value.process_files.side_effect = KeyError
+        connection = BytesIO()
+
+        status = process_request([], os.getcwd(), ToolRegistry(), connection)
+
+        self.assertEqual(1, status)
+        errors = ''.join(message['data']
+                         for message in read_messages(connection))
+        self.assertIn('KeyError', errors)
+
+    def test_process_request_with_missing_directory(self):
+        """Проверка запроса с недоступной рабочей директорией."""
+        connection = BytesIO()
+
+        status = process_request([], '/missing/directory', ToolRegistry(),
+                                 connection)
+
+        self.assertEqual(1, status)
+        self.assertEqual('stderr', read_messages(connection)[0]['stream'])
+
+
+class TestDaemonServer(TestCase):
+    """Проверки DaemonServer."""
+
+    @patch('codestyle.daemon.dictConfig', new=Mock())
+    @patch('codestyle.daemon.process_request', new_callable=Mock)
+    def test_request(self, mocked_process_request: Mock):
+        """Проверка обработки запроса клиента через сокет."""
+        mocked_process_request.return_value = 1
+
+        with TemporaryDirectory() as directory:
+            socket_path = Path(directory) / 'daemon.sock'
+            server = DaemonServer(socket_path, ToolRegistry(), Mock())
+            thread = Thread(target=server.handle_request)
+            thread.start()
+            try:
+                with patch('codestyle.client.DEFAULT_SOCKET_PATH',
+                           new=socket_path), \
+                        patch('codestyle.client.sys.argv',
+                              new=['codestyle', 'test.py']), \
+                        self.assertRaises(SystemExit) as context:
+                    run_client()
+            finally:
+                thread.join()
+                server.server_close()
+
+        self.assertEqual(1, context.exception.code)
+        args, kwargs = mocked_process_request.call_args
+        self.assertEqual(['test.py'], args[0])
+        self.assertEqual(os.getcwd(), args[1])
+
+    @patch('codestyle.command_line.run_process', new_callable=Mock)
+    @patch('codestyle.daemon.process_request', new_callable=Mock)
+    def test_request_with_other_environment(
+        self,
+        mocked_process_request: Mock,
+        mocked_run_process: Mock,
+    ):
+        """Проверка локальной обработки при другом окружении клиента."""
+        with TemporaryDirectory() as directory:
+            socket_path = Path(directory) / 'daemon.sock'
+            server = DaemonServer(socket_path, ToolRegistry(), Mock())
+            server.environment = {'PATH': '/daemon/bin'}
+            thread = Thread(target=server.handle_request)
+            thread.start()
+            try:
+                with patch('codestyle.client.DEFAULT_SOCKET_PATH',
+                           new=socket_path), \
+                        patch('codestyle.client.sys.stderr', new=Mock()):
+                    run_client()
+            finally:
+                thread.join()
+                server.server_close()
+
+        self.assertEqual(False, mocked_process_request.called)
+        self.assertEqual(1, mocked_run_process.call_count)
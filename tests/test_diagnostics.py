@@ -0,0 +1,54 @@
+"""Проверки модуля diagnostics."""
+from unittest import TestCase
+
+from codestyle.diagnostics import (DEFAULT_DIAGNOSTIC_PATTERN, Diagnostic,
+                                   normalize_severity,
+                                   parse_text_diagnostics)
+
+
+class TestDiagnostic(TestCase):
+    """Проверки Diagnostic."""
+
+    def test_str(self):
+        """Проверка текстового вывода в формате gcc."""
+        diagnostic = Diagnostic('test.sh', 3, 8, 'SC2086', 'info',
+                                'Double quote', 'shellcheck')
+
+        self.assertEqual('test.sh:3:8: info: Double quote [SC2086]',
+                         str(diagnostic))
+
+    def test_deduplication(self):
+        """Проверка сравнения замечаний для исключения повторов."""
+        fields = ('test.py', 1, None, '', 'error', 'message', 'flake8')
+
+        self.assertEqual(1, len({Diagnostic(*fields), Diagnostic(*fields)}))
+        self.assertEqual(False, hasattr(Diagnostic(*fields), '__dict__'))
+
+
+class TestParseTextDiagnostics(TestCase):
+    """Проверки parse_text_diagnostics."""
+
+    def test_default_pattern(self):
+        """Проверка разбора строк вывода в формате gcc."""
+        text = ('test.sh:3:8: note: Double quote [SC2086]\n'
+                'In test.sh line 3:\n'
+                'test.sh:7: missing')
+
+        diagnostics = parse_text_diagnostics(
+            text, DEFAULT_DIAGNOSTIC_PATTERN, 'shellcheck')
+
+        self.assertListEqual(
+            [Diagnostic('test.sh', 3, 8, 'SC2086', 'info', 'Double quote',
+                        'shellcheck'),
+             Diagnostic('test.sh', 7, None, '', 'error', 'missing',
+                        'shellcheck')],
+            diagnostics,
+        )
+
+    def test_normalize_severity(self):
+        """Проверка приведения уровней важности."""
+        self.assertEqual('warning', normalize_severity('WARN'))
+        self.assertEqual('info', normalize_severity('style'))
+        self.assertEqual('error', normalize_severity(None))
+        self.assertEqual('warning',
+                         normalize_severity('unknown', default='warning'))
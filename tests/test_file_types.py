@@ -0,0 +1,97 @@
+"""Проверки модуля file_types."""
+import os
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import patch
+
+from codestyle import file_types
+from codestyle.file_types import (compile_name_filter, get_file_suffix,
+                                  get_interpreter, get_interpreter_suffix)
+
+
+class Test(TestCase):
+    """Проверка функций модуля."""
+
+    def test_get_file_suffix_by_name(self):
+        """Проверка суффикса по имени и собственному суффиксу файла."""
+        for name, suffix in (('Dockerfile', '.dockerfile'),
+                             ('Dockerfile.dev', '.dockerfile'),
+                             ('app.dockerfile', '.dockerfile'),
+                             ('module.py', '.py'),
+                             ('missing', '')):
+            with self.subTest(name=name):
+                self.assertEqual(suffix, get_file_suffix(Path(name)))
+
+    def test_get_file_suffix_by_content(self):
+        """Проверка суффикса файлов без суффикса по их содержимому."""
+        with TemporaryDirectory() as directory:
+            contents = {'deploy': b'#!/bin/bash\nset -e\n',
+                        'manage': b'#!/usr/bin/env python3\n',
+                        'tool': b'#!/usr/bin/python3.9 -u\n',
+                        'Makefile': b'all:\n\ttrue\n',
+                        'program': b'#!\0\x7fELF',
+                        'script': b'#!/usr/bin/perl\n'}
+            for name, content in contents.items():
+                (Path(directory) / name).write_bytes(content)
+
+            self.assertDictEqual(
+                {'deploy': '.sh', 'manage': '.py', 'tool': '.py',
+                 'Makefile': '', 'program': '', 'script': ''},
+                {name: get_file_suffix(Path(directory) / name)
+                 for name in contents},
+            )
+            self.assertEqual('', get_file_suffix(Path(directory)))
+
+    def test_get_file_suffix_cache(self):
+        """Проверка повторного чтения только изменённого файла."""
+        with TemporaryDirectory() as directory:
+            file_path = Path(directory) / 'deploy'
+            file_path.write_bytes(b'#!/bin/sh\n')
+
+            with patch.object(file_types, 'open', create=True,
+                              side_effect=open) as mocked_open:
+                self.assertEqual('.sh', get_file_suffix(file_path))
+                self.assertEqual('.sh', get_file_suffix(file_path))
+                self.assertEqual(1, mocked_open.call_count)
+
+                file_path.write_bytes(b'#!/usr/bin/python\n')
+                os.utime(file_path, ns=(0, 0))
+                self.assertEqual('.py', get_file_suffix(file_path))
+                self.assertEqual(2, mocked_open.call_count)
+
+    def test_compile_name_filter(self):
+        """Проверка отбора имён файлов по суффиксам."""
+        for suffixes, accepted in (
+                (('.py',), ['module.py', 'deploy']),
+                (('.js',), ['app.js']),
+                (('.dockerfile',), ['Dockerfile.dev']),
+        ):
+            is_accepted = compile_name_filter(suffixes)
+            with self.subTest(suffixes=suffixes):
+                self.assertListEqual(accepted, [
+                    name for name in ('module.py', 'app.js', 'deploy',
+                                      'Dockerfile.dev')
+                    if is_accepted(name)])
+
+    def test_get_interpreter(self):
+        """Проверка интерпретатора из строки shebang."""
+        for head, interpreter in ((b'#!/bin/bash -e\n', 'bash'),
+                                  (b'#! /bin/sh', 'sh'),
+                                  (b'#!/usr/bin/env -S bash -x\n', 'bash'),
+                                  (b'#!/usr/bin/env\n', None),
+                                  (b'echo', None)):
+            with self.subTest(head=head):
+                self.assertEqual(interpreter, get_interpreter(head))
+
+    def test_get_interpreter_suffix(self):
+        """Проверка суффикса по названию интерпретатора с версией."""
+        for interpreter, suffix in (('python', '.py'),
+                                    ('python3', '.py'),
+                                    ('python3.11', '.py'),
+                                    ('pypy3', '.py'),
+                                    ('python-config', ''),
+                                    ('bash', '.sh'),
+                                    ('perl', '')):
+            with self.subTest(interpreter=interpreter):
+                self.assertEqual(suffix, get_interpreter_suffix(interpreter))
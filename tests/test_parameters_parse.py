@@ -5,7 +5,13 @@ from unittest import TestCase
 from unittest.mock import Mock, call, patch
 
 from codestyle import __version__ as application_version
-from codestyle.parameters_parse import ArgumentationTool, ParametersStorage
+from codestyle.cache import DEFAULT_CACHE_PATH, DEFAULT_CACHE_SIZE
+from codestyle.client import DEFAULT_SOCKET_PATH, SOCKET_PATH_VARIABLE
+from codestyle.parameters import DEFAULT_JOBS
+from codestyle.parameters_parse import (ArgumentationTool,
+                                        MergeResultsArgumentationTool,
+                                        ParametersStorage)
+from codestyle.reporters import REPORTERS
 from codestyle.tool_wrappers import (ESLint, Flake8, HTMLCS, PHPCBF, PHPCS,
                                      Stylelint, TOOL_SETTINGS_PATH,
                                      MyPy, Black, Hadolint)
@@ -42,6 +48,59 @@ class TestParametersStorage(TestCase):
         """Проверка logging_level без debug и quiet."""
         self.assertEqual('INFO', self.storage.logging_level)
 
+    def test_logging_stream_with_report(self):
+        """Проверка logging_stream при выводе отчёта в stdout."""
+        self.storage.format = 'jsonl'
+        self.assertEqual('ext://sys.stderr', self.storage.logging_stream)
+
+        self.storage.output = Path('report.jsonl')
+        self.assertEqual('ext://sys.stdout', self.storage.logging_stream)
+
+    def test_logging_stream(self):
+        """Проверка logging_stream без отчёта."""
+        self.assertEqual('ext://sys.stdout', self.storage.logging_stream)
+
+    def test_tool_timeouts(self):
+        """Проверка ограничений времени запуска утилит."""
+        self.assertDictEqual({}, self.storage.tool_timeouts)
+
+        self.storage.tool_timeout = ['MyPy=300', 'eslint = 0', 'flake8=2.5']
+        self.assertDictEqual({'mypy': 300, 'eslint': None, 'flake8': 2.5},
+                             self.storage.tool_timeouts)
+
+        for value in ('mypy', 'mypy=', '=300', 'mypy=-1'):
+            with self.subTest(value=value), self.assertRaises(ValueError):
+                self.storage.tool_timeout = [value]
+                self.storage.tool_timeouts
+
+    def test_file_suffixes(self):
+        """Проверка суффиксов обрабатываемых файлов."""
+        self.assertEqual(None, self.storage.file_suffixes)
+
+        self.storage.file_suffix = ['.py', 'php']
+        self.assertSetEqual({'.py', '.php'}, self.storage.file_suffixes)
+
+    def test_tool_filters(self):
+        """Проверка названий утилит для отбора."""
+        self.assertSetEqual(set(), self.storage.only_tools)
+
+        self.storage.only_tool = ['MyPy', ' flake8']
+        self.storage.skip_tool = ['eslint']
+        self.assertSetEqual({'mypy', 'flake8'}, self.storage.only_tools)
+        self.assertSetEqual({'eslint'}, self.storage.skip_tools)
+
+    def test_shard_position(self):
+        """Проверка сегмента обработки."""
+        self.assertEqual(None, self.storage.shard_position)
+
+        self.storage.shard = '2/4'
+        self.assertTupleEqual((2, 4), self.storage.shard_position)
+
+        for value in ('2', '0/4', '5/4', 'a/4'):
+            with self.subTest(value=value), self.assertRaises(ValueError):
+                self.storage.shard = value
+                self.storage.shard_position
+
 
 class TestArgumentationTool(TestCase):
     """Проверки ArgumentationTool."""
@@ -102,7 +161,7 @@ class TestArgumentationTool(TestCase):
         args, kwargs = mock_parse.call_args
         self.assertTupleEqual((), args)
         self.assertDictEqual(
-            {'namespace': mocked_storage.return_value}, kwargs
+            {'args': None, 'namespace': mocked_storage.return_value}, kwargs
         )
 
     @patch('codestyle.parameters_parse.ParametersStorage', new=Mock())
@@ -118,13 +177,13 @@ class TestArgumentationTool(TestCase):
         ArgumentationTool()
 
         self.assertEqual(True, mock_add_argument.called)
-        self.assertEqual(19, mock_add_argument.call_count)
+        self.assertEqual(50, mock_add_argument.call_count)
         parameter_calls = [
             call(
                 'target',
                 help='Путь до проверяемых файлов или директорий',
                 metavar='target',
-                nargs='+',
+                nargs='*',
                 type=Path,
             ),
             call(
@@ -134,6 +193,89 @@ class TestArgumentationTool(TestCase):
                 dest='fix',
                 help='Исправить ошибки по возможности',
             ),
+            call(
+                '--check',
+                action='store_true',
+                dest='check',
+                help='Проверить файлы после исправления (с параметром --fix) '
+                     'за один запуск приложения',
+            ),
+            call(
+                '--diff',
+                action='store_true',
+                dest='diff',
+                help='Выводить изменения исправленных файлов в формате '
+                     'unified diff (с параметром --fix)',
+            ),
+            call(
+                '--exit-on-change',
+                action='store_true',
+                dest='exit_on_change',
+                help='Завершать работу с ошибкой, если исправление изменило '
+                     'файлы (с параметром --fix)',
+            ),
+            call(
+                '--format',
+                dest='format',
+                choices=tuple(REPORTERS),
+                default=None,
+                help='Формат машиночитаемого отчёта о результатах обработки '
+                     'файлов (сообщения приложения при выводе отчёта в '
+                     'стандартный вывод пишутся в поток ошибок)',
+            ),
+            call(
+                '--output',
+                dest='output',
+                metavar='<report path>',
+                type=Path,
+                default=None,
+                help='Путь до файла отчёта (с параметром --format; '
+                     'по-умолчанию: стандартный вывод)',
+            ),
+            call(
+                '--baseline',
+                dest='baseline',
+                metavar='<baseline path>',
+                type=Path,
+                default=None,
+                help='Путь до базового файла известных замечаний: при '
+                     'проверке ошибками считаются только новые замечания',
+            ),
+            call(
+                '--write-baseline',
+                dest='write_baseline',
+                metavar='<baseline path>',
+                type=Path,
+                default=None,
+                help='Записать замечания проверки в базовый файл по '
+                     'указанному пути (вместо --baseline)',
+            ),
+            call(
+                '--profile',
+                dest='profile',
+                action='store_true',
+                help='Вывести в поток ошибок профиль обработки: время, '
+                     'процессорное время и память утилит, самые долгие '
+                     'запуски',
+            ),
+            call(
+                '--profile-slowest',
+                dest='profile_slowest',
+                metavar='<количество запусков>',
+                type=int,
+                default=10,
+                help='Количество самых долгих запусков утилит в профиле '
+                     '(по-умолчанию: 10)',
+            ),
+            call(
+                '--profile-output',
+                dest='profile_output',
+                metavar='<profile path>',
+                type=Path,
+                default=None,
+                help='Путь до файла для записи измерений профиля обработки в '
+                     'формате JSON',
+            ),
             call(
                 '-c',
                 '--compact',
@@ -168,9 +310,27 @@ class TestArgumentationTool(TestCase):
             call(
                 '--file_suffix',
                 dest='file_suffix',
-                help='Проверяемое расширение файлов (.py, .js и так '
-                     'далее; по-умолчанию: все расширения)',
                 metavar='<file suffix>',
+                action='append',
+                help='Проверяемое расширение файлов (.py, .js и так '
+                     'далее; можно указать несколько раз; по-умолчанию: '
+                     'все расширения)',
+            ),
+            call(
+                '--only-tool',
+                dest='only_tool',
+                metavar='<утилита>',
+                action='append',
+                help='Обрабатывать файлы только указанной утилитой (в том '
+                     'числе опциональной; можно указать несколько раз)',
+            ),
+            call(
+                '--skip-tool',
+                dest='skip_tool',
+                metavar='<утилита>',
+                action='append',
+                help='Не обрабатывать файлы указанной утилитой (можно '
+                     'указать несколько раз)',
             ),
             call(
                 '-x',
@@ -181,6 +341,169 @@ class TestArgumentationTool(TestCase):
                 metavar='<globbing шаблон>',
                 nargs='+',
             ),
+            call(
+                '--no-ignore-files',
+                action='store_false',
+                dest='ignore_files',
+                help='Не учитывать правила из файлов .gitignore и '
+                     '.codestyleignore при обходе директорий',
+            ),
+            call(
+                '--changed-since',
+                default=None,
+                dest='changed_since',
+                help='Обрабатывать только файлы, изменённые относительно '
+                     'указанной ветки, тега или коммита git (включая '
+                     'неотслеживаемые файлы)',
+                metavar='<git ссылка>',
+            ),
+            call(
+                '--staged',
+                action='store_true',
+                dest='staged',
+                help='Обрабатывать только файлы, изменения которых '
+                     'добавлены в индекс git',
+            ),
+            call(
+                '--shard',
+                dest='shard',
+                metavar='<номер>/<количество>',
+                default=None,
+                help='Обрабатывать только файлы указанного сегмента (номера '
+                     'начинаются с 1) для разделения работы между узлами CI',
+            ),
+            call(
+                '--shard-balance',
+                dest='shard_balance',
+                choices=('hash', 'size', 'timing'),
+                default='hash',
+                help='Способ разделения файлов между сегментами: по хэшу '
+                     'пути, по размеру файлов или по длительности обработки '
+                     'из профиля --shard-timings (по-умолчанию: hash)',
+            ),
+            call(
+                '--shard-timings',
+                dest='shard_timings',
+                metavar='<profile path>',
+                type=Path,
+                default=None,
+                help='Путь до профиля предыдущего запуска (--profile-output) '
+                     'для разделения файлов по длительности обработки',
+            ),
+            call(
+                '--batch',
+                action='store_true',
+                dest='batch',
+                help='Обрабатывать файлы пакетами: один запуск утилиты на '
+                     'группу файлов вместо запуска для каждого файла',
+            ),
+            call(
+                '--batch-size',
+                default=0,
+                dest='batch_size',
+                help='Максимальное количество файлов в пакете '
+                     '(по-умолчанию: 0 - ограничено только длиной командной '
+                     'строки)',
+                metavar='<количество файлов>',
+                type=int,
+            ),
+            call(
+                '-j',
+                '--jobs',
+                default=DEFAULT_JOBS,
+                dest='jobs',
+                help='Количество параллельно обрабатываемых заданий '
+                     '(по-умолчанию: количество процессоров - '
+                     f'{DEFAULT_JOBS})',
+                metavar='<количество заданий>',
+                type=int,
+            ),
+            call(
+                '--timeout',
+                dest='timeout',
+                metavar='<секунд>',
+                type=float,
+                default=0,
+                help='Ограничение времени одного запуска утилиты: утилита '
+                     'завершается вместе с порождёнными процессами, а файл '
+                     'считается необработанным (по-умолчанию: 0 - без '
+                     'ограничения)',
+            ),
+            call(
+                '--tool-timeout',
+                dest='tool_timeout',
+                metavar='<утилита>=<секунд>',
+                action='append',
+                default=None,
+                help='Ограничение времени запуска указанной утилиты вместо '
+                     '--timeout (0 - без ограничения), например: mypy=300',
+            ),
+            call(
+                '--max-output-lines',
+                dest='max_output_lines',
+                metavar='<количество строк>',
+                type=int,
+                default=0,
+                help='Читать вывод утилит построчно и хранить только '
+                     'указанное количество последних строк для каждого файла '
+                     '(по-умолчанию: 0 - весь вывод)',
+            ),
+            call(
+                '--no-cache',
+                action='store_false',
+                dest='cache',
+                help='Не использовать кэш на диске (результаты проверки '
+                     'файлов и сведения об утилитах)',
+            ),
+            call(
+                '--cache-dir',
+                default=DEFAULT_CACHE_PATH,
+                dest='cache_dir',
+                help=f'Путь до директории кэша '
+                     f'(по-умолчанию: {DEFAULT_CACHE_PATH})',
+                type=Path,
+            ),
+            call(
+                '--cache-size',
+                default=DEFAULT_CACHE_SIZE,
+                dest='cache_size',
+                help='Максимальный размер кэша результатов в мегабайтах '
+                     f'(по-умолчанию: {DEFAULT_CACHE_SIZE})',
+                metavar='<мегабайт>',
+                type=int,
+            ),
+            call(
+                '--resident',
+                action='store_true',
+                dest='resident',
+                help='Использовать резидентные серверы утилит (eslint_d, '
+                     'dmypy, blackd), если они установлены',
+            ),
+            call(
+                '--in-process',
+                action='store_true',
+                dest='in_process',
+                help='Выполнять Python утилиты (flake8, autopep8, autoflake, '
+                     'black) в пуле процессов приложения, если они '
+                     'установлены в его окружении',
+            ),
+            call(
+                '--daemon',
+                action='store_true',
+                dest='daemon',
+                help='Запустить демон, обрабатывающий запросы клиента '
+                     '(python -m codestyle.client) без повторного запуска '
+                     'приложения',
+            ),
+            call(
+                '--socket',
+                default=DEFAULT_SOCKET_PATH,
+                dest='socket',
+                help='Путь до Unix сокета демона (по-умолчанию: значение '
+                     f'переменной окружения {SOCKET_PATH_VARIABLE} или '
+                     f'{DEFAULT_SOCKET_PATH})',
+                type=Path,
+            ),
             call(
                 '--phpcs-encoding',
                 default=PHPCS.encoding,
@@ -268,3 +591,59 @@ class TestArgumentationTool(TestCase):
 
         for parameter_call in parameter_calls:
             self.assertIn(parameter_call, mock_add_argument.mock_calls)
+
+    @patch.object(ArgumentationTool, 'DEFAULT_CONFIG_FILES', new=())
+    def test_check_timeouts(self):
+        """Проверка ошибки при неверном ограничении времени утилиты."""
+        with patch('sys.stderr'), self.assertRaises(SystemExit):
+            ArgumentationTool(['--tool-timeout', 'mypy', '.'])
+
+        parameters_storage = ArgumentationTool(
+            ['--timeout', '60', '--tool-timeout', 'mypy=300',
+             '.']).parameters_storage
+        self.assertEqual(60, parameters_storage.timeout)
+        self.assertDictEqual({'mypy': 300}, parameters_storage.tool_timeouts)
+
+    def test_check_report(self):
+        """Проверка запрета вывода отчёта и изменений в stdout."""
+        with patch('sys.stderr'), self.assertRaises(SystemExit):
+            ArgumentationTool(['--fix', '--diff', '--format', 'json', '.'])
+
+        parameters_storage = ArgumentationTool(
+            ['--fix', '--diff', '--format', 'json', '--output',
+             'report.json', '.']).parameters_storage
+        self.assertEqual(Path('report.json'), parameters_storage.output)
+
+    @patch.object(ArgumentationTool, 'DEFAULT_CONFIG_FILES', new=())
+    def test_check_shard(self):
+        """Проверка ошибки при неверном сегменте или без профиля."""
+        for arguments in (['--shard', '3/2', '.'],
+                          ['--shard', '1/2', '--shard-balance', 'timing',
+                           '.']):
+            with self.subTest(arguments=arguments), patch(
+                    'sys.stderr'), self.assertRaises(SystemExit):
+                ArgumentationTool(arguments)
+
+        parameters_storage = ArgumentationTool(
+            ['--shard', '1/2', '--shard-balance', 'size',
+             '.']).parameters_storage
+        self.assertTupleEqual((1, 2), parameters_storage.shard_position)
+
+
+class TestMergeResultsArgumentationTool(TestCase):
+    """Проверки MergeResultsArgumentationTool."""
+
+    def test_init(self):
+        """Проверка разбора аргументов команды merge-results."""
+        parameters_storage = MergeResultsArgumentationTool(
+            ['1.jsonl', '2.jsonl', '--format', 'sarif', '--output',
+             'report.sarif']).parameters_storage
+
+        self.assertListEqual([Path('1.jsonl'), Path('2.jsonl')],
+                             parameters_storage.report)
+        self.assertEqual('sarif', parameters_storage.format)
+        self.assertEqual('ext://sys.stdout',
+                         parameters_storage.logging_stream)
+
+        with patch('sys.stderr'), self.assertRaises(SystemExit):
+            MergeResultsArgumentationTool([])
@@ -0,0 +1,96 @@
+"""Проверки модуля profiling."""
+import json
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from codestyle.profiling import Profile, get_percentile
+from codestyle.tool_wrappers import Result
+
+
+def create_profile() -> Profile:
+    """Профиль с измерениями двух утилит и результатом из кэша."""
+    profile = Profile()
+    for index in range(1, 11):
+        profile.add(Path(f'{index}.py'), 'flake8',
+                    Result(0, duration=index / 10, cpu_time=index / 20,
+                           max_rss=index * 1024 * 1024))
+    profile.add(Path('1.js'), 'eslint', Result(1, duration=2.0))
+    cached_result = Result(0)
+    cached_result.is_cached = True
+    profile.add(Path('11.py'), 'flake8', cached_result)
+    profile.finish()
+    return profile
+
+
+class TestProfile(TestCase):
+    """Проверки профиля обработки."""
+
+    def test_get_percentile(self):
+        """Проверка процентилей методом ближайшего ранга."""
+        values = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
+
+        self.assertEqual(5, get_percentile(values, 50))
+        self.assertEqual(9, get_percentile(values, 90))
+        self.assertEqual(10, get_percentile(values, 99))
+        self.assertEqual(1, get_percentile(values, 0))
+        self.assertEqual(0.0, get_percentile([], 50))
+
+    def test_get_tool_totals(self):
+        """Проверка итогов по утилитам."""
+        totals = create_profile().get_tool_totals()
+
+        self.assertListEqual(['eslint', 'flake8'], list(totals))
+        self.assertDictEqual(
+            {'count': 10, 'cached': 1, 'duration': 5.5, 'cpu_time': 2.75,
+             'percentiles': {'p50': 0.5, 'p90': 0.9, 'p99': 1.0},
+             'max_rss': 10 * 1024 * 1024},
+            totals['flake8'],
+        )
+        self.assertEqual(None, totals['eslint']['cpu_time'])
+        self.assertEqual(None, totals['eslint']['max_rss'])
+
+    def test_get_slowest(self):
+        """Проверка самых долгих запусков без результатов из кэша."""
+        slowest = create_profile().get_slowest(3)
+
+        self.assertListEqual([('1.js', 'eslint'), ('10.py', 'flake8'),
+                              ('9.py', 'flake8')],
+                             [(timing.file, timing.tool)
+                              for timing in slowest])
+
+    def test_get_report(self):
+        """Проверка текстовых итогов профиля."""
+        lines = create_profile().get_report(slowest_count=2).splitlines()
+
+        self.assertEqual(True, lines[0].startswith('Профиль обработки'))
+        self.assertListEqual(
+            ['eslint', '1', '0', '2.000', '-', '2.000', '2.000', '2.000',
+             '-'],
+            lines[2].split(),
+        )
+        self.assertListEqual(
+            ['flake8', '10', '1', '5.500', '2.750', '0.500', '0.900',
+             '1.000', '10.0'],
+            lines[3].split(),
+        )
+        self.assertEqual('Самые долгие запуски (2):', lines[4])
+        self.assertListEqual(['2.000', 'с', 'eslint', '1.js'],
+                             lines[5].split())
+        self.assertEqual(7, len(lines))
+
+    def test_save(self):
+        """Проверка записи измерений в формате JSON."""
+        with TemporaryDirectory() as directory:
+            profile_path = Path(directory) / 'profile.json'
+            create_profile().save(profile_path)
+            data = json.loads(profile_path.read_text(encoding='utf-8'))
+
+        self.assertEqual(12, len(data['timings']))
+        self.assertDictEqual(
+            {'file': '1.py', 'tool': 'flake8', 'duration': 0.1,
+             'cpu_time': 0.05, 'max_rss': 1024 * 1024, 'cached': False},
+            data['timings'][0],
+        )
+        self.assertEqual(True, data['timings'][-1]['cached'])
+        self.assertEqual(['eslint', 'flake8'], sorted(data['tools']))
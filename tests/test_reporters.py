@@ -0,0 +1,225 @@
+"""Проверки модуля reporters."""
+import json
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import Mock, patch
+# Разбираются только отчёты, записанные в тестах.
+from xml.etree import ElementTree  # noqa: S405
+
+from codestyle.reporters import (JsonLinesReporter, JsonReporter,
+                                 JUnitReporter, SarifReporter, create_record,
+                                 load_report, merge_reports)
+from codestyle.tool_wrappers import Flake8, Result
+
+SUMMARY = {'method': 'check', 'status': 1, 'total_count': 2,
+           'total_failed': 1, 'total_changed': 0}
+
+
+def parse_xml(text: str) -> ElementTree.Element:
+    """Разбор отчёта JUnit XML, записанного в тесте."""
+    return ElementTree.fromstring(text)  # noqa: S314
+
+
+def create_records() -> list:
+    """Записи отчёта с успешной и неуспешной обработкой."""
+    tool = Flake8(registry=Mock())
+    return [
+        create_record(Path('good.py'), tool, Result(0, duration=0.5)),
+        create_record(Path('bad.py'), tool, Result(
+            1, output='bad.py:3:1: E302 expected 2 blank lines <&>',
+            duration=0.25)),
+    ]
+
+
+class TestRecords(TestCase):
+    """Проверки создания записей отчёта."""
+
+    def test_create_record(self):
+        """Проверка записи отчёта."""
+        record = create_records()[1]
+
+        self.assertEqual('flake8', record['tool'])
+        self.assertEqual('bad.py', record['file'])
+        self.assertEqual(1, record['return_code'])
+        self.assertEqual(False, record['success'])
+        self.assertEqual(False, record['timed_out'])
+        self.assertEqual(0.25, record['duration'])
+        self.assertListEqual(
+            [{'line': 3, 'column': 1, 'code': 'E302', 'severity': 'error',
+              'message': 'expected 2 blank lines <&>'}],
+            record['diagnostics'],
+        )
+
+
+class TestReporters(TestCase):
+    """Проверки отчётов."""
+
+    def write_report(self, reporter_cls, summary=SUMMARY) -> str:
+        """Запись отчёта в стандартный вывод."""
+        stdout = StringIO()
+        with patch('codestyle.reporters.sys.stdout', new=stdout):
+            reporter = reporter_cls()
+            for record in create_records():
+                reporter.add(record)
+            reporter.finish(summary)
+        return stdout.getvalue()
+
+    def test_json_lines(self):
+        """Проверка отчёта JSON Lines."""
+        lines = [json.loads(line)
+                 for line in self.write_report(JsonLinesReporter).splitlines()]
+
+        self.assertListEqual(['result', 'result', 'summary'],
+                             [line['type'] for line in lines])
+        self.assertEqual('good.py', lines[0]['file'])
+        self.assertEqual(1, lines[2]['total_failed'])
+
+    def test_json(self):
+        """Проверка отчёта JSON."""
+        report = json.loads(self.write_report(JsonReporter))
+
+        self.assertEqual(2, len(report['results']))
+        self.assertDictEqual(SUMMARY, report['summary'])
+
+    def test_json_interrupted(self):
+        """Проверка корректности прерванного отчёта JSON."""
+        report = json.loads(self.write_report(JsonReporter, summary=None))
+
+        self.assertEqual(None, report['summary'])
+
+    def test_sarif(self):
+        """Проверка отчёта SARIF."""
+        report = json.loads(self.write_report(SarifReporter))
+
+        self.assertEqual('2.1.0', report['version'])
+        run = report['runs'][0]
+        self.assertEqual('codestyle', run['tool']['driver']['name'])
+        self.assertEqual(1, len(run['results']))
+        result = run['results'][0]
+        self.assertEqual('error', result['level'])
+        self.assertEqual('E302', result['ruleId'])
+        self.assertEqual('flake8', result['properties']['tool'])
+        location = result['locations'][0]['physicalLocation']
+        self.assertEqual('bad.py', location['artifactLocation']['uri'])
+        self.assertDictEqual({'startLine': 3, 'startColumn': 1},
+                             location['region'])
+        self.assertDictEqual({'executionSuccessful': True, 'exitCode': 1},
+                             run['invocations'][0])
+
+    def test_junit(self):
+        """Проверка отчёта JUnit XML."""
+        root = parse_xml(self.write_report(JUnitReporter))
+
+        testcases = root.findall('testcase')
+        self.assertListEqual(['good.py', 'bad.py'],
+                             [testcase.get('name') for testcase in testcases])
+        self.assertEqual('0.500', testcases[0].get('time'))
+        self.assertEqual(None, testcases[0].find('failure'))
+        self.assertIn('<&>', testcases[1].find('failure').text)
+
+    def test_junit_timed_out(self):
+        """Проверка ошибки теста при превышении времени работы утилиты."""
+        stdout = StringIO()
+        with patch('codestyle.reporters.sys.stdout', new=stdout):
+            reporter = JUnitReporter()
+            reporter.add(create_record(
+                Path('slow.py'), Flake8(registry=Mock()),
+                Result(-9, error='Превышено время работы flake8',
+                       timed_out=True)))
+            reporter.finish(SUMMARY)
+
+        testcase = parse_xml(stdout.getvalue()).find('testcase')
+        self.assertEqual(None, testcase.find('failure'))
+        self.assertEqual('Превышено время работы утилиты',
+                         testcase.find('error').get('message'))
+
+    def test_junit_illegal_characters(self):
+        """Проверка удаления недопустимых в XML 1.0 символов."""
+        stdout = StringIO()
+        with patch('codestyle.reporters.sys.stdout', new=stdout):
+            reporter = JUnitReporter()
+            reporter.add(create_record(
+                Path('bad\x0c.py'), Flake8(registry=Mock()),
+                Result(1, output='\x1b[31mE302\x1b[0m\x00')))
+            reporter.finish(SUMMARY)
+
+        testcase = parse_xml(stdout.getvalue()).find('testcase')
+        self.assertEqual('bad.py', testcase.get('name'))
+        self.assertEqual('[31mE302[0m', testcase.find('failure').text)
+
+    def test_output_file(self):
+        """Проверка записи отчёта в файл."""
+        with TemporaryDirectory() as directory:
+            output_path = Path(directory) / 'report.jsonl'
+            reporter = JsonLinesReporter(output_path)
+            reporter.add(create_records()[0])
+            reporter.finish(SUMMARY)
+
+            self.assertEqual(True, reporter.stream.closed)
+            self.assertEqual(2, len(output_path.read_text().splitlines()))
+
+
+class TestMergeReports(TestCase):
+    """Проверки объединения отчётов сегментов."""
+
+    def write_reports(self, directory: str) -> list:
+        """Запись отчётов двух сегментов в форматах json и jsonl."""
+        paths = [Path(directory) / 'shard_1.json',
+                 Path(directory) / 'shard_2.jsonl']
+        records = create_records()
+        for path, reporter_cls, record, summary in zip(
+                paths, (JsonReporter, JsonLinesReporter), records,
+                ({**SUMMARY, 'status': 0, 'total_failed': 0,
+                  'total_count': 1},
+                 {**SUMMARY, 'total_count': 1})):
+            reporter = reporter_cls(path)
+            reporter.add(record)
+            reporter.finish(summary)
+        return paths
+
+    def test_load_report(self):
+        """Проверка чтения отчётов json и jsonl."""
+        with TemporaryDirectory() as directory:
+            json_path, jsonl_path = self.write_reports(directory)
+
+            records, summary = load_report(json_path)
+            self.assertEqual('good.py', records[0]['file'])
+            self.assertEqual(0, summary['status'])
+            records, summary = load_report(jsonl_path)
+            self.assertNotIn('type', records[0])
+            self.assertEqual(1, summary['total_failed'])
+
+            sarif_path = Path(directory) / 'report.sarif'
+            SarifReporter(sarif_path).finish(SUMMARY)
+            with self.assertRaises(ValueError):
+                load_report(sarif_path)
+
+    def test_merge_reports(self):
+        """Проверка объединённого отчёта и итогов."""
+        with TemporaryDirectory() as directory:
+            paths = self.write_reports(directory)
+            output_path = Path(directory) / 'report.jsonl'
+            reporter = JsonLinesReporter(output_path)
+
+            summary = merge_reports(paths, reporter)
+            reporter.finish(summary)
+
+            self.assertDictEqual({**SUMMARY, 'interrupted': 0}, summary)
+            self.assertEqual(3, len(output_path.read_text().splitlines()))
+
+    def test_merge_interrupted_reports(self):
+        """Проверка неуспешных итогов при прерванном сегменте."""
+        with TemporaryDirectory() as directory:
+            paths = self.write_reports(directory)
+            interrupted_path = Path(directory) / 'shard_3.json'
+            reporter = JsonReporter(interrupted_path)
+            reporter.add(create_records()[0])
+            reporter.finish(None)
+
+            summary = merge_reports([*paths, interrupted_path])
+
+            self.assertEqual(1, summary['interrupted'])
+            self.assertEqual(1, summary['status'])
+            self.assertEqual(3, summary['total_count'])
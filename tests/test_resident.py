@@ -0,0 +1,303 @@
+"""Проверки модуля resident."""
+import sys
+from pathlib import Path
+from subprocess import CompletedProcess  # noqa: S404 - только тип результата
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from codestyle.resident import (BlackD, DMypy, EslintD, Flake8Engine,
+                                PythonEngine, _run_autoflake,
+                                _run_entry_point)
+
+
+def create_process(returncode: int = 0, stdout: bytes = b'') -> Mock:
+    """Создание завершённого процесса с указанным статусом и выводом."""
+    return Mock(returncode=returncode, stdout=stdout, stderr=b'')
+
+
+def run_echo_tool(arguments: list) -> int:
+    """Точка входа утилиты для проверки PythonEngine."""
+    sys.stdout.write(' '.join(arguments) + '\n')
+    raise SystemExit(len(arguments))
+
+
+def run_upper_tool(arguments: list):
+    """Точка входа утилиты, исправляющей код из стандартного ввода."""
+    sys.stdout.write(sys.stdin.read().upper())
+
+
+class EchoEngine(PythonEngine):
+    """Выполнение утилиты для проверки в пуле процессов."""
+
+    module_name = 'json'
+    entry_point = staticmethod(run_echo_tool)
+
+
+class TestEslintD(TestCase):
+    """Проверки EslintD."""
+
+    @patch('codestyle.resident.run', new_callable=Mock)
+    def test_ensure_started_with_running_server(self, mocked_run: Mock):
+        """Проверка использования уже запущенного сервера."""
+        mocked_run.return_value = create_process(stdout=b'Running\n')
+        backend = EslintD('/usr/bin/eslint_d', None)
+
+        self.assertEqual(True, backend.ensure_started(['eslint']))
+        self.assertEqual(True, backend.ensure_started(['eslint']))
+        backend.stop()
+
+        self.assertEqual(False, backend.is_owned)
+        mocked_run.assert_called_once()
+
+    @patch('codestyle.resident.run', new_callable=Mock)
+    def test_ensure_started_and_stop(self, mocked_run: Mock):
+        """Проверка запуска и остановки сервера приложением."""
+        mocked_run.side_effect = [create_process(stdout=b'Not running\n'),
+                                  create_process(), create_process()]
+        backend = EslintD('/usr/bin/eslint_d', None)
+
+        self.assertEqual(True, backend.ensure_started(['eslint']))
+        self.assertEqual(True, backend.is_owned)
+        backend.stop()
+
+        commands = [args[0] for args, kwargs in mocked_run.call_args_list]
+        self.assertListEqual(
+            [('/usr/bin/eslint_d', 'status'),
+             ('/usr/bin/eslint_d', 'start'),
+             ('/usr/bin/eslint_d', 'stop')],
+            commands,
+        )
+
+    @patch('codestyle.resident.run', new_callable=Mock)
+    def test_ensure_started_failure(self, mocked_run: Mock):
+        """Проверка однократной попытки запуска сервера."""
+        mocked_run.side_effect = OSError
+
+        backend = EslintD('/usr/bin/eslint_d', None)
+        with self.assertLogs('codestyle.resident', level='WARNING'):
+            self.assertEqual(False, backend.ensure_started(['eslint']))
+        self.assertEqual(False, backend.ensure_started(['eslint']))
+
+        self.assertEqual(1, mocked_run.call_count)
+
+    @patch('codestyle.resident.run', new_callable=Mock)
+    def test_run(self, mocked_run: Mock):
+        """Проверка команды обработки файлов сервером."""
+        EslintD('/usr/bin/eslint_d', None).run(
+            ['eslint', '--config', 'eslint.json', '--fix'], ['test.js'])
+
+        args, kwargs = mocked_run.call_args
+        self.assertListEqual(
+            ['/usr/bin/eslint_d', '--config', 'eslint.json', '--fix',
+             'test.js'],
+            args[0],
+        )
+
+
+class TestDMypy(TestCase):
+    """Проверки DMypy."""
+
+    @patch('codestyle.resident.run', new_callable=Mock)
+    def test_run_with_state_directory(self, mocked_run: Mock):
+        """Проверка команды с файлом состояния в директории кэша."""
+        with TemporaryDirectory() as directory:
+            DMypy('/usr/bin/dmypy', Path(directory)).run(
+                ['mypy', '--config', 'mypy.ini'], ['test.py'])
+
+        args, kwargs = mocked_run.call_args
+        self.assertListEqual(
+            ['/usr/bin/dmypy', '--status-file',
+             str(Path(directory) / 'dmypy.json'), 'run', '--', '--config',
+             'mypy.ini', 'test.py'],
+            args[0],
+        )
+
+    @patch('codestyle.resident.run', new_callable=Mock)
+    def test_ensure_started(self, mocked_run: Mock):
+        """Проверка запуска сервера с параметрами mypy."""
+        mocked_run.side_effect = [create_process(returncode=2),
+                                  create_process()]
+
+        backend = DMypy('/usr/bin/dmypy', None)
+
+        self.assertEqual(True, backend.ensure_started(['mypy', '--strict']))
+        self.assertEqual(True, backend.is_owned)
+        args, kwargs = mocked_run.call_args
+        self.assertListEqual(
+            ['/usr/bin/dmypy', 'start', '--', '--strict'], args[0]
+        )
+
+
+class TestBlackD(TestCase):
+    """Проверки BlackD."""
+
+    def setUp(self):
+        """Создание файла и сервера с адресом во временной директории."""
+        self.directory = TemporaryDirectory()
+        self.file_path = Path(self.directory.name) / 'test.py'
+        self.file_path.write_bytes(b"x = 'a'\n")
+
+        self.backend = BlackD('/usr/bin/blackd', None)
+        self.backend._BlackD__url = 'http://127.0.0.1:45484'
+
+    def tearDown(self):
+        """Удаление временной директории."""
+        self.directory.cleanup()
+
+    @staticmethod
+    def create_response(body: bytes, status: int = 200) -> Mock:
+        """Создание ответа сервера."""
+        response = Mock(status=status)
+        response.read.return_value = body
+        response.__enter__ = Mock(return_value=response)
+        response.__exit__ = Mock(return_value=None)
+        return response
+
+    @patch('codestyle.resident.urlopen', new_callable=Mock)
+    def test_run_reformatted(self, mocked_urlopen: Mock):
+        """Проверка записи отформатированного файла."""
+        mocked_urlopen.return_value = self.create_response(b'x = "a"\n')
+        self.file_path.chmod(0o640)
+
+        completed_process = self.backend.run(
+            ['black'], [str(self.file_path)])
+
+        self.assertIsInstance(completed_process, CompletedProcess)
+        self.assertEqual(0, completed_process.returncode)
+        self.assertEqual(f'reformatted {self.file_path}',
+                         completed_process.stderr.decode())
+        self.assertEqual(b'x = "a"\n', self.file_path.read_bytes())
+        self.assertEqual(0o640, self.file_path.stat().st_mode & 0o777)
+        self.assertListEqual([self.file_path],
+                             list(Path(self.directory.name).iterdir()))
+
+    @patch('codestyle.resident.urlopen', new_callable=Mock)
+    def test_run_unchanged(self, mocked_urlopen: Mock):
+        """Проверка обработки файла без изменений (статус 204)."""
+        mocked_urlopen.return_value = self.create_response(b'', status=204)
+
+        completed_process = self.backend.run(
+            ['black'], [str(self.file_path)])
+
+        self.assertEqual(0, completed_process.returncode)
+        self.assertEqual(b'', completed_process.stderr)
+        self.assertEqual(b"x = 'a'\n", self.file_path.read_bytes())
+
+    @patch('codestyle.resident.urlopen', new_callable=Mock)
+    def test_run_with_error(self, mocked_urlopen: Mock):
+        """Проверка ошибки форматирования."""
+        mocked_urlopen.side_effect = OSError('connection refused')
+
+        completed_process = self.backend.run(
+            ['black'], [str(self.file_path)])
+
+        self.assertEqual(123, completed_process.returncode)
+        self.assertEqual(
+            f'error: cannot format {self.file_path}: connection refused',
+            completed_process.stderr.decode(),
+        )
+
+    @patch('codestyle.resident.urlopen', new_callable=Mock)
+    def test_run_with_configuration(self, mocked_urlopen: Mock):
+        """Проверка передачи параметров из файла конфигурации."""
+        mocked_urlopen.return_value = self.create_response(b'', status=204)
+        configuration_path = Path(self.directory.name) / 'black.toml'
+        configuration_path.write_text(
+            '[tool.black]\nline-length = 79\n'
+            'skip-string-normalization = true\n')
+
+        self.backend.run(
+            ['black', '--config', str(configuration_path)],
+            [str(self.file_path)])
+
+        args, kwargs = mocked_urlopen.call_args
+        self.assertEqual('79', args[0].get_header('X-line-length'))
+        self.assertEqual(
+            'true', args[0].get_header('X-skip-string-normalization')
+        )
+
+
+class TestPythonEngine(TestCase):
+    """Проверки PythonEngine."""
+
+    def test_locate(self):
+        """Проверка поиска модуля утилиты без импорта."""
+        self.assertEqual('json', EchoEngine.locate(Mock()))
+        with patch.object(Flake8Engine, 'module_name', new='missing.cli'):
+            self.assertEqual(None, Flake8Engine.locate(Mock()))
+        with patch('codestyle.resident.sys', version_info=(3, 6)):
+            self.assertEqual(None, EchoEngine.locate(Mock()))
+
+    def test_run(self):
+        """Проверка запуска утилиты в пуле процессов."""
+        engine = EchoEngine('json', None)
+
+        try:
+            self.assertEqual(True, engine.ensure_started(['tool']))
+            completed_process = engine.run(['tool', '--check'], ['test.py'])
+        finally:
+            engine.stop()
+
+        self.assertEqual(2, completed_process.returncode)
+        self.assertEqual(b'--check test.py\n', completed_process.stdout)
+        self.assertEqual(b'', completed_process.stderr)
+        self.assertListEqual(['tool', '--check', 'test.py'],
+                             completed_process.args)
+
+    def test_ensure_started_without_module(self):
+        """Проверка запуска утилиты без сервера при ошибке импорта."""
+        engine = EchoEngine('json', None)
+
+        try:
+            with patch.object(EchoEngine, 'module_name',
+                              new='missing_module'), \
+                    self.assertLogs('codestyle.resident', level='WARNING'):
+                self.assertEqual(False, engine.ensure_started(['tool']))
+        finally:
+            engine.stop()
+
+    def test_run_with_input(self):
+        """Проверка передачи кода через стандартный ввод."""
+        engine = EchoEngine('json', None)
+
+        try:
+            with patch.object(EchoEngine, 'entry_point',
+                              new=staticmethod(run_upper_tool)):
+                completed_process = engine.run(['tool'], ['-'],
+                                               input_data=b'x = 1\n')
+        finally:
+            engine.stop()
+
+        self.assertEqual(0, completed_process.returncode)
+        self.assertEqual(b'X = 1\n', completed_process.stdout)
+
+    def test_run_entry_point_with_message(self):
+        """Проверка вывода сообщения из SystemExit в поток ошибок."""
+        def exit_with_message(arguments: list):
+            raise SystemExit('ошибка')
+
+        self.assertTupleEqual(
+            (1, b'', 'ошибка\n'.encode()),
+            _run_entry_point(exit_with_message, [], '.'),
+        )
+
+    def test_run_entry_point_restores_stdin(self):
+        """Проверка восстановления стандартного ввода при прерывании."""
+        def interrupt(arguments: list):
+            raise KeyboardInterrupt
+
+        stdin = sys.stdin
+        with self.assertRaises(KeyboardInterrupt):
+            _run_entry_point(interrupt, [], '.', input_data=b'x')
+        self.assertIs(stdin, sys.stdin)
+
+    def test_run_autoflake(self):
+        """Проверка запуска autoflake через его точку входа."""
+        argv = sys.argv
+        mock_autoflake = Mock()
+        mock_autoflake.main.side_effect = lambda: len(sys.argv)
+
+        with patch.dict('sys.modules', autoflake=mock_autoflake):
+            self.assertEqual(3, _run_autoflake(['--in-place', 'test.py']))
+        self.assertIs(argv, sys.argv)
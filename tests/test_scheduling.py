@@ -0,0 +1,66 @@
+"""Проверки модуля scheduling."""
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from codestyle.scheduling import (TimingHistory, estimate_durations,
+                                  get_parallel_efficiency)
+
+
+class Test(TestCase):
+    """Проверка функций модуля."""
+
+    def test_estimate_durations(self):
+        """Проверка оценки неизвестной длительности по размеру."""
+        sizes = {'known': 100.0, 'large': 1000.0, 'empty': 0.0}
+
+        self.assertDictEqual(sizes, estimate_durations(sizes, {}))
+        self.assertDictEqual(
+            {'known': 0.5, 'large': 5.0, 'empty': 0.0},
+            estimate_durations(sizes, {'known': 0.5, 'unused': 9.0}),
+        )
+        self.assertDictEqual(
+            {'known': 0.5, 'large': 0.5},
+            estimate_durations({'known': 0.0, 'large': 1000.0},
+                               {'known': 0.5}),
+        )
+
+    def test_get_parallel_efficiency(self):
+        """Проверка эффективности параллельной обработки."""
+        self.assertEqual(0.75, get_parallel_efficiency(6.0, 2.0, 4))
+        self.assertEqual(0.0, get_parallel_efficiency(6.0, 0.0, 4))
+
+
+class TestTimingHistory(TestCase):
+    """Проверки истории длительности обработки."""
+
+    def test_add(self):
+        """Проверка сглаживания длительности."""
+        with TemporaryDirectory() as directory:
+            history = TimingHistory(Path(directory))
+            self.assertEqual(None, history.get(Path('a.py'), 'flake8',
+                                               'check'))
+
+            history.add(Path('a.py'), 'flake8', 'check', 1.0)
+            history.add(Path('a.py'), 'flake8', 'check', 3.0)
+
+            self.assertEqual(2.0, history.get(Path('a.py').absolute(),
+                                              'flake8', 'check'))
+            self.assertEqual(None, history.get(Path('a.py'), 'flake8',
+                                               'fix'))
+
+    def test_save(self):
+        """Проверка сохранения с вытеснением давно не обновлявшихся."""
+        with TemporaryDirectory() as directory:
+            history = TimingHistory(Path(directory), max_count=2)
+            for name in ('a.py', 'b.py', 'c.py'):
+                history.add(Path(name), 'flake8', 'check', 1.0)
+            history.add(Path('a.py'), 'flake8', 'check', 1.0)
+            history.save()
+
+            history = TimingHistory(Path(directory))
+            self.assertListEqual(
+                [None, 1.0, 1.0],
+                [history.get(Path(name), 'flake8', 'check')
+                 for name in ('b.py', 'c.py', 'a.py')],
+            )
@@ -0,0 +1,79 @@
+"""Проверки модуля sharding."""
+import json
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from codestyle.sharding import (get_hash_shard, get_size_costs,
+                                get_timing_costs, load_timings, parse_shard,
+                                select_shard)
+
+PATHS = [Path(f'src/module_{number}.py') for number in range(100)]
+
+
+class Test(TestCase):
+    """Проверка функций модуля."""
+
+    def test_parse_shard(self):
+        """Проверка разбора сегмента."""
+        self.assertTupleEqual((1, 3), parse_shard('1/3'))
+        for value in ('1', '0/3', '4/3', '1/x'):
+            with self.subTest(value=value), self.assertRaises(ValueError):
+                parse_shard(value)
+
+    def test_get_hash_shard(self):
+        """Проверка независимости сегмента от записи пути."""
+        self.assertEqual(get_hash_shard(Path('src/module.py'), 4),
+                         get_hash_shard(Path('src/module.py').absolute(), 4))
+        self.assertIn(get_hash_shard(Path('src/module.py'), 4), range(1, 5))
+
+    def test_select_shard_by_hash(self):
+        """Проверка попадания каждого файла ровно в один сегмент."""
+        shards = [list(select_shard(iter(PATHS), index, 3))
+                  for index in range(1, 4)]
+
+        self.assertListEqual(PATHS, sorted(
+            (path for shard in shards for path in shard),
+            key=PATHS.index))
+        self.assertTrue(all(shards))
+
+    def test_select_shard_by_costs(self):
+        """Проверка балансировки сегментов по затратам."""
+        costs = {path: 1.0 for path in PATHS}
+        costs[PATHS[0]] = 50.0
+        shards = [list(select_shard(PATHS, index, 2,
+                                    get_costs=lambda paths: costs))
+                  for index in range(1, 3)]
+        loads = [sum(costs[path] for path in shard) for shard in shards]
+
+        self.assertIn(PATHS[0], shards[0])
+        self.assertEqual(len(PATHS), sum(map(len, shards)))
+        self.assertLessEqual(abs(loads[0] - loads[1]), 1.0)
+        self.assertLess(len(shards[0]), len(shards[1]))
+
+    def test_costs(self):
+        """Проверка затрат по размеру и длительности из профиля."""
+        with TemporaryDirectory() as directory:
+            known, unknown = Path(directory, 'a.py'), Path(directory, 'b.py')
+            known.write_text('x' * 100)
+            unknown.write_text('x' * 300)
+            profile_path = Path(directory, 'profile.json')
+            profile_path.write_text(json.dumps({'timings': [
+                {'file': str(known), 'tool': 'flake8', 'duration': 1.5,
+                 'cached': False},
+                {'file': str(known), 'tool': 'mypy', 'duration': 0.5,
+                 'cached': False},
+                {'file': str(unknown), 'tool': 'flake8', 'duration': 0.0,
+                 'cached': True},
+            ]}))
+
+            self.assertDictEqual({known: 100.0, unknown: 300.0},
+                                 get_size_costs([known, unknown]))
+            self.assertDictEqual(
+                {known: 2.0, unknown: 6.0},
+                get_timing_costs([known, unknown],
+                                 load_timings(profile_path)))
+
+            profile_path.write_text('{"elapsed": 1}')
+            with self.assertRaises(ValueError):
+                load_timings(profile_path)
@@ -1,13 +1,25 @@
 """Проверки модуля system_wrappers."""
+import os
+import signal
+import sys
 from logging import INFO
+from time import monotonic
+from pathlib import Path
+from tempfile import TemporaryDirectory
 from unittest import TestCase
 from unittest.mock import Mock, call, patch
 
 from codestyle import system_wrappers
 from codestyle.system_wrappers import (
+    ARGUMENTS_LENGTH_RESERVE,
+    POINTER_SIZE,
     ExitCodes,
     check_output,
+    get_argument_length,
+    get_arguments_max_length,
     interrupt_program_flow,
+    run_measured,
+    write_file_atomically,
 )
 
 
@@ -124,3 +136,128 @@ class Test(TestCase):
         args, kwargs = mocked_interrupt_program_flow.call_args
         self.assertTupleEqual((ExitCodes.UNSUCCESSFUL,), args)
         self.assertDictEqual({}, kwargs)
+
+    def test_get_argument_length(self):
+        """Проверка get_argument_length."""
+        self.assertEqual(5 + POINTER_SIZE, get_argument_length('test'))
+        self.assertEqual(
+            len('тест'.encode()) + 1 + POINTER_SIZE,
+            get_argument_length('тест'),
+        )
+
+    @patch('codestyle.system_wrappers.os', new_callable=Mock)
+    def test_get_arguments_max_length(self, mocked_os: Mock):
+        """Проверка get_arguments_max_length с учётом окружения."""
+        mocked_os.sysconf = Mock(return_value=100000)
+        mocked_os.environ = {'KEY': 'value'}
+        mocked_os.fsencode = str.encode
+
+        self.assertEqual(
+            100000 - len('KEY=value') - 1 - POINTER_SIZE
+            - ARGUMENTS_LENGTH_RESERVE,
+            get_arguments_max_length(),
+        )
+
+    @patch('codestyle.system_wrappers.os', new_callable=Mock)
+    def test_get_arguments_max_length_without_sysconf(self, mocked_os: Mock):
+        """Проверка get_arguments_max_length без SC_ARG_MAX."""
+        mocked_os.sysconf = Mock(side_effect=ValueError)
+        mocked_os.environ = {}
+
+        self.assertEqual(
+            system_wrappers.DEFAULT_ARGUMENTS_MAX_LENGTH
+            - ARGUMENTS_LENGTH_RESERVE,
+            get_arguments_max_length(),
+        )
+
+    @patch(
+        'codestyle.system_wrappers.interrupt_program_flow', new_callable=Mock
+    )
+    @patch(
+        'codestyle.system_wrappers.check_process_output',
+        new=Mock(side_effect=FileNotFoundError),
+    )
+    def test_check_output_without_interrupt(
+        self, mocked_interrupt_program_flow: Mock
+    ):
+        """Проверка check_output без завершения работы приложения."""
+        result = check_output(('application', 'run'), interrupt=False)
+
+        self.assertEqual(None, result)
+        self.assertEqual(False, mocked_interrupt_program_flow.called)
+
+    def test_write_file_atomically(self):
+        """Проверка замены файла с сохранением прав доступа."""
+        with TemporaryDirectory() as directory:
+            file_path = Path(directory) / 'test.py'
+            file_path.write_bytes(b'old')
+            file_path.chmod(0o751)
+            link_path = Path(directory) / 'link.py'
+            link_path.symlink_to(file_path)
+
+            write_file_atomically(link_path, b'new')
+
+            self.assertEqual(True, link_path.is_symlink())
+            self.assertEqual(b'new', file_path.read_bytes())
+            self.assertEqual(0o751, file_path.stat().st_mode & 0o777)
+            self.assertListEqual(['link.py', 'test.py'],
+                                 sorted(os.listdir(directory)))
+
+    def test_run_measured(self):
+        """Проверка вывода и измерения ресурсов процесса."""
+        completed_process = run_measured(
+            [sys.executable, '-c',
+             'import sys; sys.stdout.write(sys.stdin.read()); sys.exit(3)'],
+            input_data=b'code')
+
+        self.assertEqual(3, completed_process.returncode)
+        self.assertEqual(b'code', completed_process.stdout)
+        self.assertEqual(b'', completed_process.stderr)
+        if hasattr(os, 'wait4'):
+            self.assertGreater(completed_process.cpu_time, 0)
+            self.assertGreater(completed_process.max_rss, 1024 * 1024)
+
+    def test_run_measured_with_timeout(self):
+        """Проверка завершения группы процессов по истечении времени."""
+        start_time = monotonic()
+        completed_process = run_measured(
+            [sys.executable, '-c',
+             'import subprocess, sys, time; print("started", flush=True); '
+             'subprocess.Popen([sys.executable, "-c", '
+             '"import time; time.sleep(30)"]); time.sleep(30)'],
+            timeout=1)
+
+        self.assertEqual(True, completed_process.timed_out)
+        self.assertNotEqual(0, completed_process.returncode)
+        if hasattr(os, 'killpg'):
+            self.assertEqual(-signal.SIGKILL, completed_process.returncode)
+        self.assertEqual(b'started', completed_process.stdout.strip())
+        self.assertLess(monotonic() - start_time, 10)
+
+    def test_run_measured_with_input_and_timeout(self):
+        """Проверка однократной записи ввода при превышении времени."""
+        for line_handlers in (None, (Mock(), Mock())):
+            with self.subTest(line_handlers=line_handlers is not None):
+                completed_process = run_measured(
+                    [sys.executable, '-c', 'import time; time.sleep(30)'],
+                    input_data=b'x' * 1024 * 1024, timeout=0.5,
+                    line_handlers=line_handlers)
+
+                self.assertEqual(True, completed_process.timed_out)
+                self.assertNotEqual(0, completed_process.returncode)
+
+    def test_run_measured_with_line_handlers(self):
+        """Проверка построчной передачи вывода процесса обработчикам."""
+        stdout_lines, stderr_lines = [], []
+
+        completed_process = run_measured(
+            [sys.executable, '-c',
+             'import sys; print(sys.stdin.read()); print("first"); '
+             'print("error", file=sys.stderr)'],
+            input_data=b'code',
+            line_handlers=(stdout_lines.append, stderr_lines.append))
+
+        self.assertEqual(0, completed_process.returncode)
+        self.assertEqual(b'', completed_process.stdout)
+        self.assertListEqual([b'code\n', b'first\n'], stdout_lines)
+        self.assertListEqual([b'error\n'], stderr_lines)
@@ -0,0 +1,148 @@
+"""Проверки модуля tool_registry."""
+import os
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from codestyle.resident import DMypy, EslintD
+from codestyle.tool_registry import ToolRegistry
+
+
+class TestToolRegistry(TestCase):
+    """Проверки ToolRegistry."""
+
+    def setUp(self):
+        """Создание исполняемого файла утилиты во временной директории."""
+        self.directory = TemporaryDirectory()
+        self.executable = Path(self.directory.name) / 'tool'
+        self.executable.write_text('#!/bin/sh\n')
+        self.cache_directory = Path(self.directory.name) / 'cache'
+
+    def tearDown(self):
+        """Удаление временной директории."""
+        self.directory.cleanup()
+
+    @patch('codestyle.tool_registry.which', new_callable=Mock)
+    def test_which(self, mocked_which: Mock):
+        """Проверка однократного поиска утилиты."""
+        mocked_which.return_value = '/usr/bin/tool'
+        registry = ToolRegistry()
+
+        self.assertEqual('/usr/bin/tool', registry.which('tool'))
+        self.assertEqual('/usr/bin/tool', registry.which('tool'))
+
+        mocked_which.assert_called_once_with('tool')
+
+    @patch('codestyle.tool_registry.interrupt_program_flow',
+           new_callable=Mock)
+    @patch('codestyle.tool_registry.which', new=Mock(return_value=None))
+    def test_require_missing(self, mocked_interrupt: Mock):
+        """Проверка завершения работы без обязательной утилиты."""
+        ToolRegistry().require('tool')
+
+        self.assertEqual(1, mocked_interrupt.call_count)
+        args, kwargs = mocked_interrupt.call_args
+        self.assertEqual('Инструмент tool не найден.', kwargs['log_message'])
+
+    @patch('codestyle.tool_registry.check_output', new_callable=Mock)
+    def test_probe_with_disk_cache(self, mocked_check_output: Mock):
+        """Проверка сохранения вывода утилиты между запусками."""
+        mocked_check_output.return_value = '1.0.0'
+        with patch('codestyle.tool_registry.which',
+                   return_value=str(self.executable)):
+            registry = ToolRegistry(self.cache_directory)
+            self.assertEqual('1.0.0', registry.probe('tool', '--version'))
+            self.assertEqual('1.0.0', registry.probe('tool', '--version'))
+            registry.save()
+
+            second_registry = ToolRegistry(self.cache_directory)
+            self.assertEqual(
+                '1.0.0', second_registry.probe('tool', '--version')
+            )
+
+        mocked_check_output.assert_called_once_with(
+            (str(self.executable), '--version'), interrupt=False
+        )
+
+    @patch('codestyle.tool_registry.check_output', new_callable=Mock)
+    def test_probe_after_executable_change(self, mocked_check_output: Mock):
+        """Проверка повторного запуска после обновления утилиты."""
+        mocked_check_output.side_effect = ['1.0.0', '2.0.0']
+        with patch('codestyle.tool_registry.which',
+                   return_value=str(self.executable)):
+            registry = ToolRegistry(self.cache_directory)
+            registry.probe('tool', '--version')
+            registry.save()
+
+            executable_stat = self.executable.stat()
+            os.utime(self.executable, ns=(executable_stat.st_atime_ns,
+                                          executable_stat.st_mtime_ns + 1))
+            second_registry = ToolRegistry(self.cache_directory)
+
+            self.assertEqual(
+                '2.0.0', second_registry.probe('tool', '--version')
+            )
+        self.assertEqual(2, mocked_check_output.call_count)
+
+    @patch('codestyle.tool_registry.check_output', new_callable=Mock)
+    def test_probe_with_context(self, mocked_check_output: Mock):
+        """Проверка повторного запуска при изменении условий запуска."""
+        mocked_check_output.side_effect = ['/usr/lib', '/opt/lib']
+        with patch('codestyle.tool_registry.which',
+                   return_value=str(self.executable)):
+            registry = ToolRegistry(self.cache_directory)
+
+            self.assertListEqual(
+                ['/usr/lib', '/opt/lib', '/usr/lib'],
+                [registry.probe('tool', 'root', context=context)
+                 for context in (('prefix=/usr',), ('prefix=/opt',),
+                                 ('prefix=/usr',))],
+            )
+        self.assertEqual(2, mocked_check_output.call_count)
+
+    @patch('codestyle.tool_registry.check_output',
+           new=Mock(return_value=None))
+    def test_probe_failure_is_not_cached(self):
+        """Проверка, что неудачный запуск утилиты не сохраняется."""
+        with patch('codestyle.tool_registry.which',
+                   return_value=str(self.executable)):
+            registry = ToolRegistry(self.cache_directory)
+
+            self.assertEqual(None, registry.probe('tool', '--version'))
+            registry.save()
+
+        self.assertEqual(False, self.cache_directory.exists())
+
+    @patch('codestyle.tool_registry.check_output', new_callable=Mock)
+    @patch('codestyle.tool_registry.which', new=Mock(return_value=None))
+    def test_probe_missing(self, mocked_check_output: Mock):
+        """Проверка запуска отсутствующей утилиты."""
+        self.assertEqual(None, ToolRegistry().probe('tool', '--version'))
+        self.assertEqual(False, mocked_check_output.called)
+
+    @patch('codestyle.tool_registry.which', new_callable=Mock)
+    def test_get_backend(self, mocked_which: Mock):
+        """Проверка создания одного резидентного сервера на реестр."""
+        mocked_which.side_effect = ['/usr/bin/eslint_d', None]
+        registry = ToolRegistry(self.cache_directory)
+
+        backend = registry.get_backend(EslintD)
+        self.assertIsInstance(backend, EslintD)
+        self.assertIs(backend, registry.get_backend(EslintD))
+        self.assertEqual('/usr/bin/eslint_d', backend.executable)
+        self.assertEqual(self.cache_directory, backend.state_directory)
+        self.assertEqual(None, registry.get_backend(DMypy))
+        self.assertEqual(2, mocked_which.call_count)
+
+    @patch('codestyle.tool_registry.which',
+           new=Mock(return_value='/usr/bin/eslint_d'))
+    def test_stop_backends(self):
+        """Проверка остановки резидентных серверов."""
+        registry = ToolRegistry()
+        backend = registry.get_backend(EslintD)
+
+        with patch.object(backend, 'stop') as mocked_stop:
+            registry.stop_backends()
+
+        self.assertEqual(1, mocked_stop.call_count)
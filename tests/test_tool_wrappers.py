@@ -1,10 +1,15 @@
 """Проверки модуля tool_wrappers."""
 from os import linesep
+from os.path import abspath
 from pathlib import Path
 from unittest import TestCase
-from unittest.mock import Mock, patch
+from unittest.mock import Mock, call, patch
 
-from codestyle.tool_wrappers import ConsoleTool, Result
+from codestyle.diagnostics import Diagnostic
+from codestyle.tool_wrappers import (PHPCS, Black, ConsoleTool, ESLint,
+                                     Flake8, HTMLCS, Hadolint, MyPy,
+                                     OutputTail, Result, ShellCheck,
+                                     Stylelint)
 
 
 class TestResult(TestCase):
@@ -20,24 +25,55 @@ class TestResult(TestCase):
         result = Result(0, output='result', error='')
         self.assertEqual('result' + linesep, result.whole_output)
 
+    def test_whole_output_with_skipped_lines(self):
+        """Проверка whole_output с отброшенными строками вывода."""
+        result = Result(1, output='result', skipped_lines=3)
+        self.assertEqual(
+            '... (пропущено строк вывода: 3)' + linesep + 'result' + linesep,
+            result.whole_output,
+        )
+
+
+class TestOutputTail(TestCase):
+    """Проверки OutputTail."""
+
+    def test_add_line(self):
+        """Проверка хранения последних строк вывода."""
+        tail = OutputTail(2)
+        for line in (b'first\n', b'second\r\n', b'third\n'):
+            tail.add_line(line)
+
+        self.assertEqual(f'second{linesep}third', tail.get_text())
+        self.assertDictEqual({None: 1}, tail.skipped_counts)
+
+    def test_add_line_with_keys(self):
+        """Проверка хранения последних строк вывода по ключам."""
+        tail = OutputTail(1, get_key=lambda line: line.split(':')[0])
+        for line in (b'a.py:1\n', b'b.py:1\n', b'a.py:2\n', b'a.py:3\n'):
+            tail.add_line(line)
+
+        self.assertEqual(f'a.py:3{linesep}b.py:1', tail.get_text())
+        self.assertDictEqual({'a.py': 2}, tail.skipped_counts)
+
 
 class TestConsoleTool(TestCase):
     """Проверки ConsoleTool."""
 
     @patch.object(ConsoleTool, 'get_name', new_callable=Mock)
-    @patch('codestyle.tool_wrappers.check_output', new_callable=Mock)
-    def test_init(self, mocked_check_output: Mock, mocked_get_name: Mock):
+    def test_init(self, mocked_get_name: Mock):
         """Проверка инициализации инструмента."""
         mocked_get_name.return_value = 'application'
+        mock_registry = Mock()
 
         mock_path = Path('test.py')
-        tool = ConsoleTool(mock_path)
+        tool = ConsoleTool(mock_path, registry=mock_registry)
 
-        self.assertEqual(True, mocked_check_output.called)
-        self.assertEqual(1, mocked_check_output.call_count)
-        args, kwargs = mocked_check_output.call_args
-        self.assertTupleEqual((('application', '--help'),), args)
+        self.assertEqual(True, mock_registry.require.called)
+        self.assertEqual(1, mock_registry.require.call_count)
+        args, kwargs = mock_registry.require.call_args
+        self.assertTupleEqual(('application',), args)
         self.assertDictEqual({}, kwargs)
+        self.assertEqual(False, mock_registry.probe.called)
 
         self.assertEqual(True, mocked_get_name.called)
         self.assertEqual(1, mocked_get_name.call_count)
@@ -46,6 +82,7 @@ class TestConsoleTool(TestCase):
         self.assertDictEqual({}, kwargs)
 
         self.assertEqual(mock_path, tool.configuration_path)
+        self.assertEqual(mock_registry, tool.registry)
 
     @patch.object(ConsoleTool, 'cli_tool_name', new='tool')
     def test_get_name(self):
@@ -57,11 +94,10 @@ class TestConsoleTool(TestCase):
         self.assertEqual('consoletool', ConsoleTool.get_name())
 
     @patch.object(ConsoleTool, '_process_file', new_callable=Mock)
-    @patch('codestyle.tool_wrappers.check_output', new=Mock)
     def test_check(self, mocked__process_file: Mock):
         """Проверка check."""
         path = Mock()
-        ConsoleTool().check(path)
+        ConsoleTool(registry=Mock()).check(path)
 
         self.assertEqual(True, mocked__process_file.called)
         self.assertEqual(1, mocked__process_file.call_count)
@@ -70,14 +106,455 @@ class TestConsoleTool(TestCase):
         self.assertDictEqual({}, kwargs)
 
     @patch.object(ConsoleTool, '_process_file', new_callable=Mock)
-    @patch('codestyle.tool_wrappers.check_output', new=Mock)
     def test_fix(self, mocked__process_file: Mock):
         """Проверка fix."""
         path = Mock()
-        ConsoleTool().check(path)
+        ConsoleTool(registry=Mock()).check(path)
 
         self.assertEqual(True, mocked__process_file.called)
         self.assertEqual(1, mocked__process_file.call_count)
         args, kwargs = mocked__process_file.call_args
         self.assertTupleEqual((path, ()), args)
         self.assertDictEqual({}, kwargs)
+
+
+class TestConsoleToolBatch(TestCase):
+    """Проверки пакетной обработки файлов ConsoleTool."""
+
+    def setUp(self):
+        """Создание проверяемого инструмента."""
+        self.tool = Flake8(registry=Mock())
+
+    def test_supports_batch(self):
+        """Проверка определения поддержки пакетного режима."""
+        self.assertEqual(True, Flake8.supports_batch())
+        self.assertEqual(False, HTMLCS.supports_batch())
+
+    @patch('codestyle.tool_wrappers.get_arguments_max_length',
+           new=Mock(return_value=10000))
+    def test_get_batches_with_max_count(self):
+        """Проверка разбиения на пакеты по количеству файлов."""
+        paths = ['first.py', 'second.py', 'third.py']
+
+        batches = list(self.tool.get_batches(paths, (), max_count=2))
+
+        self.assertListEqual([['first.py', 'second.py'], ['third.py']],
+                             batches)
+
+    @patch('codestyle.tool_wrappers.get_argument_length',
+           new=Mock(return_value=10))
+    @patch('codestyle.tool_wrappers.get_arguments_max_length',
+           new_callable=Mock)
+    def test_get_batches_with_max_length(self, mocked_max_length: Mock):
+        """Проверка разбиения на пакеты по длине командной строки."""
+        command_length = 10 * len(self.tool.get_command((), batch=True))
+        mocked_max_length.return_value = command_length + 25
+        paths = ['first.py', 'second.py', 'third.py', 'fourth.py']
+
+        batches = list(self.tool.get_batches(paths, ()))
+
+        self.assertListEqual(
+            [['first.py', 'second.py'], ['third.py', 'fourth.py']], batches
+        )
+
+    def test_split_batch_result(self):
+        """Проверка разделения вывода пакетной обработки по файлам."""
+        output = linesep.join((
+            f'{abspath("first.py")}:1:1: E302 expected 2 blank lines',
+            'third.py:3:80: E501 line too long',
+            '2 problems',
+        ))
+
+        results = self.tool._split_batch_result(
+            Result(1, output=output), ['first.py', 'second.py', 'third.py']
+        )
+
+        self.assertEqual(1, results['first.py'].return_code)
+        self.assertEqual(
+            f'{abspath("first.py")}:1:1: E302 expected 2 blank lines',
+            results['first.py'].output,
+        )
+        self.assertEqual(True, results['second.py'].is_success)
+        self.assertEqual('', results['second.py'].whole_output)
+        self.assertEqual(
+            'third.py:3:80: E501 line too long', results['third.py'].output
+        )
+
+    def test_split_batch_result_without_paths(self):
+        """Проверка разделения вывода без путей до файлов."""
+        result = Result(2, error='Traceback (most recent call last):')
+
+        results = self.tool._split_batch_result(
+            result, ['first.py', 'second.py']
+        )
+
+        self.assertDictEqual(
+            {'first.py': result, 'second.py': result}, results
+        )
+
+    def test_split_batch_result_black(self):
+        """Проверка разделения вывода black."""
+        error = linesep.join((
+            'reformatted first.py',
+            'error: cannot format second.py: Cannot parse: 1:4: def',
+            'All done! 💥 💔 💥',
+        ))
+
+        results = Black(registry=Mock())._split_batch_result(
+            Result(123, error=error), ['first.py', 'second.py', 'third.py']
+        )
+
+        self.assertEqual('reformatted first.py', results['first.py'].error)
+        self.assertEqual(123, results['second.py'].return_code)
+        self.assertEqual(True, results['third.py'].is_success)
+
+    def test_get_command_with_cache_dir(self):
+        """Проверка директории кэша утилиты в команде запуска."""
+        command = MyPy(registry=Mock(), cache_dir=Path('/cache')).get_command(
+            (), batch=True)
+
+        self.assertListEqual(
+            ['--cache-dir', str(Path('/cache') / 'mypy')], command[-2:]
+        )
+        self.assertNotIn(
+            '--cache-dir',
+            Flake8(registry=Mock(), cache_dir=Path('/cache')).get_command(()),
+        )
+        self.assertNotIn('--cache-dir', MyPy(registry=Mock()).get_command(()))
+
+    @patch('codestyle.tool_wrappers.run_measured', new_callable=Mock)
+    def test_process_batch_with_timeout(self, mocked_run: Mock):
+        """Проверка неполного результата при превышении времени работы."""
+        mocked_run.return_value = Mock(
+            returncode=-9, stdout=b'first.py:1:1: E302 expected 2 lines',
+            stderr=b'', timed_out=True)
+        tool = Flake8(registry=Mock(), timeout=2.5)
+
+        results = tool.check_batch(['first.py', 'second.py'])
+
+        args, kwargs = mocked_run.call_args
+        self.assertEqual(2.5, kwargs['timeout'])
+        self.assertIs(results['first.py'], results['second.py'])
+        result = results['second.py']
+        self.assertEqual(True, result.is_timed_out)
+        self.assertEqual(False, result.is_success)
+        self.assertEqual('Превышено время работы flake8 (2.5 с), процесс '
+                         'завершён.', result.error)
+
+    @patch('codestyle.tool_wrappers.run_measured', new_callable=Mock)
+    def test_process_batch_with_max_output_lines(self, mocked_run: Mock):
+        """Проверка хранения последних строк вывода каждого файла."""
+        def run(command, input_data=None, timeout=None, line_handlers=None):
+            stdout_handler, stderr_handler = line_handlers
+            for line in range(1, 4):
+                stdout_handler(f'first.py:{line}:1: E302 line\n'.encode())
+            stdout_handler(b'third.py:1:1: E302 line\n')
+            stderr_handler(b'warning\n')
+            return Mock(returncode=1, stdout=b'', stderr=b'',
+                        timed_out=False)
+
+        mocked_run.side_effect = run
+        tool = Flake8(registry=Mock(), max_output_lines=1)
+
+        results = tool.check_batch(['first.py', 'second.py', 'third.py'])
+
+        self.assertEqual('first.py:3:1: E302 line', results['first.py'].output)
+        self.assertEqual(2, results['first.py'].skipped_lines)
+        self.assertEqual(True, results['second.py'].is_success)
+        self.assertEqual('third.py:1:1: E302 line', results['third.py'].output)
+        self.assertEqual(0, results['third.py'].skipped_lines)
+
+
+class TestConsoleToolStdinFix(TestCase):
+    """Проверки исправления кода из стандартного ввода."""
+
+    @patch('codestyle.tool_wrappers.run_measured', new_callable=Mock)
+    def test_fix_content(self, mocked_run: Mock):
+        """Проверка исправленного кода и пути до файла в выводе."""
+        mocked_run.return_value = Mock(
+            returncode=0, stdout=b'x = "a"\n',
+            stderr=b'reformatted -\nAll done!\n', timed_out=False)
+        tool = Black(registry=Mock())
+
+        result, content = tool.fix_content(Path('test.py'), b"x = 'a'\n")
+
+        self.assertEqual(b'x = "a"\n', content)
+        self.assertEqual(f'reformatted test.py{linesep}All done!',
+                         result.error)
+        args, kwargs = mocked_run.call_args
+        self.assertEqual('-', args[0][-1])
+        self.assertEqual(b"x = 'a'\n", kwargs['input_data'])
+
+    @patch('codestyle.tool_wrappers.run_measured', new_callable=Mock)
+    def test_fix_content_with_error(self, mocked_run: Mock):
+        """Проверка сохранения исходного кода при ошибке утилиты."""
+        mocked_run.return_value = Mock(
+            returncode=123, stdout=b'',
+            stderr=b'error: cannot format -: Cannot parse: 1:0',
+            timed_out=False)
+        tool = Black(registry=Mock())
+
+        result, content = tool.fix_content(Path('test.py'), b'x = (\n')
+
+        self.assertEqual(False, result.is_success)
+        self.assertEqual(b'x = (\n', content)
+        self.assertEqual('error: cannot format test.py: Cannot parse: 1:0',
+                         result.error)
+
+
+class TestConsoleToolResident(TestCase):
+    """Проверки запуска утилиты через резидентный сервер."""
+
+    def test_process_file_with_backend(self):
+        """Проверка обработки файла сервером."""
+        mock_registry = Mock()
+        backend = mock_registry.get_backend.return_value
+        backend.ensure_started.return_value = True
+        backend.run.return_value.returncode = 0
+        backend.run.return_value.stdout = b''
+        backend.run.return_value.stderr = b''
+        tool = Black(registry=mock_registry, resident=True)
+
+        result = tool.fix(Path('test.py'))
+
+        self.assertEqual(True, result.is_success)
+        args, kwargs = backend.run.call_args
+        self.assertEqual(['test.py'], args[1])
+
+    @patch('codestyle.tool_wrappers.run_measured', new_callable=Mock)
+    def test_process_file_without_backend(self, mocked_run: Mock):
+        """Проверка запуска утилиты, если сервер не запустился."""
+        mocked_run.return_value = Mock(returncode=0, stdout=b'', stderr=b'',
+                                       timed_out=False)
+        mock_registry = Mock()
+        backend = mock_registry.get_backend.return_value
+        backend.ensure_started.return_value = False
+        tool = Black(registry=mock_registry, resident=True)
+
+        tool.fix(Path('test.py'))
+
+        self.assertEqual(False, backend.run.called)
+        self.assertEqual(1, mocked_run.call_count)
+
+    def test_init_without_resident(self):
+        """Проверка, что сервер не используется без параметра."""
+        mock_registry = Mock()
+
+        Black(registry=mock_registry)
+        Flake8(registry=mock_registry, resident=True)
+
+        self.assertEqual(False, mock_registry.get_backend.called)
+
+
+class TestConsoleToolDiagnostics(TestCase):
+    """Проверки разбора замечаний утилит."""
+
+    @staticmethod
+    def create_process(stdout: str, returncode: int = 1) -> Mock:
+        """Создание завершённого процесса с выводом утилиты."""
+        return Mock(returncode=returncode, stdout=stdout.encode(),
+                    stderr=b'', timed_out=False)
+
+    def test_get_diagnostics_from_text(self):
+        """Проверка однократного разбора текстового вывода."""
+        tool = Flake8(registry=Mock())
+        result = Result(1, output='test.py:2:1: E302 expected 2 blank lines'
+                        '\n1     E302 expected 2 blank lines')
+
+        diagnostics = tool.get_diagnostics(Path('test.py'), result)
+
+        self.assertListEqual(
+            [Diagnostic('test.py', 2, 1, 'E302', 'error',
+                        'expected 2 blank lines', 'flake8')],
+            diagnostics,
+        )
+        self.assertIs(diagnostics, result.diagnostics)
+
+    def test_get_diagnostics_mypy(self):
+        """Проверка разбора вывода mypy с уровнями важности."""
+        result = Result(1, output='test.py:3: error: Incompatible types  '
+                        '[assignment]\ntest.py:3: note: See docs')
+
+        diagnostics = MyPy(registry=Mock()).get_diagnostics(
+            Path('test.py'), result)
+
+        self.assertListEqual(
+            [('error', 'assignment', 'Incompatible types'),
+             ('info', '', 'See docs')],
+            [(diagnostic.severity, diagnostic.code, diagnostic.message)
+             for diagnostic in diagnostics],
+        )
+
+    def test_get_diagnostics_without_path(self):
+        """Проверка замечаний без пути в строке вывода."""
+        result = Result(1, output='test.html\n'
+                        '  [WARN] line 4, column 2: Tag missing (003)')
+
+        diagnostics = HTMLCS(registry=Mock()).get_diagnostics(
+            Path('test.html'), result)
+
+        self.assertListEqual(
+            [Diagnostic('test.html', 4, 2, '003', 'warning', 'Tag missing',
+                        'htmlcs')],
+            diagnostics,
+        )
+
+    def test_structured_output_command(self):
+        """Проверка аргументов вывода JSON в команде запуска."""
+        tool = ShellCheck(registry=Mock(), structured_output=True)
+
+        self.assertEqual(True, tool.structured_output)
+        self.assertEqual('--format=json',
+                         tool.get_command((), batch=True)[-1])
+        self.assertEqual(
+            False,
+            Flake8(registry=Mock(), structured_output=True).structured_output,
+        )
+
+    @patch('codestyle.tool_wrappers.run_measured', new_callable=Mock)
+    def test_process_batch_with_json(self, mocked_run: Mock):
+        """Проверка разделения замечаний из JSON по файлам пакета."""
+        mocked_run.return_value = self.create_process(
+            '[{"file": "a.sh", "line": 3, "column": 8, "level": "info", '
+            '"code": 2086, "message": "Double quote"}]')
+        tool = ShellCheck(registry=Mock(), structured_output=True)
+
+        results = tool.check_batch(['a.sh', 'b.sh'])
+
+        self.assertEqual('a.sh:3:8: info: Double quote [SC2086]',
+                         results['a.sh'].output)
+        self.assertListEqual(
+            [Diagnostic('a.sh', 3, 8, 'SC2086', 'info', 'Double quote',
+                        'shellcheck')],
+            results['a.sh'].diagnostics,
+        )
+        self.assertEqual(True, results['b.sh'].is_success)
+        self.assertListEqual([], results['b.sh'].diagnostics)
+
+    @patch('codestyle.tool_wrappers.run_measured', new_callable=Mock)
+    def test_process_file_with_invalid_json(self, mocked_run: Mock):
+        """Проверка результата, если вывод не удалось разобрать."""
+        mocked_run.return_value = self.create_process('Segmentation fault')
+        tool = Hadolint(registry=Mock(), structured_output=True)
+
+        result = tool.check(Path('Dockerfile'))
+
+        self.assertEqual('Segmentation fault', result.output)
+        self.assertIn('Не удалось разобрать вывод hadolint', result.error)
+        self.assertEqual(None, result.diagnostics)
+
+    @patch('codestyle.tool_wrappers.run_measured', new_callable=Mock)
+    def test_process_file_without_json_parser(self, mocked_run: Mock):
+        """Проверка текстового разбора вывода утилиты без разбора JSON."""
+        mocked_run.return_value = self.create_process(
+            '"test.py:2:1: E302 expected 2 blank lines"')
+
+        with patch.object(Flake8, 'json_output_arguments',
+                          new=('--format=json',)):
+            tool = Flake8(registry=Mock(), structured_output=True)
+            result = tool.check(Path('test.py'))
+
+        self.assertEqual(True, tool.structured_output)
+        self.assertEqual('"test.py:2:1: E302 expected 2 blank lines"',
+                         result.output)
+        self.assertEqual('', result.error)
+        self.assertListEqual(
+            ['E302'], [diagnostic.code for diagnostic
+                       in tool.get_diagnostics(Path('test.py'), result)])
+
+    def test_parse_json_output(self):
+        """Проверка разбора вывода JSON утилит."""
+        mock_registry = Mock()
+        mock_registry.probe.return_value = '/usr/lib/node_modules'
+        outputs = (
+            (ESLint, [{'filePath': 'a.js', 'messages': [
+                {'ruleId': 'no-var', 'severity': 1, 'message': 'Use let',
+                 'line': 1, 'column': 1}]}]),
+            (PHPCS, {'files': {'a.php': {'messages': [
+                {'message': 'Missing doc', 'source': 'Squiz.Doc',
+                 'type': 'ERROR', 'line': 1, 'column': 1}]}}}),
+            (Hadolint, [{'file': 'Dockerfile', 'line': 1, 'column': 1,
+                         'code': 'DL3006', 'level': 'warning',
+                         'message': 'Tag image'}]),
+            (Stylelint, [{'source': 'a.css', 'warnings': [
+                {'line': 1, 'column': 1, 'rule': 'block-no-empty',
+                 'severity': 'error',
+                 'text': 'Unexpected empty block (block-no-empty)'}]}]),
+        )
+        expected = (
+            ('a.js', 'no-var', 'warning', 'Use let'),
+            ('a.php', 'Squiz.Doc', 'error', 'Missing doc'),
+            ('Dockerfile', 'DL3006', 'warning', 'Tag image'),
+            ('a.css', 'block-no-empty', 'error', 'Unexpected empty block'),
+        )
+
+        for (tool_cls, data), fields in zip(outputs, expected):
+            with self.subTest(tool=tool_cls.__name__):
+                diagnostics = tool_cls(
+                    registry=mock_registry).parse_json_output(data)
+                self.assertListEqual(
+                    [fields],
+                    [(diagnostic.path, diagnostic.code, diagnostic.severity,
+                      diagnostic.message) for diagnostic in diagnostics],
+                )
+
+
+class TestConsoleToolVersion(TestCase):
+    """Проверки определения версии утилиты."""
+
+    def test_get_version(self):
+        """Проверка однократного определения версии."""
+        mock_registry = Mock()
+        mock_registry.probe.return_value = '3.8.3'
+        tool = Flake8(registry=mock_registry)
+
+        self.assertEqual('3.8.3', tool.get_version())
+        self.assertEqual('3.8.3', tool.get_version())
+
+        self.assertEqual(1, mock_registry.probe.call_count)
+        args, kwargs = mock_registry.probe.call_args
+        self.assertTupleEqual(('flake8', '--version'), args)
+        self.assertDictEqual({}, kwargs)
+
+
+class TestESLint(TestCase):
+    """Проверки ESLint."""
+
+    def test_npm_root_path(self):
+        """Проверка определения директории npm пакетов при создании."""
+        mock_registry = Mock()
+        mock_registry.probe.return_value = '/usr/lib/node_modules'
+
+        with patch.dict('codestyle.tool_wrappers.environ', clear=True,
+                        NPM_CONFIG_PREFIX='/opt/npm',
+                        npm_config_userconfig='/missing/.npmrc'):
+            tool = ESLint(registry=mock_registry)
+
+        self.assertListEqual(
+            [call('eslint'), call('npm')], mock_registry.require.mock_calls
+        )
+        mock_registry.probe.assert_called_once_with(
+            'npm', 'root', '-g', context=(
+                'npm_config_prefix=/opt/npm',
+                'npm_config_userconfig=/missing/.npmrc',
+                '/missing/.npmrc', '',
+            ),
+        )
+        self.assertListEqual(
+            ['--resolve-plugins-relative-to',
+             str(Path('/usr/lib/node_modules').resolve())],
+            list(tool._get_extra_run_arguments()),
+        )
+
+    @patch('codestyle.tool_wrappers.interrupt_program_flow',
+           new_callable=Mock)
+    def test_npm_root_path_without_npm_root(self,
+                                            mocked_interrupt: Mock):
+        """Проверка завершения работы без директории npm пакетов."""
+        mocked_interrupt.side_effect = SystemExit
+        mock_registry = Mock()
+        mock_registry.probe.return_value = None
+
+        with self.assertRaises(SystemExit):
+            ESLint(registry=mock_registry)
+        self.assertEqual(1, mocked_interrupt.call_count)
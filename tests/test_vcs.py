@@ -0,0 +1,76 @@
+"""Проверки модуля vcs."""
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import Mock, call, patch
+
+from codestyle.system_wrappers import ExitCodes
+from codestyle.vcs import get_changed_paths
+
+
+class Test(TestCase):
+    """Проверки функций модуля."""
+
+    @patch('codestyle.vcs.run', new_callable=Mock)
+    def test_get_changed_paths(self, mocked_run: Mock):
+        """Проверка объединения изменённых и неотслеживаемых файлов."""
+        outputs = {
+            'rev-parse': b'/repository\n',
+            'diff': b'b.py\0a.py\0',
+            'ls-files': b'new.py\0a.py\0',
+        }
+        mocked_run.side_effect = lambda arguments, **kwargs: Mock(
+            returncode=0, stdout=outputs[arguments[1]]
+        )
+
+        paths = get_changed_paths(ref='main')
+
+        self.assertListEqual(
+            [Path('/repository/a.py'), Path('/repository/b.py'),
+             Path('/repository/new.py')],
+            paths,
+        )
+        self.assertIn(
+            call(('git', 'diff', '-z', '--name-only', '--diff-filter=d',
+                  'main', '--'), stdout=-1, stderr=-1),
+            mocked_run.mock_calls,
+        )
+
+    @patch('codestyle.vcs.run', new_callable=Mock)
+    def test_get_changed_paths_staged(self, mocked_run: Mock):
+        """Проверка получения файлов из индекса."""
+        mocked_run.side_effect = [
+            Mock(returncode=0, stdout=b'/repository\n'),
+            Mock(returncode=0, stdout=b'staged.py\0'),
+        ]
+
+        paths = get_changed_paths(staged=True)
+
+        self.assertListEqual([Path('/repository/staged.py')], paths)
+        self.assertEqual(2, mocked_run.call_count)
+        args, kwargs = mocked_run.call_args
+        self.assertTupleEqual(
+            (('git', 'diff', '-z', '--cached', '--name-only',
+              '--diff-filter=d'),),
+            args,
+        )
+
+    @patch('codestyle.vcs.interrupt_program_flow', new_callable=Mock)
+    @patch('codestyle.vcs.run', new_callable=Mock)
+    def test_get_changed_paths_with_error(
+        self, mocked_run: Mock, mocked_interrupt_program_flow: Mock
+    ):
+        """Проверка завершения работы при ошибке git."""
+        mocked_run.return_value = Mock(
+            returncode=128, stdout=b'', stderr=b'fatal: not a git repository'
+        )
+
+        get_changed_paths(staged=True)
+
+        self.assertEqual(True, mocked_interrupt_program_flow.called)
+        args, kwargs = mocked_interrupt_program_flow.call_args
+        self.assertEqual(ExitCodes.UNSUCCESSFUL, kwargs['status'])
+        self.assertEqual(
+            'Не удалось получить изменения из git: '
+            'fatal: not a git repository',
+            kwargs['log_message'],
+        )